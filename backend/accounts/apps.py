@@ -14,6 +14,7 @@ class AccountsConfig(AppConfig):
             if hasattr(signals, 'connect_user_profile_signal'):
                 if getattr(settings, 'ENABLE_PROFILE_AUTO_CREATE', True):
                     signals.connect_user_profile_signal()
+            signals.connect_authz_principal_signals()
         except Exception:  # nosec B110
             # Avoid import-time crashes; Django will surface errors at runtime
             pass
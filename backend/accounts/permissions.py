@@ -2,14 +2,25 @@ from typing import Any
 from django.contrib.auth.models import Group
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from accounts.principal import get_principal
+
 
 def _get_group_names(user) -> set[str]:
+    principal = get_principal(user)
+    if principal is not None:
+        return set(principal.group_names)
     try:
         return set(user.groups.values_list('name', flat=True))
     except Exception:
         return set()
 
 
+def get_user_person_id(user) -> int | None:
+    """Person linked to ``user`` via its profile, from the cached principal."""
+    principal = get_principal(user)
+    return principal.person_id if principal is not None else None
+
+
 def is_admin_user(user) -> bool:
     return bool(user and (getattr(user, 'is_staff', False) or getattr(user, 'is_superuser', False)))
 
@@ -87,7 +98,8 @@ class RoleBasedAccessPermission(BasePermission):
         Rules:
         - Admins/Managers: allowed (same as has_permission above).
         - SAFE methods: allowed.
-        - People: a regular user may modify only their own linked Person (via UserProfile.person).
+        - People: regular users may not modify any Person, including their own linked one;
+          profile edits go through Managers/Admins.
         - Assignments: a regular user may modify only assignments for their own Person.
         - Otherwise: deny writes for regular users.
         """
@@ -111,15 +123,11 @@ class RoleBasedAccessPermission(BasePermission):
         except Exception:
             label = ''
 
-        # Resolve linked person id (if any)
-        try:
-            profile = getattr(user, 'profile', None)
-            user_person_id = getattr(profile, 'person_id', None)
-        except Exception:
-            user_person_id = None
-
         if label == 'people.person':
-            return bool(user_person_id and getattr(obj, 'id', None) == user_person_id)
+            return False
+
+        # Resolve linked person id (if any)
+        user_person_id = get_user_person_id(user)
 
         if label == 'assignments.assignment':
             try:
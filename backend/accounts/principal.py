@@ -0,0 +1,181 @@
+"""Authorization principal resolved once per request and cached across requests.
+
+``get_principal(user)`` returns the facts permission checks need (group
+names, linked person, that person's department and vertical). The result is
+memoised on the user object, which lives for one request, and stored in the
+cache under the user's authz version plus a global authz epoch. Signals in
+``accounts.signals`` bump the user version when group membership or the
+profile link changes and the global epoch when people change department,
+departments change vertical or groups are renamed/deleted, so stale entries
+are never read again. ``is_staff``/``is_superuser`` are read from the user
+row itself and are not cached.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+MANAGER_GROUP = 'Manager'
+_REQUEST_ATTR = '_authz_principal'
+# Incremented by every bump in this process; memoised principals from an
+# older generation are ignored (matters for user objects reused across
+# requests, e.g. force-authenticated test clients).
+_local_generation = 0
+
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: int
+    group_names: frozenset[str]
+    person_id: Optional[int]
+    department_id: Optional[int]
+    vertical_id: Optional[int]
+
+    @property
+    def is_manager(self) -> bool:
+        return MANAGER_GROUP in self.group_names
+
+
+def _ttl() -> int:
+    try:
+        return max(0, int(getattr(settings, 'AUTHZ_PRINCIPAL_CACHE_TTL_SECONDS', 300)))
+    except Exception:
+        return 300
+
+
+def _user_version_key(user_id: int) -> str:
+    return f'authz:principal_version:{user_id}'
+
+
+def _epoch_key() -> str:
+    return 'authz:principal_epoch'
+
+
+def _principal_key(user_id: int, user_version: Any, epoch: Any) -> str:
+    return f'authz:principal:{user_id}:{epoch}:{user_version}'
+
+
+def _positive_int(value: Any) -> Optional[int]:
+    try:
+        parsed = int(value)
+    except Exception:
+        return None
+    return parsed if parsed > 0 else None
+
+
+def _versions(user_id: int) -> tuple[Any, Any]:
+    """Read (user_version, epoch), seeding missing counters with a fresh value.
+
+    A counter that was never set or got evicted restarts from the current
+    time so it can never collide with a version used before.
+    """
+    user_key, epoch_key = _user_version_key(user_id), _epoch_key()
+    found = cache.get_many([user_key, epoch_key])
+    missing = [key for key in (user_key, epoch_key) if found.get(key) is None]
+    for key in missing:
+        cache.add(key, time.time_ns(), None)
+    if missing:
+        found.update(cache.get_many(missing))
+    return found.get(user_key), found.get(epoch_key)
+
+
+def _load_principal(user_id: int) -> Principal:
+    from django.contrib.auth.models import Group
+
+    from accounts.models import UserProfile
+
+    group_names = frozenset(Group.objects.filter(user__id=user_id).values_list('name', flat=True))
+    row = (
+        UserProfile.objects
+        .filter(user_id=user_id)
+        .values_list('person_id', 'person__department_id', 'person__department__vertical_id')
+        .first()
+    ) or (None, None, None)
+    return Principal(
+        user_id=user_id,
+        group_names=group_names,
+        person_id=_positive_int(row[0]),
+        department_id=_positive_int(row[1]),
+        vertical_id=_positive_int(row[2]),
+    )
+
+
+def get_principal(user: Any) -> Optional[Principal]:
+    """Return the authorization principal for ``user`` (None for anonymous users)."""
+    user_id = _positive_int(getattr(user, 'pk', None))
+    if user_id is None or not getattr(user, 'is_authenticated', False):
+        return None
+    try:
+        memo = user.__dict__.get(_REQUEST_ATTR)
+    except Exception:
+        memo = None
+    if memo is not None and memo[0] == _local_generation:
+        return memo[1]
+    generation = _local_generation
+
+    principal = None
+    key = None
+    ttl = _ttl()
+    if ttl:
+        try:
+            # Versions are read before the DB so a concurrent change always
+            # lands under a newer key than the one written here.
+            key = _principal_key(user_id, *_versions(user_id))
+            principal = cache.get(key)
+        except Exception:
+            key = principal = None
+    if not isinstance(principal, Principal):
+        principal = _load_principal(user_id)
+        if key is not None:
+            try:
+                cache.set(key, principal, ttl)
+            except Exception:  # nosec B110
+                pass
+    try:
+        setattr(user, _REQUEST_ATTR, (generation, principal))
+    except Exception:  # nosec B110
+        pass
+    return principal
+
+
+def request_principal(request: Any) -> Optional[Principal]:
+    return get_principal(getattr(request, 'user', None))
+
+
+def _bump(keys: list[str]) -> None:
+    global _local_generation
+    _local_generation += 1
+    for key in keys:
+        try:
+            cache.incr(key)
+        except Exception:
+            try:
+                cache.set(key, time.time_ns(), None)
+            except Exception:  # nosec B110
+                pass
+
+
+def _bump_now_and_on_commit(keys: list[str]) -> None:
+    # Bump immediately so this process stops using the old entry, and again
+    # after commit so a principal rebuilt from pre-commit rows is discarded.
+    _bump(keys)
+    try:
+        transaction.on_commit(lambda: _bump(keys))
+    except Exception:  # nosec B110
+        pass
+
+
+def bump_user_authz(user_ids: Iterable[Any]) -> None:
+    keys = [_user_version_key(uid) for uid in sorted({_positive_int(u) for u in user_ids} - {None})]
+    if keys:
+        _bump_now_and_on_commit(keys)
+
+
+def bump_authz_epoch() -> None:
+    _bump_now_and_on_commit([_epoch_key()])
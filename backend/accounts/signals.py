@@ -3,8 +3,9 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.mail import mail_admins
 from django.db import IntegrityError, transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from .models import UserProfile
+from .principal import bump_authz_epoch, bump_user_authz
 
 logger = logging.getLogger(__name__)
 
@@ -75,3 +76,58 @@ def connect_user_profile_signal():
     except Exception:
         # Keep startup resilient if axes/settings are misconfigured
         logger.debug('Failed to connect user_locked_out signal', exc_info=True)
+
+
+def _bump_new_or_deleted_user(sender, instance, created=True, **kwargs):
+    # Primary keys can be reused (e.g. after a rollback), so a new or removed
+    # user must never inherit a cached principal.
+    if created:
+        bump_user_authz([instance.pk])
+
+
+def _bump_on_group_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        bump_user_authz([instance.pk])
+    elif pk_set:
+        bump_user_authz(pk_set)
+    else:
+        bump_authz_epoch()
+
+
+def _bump_on_profile_change(sender, instance, created=False, update_fields=None, **kwargs):
+    if update_fields is not None and not created and 'person' not in update_fields:
+        return
+    bump_user_authz([instance.user_id])
+
+
+def _bump_on_person_department_change(sender, instance, created=False, **kwargs):
+    if created or getattr(instance, '_previous_department_id', None) == instance.department_id:
+        return
+    bump_user_authz(UserProfile.objects.filter(person_id=instance.pk).values_list('user_id', flat=True))
+
+
+def _bump_on_person_delete(sender, instance, **kwargs):
+    bump_user_authz(UserProfile.objects.filter(person_id=instance.pk).values_list('user_id', flat=True))
+
+
+def _bump_authz_epoch(sender, instance, **kwargs):
+    bump_authz_epoch()
+
+
+def connect_authz_principal_signals():
+    """Invalidate cached authorization principals when their inputs change."""
+    from django.contrib.auth.models import Group
+
+    User = get_user_model()
+    post_save.connect(_bump_new_or_deleted_user, sender=User, dispatch_uid='accounts_authz_user_saved')
+    post_delete.connect(_bump_new_or_deleted_user, sender=User, dispatch_uid='accounts_authz_user_deleted')
+    m2m_changed.connect(_bump_on_group_membership, sender=User.groups.through, dispatch_uid='accounts_authz_groups')
+    post_save.connect(_bump_on_profile_change, sender=UserProfile, dispatch_uid='accounts_authz_profile_saved')
+    post_delete.connect(_bump_on_profile_change, sender=UserProfile, dispatch_uid='accounts_authz_profile_deleted')
+    post_save.connect(_bump_on_person_department_change, sender='people.Person', dispatch_uid='accounts_authz_person_saved')
+    pre_delete.connect(_bump_on_person_delete, sender='people.Person', dispatch_uid='accounts_authz_person_deleted')
+    for label, model in (('group', Group), ('department', 'departments.Department')):
+        post_save.connect(_bump_authz_epoch, sender=model, dispatch_uid=f'accounts_authz_{label}_saved')
+        post_delete.connect(_bump_authz_epoch, sender=model, dispatch_uid=f'accounts_authz_{label}_deleted')
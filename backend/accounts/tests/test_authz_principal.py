@@ -0,0 +1,67 @@
+from django.contrib.auth.models import Group, User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import UserProfile
+from accounts.permissions import get_user_person_id, is_manager_user
+from accounts.principal import get_principal
+from core.vertical_scope import get_user_enforced_vertical_id
+from departments.models import Department
+from people.models import Person
+from verticals.models import Vertical
+
+
+class AuthzPrincipalTests(TestCase):
+    def setUp(self):
+        self.vertical = Vertical.objects.create(name='Principal Vertical')
+        self.other_vertical = Vertical.objects.create(name='Principal Other Vertical')
+        self.department = Department.objects.create(name='Principal Dept', vertical=self.vertical)
+        self.person = Person.objects.create(name='Principal Person', department=self.department)
+        self.user = User.objects.create_user(username='principal-user', password='x')
+        profile, _ = UserProfile.objects.get_or_create(user=self.user)
+        profile.person = self.person
+        profile.save(update_fields=['person'])
+
+    def _fresh_user(self):
+        return User.objects.get(pk=self.user.pk)
+
+    def test_principal_is_cached_across_requests(self):
+        first = get_principal(self._fresh_user())
+        self.assertEqual(first.person_id, self.person.id)
+        self.assertEqual(first.department_id, self.department.id)
+        self.assertEqual(first.vertical_id, self.vertical.id)
+
+        user = self._fresh_user()
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertFalse(is_manager_user(user))
+            self.assertEqual(get_user_person_id(user), self.person.id)
+            self.assertEqual(get_user_enforced_vertical_id(user), self.vertical.id)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_group_membership_change_invalidates(self):
+        user = self._fresh_user()
+        self.assertFalse(is_manager_user(user))
+        manager_group, _ = Group.objects.get_or_create(name='Manager')
+        manager_group.user_set.add(self.user)
+        self.assertTrue(is_manager_user(user))
+        self.assertTrue(is_manager_user(self._fresh_user()))
+        self.user.groups.clear()
+        self.assertFalse(is_manager_user(self._fresh_user()))
+
+    def test_profile_and_department_changes_invalidate(self):
+        self.assertEqual(get_user_enforced_vertical_id(self._fresh_user()), self.vertical.id)
+
+        self.department.vertical = self.other_vertical
+        self.department.save()
+        self.assertEqual(get_user_enforced_vertical_id(self._fresh_user()), self.other_vertical.id)
+
+        other_department = Department.objects.create(name='Principal Dept 2', vertical=self.vertical)
+        self.person.department = other_department
+        self.person.save()
+        self.assertEqual(get_principal(self._fresh_user()).department_id, other_department.id)
+
+        profile = UserProfile.objects.get(user=self.user)
+        profile.person = None
+        profile.save()
+        self.assertIsNone(get_user_person_id(self._fresh_user()))
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from typing import Dict, List, Tuple
-from datetime import date, datetime
-from django.db import connection
-from django.db.models import Q, QuerySet
+from datetime import date, datetime, timedelta
+from django.core.cache import cache
+from django.db.models import Count, Q, QuerySet, Sum
 from django.conf import settings
 
 from people.models import Person
-from people.eligibility import is_hired_in_week
 from .models import Assignment as Asn
 from roles.models import Role
 from core.models import AutoHoursRoleSetting, AutoHoursTemplateRoleSetting
+from core.cache_scopes import get_snapshot_scope_version
 from core.project_visibility import get_hidden_project_ids_for_scope
+from core.week_utils import sunday_of_week
+from .read_queries import week_hours_by, week_hours_by_person
 
 
 def _eligible_role_capacity_people_ids(
@@ -26,65 +30,37 @@ def _eligible_role_capacity_people_ids(
     eval_weeks = max(0, min(int(weeks_to_check or 0), len(week_keys)))
     if eval_weeks == 0:
         return set()
-    eval_week_keys = week_keys[:eval_weeks]
-    eval_week_dates: list[date | None] = []
-    for week_key in eval_week_keys:
+    eval_week_dates: list[date] = []
+    for week_key in week_keys[:eval_weeks]:
         try:
             eval_week_dates.append(datetime.strptime(week_key, '%Y-%m-%d').date())
         except Exception:
-            eval_week_dates.append(None)
+            continue
 
-    asn_qs = Asn.objects.filter(is_active=True, person__is_active=True)
+    asn_qs = Asn.objects.filter(is_active=True, person__is_active=True, person__role_id__isnull=False)
     if dept_id is not None:
         asn_qs = asn_qs.filter(person__department_id=dept_id)
     if vertical_id is not None:
         asn_qs = asn_qs.filter(project__vertical_id=vertical_id)
     if hidden_project_ids:
         asn_qs = asn_qs.exclude(project_id__in=sorted(hidden_project_ids))
-    asn_qs = asn_qs.select_related('person').only(
-        'person_id',
-        'weekly_hours',
-        'person__role_id',
-        'person__hire_date',
-        'person__is_active',
-    )
-
-    totals_by_person: Dict[int, List[float]] = {}
-    for asn in asn_qs.iterator():
-        rid = getattr(asn.person, 'role_id', None)
-        if not rid:
-            continue
-        if role_ids and rid not in role_ids:
-            continue
-        pid = int(getattr(asn, 'person_id', 0) or 0)
-        if pid <= 0:
-            continue
-        hire = getattr(asn.person, 'hire_date', None)
-        wh = getattr(asn, 'weekly_hours', None) or {}
-        weekly_totals = totals_by_person.setdefault(pid, [0.0 for _ in range(eval_weeks)])
-        for idx, wk in enumerate(eval_week_keys):
-            week_start = eval_week_dates[idx]
-            if week_start is None:
-                continue
-            if not is_hired_in_week(hire, week_start):
-                continue
-            try:
-                hours = float(wh.get(wk) or 0.0)
-            except Exception:
-                hours = 0.0
-            if hours <= 0:
-                continue
-            weekly_totals[idx] += hours
+    if role_ids:
+        asn_qs = asn_qs.filter(person__role_id__in=role_ids)
 
     threshold = float(min_hours_per_week or 0.0)
     return {
-        pid
-        for pid, totals in totals_by_person.items()
-        if any(float(total or 0.0) >= threshold for total in totals)
+        int(pid)
+        for pid, by_week in week_hours_by_person(asn_qs, eval_week_dates, hire_gated=True).items()
+        if any(total >= threshold for total in by_week.values())
     }
 
 
-def _python_role_capacity(
+def _hire_gate_q(hire_field: str, week_start: date) -> Q:
+    """ORM equivalent of ``is_hired_in_week`` for a person hire-date path."""
+    return Q(**{f'{hire_field}__isnull': True}) | Q(**{f'{hire_field}__lte': week_start + timedelta(days=6)})
+
+
+def _role_capacity(
     dept_id: int | None,
     week_keys: List[date],
     role_ids: List[int] | None,
@@ -94,11 +70,16 @@ def _python_role_capacity(
     low_hours_weeks: int = 4,
     hidden_project_ids: set[int] | None = None,
 ) -> Tuple[List[str], List[Dict], List[Dict], Dict]:
-    """Optimized Python implementation (portable across DB vendors).
+    """Role capacity, assigned and projected demand per role and week.
 
-    Returns (week_keys_str, roles_payload, series_payload).
+    Capacity and headcount come from one grouped query; hours come from
+    ``week_hours_by``. Only the template/global role mapping split runs in
+    Python, over the aggregated (template, project role) rows.
+
+    Returns (week_keys_str, roles_payload, series_payload, summary).
     """
     wk_strs = [wk.strftime('%Y-%m-%d') for wk in week_keys]
+    week_labels = {sunday_of_week(wk): label for wk, label in zip(week_keys, wk_strs)}
 
     # Roles list (stable order)
     if role_ids:
@@ -106,32 +87,8 @@ def _python_role_capacity(
     else:
         roles = list(Role.objects.filter(is_active=True).order_by('sort_order', 'name'))
         role_ids = [r.id for r in roles]
-
     roles_payload = [{'id': r.id, 'name': r.name} for r in roles]
 
-    # Capacity per role/week (hire-date gated)
-    people_qs: QuerySet[Person] = Person.objects.filter(is_active=True)
-    if dept_id is not None:
-        people_qs = people_qs.filter(department_id=dept_id)
-    if vertical_id is not None:
-        people_qs = people_qs.filter(department__vertical_id=vertical_id)
-    people_qs = people_qs.only('id', 'role_id', 'weekly_capacity', 'hire_date')
-    people_by_role: Dict[int, List[Tuple[int, date | None, int]]] = {}
-    for p in people_qs.iterator():
-        rid = getattr(p, 'role_id', None)
-        if not rid:
-            continue
-        if role_ids and rid not in role_ids:
-            continue
-        pid = int(getattr(p, 'id', 0) or 0)
-        if pid <= 0:
-            continue
-        people_by_role.setdefault(rid, []).append((
-            int(getattr(p, 'weekly_capacity', 0) or 0),
-            getattr(p, 'hire_date', None),
-            pid,
-        ))
-
     eligible_person_ids: set[int] | None = None
     if filter_out_lt5h:
         eligible_person_ids = _eligible_role_capacity_people_ids(
@@ -144,64 +101,46 @@ def _python_role_capacity(
             hidden_project_ids=hidden_project_ids,
         )
 
+    # Capacity and headcount per role/week (hire-date gated) in one grouped query
+    people_qs: QuerySet[Person] = Person.objects.filter(is_active=True, role_id__isnull=False)
+    if dept_id is not None:
+        people_qs = people_qs.filter(department_id=dept_id)
+    if vertical_id is not None:
+        people_qs = people_qs.filter(department__vertical_id=vertical_id)
+    if role_ids:
+        people_qs = people_qs.filter(role_id__in=role_ids)
+    if eligible_person_ids is not None:
+        people_qs = people_qs.filter(id__in=sorted(eligible_person_ids))
+    cap_annotations = {}
+    for idx, wk in enumerate(week_keys):
+        gate = _hire_gate_q('hire_date', wk)
+        cap_annotations[f'cap{idx}'] = Sum('weekly_capacity', filter=gate)
+        cap_annotations[f'heads{idx}'] = Count('id', filter=gate)
     caps: Dict[Tuple[str, int], float] = {}
     heads: Dict[Tuple[str, int], int] = {}
-    for rid, lst in people_by_role.items():
-        for wk in week_keys:
-            total = 0.0
-            count = 0
-            for cap, hire, pid in lst:
-                if eligible_person_ids is not None and pid not in eligible_person_ids:
-                    continue
-                if not is_hired_in_week(hire, wk):
-                    continue
-                total += float(cap or 0)
-                count += 1
-            k = (wk.strftime('%Y-%m-%d'), rid)
-            caps[k] = total
-            heads[k] = count
-
-    # Assigned hours: iterate only requested week keys; string compare for hire gating
-    asn_qs = Asn.objects.filter(is_active=True, person__is_active=True)
+    for row in people_qs.order_by().values('role_id').annotate(**cap_annotations):
+        rid = int(row['role_id'])
+        for idx, wk in enumerate(wk_strs):
+            caps[(wk, rid)] = float(row.get(f'cap{idx}') or 0.0)
+            heads[(wk, rid)] = int(row.get(f'heads{idx}') or 0)
+
+    # Assigned hours per role/week, hire-gated per person
+    asn_qs = Asn.objects.filter(is_active=True, person__is_active=True, person__role_id__isnull=False)
     if dept_id is not None:
         asn_qs = asn_qs.filter(person__department_id=dept_id)
     if vertical_id is not None:
         asn_qs = asn_qs.filter(project__vertical_id=vertical_id)
     if hidden_project_ids:
         asn_qs = asn_qs.exclude(project_id__in=sorted(hidden_project_ids))
-    asn_qs = asn_qs.select_related('person').only('id', 'weekly_hours', 'person__id', 'person__role_id', 'person__hire_date', 'person__is_active')
+    if role_ids:
+        asn_qs = asn_qs.filter(person__role_id__in=role_ids)
+    if eligible_person_ids is not None:
+        asn_qs = asn_qs.filter(person_id__in=sorted(eligible_person_ids))
     assigned: Dict[Tuple[str, int], float] = {}
-    wk_dates_by_key: Dict[str, date] = {}
-    for key in wk_strs:
-        try:
-            wk_dates_by_key[key] = datetime.strptime(key, '%Y-%m-%d').date()
-        except Exception:
-            continue
-    for a in asn_qs.iterator():
-        rid = getattr(a.person, 'role_id', None)
-        if not rid:
-            continue
-        if role_ids and rid not in role_ids:
-            continue
-        pid = int(getattr(a, 'person_id', 0) or 0)
-        if eligible_person_ids is not None and pid not in eligible_person_ids:
-            continue
-        wh = getattr(a, 'weekly_hours', None) or {}
-        hire = getattr(a.person, 'hire_date', None)
-        for k in wk_strs:
-            week_start = wk_dates_by_key.get(k)
-            if week_start is None:
-                continue
-            if not is_hired_in_week(hire, week_start):
-                continue
-            try:
-                v = wh.get(k)
-                hours = float(v or 0.0)
-            except Exception:
-                hours = 0.0
-            if hours <= 0:
-                continue
-            assigned[(k, rid)] = assigned.get((k, rid), 0.0) + hours
+    for (rid,), by_week in week_hours_by(asn_qs, week_keys, 'person__role_id', hire_gated=True).items():
+        for week, hours in by_week.items():
+            k = (week_labels[week], int(rid))
+            assigned[k] = assigned.get(k, 0.0) + hours
 
     projected: Dict[Tuple[str, int], float] = {}
     mapped_projected_hours = 0.0
@@ -222,24 +161,15 @@ def _python_role_capacity(
             placeholder_qs = placeholder_qs.filter(project__vertical_id=vertical_id)
         if hidden_project_ids:
             placeholder_qs = placeholder_qs.exclude(project_id__in=sorted(hidden_project_ids))
-        placeholder_qs = placeholder_qs.select_related('project').only(
-            'weekly_hours',
-            'role_on_project_ref_id',
+        # (template, project role) -> weekly placeholder hours
+        placeholder_rows = week_hours_by(
+            placeholder_qs,
+            week_keys,
             'project__auto_hours_template_id',
-            'department_id',
-        )
-
-        assignments = list(placeholder_qs.iterator())
-        template_ids = sorted(
-            {
-                int(a.project.auto_hours_template_id)
-                for a in assignments
-                if getattr(a, 'project', None) and getattr(a.project, 'auto_hours_template_id', None)
-            }
-        )
-        project_role_ids = sorted(
-            {int(a.role_on_project_ref_id) for a in assignments if getattr(a, 'role_on_project_ref_id', None)}
+            'role_on_project_ref_id',
         )
+        template_ids = sorted({int(template_id) for template_id, _ in placeholder_rows if template_id})
+        project_role_ids = sorted({int(role_id) for _, role_id in placeholder_rows if role_id})
         template_mapping: Dict[tuple[int, int], List[int]] = {}
         global_mapping: Dict[int, List[int]] = {}
         if template_ids and project_role_ids:
@@ -258,16 +188,14 @@ def _python_role_capacity(
                 people_role_ids = sorted(int(rid) for rid in row.people_roles.values_list('id', flat=True))
                 global_mapping[int(row.role_id)] = people_role_ids
 
-        for asn in assignments:
-            project = getattr(asn, 'project', None)
-            template_id = int(project.auto_hours_template_id) if project and project.auto_hours_template_id else None
-            project_role_id = int(asn.role_on_project_ref_id) if asn.role_on_project_ref_id else None
+        for (template_id, project_role_id), by_week in placeholder_rows.items():
             if not project_role_id:
                 continue
+            project_role_id = int(project_role_id)
             mapped_people_roles: List[int] = []
             mapped_key: tuple[int, int] | None = None
             if template_id:
-                key = (template_id, project_role_id)
+                key = (int(template_id), project_role_id)
                 mapped_people_roles = template_mapping.get(key) or []
                 if mapped_people_roles:
                     mapped_key = key
@@ -275,14 +203,7 @@ def _python_role_capacity(
                 mapped_people_roles = global_mapping.get(project_role_id) or []
                 if mapped_people_roles:
                     mapped_key = (0, project_role_id)
-            wh = getattr(asn, 'weekly_hours', None) or {}
-            for wk in wk_strs:
-                try:
-                    hours = float(wh.get(wk) or 0.0)
-                except Exception:
-                    hours = 0.0
-                if hours <= 0:
-                    continue
+            for week, hours in by_week.items():
                 if not mapped_people_roles:
                     unmapped_project_role_hours += hours
                     continue
@@ -290,6 +211,7 @@ def _python_role_capacity(
                     mapped_template_role_pairs_used.add(mapped_key)
                 mapped_projected_hours += hours
                 split = hours / float(len(mapped_people_roles))
+                wk = week_labels[week]
                 for rid in mapped_people_roles:
                     if role_ids and rid not in role_ids:
                         continue
@@ -318,114 +240,37 @@ def _python_role_capacity(
     return wk_strs, roles_payload, series, summary
 
 
-def _postgres_role_capacity(
+def _role_capacity_cache_key(
     dept_id: int | None,
     week_keys: List[date],
     role_ids: List[int] | None,
-    vertical_id: int | None = None,
-    filter_out_lt5h: bool = False,
-    low_hours_threshold: float = 5.0,
-    low_hours_weeks: int = 4,
-) -> Tuple[List[str], List[Dict], List[Dict], Dict]:
-    """Postgres JSONB implementation using lateral expansion and GIN prefilter.
-    If anything goes wrong, callers should fallback to the Python path.
-    """
-    wk_strs = [wk.strftime('%Y-%m-%d') for wk in week_keys]
-
-    # Roles
-    if role_ids:
-        roles = list(Role.objects.filter(id__in=role_ids, is_active=True).order_by('sort_order', 'name'))
-    else:
-        roles = list(Role.objects.filter(is_active=True).order_by('sort_order', 'name'))
-        role_ids = [r.id for r in roles]
-    roles_payload = [{'id': r.id, 'name': r.name} for r in roles]
-
-    # Capacity (kept in ORM for clarity/perf suffices)
-    people_qs: QuerySet[Person] = Person.objects.filter(is_active=True)
+    vertical_id: int | None,
+    filter_out_lt5h: bool,
+    low_hours_threshold: float,
+    low_hours_weeks: int,
+    hidden_project_ids: set[int],
+) -> str:
+    versions = [
+        int(cache.get('analytics_cache_version', 1) or 1),
+        get_snapshot_scope_version('global', 'global'),
+    ]
     if dept_id is not None:
-        people_qs = people_qs.filter(department_id=dept_id)
-    if vertical_id is not None:
-        people_qs = people_qs.filter(department__vertical_id=vertical_id)
-    people_qs = people_qs.only('id', 'role_id', 'weekly_capacity', 'hire_date')
-    people_by_role: Dict[int, List[Tuple[int, date | None]]] = {}
-    for p in people_qs.iterator():
-        rid = getattr(p, 'role_id', None)
-        if not rid:
-            continue
-        if role_ids and rid not in role_ids:
-            continue
-        people_by_role.setdefault(rid, []).append((int(getattr(p, 'weekly_capacity', 0) or 0), getattr(p, 'hire_date', None)))
-
-    caps: Dict[Tuple[str, int], float] = {}
-    heads: Dict[Tuple[str, int], int] = {}
-    for rid, lst in people_by_role.items():
-        for wk in week_keys:
-            total = 0.0
-            count = 0
-            for cap, hire in lst:
-                if not is_hired_in_week(hire, wk):
-                    continue
-                total += float(cap or 0)
-                count += 1
-            k = (wk.strftime('%Y-%m-%d'), rid)
-            caps[k] = total
-            heads[k] = count
-
-    # Assigned hours via raw SQL
-    assigned: Dict[Tuple[str, int], float] = {}
-    with connection.cursor() as cur:
-        base_sql = (
-            """
-            SELECT j.key AS wk, p.role_id, SUM(GREATEST(0, COALESCE(NULLIF(j.value,'')::numeric, 0))) AS hours
-            FROM assignments_assignment a
-            JOIN people_person p ON p.id = a.person_id
-            WHERE a.is_active = TRUE
-              AND p.is_active = TRUE
-            
-              AND a.weekly_hours ?| %s
-            CROSS JOIN LATERAL jsonb_each_text(a.weekly_hours) AS j(key, value)
-            WHERE j.key = ANY(%s)
-              AND (%s IS NULL OR p.role_id = ANY(%s))
-              AND (
-                p.hire_date IS NULL
-                OR p.hire_date <= (TO_DATE(j.key, 'YYYY-MM-DD') + INTERVAL '6 day')::date
-              )
-            GROUP BY j.key, p.role_id
-            """
-        )
-        # Add department filter dynamically when provided
-        if dept_id is not None:
-            sql = base_sql.replace("WHERE a.is_active = TRUE\n              AND p.is_active = TRUE\n", "WHERE a.is_active = TRUE\n              AND p.is_active = TRUE\n              AND p.department_id = %s\n")
-            params = [wk_strs, wk_strs, None if not role_ids else role_ids, None if not role_ids else role_ids]
-            params = [dept_id] + params
-        else:
-            sql = base_sql
-            params = [wk_strs, wk_strs, None if not role_ids else role_ids, None if not role_ids else role_ids]
-        cur.execute(sql, params)
-        for wk, rid, hours in cur.fetchall():
-            if rid is None:
-                continue
-            assigned[(wk, int(rid))] = float(hours or 0.0)
-
-    series: List[Dict] = []
-    for r in roles:
-        assigned_series = [float(assigned.get((wk, r.id), 0.0)) for wk in wk_strs]
-        series.append({
-            'roleId': r.id,
-            'roleName': r.name,
-            'assigned': assigned_series,
-            'projected': [0.0 for _ in wk_strs],
-            'demand': assigned_series,
-            'capacity': [float(caps.get((wk, r.id), 0.0)) for wk in wk_strs],
-            'people': [int(heads.get((wk, r.id), 0)) for wk in wk_strs],
-        })
-
-    summary = {
-        'mappedProjectedHours': 0.0,
-        'unmappedProjectRoleHours': 0.0,
-        'mappedTemplateRolePairsUsed': 0,
-    }
-    return wk_strs, roles_payload, series, summary
+        versions.append(get_snapshot_scope_version('department', str(int(dept_id))))
+    raw = json.dumps(
+        {
+            'dept': dept_id,
+            'weeks': [wk.isoformat() for wk in week_keys],
+            'roles': sorted(int(r) for r in (role_ids or [])),
+            'vertical': vertical_id,
+            'lt5h': [bool(filter_out_lt5h), float(low_hours_threshold), int(low_hours_weeks)],
+            'hidden': sorted(hidden_project_ids),
+            'tplmap': bool(settings.FEATURES.get('FF_ROLE_CAPACITY_TEMPLATE_ROLE_MAPPING', True)),
+            'storage': getattr(settings, 'ASSIGNMENT_HOURS_STORAGE_MODE', 'dual'),
+            'versions': versions,
+        },
+        sort_keys=True,
+    )
+    return f"role_capacity:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
 
 
 def compute_role_capacity(
@@ -438,87 +283,45 @@ def compute_role_capacity(
     low_hours_weeks: int = 4,
     visibility_scope: str | None = None,
 ) -> Tuple[List[str], List[Dict], List[Dict], Dict]:
-    """Dispatch to the best implementation based on DB vendor.
-    Falls back safely to the Python path if Postgres query fails.
-    """
+    """Compute role capacity, cached per scope version (analytics + snapshot scope markers)."""
     hidden_project_ids: set[int] = set()
     if visibility_scope:
         hidden_project_ids = get_hidden_project_ids_for_scope(visibility_scope)
 
-    if hidden_project_ids:
-        return _python_role_capacity(
-            dept_id,
-            week_keys,
-            role_ids,
-            vertical_id=vertical_id,
-            filter_out_lt5h=filter_out_lt5h,
-            low_hours_threshold=low_hours_threshold,
-            low_hours_weeks=low_hours_weeks,
-            hidden_project_ids=hidden_project_ids,
-        )
-    if filter_out_lt5h:
-        return _python_role_capacity(
-            dept_id,
-            week_keys,
-            role_ids,
-            vertical_id=vertical_id,
-            filter_out_lt5h=filter_out_lt5h,
-            low_hours_threshold=low_hours_threshold,
-            low_hours_weeks=low_hours_weeks,
-            hidden_project_ids=hidden_project_ids,
-        )
-    if bool(settings.FEATURES.get('FF_ROLE_CAPACITY_TEMPLATE_ROLE_MAPPING', True)):
-        return _python_role_capacity(
-            dept_id,
-            week_keys,
-            role_ids,
-            vertical_id=vertical_id,
-            filter_out_lt5h=filter_out_lt5h,
-            low_hours_threshold=low_hours_threshold,
-            low_hours_weeks=low_hours_weeks,
-            hidden_project_ids=hidden_project_ids,
-        )
-    if vertical_id is not None:
-        return _python_role_capacity(
-            dept_id,
-            week_keys,
-            role_ids,
-            vertical_id=vertical_id,
-            filter_out_lt5h=filter_out_lt5h,
-            low_hours_threshold=low_hours_threshold,
-            low_hours_weeks=low_hours_weeks,
-            hidden_project_ids=hidden_project_ids,
-        )
-    if connection.vendor == 'postgresql':
+    cache_ttl = max(0, int(getattr(settings, 'ROLE_CAPACITY_CACHE_TTL_SECONDS', 0) or 0))
+    cache_key = None
+    if cache_ttl:
         try:
-            return _postgres_role_capacity(
+            cache_key = _role_capacity_cache_key(
                 dept_id,
                 week_keys,
                 role_ids,
-                vertical_id=None,
-                filter_out_lt5h=filter_out_lt5h,
-                low_hours_threshold=low_hours_threshold,
-                low_hours_weeks=low_hours_weeks,
+                vertical_id,
+                filter_out_lt5h,
+                low_hours_threshold,
+                low_hours_weeks,
+                hidden_project_ids,
             )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
         except Exception:
-            # Fall back to Python path on any SQL/driver error
-            return _python_role_capacity(
-                dept_id,
-                week_keys,
-                role_ids,
-                vertical_id=None,
-                filter_out_lt5h=filter_out_lt5h,
-                low_hours_threshold=low_hours_threshold,
-                low_hours_weeks=low_hours_weeks,
-                hidden_project_ids=hidden_project_ids,
-            )
-    return _python_role_capacity(
+            cache_key = None
+
+    result = _role_capacity(
         dept_id,
         week_keys,
         role_ids,
-        vertical_id=None,
+        vertical_id=vertical_id,
         filter_out_lt5h=filter_out_lt5h,
         low_hours_threshold=low_hours_threshold,
         low_hours_weeks=low_hours_weeks,
         hidden_project_ids=hidden_project_ids,
     )
+
+    if cache_key:
+        try:
+            cache.set(cache_key, result, timeout=cache_ttl)
+        except Exception:  # nosec B110
+            pass
+    return result
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from assignments import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Manage quarterly week_start range partitions for AssignmentWeekHour and "
+        "WeeklyAssignmentSnapshot (PostgreSQL only)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--convert', action='store_true', help='Rebuild unpartitioned tables as partitioned (locks the tables while copying).')
+        parser.add_argument('--ahead', type=int, default=None, help='Quarters to pre-create past the current one.')
+        parser.add_argument('--retain-quarters', type=int, default=None, help='Detach snapshot quarters that ended more than N quarters ago (never AssignmentWeekHour).')
+        parser.add_argument('--archive-schema', default=None, help='Schema that receives detached partitions.')
+        parser.add_argument('--drop-detached', action='store_true', help='Drop detached partitions instead of archiving them.')
+        parser.add_argument('--table', action='append', default=None, help='Limit to these db tables (repeatable).')
+        parser.add_argument('--dry-run', action='store_true', help='Print the SQL plan without running it.')
+
+    def handle(self, *args, **options):
+        if not partitioning.is_supported():
+            raise CommandError('Week partitioning requires PostgreSQL.')
+
+        ahead = options.get('ahead')
+        if ahead is None:
+            ahead = settings.WEEK_PARTITION_AHEAD_QUARTERS
+        retain = options.get('retain_quarters')
+        if retain is None:
+            retain = settings.WEEK_PARTITION_RETAIN_QUARTERS
+        archive_schema = None if options.get('drop_detached') else (
+            options.get('archive_schema') or settings.WEEK_PARTITION_ARCHIVE_SCHEMA
+        )
+        dry_run = bool(options.get('dry_run'))
+        tables = set(options.get('table') or [])
+
+        for model in partitioning.PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if tables and table not in tables:
+                continue
+            reports = []
+            if not partitioning.is_partitioned(table):
+                if not options.get('convert'):
+                    self.stdout.write(self.style.WARNING(f'{table}: not partitioned (run with --convert)'))
+                    continue
+                reports.append(partitioning.convert_to_partitioned(model, ahead_quarters=ahead, dry_run=dry_run))
+            else:
+                reports.append(partitioning.ensure_partitions(model, ahead_quarters=ahead, dry_run=dry_run))
+            if retain is not None and model in partitioning.RETENTION_MODELS and partitioning.is_partitioned(table):
+                reports.append(
+                    partitioning.detach_old_partitions(
+                        model, retain_quarters=retain, archive_schema=archive_schema, dry_run=dry_run,
+                    )
+                )
+            for report in reports:
+                if dry_run:
+                    for sql in report.statements:
+                        self.stdout.write(f'{sql};')
+                created = ','.join(report.created) or '-'
+                detached = ','.join(report.detached) or '-'
+                self.stdout.write(f'{table}: created={created} detached={detached}')
+        self.stdout.write(self.style.SUCCESS('Week partitions up to date' + (' (dry run)' if dry_run else '')))
@@ -5,43 +5,67 @@ import json
 from django.core.management.base import BaseCommand
 
 from assignments.models import Assignment
-from assignments.week_hours_service import parity_for_assignment
+from assignments.week_hours_service import bulk_sync_assignment_week_hours, parity_for_assignments
+from core.chunked import iter_keyset_chunks
 
 
 class Command(BaseCommand):
-    help = "Verify parity between Assignment.weekly_hours JSON and AssignmentWeekHour rows."
+    help = (
+        "Verify parity between Assignment.weekly_hours JSON and AssignmentWeekHour rows. "
+        "A clean run means ASSIGNMENT_HOURS_STORAGE_MODE=normalized is safe to enable."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument('--sample', type=int, default=None, help='Limit verification to first N assignments.')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Assignments checked per batch.')
+        parser.add_argument('--repair', action='store_true', help='Re-sync mismatched assignments from JSON and re-check them.')
         parser.add_argument('--fail-on-mismatch', action='store_true', help='Exit with status 1 when mismatches exist.')
         parser.add_argument('--verbose-mismatch', action='store_true', help='Print mismatch payloads.')
 
     def handle(self, *args, **options):
-        qs = Assignment.objects.all().order_by('id')
+        qs = Assignment.objects.only('id', 'weekly_hours', 'person_id', 'project_id', 'department_id')
         sample = options.get('sample')
-        if sample:
-            qs = qs[: max(1, int(sample))]
+        limit = max(1, int(sample)) if sample else None
+        chunk_size = max(1, int(options.get('chunk_size') or 500))
+        repair = bool(options.get('repair'))
 
         total = 0
         mismatches = 0
-        for assignment in qs.iterator(chunk_size=500):
-            total += 1
-            parity = parity_for_assignment(assignment)
-            if parity.matches:
-                continue
-            mismatches += 1
+        repaired = 0
+        for chunk in iter_keyset_chunks(qs, chunk_size=chunk_size):
+            if limit is not None:
+                chunk = chunk[: limit - total]
+            total += len(chunk)
+            bad = [p for p in parity_for_assignments(chunk) if not p.matches]
+            if bad and repair:
+                by_id = {a.id: a for a in chunk}
+                bulk_sync_assignment_week_hours(by_id[p.assignment_id] for p in bad)
+                still_bad = {p.assignment_id for p in parity_for_assignments(by_id[p.assignment_id] for p in bad) if not p.matches}
+                repaired += len(bad) - len(still_bad)
+                if options.get('verbose_mismatch'):
+                    for parity in bad:
+                        self.stdout.write(json.dumps({'assignmentId': parity.assignment_id, 'repaired': parity.assignment_id not in still_bad}, sort_keys=True))
+                bad = [p for p in bad if p.assignment_id in still_bad]
+            mismatches += len(bad)
             if options.get('verbose_mismatch'):
-                payload = {
-                    'assignmentId': parity.assignment_id,
-                    'json': parity.json_map,
-                    'normalized': parity.normalized_map,
-                }
-                self.stdout.write(json.dumps(payload, sort_keys=True))
+                for parity in bad:
+                    payload = {
+                        'assignmentId': parity.assignment_id,
+                        'json': parity.json_map,
+                        'normalized': parity.normalized_map,
+                        'scopeMatches': parity.scope_matches,
+                    }
+                    self.stdout.write(json.dumps(payload, sort_keys=True))
+            if limit is not None and total >= limit:
+                break
 
         ratio = (mismatches / total) if total else 0.0
-        self.stdout.write(f"checked={total} mismatches={mismatches} mismatch_rate={ratio:.4%}")
+        summary = f"checked={total} mismatches={mismatches} mismatch_rate={ratio:.4%}"
+        if repair:
+            summary += f" repaired={repaired}"
+        self.stdout.write(summary)
         if mismatches == 0:
-            self.stdout.write(self.style.SUCCESS("Parity check passed"))
+            self.stdout.write(self.style.SUCCESS("Parity check passed; ASSIGNMENT_HOURS_STORAGE_MODE=normalized is safe to enable"))
             return
         if options.get('fail_on_mismatch'):
             raise SystemExit(1)
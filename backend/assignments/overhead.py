@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import Sequence
@@ -11,6 +13,8 @@ from django.db import transaction
 from django.utils import timezone
 
 from assignments.models import Assignment
+from assignments.rollup_service import rollup_state_for
+from core.chunked import iter_keyset_chunks
 from people.models import Person
 from projects.models import Project
 
@@ -18,6 +22,8 @@ OVERHEAD_TOKEN = "overhead"
 DEFAULT_SYNC_WEEKS = 12
 MAX_SYNC_WEEKS = 52
 SYNC_CACHE_TTL_SECONDS = 300
+QUEUE_DEBOUNCE_SECONDS = 5
+SYNC_PEOPLE_CHUNK_SIZE = 500
 
 
 @dataclass
@@ -67,21 +73,47 @@ def sync_overhead_assignments(
     projects_qs=None,
     weeks: int = DEFAULT_SYNC_WEEKS,
 ) -> OverheadSyncResult:
-    people = list(
-        (people_qs or Person.objects.filter(is_active=True).select_related('role', 'department'))
-    )
+    """Ensure every active person has an overhead assignment on each overhead project.
+
+    People are processed in keyset chunks of ``SYNC_PEOPLE_CHUNK_SIZE``, each
+    in its own transaction: missing rows are inserted with ``bulk_create`` and
+    changed rows written with one ``bulk_update``; save() signals are bypassed
+    in favour of a week-hour upsert and a coalesced cache/rollup invalidation
+    per chunk.
+    """
+    if people_qs is None:
+        people_qs = Person.objects.filter(is_active=True)
     projects = list(list_overhead_projects(projects_qs))
 
     result = OverheadSyncResult(
-        people_count=len(people),
-        project_count=len(projects),
         week_count=max(1, min(int(weeks or DEFAULT_SYNC_WEEKS), MAX_SYNC_WEEKS)),
     )
-
-    if not people or not projects:
+    result.project_count = len(projects)
+    if not projects:
+        result.people_count = people_qs.count()
         return result
 
     week_keys = _week_keys(result.week_count)
+    membership_project_ids: set[int] = set()
+    for people in iter_keyset_chunks(people_qs.select_related('role'), chunk_size=SYNC_PEOPLE_CHUNK_SIZE):
+        result.people_count += len(people)
+        _sync_overhead_chunk(people, projects, week_keys, result, membership_project_ids)
+
+    if membership_project_ids:
+        from projects.assigned_names import enqueue_assigned_names_rebuild_on_commit
+
+        enqueue_assigned_names_rebuild_on_commit(sorted(membership_project_ids))
+
+    return result
+
+
+def _sync_overhead_chunk(
+    people: list[Person],
+    projects: list[Project],
+    week_keys: list[str],
+    result: OverheadSyncResult,
+    membership_project_ids: set[int],
+) -> None:
     desired_hours_by_person = {
         p.id: _normalize_hours(getattr(p.role, 'overhead_hours_per_week', 0) if p.role_id else 0)
         for p in people
@@ -89,6 +121,7 @@ def sync_overhead_assignments(
 
     people_ids = [p.id for p in people]
     project_ids = [p.id for p in projects]
+    now = timezone.now()
 
     with transaction.atomic():
         existing = list(
@@ -102,24 +135,30 @@ def sync_overhead_assignments(
             key = (a.person_id, a.project_id)
             by_pair.setdefault(key, []).append(a)
 
+        to_create: list[Assignment] = []
+        to_update: list[Assignment] = []
+        previous_states: dict = {}
         for person in people:
             desired_hours = desired_hours_by_person.get(person.id, 0.0)
-            desired_weekly = {wk: desired_hours for wk in week_keys}
             for project in projects:
                 key = (person.id, project.id)
                 assignments = by_pair.get(key, [])
                 if not assignments:
-                    Assignment.objects.create(
-                        person=person,
-                        project=project,
-                        weekly_hours=desired_weekly,
-                        department=person.department,
-                        is_active=True,
+                    to_create.append(
+                        Assignment(
+                            person=person,
+                            project=project,
+                            weekly_hours={wk: desired_hours for wk in week_keys},
+                            department_id=person.department_id,
+                            is_active=True,
+                        )
                     )
-                    result.created += 1
+                    membership_project_ids.add(project.id)
                     continue
 
                 for assignment in assignments:
+                    assignment.person = person
+                    previous_state = rollup_state_for(assignment)
                     changed = False
                     new_weekly = dict(assignment.weekly_hours or {})
                     for wk in week_keys:
@@ -128,18 +167,37 @@ def sync_overhead_assignments(
                             changed = True
                     if assignment.is_active is False:
                         assignment.is_active = True
+                        membership_project_ids.add(project.id)
                         changed = True
-                    if assignment.department_id != getattr(person.department, 'id', None):
-                        assignment.department = person.department
+                    if assignment.department_id != person.department_id:
+                        assignment.department_id = person.department_id
                         changed = True
                     if changed:
                         assignment.weekly_hours = new_weekly
-                        assignment.save(update_fields=['weekly_hours', 'is_active', 'department', 'updated_at'])
-                        result.updated += 1
+                        assignment.updated_at = now
+                        to_update.append(assignment)
+                        previous_states[assignment.id] = previous_state
                     else:
                         result.skipped += 1
 
-    return result
+        if to_create:
+            Assignment.objects.bulk_create(to_create, batch_size=500)
+            result.created += len(to_create)
+        if to_update:
+            Assignment.objects.bulk_update(
+                to_update,
+                ['weekly_hours', 'is_active', 'department', 'updated_at'],
+                batch_size=500,
+            )
+            result.updated += len(to_update)
+
+        touched = to_create + to_update
+        if touched:
+            from assignments.signals import invalidate_for_bulk_hours_update
+            from assignments.week_hours_service import bulk_sync_assignment_week_hours
+
+            bulk_sync_assignment_week_hours(touched)
+            invalidate_for_bulk_hours_update(touched, previous_states)
 
 
 def sync_overhead_assignments_for_people(person_ids: Sequence[int], weeks: int = DEFAULT_SYNC_WEEKS) -> OverheadSyncResult:
@@ -163,12 +221,76 @@ def sync_overhead_assignments_for_projects(project_ids: Sequence[int], weeks: in
     return sync_overhead_assignments(projects_qs=projects, weeks=weeks)
 
 
-def maybe_sync_overhead_assignments(weeks: int = DEFAULT_SYNC_WEEKS, ttl_seconds: int = SYNC_CACHE_TTL_SECONDS) -> OverheadSyncResult:
+def queue_overhead_sync(
+    *,
+    person_ids: Sequence[int] | None = None,
+    role_ids: Sequence[int] | None = None,
+    project_ids: Sequence[int] | None = None,
+    weeks: int = DEFAULT_SYNC_WEEKS,
+    inline_fallback: bool = True,
+) -> bool:
+    """Dispatch overhead sync to Celery, debounced per scope.
+
+    Returns True when a job was dispatched (or run inline as a fallback).
+    """
+    scope = {
+        'p': sorted({int(x) for x in (person_ids or []) if x}),
+        'r': sorted({int(x) for x in (role_ids or []) if x}),
+        'j': sorted({int(x) for x in (project_ids or []) if x}),
+    }
+    weeks = max(1, min(int(weeks or DEFAULT_SYNC_WEEKS), MAX_SYNC_WEEKS))
+    debounce_key = "overhead_assignment_sync:queued:" + hashlib.sha256(
+        json.dumps([scope, weeks], separators=(',', ':')).encode()
+    ).hexdigest()[:16]
+    try:
+        if not cache.add(debounce_key, True, timeout=QUEUE_DEBOUNCE_SECONDS):
+            return False
+    except Exception:  # nosec B110
+        pass
+    try:
+        from assignments.tasks import sync_overhead_assignments_task
+        sync_overhead_assignments_task.delay(
+            person_ids=scope['p'] or None,
+            role_ids=scope['r'] or None,
+            project_ids=scope['j'] or None,
+            weeks=weeks,
+        )
+        return True
+    except Exception:
+        if not inline_fallback:
+            return False
+    run_overhead_sync(person_ids=scope['p'], role_ids=scope['r'], project_ids=scope['j'], weeks=weeks)
+    return True
+
+
+def run_overhead_sync(
+    *,
+    person_ids: Sequence[int] | None = None,
+    role_ids: Sequence[int] | None = None,
+    project_ids: Sequence[int] | None = None,
+    weeks: int = DEFAULT_SYNC_WEEKS,
+) -> OverheadSyncResult:
+    """Run a (possibly scoped) overhead sync; no ids means a full sync."""
+    if person_ids:
+        return sync_overhead_assignments_for_people(person_ids, weeks=weeks)
+    if role_ids:
+        return sync_overhead_assignments_for_roles(role_ids, weeks=weeks)
+    if project_ids:
+        return sync_overhead_assignments_for_projects(project_ids, weeks=weeks)
+    return sync_overhead_assignments(weeks=weeks)
+
+
+def maybe_sync_overhead_assignments(weeks: int = DEFAULT_SYNC_WEEKS, ttl_seconds: int = SYNC_CACHE_TTL_SECONDS) -> bool:
+    """Request-path hook: at most once per TTL, enqueue a full background sync.
+
+    Never writes from the request; week rollover is also covered by the
+    periodic beat task.
+    """
     cache_key = f"overhead_assignment_sync:v1:w{max(1, min(int(weeks or DEFAULT_SYNC_WEEKS), MAX_SYNC_WEEKS))}"
     try:
         acquired = cache.add(cache_key, timezone.now().isoformat(), ttl_seconds)
     except Exception:
         acquired = True
     if not acquired:
-        return OverheadSyncResult()
-    return sync_overhead_assignments(weeks=weeks)
+        return False
+    return queue_overhead_sync(weeks=weeks, inline_fallback=False)
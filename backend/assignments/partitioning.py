@@ -0,0 +1,264 @@
+"""Quarterly range partitioning of the per-week tables (PostgreSQL only).
+
+``AssignmentWeekHour`` and ``WeeklyAssignmentSnapshot`` gain one row per
+(assignment, week) forever while hot queries only touch a ``week_start``
+window. Once converted (``manage_week_partitions --convert``) each table is a
+``PARTITION BY RANGE (week_start)`` parent with one child per calendar
+quarter plus a default partition, so a 12-week read is pruned to one or two
+small partitions. The ORM keeps using the parent table name; the only
+schema difference is a ``(id, week_start)`` primary key, which Postgres
+requires for partitioned tables (ids stay unique through their sequence).
+
+Retention (detaching old quarters) applies to ``WeeklyAssignmentSnapshot``
+only; ``AssignmentWeekHour`` holds the hours themselves.
+
+Everything here returns the SQL it runs so ``--dry-run`` can print the plan.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date
+
+from django.db import connection, transaction
+
+from assignments.models import AssignmentWeekHour, WeeklyAssignmentSnapshot
+
+PARTITION_COLUMN = 'week_start'
+PARTITIONED_MODELS = (AssignmentWeekHour, WeeklyAssignmentSnapshot)
+# AssignmentWeekHour is the live hours store (past weeks included), so only
+# the snapshot history may have old quarters detached.
+RETENTION_MODELS = (WeeklyAssignmentSnapshot,)
+
+_PARTITION_NAME_RE = re.compile(r'_p(\d{4})q([1-4])$')
+
+
+def quarter_start(d: date) -> date:
+    return date(d.year, 3 * ((d.month - 1) // 3) + 1, 1)
+
+
+def add_quarters(d: date, quarters: int) -> date:
+    index = d.year * 4 + (d.month - 1) // 3 + quarters
+    return date(index // 4, 3 * (index % 4) + 1, 1)
+
+
+def quarter_ranges(first: date, last: date) -> list[tuple[date, date]]:
+    """``[start, end)`` quarter bounds covering ``first`` through ``last``."""
+    ranges = []
+    start = quarter_start(first)
+    while start <= last:
+        end = add_quarters(start, 1)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def partition_name(table: str, start: date) -> str:
+    return f'{table}_p{start.year}q{(start.month - 1) // 3 + 1}'
+
+
+def default_partition_name(table: str) -> str:
+    return f'{table}_pdefault'
+
+
+def partition_start(name: str) -> date | None:
+    """Quarter start encoded in a partition name created by this module."""
+    match = _PARTITION_NAME_RE.search(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), 3 * (int(match.group(2)) - 1) + 1, 1)
+
+
+@dataclass
+class PartitionReport:
+    table: str
+    statements: list[str]
+    created: list[str]
+    detached: list[str]
+
+
+def is_supported() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def is_partitioned(table: str) -> bool:
+    if not is_supported():
+        return False
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = %s AND c.relnamespace = current_schema()::regnamespace",
+            [table],
+        )
+        return cur.fetchone() is not None
+
+
+def list_partitions(table: str) -> list[str]:
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s AND parent.relnamespace = current_schema()::regnamespace "
+            "ORDER BY child.relname",
+            [table],
+        )
+        return [row[0] for row in cur.fetchall()]
+
+
+def _q(name: str) -> str:
+    return connection.ops.quote_name(name)
+
+
+def _attach_partition_sql(table: str, start: date, end: date) -> list[str]:
+    """Create one quarter partition, moving any rows parked in the default partition.
+
+    The child is built standalone and attached, because Postgres refuses to
+    create a partition whose range still has rows in the default partition.
+    """
+    name = partition_name(table, start)
+    column = _q(PARTITION_COLUMN)
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    return [
+        f'CREATE TABLE {_q(name)} (LIKE {_q(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        (
+            f'WITH moved AS (DELETE FROM {_q(default_partition_name(table))} '
+            f"WHERE {column} >= '{start.isoformat()}' AND {column} < '{end.isoformat()}' RETURNING *) "
+            f'INSERT INTO {_q(name)} SELECT * FROM moved'
+        ),
+        f'ALTER TABLE {_q(table)} ATTACH PARTITION {_q(name)} {bounds}',
+    ]
+
+
+def _model_index_and_constraint_sql(model) -> list[str]:
+    """Django's own DDL for the model's FKs, indexes and constraints (not the table)."""
+    with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+        editor.create_model(model)
+        for constraint in model._meta.constraints:
+            editor.add_constraint(model, constraint)
+    return [
+        sql.rstrip().rstrip(';')
+        for sql in editor.collected_sql
+        if not sql.lstrip().upper().startswith(('CREATE TABLE', 'COMMENT ON'))
+    ]
+
+
+def _week_bounds(table: str) -> tuple[date | None, date | None]:
+    with connection.cursor() as cur:
+        cur.execute(f'SELECT MIN({_q(PARTITION_COLUMN)}), MAX({_q(PARTITION_COLUMN)}) FROM {_q(table)}')
+        row = cur.fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def _run(statements: list[str], dry_run: bool) -> None:
+    if dry_run:
+        return
+    with transaction.atomic():
+        with connection.cursor() as cur:
+            for sql in statements:
+                cur.execute(sql)
+
+
+def convert_to_partitioned(model, *, ahead_quarters: int, today: date | None = None, dry_run: bool = False) -> PartitionReport:
+    """Rebuild ``model``'s table as a quarterly range-partitioned table in one transaction.
+
+    Takes an ACCESS EXCLUSIVE lock for the copy, so run it in a maintenance
+    window. Quarters from the oldest row through ``ahead_quarters`` past
+    today get their own partition; anything else lands in the default one.
+    """
+    table = model._meta.db_table
+    pk_column = model._meta.pk.column
+    old = f'{table}_unpartitioned'
+    seq = f'{table}_pid_seq'
+    today = today or date.today()
+    first, last = _week_bounds(table)
+    horizon = add_quarters(quarter_start(today), max(0, int(ahead_quarters)))
+    ranges = quarter_ranges(min(first or today, today), max(last or today, horizon))
+
+    statements = [
+        f'LOCK TABLE {_q(table)} IN ACCESS EXCLUSIVE MODE',
+        f'ALTER TABLE {_q(table)} RENAME TO {_q(old)}',
+        (
+            f'CREATE TABLE {_q(table)} (LIKE {_q(old)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            f'PARTITION BY RANGE ({_q(PARTITION_COLUMN)})'
+        ),
+        f'CREATE SEQUENCE IF NOT EXISTS {_q(seq)}',
+        f"ALTER TABLE {_q(table)} ALTER COLUMN {_q(pk_column)} SET DEFAULT nextval('{seq}')",
+    ]
+    for start, end in ranges:
+        statements.append(
+            f'CREATE TABLE {_q(partition_name(table, start))} PARTITION OF {_q(table)} '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    statements += [
+        f'CREATE TABLE {_q(default_partition_name(table))} PARTITION OF {_q(table)} DEFAULT',
+        f'INSERT INTO {_q(table)} SELECT * FROM {_q(old)}',
+        f"SELECT setval('{seq}', COALESCE((SELECT MAX({_q(pk_column)}) FROM {_q(table)}), 0) + 1, false)",
+        f'DROP TABLE {_q(old)}',
+        f'ALTER SEQUENCE {_q(seq)} OWNED BY {_q(table)}.{_q(pk_column)}',
+        f'ALTER TABLE {_q(table)} ADD PRIMARY KEY ({_q(pk_column)}, {_q(PARTITION_COLUMN)})',
+    ]
+    statements += _model_index_and_constraint_sql(model)
+    _run(statements, dry_run)
+    return PartitionReport(
+        table=table,
+        statements=statements,
+        created=[partition_name(table, start) for start, _ in ranges] + [default_partition_name(table)],
+        detached=[],
+    )
+
+
+def ensure_partitions(model, *, ahead_quarters: int, today: date | None = None, dry_run: bool = False) -> PartitionReport:
+    """Create missing quarter partitions from the current quarter through ``ahead_quarters``."""
+    table = model._meta.db_table
+    today = today or date.today()
+    existing = set(list_partitions(table))
+    horizon = add_quarters(quarter_start(today), max(0, int(ahead_quarters)))
+    statements: list[str] = []
+    created: list[str] = []
+    for start, end in quarter_ranges(today, horizon):
+        name = partition_name(table, start)
+        if name in existing:
+            continue
+        statements += _attach_partition_sql(table, start, end)
+        created.append(name)
+    _run(statements, dry_run)
+    return PartitionReport(table=table, statements=statements, created=created, detached=[])
+
+
+def detach_old_partitions(
+    model,
+    *,
+    retain_quarters: int,
+    archive_schema: str | None,
+    today: date | None = None,
+    dry_run: bool = False,
+) -> PartitionReport:
+    """Detach quarters that ended more than ``retain_quarters`` ago.
+
+    Detached partitions move to ``archive_schema`` (kept queryable for
+    audits) or are dropped when it is empty/None. Only ``RETENTION_MODELS``
+    are accepted.
+    """
+    if model not in RETENTION_MODELS:
+        raise ValueError(f'{model._meta.label} does not support partition retention')
+    table = model._meta.db_table
+    cutoff = add_quarters(quarter_start(today or date.today()), -max(0, int(retain_quarters)))
+    statements: list[str] = []
+    detached: list[str] = []
+    if archive_schema:
+        statements.append(f'CREATE SCHEMA IF NOT EXISTS {_q(archive_schema)}')
+    for name in list_partitions(table):
+        start = partition_start(name)
+        if start is None or add_quarters(start, 1) > cutoff:
+            continue
+        statements.append(f'ALTER TABLE {_q(table)} DETACH PARTITION {_q(name)}')
+        if archive_schema:
+            statements.append(f'ALTER TABLE {_q(name)} SET SCHEMA {_q(archive_schema)}')
+        else:
+            statements.append(f'DROP TABLE {_q(name)}')
+        detached.append(name)
+    if not detached:
+        statements = []
+    _run(statements, dry_run)
+    return PartitionReport(table=table, statements=statements, created=[], detached=detached)
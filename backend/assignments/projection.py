@@ -0,0 +1,156 @@
+"""Read-side projection for assignment list payloads.
+
+Query parameters (all optional):
+- ``fields`` / ``exclude``: CSV of ``AssignmentSerializer`` field names.
+- ``weeks_from`` / ``weeks_to``: inclusive YYYY-MM-DD bounds for ``weeklyHours``.
+- ``window``: number of weeks starting at ``weeks_from`` (default: current Sunday).
+
+When a week window is requested the full ``weekly_hours`` JSON is deferred and
+only the keys for days inside the window are selected from the database.
+Off-Sunday keys fold into their week's Sunday key, as in ``read_queries``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import cached_property
+from typing import Optional
+
+from django.db.models import Prefetch
+from django.db.models.fields.json import KeyTransform
+
+from core.week_utils import sunday_of_week
+
+from .read_queries import _week_lookup
+
+MAX_WINDOW_WEEKS = 260
+# Above this many weeks (seven day keys each), select the whole JSON and slice in Python instead.
+MAX_SQL_WINDOW_WEEKS = 52
+WEEK_ALIAS_PREFIX = 'wh_window_'
+PROJECTION_PARAMS = ('fields', 'exclude', 'weeks_from', 'weeks_to', 'window')
+
+
+@dataclass(frozen=True)
+class AssignmentProjection:
+    fields: Optional[frozenset] = None
+    exclude: frozenset = frozenset()
+    week_keys: Optional[tuple] = None
+
+    def includes(self, name: str) -> bool:
+        if self.fields is not None and name not in self.fields:
+            return False
+        return name not in self.exclude
+
+    @property
+    def uses_week_columns(self) -> bool:
+        return self.week_keys is not None and len(self.week_keys) <= MAX_SQL_WINDOW_WEEKS
+
+    @cached_property
+    def day_weeks(self) -> dict[str, date]:
+        """Every day key inside the window mapped to its Sunday."""
+        return _week_lookup(date.fromisoformat(week_key) for week_key in self.week_keys or ())
+
+
+def _csv(raw) -> list[str]:
+    return [part.strip() for part in str(raw or '').split(',') if part.strip()]
+
+
+def _parse_date(raw) -> Optional[date]:
+    if not raw:
+        return None
+    try:
+        return datetime.strptime(str(raw), '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def parse_assignment_projection(params) -> Optional[AssignmentProjection]:
+    """Build a projection from query params; returns None when nothing is requested."""
+    fields = _csv(params.get('fields'))
+    exclude = _csv(params.get('exclude'))
+    start = _parse_date(params.get('weeks_from'))
+    end = _parse_date(params.get('weeks_to'))
+    window_raw = params.get('window')
+    week_keys = None
+    if start or end or window_raw not in (None, ''):
+        first = sunday_of_week(start or date.today())
+        if end is None:
+            try:
+                weeks = int(window_raw or 12)
+            except (TypeError, ValueError):
+                weeks = 12
+            weeks = max(1, min(weeks, MAX_WINDOW_WEEKS))
+        else:
+            weeks = max(1, min(((sunday_of_week(end) - first).days // 7) + 1, MAX_WINDOW_WEEKS))
+        week_keys = tuple((first + timedelta(weeks=i)).isoformat() for i in range(weeks))
+    if not fields and not exclude and week_keys is None:
+        return None
+    if fields and 'id' not in fields:
+        fields.append('id')
+    return AssignmentProjection(
+        fields=frozenset(fields) if fields else None,
+        exclude=frozenset(exclude),
+        week_keys=week_keys,
+    )
+
+
+def apply_projection_to_queryset(queryset, projection: Optional[AssignmentProjection]):
+    """Load only what the projected serializer emits."""
+    from skills.models import PersonSkill
+
+    if projection is None or projection.includes('personSkills'):
+        queryset = queryset.prefetch_related(
+            Prefetch('person__skills', queryset=PersonSkill.objects.select_related('skill_tag'))
+        )
+    if projection is None:
+        return queryset
+    if not projection.includes('weeklyHours'):
+        return queryset.defer('weekly_hours')
+    if projection.uses_week_columns:
+        queryset = queryset.defer('weekly_hours').annotate(**{
+            f'{WEEK_ALIAS_PREFIX}{idx}': KeyTransform(day_key, 'weekly_hours')
+            for idx, day_key in enumerate(projection.day_weeks)
+        })
+    return queryset
+
+
+def projected_weekly_hours(instance, projection: AssignmentProjection) -> dict:
+    """Return ``weeklyHours`` restricted to the projection window.
+
+    A week stored only under its Sunday key keeps the stored value. Keys for
+    other days of the week are summed into the Sunday key, skipping
+    non-numeric values, the way ``week_hours_by`` reads them.
+    """
+    day_weeks = projection.day_weeks
+    if projection.uses_week_columns and hasattr(instance, f'{WEEK_ALIAS_PREFIX}0'):
+        items = [
+            (day_key, getattr(instance, f'{WEEK_ALIAS_PREFIX}{idx}', None))
+            for idx, day_key in enumerate(day_weeks)
+        ]
+    else:
+        weekly = instance.weekly_hours or {}
+        items = list(weekly.items()) if isinstance(weekly, dict) else []
+
+    by_week: dict[str, list] = {}
+    for raw_key, value in items:
+        week = day_weeks.get(str(raw_key))
+        if week is not None and value is not None:
+            by_week.setdefault(week.isoformat(), []).append((str(raw_key), value))
+
+    out: dict = {}
+    for week_key in projection.week_keys:
+        entries = by_week.get(week_key)
+        if not entries:
+            continue
+        if len(entries) == 1 and entries[0][0] == week_key:
+            out[week_key] = entries[0][1]
+            continue
+        total = 0.0
+        for _, value in entries:
+            try:
+                total += float(value or 0)
+            except (TypeError, ValueError):
+                continue
+        out[week_key] = round(total, 4)
+    return out
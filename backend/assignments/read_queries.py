@@ -1,21 +1,185 @@
+"""Read layer for assignment hours.
+
+Every workload view aggregates hours through ``week_hours_by`` (or the
+helpers built on it) instead of parsing ``Assignment.weekly_hours`` itself.
+Once ``ASSIGNMENT_HOURS_STORAGE_MODE`` is ``normalized`` the totals are one
+grouped query over ``AssignmentWeekHour`` (served by its ``(person,
+week_start)`` / ``(project, week_start)`` indexes); until then the same
+totals are folded from the JSON maps in a single streamed pass.
+
+Cut over with::
+
+    manage.py sync_assignment_week_hours
+    manage.py verify_assignment_hours_parity --repair --fail-on-mismatch
+    ASSIGNMENT_HOURS_STORAGE_MODE=normalized
+"""
 from __future__ import annotations
 
 from datetime import date, timedelta
+from typing import Iterable
 
-from django.db.models import Sum
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Sum
 
-from assignments.models import AssignmentWeekHour
+from assignments.models import Assignment, AssignmentWeekHour
+from core.aggregate_cache import aggregate_builder
+from core.cache_scopes import get_snapshot_scope_version
+from core.chunked import iter_keyset
+from core.departments import get_descendant_department_ids
 from core.week_utils import sunday_of_week
 from people.eligibility import first_eligible_week_start
+from people.models import Person
+
+# Assignment fields that AssignmentWeekHour carries as its own columns.
+_AWH_COLUMNS = {
+    'id': 'assignment_id',
+    'person_id': 'person_id',
+    'project_id': 'project_id',
+    'department_id': 'department_id',
+}
+
+
+def normalized_hours_enabled() -> bool:
+    """True once ``AssignmentWeekHour`` is the canonical hours store."""
+    return getattr(settings, 'ASSIGNMENT_HOURS_STORAGE_MODE', 'dual') == 'normalized'
+
+
+def _awh_field(field: str) -> str:
+    if field in _AWH_COLUMNS:
+        return _AWH_COLUMNS[field]
+    if field.startswith(('person__', 'project__')):
+        return field
+    return f'assignment__{field}'
+
+
+def _week_lookup(weeks: Iterable[date]) -> dict[str, date]:
+    """Map every day of the given Sunday weeks to its Sunday.
+
+    Off-Sunday JSON keys belong to the week containing them (the rule
+    ``normalize_weekly_hours_map`` applies when syncing rows), so one dict
+    lookup per key replaces probing nearby dates.
+    """
+    return {
+        (week + timedelta(days=offset)).isoformat(): week
+        for week in weeks
+        for offset in range(7)
+    }
+
+
+def week_hours_by(
+    assignments_qs,
+    week_dates: Iterable[date],
+    *fields: str,
+    hire_gated: bool = False,
+) -> dict[tuple, dict[date, float]]:
+    """Sum positive hours of ``assignments_qs`` per ``fields`` and Sunday week.
+
+    ``fields`` are ``Assignment`` paths (``'person_id'``, ``'project_id'``,
+    ``'id'``, ``'project__status'``, ...); keys of the result are tuples of
+    their values. ``week_dates`` are folded to their Sundays. With
+    ``hire_gated`` hours before a person's hire week are dropped.
+    """
+    weeks = sorted({sunday_of_week(d) for d in week_dates})
+    if not weeks:
+        return {}
+    needed = list(fields) + (['person__hire_date'] if hire_gated else [])
+    totals: dict[tuple, dict[date, float]] = {}
+
+    def add(key: tuple, week: date, hours: float) -> None:
+        if hire_gated:
+            first_week = first_eligible_week_start(key[-1])
+            if first_week is not None and week < first_week:
+                return
+            key = key[:-1]
+        by_week = totals.setdefault(key, {})
+        by_week[week] = by_week.get(week, 0.0) + hours
+
+    if normalized_hours_enabled():
+        rows = (
+            AssignmentWeekHour.objects.filter(
+                assignment_id__in=assignments_qs.order_by().values('id'),
+                week_start__in=weeks,
+                hours__gt=0,
+            )
+            .values_list(*[_awh_field(f) for f in needed], 'week_start')
+            .annotate(total=Sum('hours'))
+            .order_by()
+        )
+        for row in rows:
+            add(tuple(row[:-2]), row[-2], float(row[-1] or 0.0))
+    else:
+        lookup = _week_lookup(weeks)
+        selected = ['id', 'weekly_hours'] + [f for f in needed if f != 'id']
+        positions = [0 if f == 'id' else selected.index(f) for f in needed]
+        projection = assignments_qs.order_by().values_list(*selected)
+        for row in iter_keyset(projection, key='id'):
+            weekly_hours = row[1]
+            if not isinstance(weekly_hours, dict) or not weekly_hours:
+                continue
+            key = tuple(row[pos] for pos in positions)
+            for raw_key, raw_hours in weekly_hours.items():
+                week = lookup.get(str(raw_key))
+                if week is None:
+                    continue
+                try:
+                    hours = float(raw_hours or 0)
+                except (TypeError, ValueError):
+                    continue
+                if hours > 0:
+                    add(key, week, hours)
+
+    return {
+        key: {week: round(hours, 4) for week, hours in sorted(by_week.items())}
+        for key, by_week in totals.items()
+    }
+
+
+def week_hours_by_person(
+    assignments_qs,
+    week_dates: Iterable[date],
+    *,
+    hire_gated: bool = False,
+) -> dict[int, dict[date, float]]:
+    """``week_hours_by`` grouped per person; placeholder hours are skipped."""
+    return {
+        key[0]: by_week
+        for key, by_week in week_hours_by(assignments_qs, week_dates, 'person_id', hire_gated=hire_gated).items()
+        if key[0] is not None
+    }
 
 
-def build_grid_snapshot_payload_normalized(
+def week_hours_by_project(
+    assignments_qs,
+    week_dates: Iterable[date],
+    *,
+    hire_gated: bool = False,
+) -> dict[int, dict[date, float]]:
+    """``week_hours_by`` grouped per project."""
+    return {
+        key[0]: by_week
+        for key, by_week in week_hours_by(assignments_qs, week_dates, 'project_id', hire_gated=hire_gated).items()
+        if key[0] is not None
+    }
+
+
+def week_hours_by_assignment(assignments_qs, week_dates: Iterable[date]) -> dict[int, dict[date, float]]:
+    """``week_hours_by`` grouped per assignment id."""
+    return {key[0]: by_week for key, by_week in week_hours_by(assignments_qs, week_dates, 'id').items()}
+
+
+def build_grid_snapshot_payload(
     *,
     people_qs,
     weeks: int,
     vertical_id: int | None = None,
+    assignments_qs=None,
 ) -> dict:
-    """Build grid snapshot payload from normalized week-hour rows."""
+    """Build the grid snapshot payload (people + per-person weekly totals).
+
+    Hours come from active assignments (optionally limited to a vertical)
+    unless ``assignments_qs`` narrows them further, e.g. to "my projects".
+    """
     start_sunday = sunday_of_week(date.today())
     week_dates = [start_sunday + timedelta(weeks=w) for w in range(max(1, int(weeks)))]
     week_keys = [wk.isoformat() for wk in week_dates]
@@ -27,23 +191,16 @@ def build_grid_snapshot_payload_normalized(
 
     hours_by_person: dict[int, dict[str, float]] = {pid: {} for pid in person_ids}
     if person_ids:
-        awh = AssignmentWeekHour.objects.filter(
-            person_id__in=person_ids,
-            assignment__is_active=True,
-            week_start__in=week_dates,
-        )
+        asn_qs = assignments_qs if assignments_qs is not None else Assignment.objects.filter(is_active=True)
+        asn_qs = asn_qs.filter(person_id__in=person_ids)
         if vertical_id is not None:
-            awh = awh.filter(assignment__project__vertical_id=vertical_id)
-        for row in (
-            awh.values('person_id', 'week_start')
-            .annotate(total_hours=Sum('hours'))
-        ):
-            person_id = int(row['person_id'])
-            week_key = row['week_start'].isoformat()
-            total = round(float(row.get('total_hours') or 0.0), 2)
-            if total == 0.0:
-                continue
-            hours_by_person.setdefault(person_id, {})[week_key] = total
+            asn_qs = asn_qs.filter(project__vertical_id=vertical_id)
+        for person_id, by_week in week_hours_by_person(asn_qs, week_dates).items():
+            target = hours_by_person.setdefault(int(person_id), {})
+            for week, hours in by_week.items():
+                total = round(hours, 2)
+                if total != 0.0:
+                    target[week.isoformat()] = total
 
     return {
         'weekKeys': week_keys,
@@ -62,3 +219,106 @@ def build_grid_snapshot_payload_normalized(
         ],
         'hoursByPerson': hours_by_person,
     }
+
+
+def apply_people_department_filters(queryset, filters):
+    """Apply cleaned ``{'departmentId', 'op'}`` clauses (and/or/not) to a Person queryset."""
+    if not filters:
+        return queryset
+    include_all = set()
+    include_any = set()
+    exclude_only = set()
+    for f in filters:
+        op = f.get('op')
+        dept_id = f.get('departmentId')
+        if not dept_id:
+            continue
+        if op == 'not':
+            exclude_only.add(dept_id)
+        elif op == 'or':
+            include_any.add(dept_id)
+        else:
+            include_all.add(dept_id)
+    if len(include_all) > 1:
+        return queryset.none()
+    if include_all:
+        queryset = queryset.filter(department_id__in=list(include_all))
+    if include_any:
+        queryset = queryset.filter(department_id__in=list(include_any))
+    if exclude_only:
+        queryset = queryset.exclude(department_id__in=list(exclude_only))
+    return queryset
+
+
+def grid_snapshot_querysets(
+    *,
+    department: int | None = None,
+    include_children: bool = False,
+    department_filters: list[dict] | None = None,
+    vertical: int | None = None,
+    mine_only: bool = False,
+    mine_person_id: int | None = None,
+):
+    """Return ``(people_qs, assignments_qs, mine_project_ids_qs)`` for a grid scope.
+
+    Every argument is a plain value resolved from the request (including the
+    enforced vertical and the caller's person id), so the same scope can be
+    rebuilt later without one.
+    """
+    people_qs = Person.objects.filter(is_active=True).select_related('department')
+    if department is not None:
+        if include_children:
+            people_qs = people_qs.filter(department_id__in=get_descendant_department_ids(department))
+        else:
+            people_qs = people_qs.filter(department_id=department)
+    if department_filters:
+        people_qs = apply_people_department_filters(people_qs, department_filters)
+    asn_qs = Assignment.objects.filter(is_active=True)
+    if vertical is not None:
+        people_qs = people_qs.filter(department__vertical_id=vertical)
+        asn_qs = asn_qs.filter(project__vertical_id=vertical)
+
+    mine_project_ids_qs = None
+    if mine_only:
+        if not mine_person_id:
+            return people_qs.none(), asn_qs.none(), None
+        mine_project_ids_qs = (
+            Assignment.objects
+            .filter(is_active=True, person_id=mine_person_id)
+            .exclude(project_id__isnull=True)
+            .values_list('project_id', flat=True)
+            .distinct()
+        )
+        has_assignment = Assignment.objects.filter(
+            is_active=True,
+            person_id=OuterRef('pk'),
+            project_id__in=mine_project_ids_qs,
+        )
+        people_qs = people_qs.annotate(_mine_project_match=Exists(has_assignment)).filter(_mine_project_match=True)
+        asn_qs = asn_qs.filter(project_id__in=mine_project_ids_qs)
+    return people_qs, asn_qs, mine_project_ids_qs
+
+
+@aggregate_builder
+def grid_snapshot_cache_key(*, base_key: str, department: int | None = None) -> str:
+    """Current cache key for a grid snapshot shape.
+
+    Appends the current Sunday week, ``analytics_cache_version`` and the
+    global/department scope versions to ``base_key``, so warming after a
+    bump writes the key the next request reads.
+    """
+    try:
+        version = int(cache.get('analytics_cache_version', 1) or 1)
+    except Exception:
+        version = 1
+    scope_version = get_snapshot_scope_version('global', 'global')
+    if department is not None:
+        scope_version = max(scope_version, get_snapshot_scope_version('department', str(department)))
+    return f'{base_key}:{sunday_of_week(date.today()).isoformat()}:v{version}.{scope_version}'
+
+
+@aggregate_builder
+def build_scoped_grid_snapshot(*, weeks: int, **scope) -> dict:
+    """``build_grid_snapshot_payload`` for a ``grid_snapshot_querysets`` scope."""
+    people_qs, asn_qs, _ = grid_snapshot_querysets(**scope)
+    return build_grid_snapshot_payload(people_qs=people_qs, weeks=weeks, assignments_qs=asn_qs)
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from dataclasses import dataclass
 from datetime import date
 from typing import Iterable
 
 from django.core.cache import cache
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
+from core.chunked import DEFAULT_CHUNK_SIZE, chunked, iter_keyset
+
 from .models import (
     Assignment,
     ProjectWeeklyHoursRollup,
@@ -14,91 +19,383 @@ from .models import (
 )
 
 
+# Projects rebuilt per transaction; bounds the in-memory hour maps.
+ROLLUP_PROJECT_BATCH = 200
+
+# Hour totals at or below this are treated as zero (rows are dropped).
+_HOURS_EPSILON = 0.005
+
+
+@dataclass(frozen=True)
+class RollupState:
+    """What one assignment contributes to its project's rollups.
+
+    ``department_id`` is the effective department (the person's for people,
+    the assignment's for placeholders). Assignments that do not count
+    (inactive, no project, inactive person) have no state (``None``).
+    """
+
+    project_id: int
+    department_id: int | None
+    person_id: int | None
+    weekly_hours: dict
+
+    @property
+    def membership(self) -> tuple[int, int | None, int | None]:
+        return (self.project_id, self.department_id, self.person_id)
+
+
+def _rollup_state(
+    project_id,
+    person_id,
+    department_id,
+    person_department_id,
+    person_is_active,
+    is_active,
+    weekly_hours,
+) -> RollupState | None:
+    if not project_id or is_active is False:
+        return None
+    if person_id and person_is_active is False:
+        return None
+    dept_id = person_department_id if person_id else department_id
+    if dept_id is not None and dept_id <= 0:
+        dept_id = None
+    return RollupState(
+        project_id=int(project_id),
+        department_id=dept_id,
+        person_id=person_id or None,
+        weekly_hours=dict(weekly_hours) if isinstance(weekly_hours, dict) else {},
+    )
+
+
+def rollup_state_for(assignment: Assignment) -> RollupState | None:
+    """Current rollup contribution of an in-memory assignment (uses ``assignment.person``)."""
+    person = assignment.person if assignment.person_id else None
+    return _rollup_state(
+        assignment.project_id,
+        assignment.person_id,
+        assignment.department_id,
+        getattr(person, 'department_id', None),
+        getattr(person, 'is_active', None),
+        assignment.is_active,
+        assignment.weekly_hours,
+    )
+
+
+ROLLUP_STATE_FIELDS = (
+    'project_id', 'person_id', 'department_id', 'person__department_id',
+    'person__is_active', 'is_active', 'weekly_hours',
+)
+
+
+def rollup_state_from_row(row) -> RollupState | None:
+    """``RollupState`` from a ``values_list(*ROLLUP_STATE_FIELDS)`` row."""
+    return _rollup_state(*row)
+
+
+def _hour_contributions(state: RollupState | None) -> dict[tuple[int, int | None, date], tuple[float, float]]:
+    out: dict[tuple[int, int | None, date], tuple[float, float]] = {}
+    if state is None:
+        return out
+    for wk_key, value in state.weekly_hours.items():
+        try:
+            wk_date = date.fromisoformat(str(wk_key))
+        except Exception:
+            continue
+        try:
+            hours = float(value or 0)
+        except Exception:
+            hours = 0.0
+        if hours <= 0:
+            continue
+        key = (state.project_id, state.department_id, wk_date)
+        person_hours, placeholder_hours = out.get(key, (0.0, 0.0))
+        if state.person_id:
+            person_hours += hours
+        else:
+            placeholder_hours += hours
+        out[key] = (person_hours, placeholder_hours)
+    return out
+
+
 def rebuild_project_rollups(project_ids: Iterable[int]) -> None:
+    """Recompute rollups for ``project_ids`` from assignments (repair path).
+
+    Only rows whose values differ are written, so a rebuild of an
+    up-to-date project is read-only.
+    """
     ids = sorted({int(pid) for pid in (project_ids or []) if pid})
     if not ids:
         return
+    for batch in chunked(ids, ROLLUP_PROJECT_BATCH):
+        _rebuild_project_rollup_batch(batch)
+
 
+def _rebuild_project_rollup_batch(ids: list[int]) -> None:
     assignments = (
         Assignment.objects
         .filter(is_active=True, project_id__in=ids)
-        .select_related('person')
-        .only('id', 'project_id', 'person_id', 'department_id', 'weekly_hours', 'person__department_id')
+        .values_list('id', *ROLLUP_STATE_FIELDS)
     )
 
     hours_map: dict[tuple[int, int | None, date], tuple[float, float]] = {}
     people_sets: dict[tuple[int, int | None], set[int]] = {}
     placeholder_counts: dict[tuple[int, int | None], int] = {}
 
-    for a in assignments.iterator():
-        pid = a.project_id
-        if pid is None:
+    for row in iter_keyset(assignments, key='id'):
+        state = rollup_state_from_row(row[1:])
+        if state is None:
             continue
-        if a.person_id and not getattr(a.person, 'is_active', True):
-            continue
-        dept_id = a.person.department_id if a.person_id else a.department_id
-        if dept_id is not None and dept_id <= 0:
-            dept_id = None
-
-        if a.person_id:
-            people_sets.setdefault((pid, dept_id), set()).add(a.person_id)
+        pair = (state.project_id, state.department_id)
+        if state.person_id:
+            people_sets.setdefault(pair, set()).add(state.person_id)
         else:
-            placeholder_counts[(pid, dept_id)] = placeholder_counts.get((pid, dept_id), 0) + 1
+            placeholder_counts[pair] = placeholder_counts.get(pair, 0) + 1
+        for key, (person_hours, placeholder_hours) in _hour_contributions(state).items():
+            current = hours_map.get(key, (0.0, 0.0))
+            hours_map[key] = (current[0] + person_hours, current[1] + placeholder_hours)
+
+    counts = {
+        pair: (len(people_sets.get(pair, ())), int(placeholder_counts.get(pair, 0)))
+        for pair in set(people_sets) | set(placeholder_counts)
+    }
+    with transaction.atomic():
+        _write_hour_rows(
+            ProjectWeeklyHoursRollup.objects.select_for_update().filter(project_id__in=ids),
+            {key: (round(ph, 2), round(plh, 2)) for key, (ph, plh) in hours_map.items()},
+            authoritative=True,
+        )
+        _write_count_rows(
+            ProjectAssignmentCountsRollup.objects.select_for_update().filter(project_id__in=ids),
+            counts,
+            authoritative=True,
+        )
 
-        weekly = a.weekly_hours or {}
-        if not isinstance(weekly, dict):
-            continue
-        for wk_key, value in weekly.items():
-            try:
-                wk_date = date.fromisoformat(str(wk_key))
-            except Exception:
-                continue
-            try:
-                hours = float(value or 0)
-            except Exception:
-                hours = 0.0
-            if hours <= 0:
-                continue
-            key = (pid, dept_id, wk_date)
-            person_hours, placeholder_hours = hours_map.get(key, (0.0, 0.0))
-            if a.person_id:
-                person_hours += hours
-            else:
-                placeholder_hours += hours
-            hours_map[key] = (person_hours, placeholder_hours)
 
+def _write_hour_rows(existing_qs, desired: dict, *, authoritative: bool) -> None:
+    """Make hours rollup rows match ``desired`` ({(project, dept, week): (person, placeholder)}).
+
+    With ``authoritative`` every existing row not in ``desired`` is deleted;
+    otherwise only the keys in ``desired`` are touched.
+    """
     now = timezone.now()
-    rollup_rows = [
+    to_update: list[ProjectWeeklyHoursRollup] = []
+    to_delete: list[int] = []
+    seen: set = set()
+    for row in existing_qs:
+        key = (row.project_id, row.department_id, row.week_start)
+        if key not in desired:
+            if authoritative:
+                to_delete.append(row.id)
+            continue
+        seen.add(key)
+        person_hours, placeholder_hours = desired[key]
+        if person_hours <= _HOURS_EPSILON and placeholder_hours <= _HOURS_EPSILON:
+            to_delete.append(row.id)
+            continue
+        if (row.person_hours, row.placeholder_hours) != (person_hours, placeholder_hours):
+            row.person_hours = person_hours
+            row.placeholder_hours = placeholder_hours
+            row.updated_at = now
+            to_update.append(row)
+    to_create = [
         ProjectWeeklyHoursRollup(
             project_id=pid,
             department_id=dept_id,
             week_start=wk_date,
-            person_hours=round(person_hours, 2),
-            placeholder_hours=round(placeholder_hours, 2),
+            person_hours=person_hours,
+            placeholder_hours=placeholder_hours,
             updated_at=now,
         )
-        for (pid, dept_id, wk_date), (person_hours, placeholder_hours) in hours_map.items()
+        for (pid, dept_id, wk_date), (person_hours, placeholder_hours) in desired.items()
+        if (pid, dept_id, wk_date) not in seen
+        and (person_hours > _HOURS_EPSILON or placeholder_hours > _HOURS_EPSILON)
     ]
+    if to_delete:
+        ProjectWeeklyHoursRollup.objects.filter(id__in=to_delete).delete()
+    if to_update:
+        ProjectWeeklyHoursRollup.objects.bulk_update(
+            to_update, ['person_hours', 'placeholder_hours', 'updated_at'], batch_size=DEFAULT_CHUNK_SIZE,
+        )
+    if to_create:
+        ProjectWeeklyHoursRollup.objects.bulk_create(to_create, batch_size=DEFAULT_CHUNK_SIZE)
+
 
-    count_keys = set(people_sets.keys()) | set(placeholder_counts.keys())
-    count_rows = [
+def _write_count_rows(existing_qs, desired: dict, *, authoritative: bool) -> None:
+    """Counts counterpart of ``_write_hour_rows`` ({(project, dept): (people, placeholders)})."""
+    now = timezone.now()
+    to_update: list[ProjectAssignmentCountsRollup] = []
+    to_delete: list[int] = []
+    seen: set = set()
+    for row in existing_qs:
+        key = (row.project_id, row.department_id)
+        if key not in desired:
+            if authoritative:
+                to_delete.append(row.id)
+            continue
+        seen.add(key)
+        people_count, placeholder_count = desired[key]
+        if not people_count and not placeholder_count:
+            to_delete.append(row.id)
+            continue
+        if (row.people_count, row.placeholder_count) != (people_count, placeholder_count):
+            row.people_count = people_count
+            row.placeholder_count = placeholder_count
+            row.updated_at = now
+            to_update.append(row)
+    to_create = [
         ProjectAssignmentCountsRollup(
             project_id=pid,
             department_id=dept_id,
-            people_count=len(people_sets.get((pid, dept_id), set())),
-            placeholder_count=int(placeholder_counts.get((pid, dept_id), 0)),
+            people_count=people_count,
+            placeholder_count=placeholder_count,
             updated_at=now,
         )
-        for (pid, dept_id) in count_keys
+        for (pid, dept_id), (people_count, placeholder_count) in desired.items()
+        if (pid, dept_id) not in seen and (people_count or placeholder_count)
     ]
+    if to_delete:
+        ProjectAssignmentCountsRollup.objects.filter(id__in=to_delete).delete()
+    if to_update:
+        ProjectAssignmentCountsRollup.objects.bulk_update(
+            to_update, ['people_count', 'placeholder_count', 'updated_at'], batch_size=DEFAULT_CHUNK_SIZE,
+        )
+    if to_create:
+        ProjectAssignmentCountsRollup.objects.bulk_create(to_create, batch_size=DEFAULT_CHUNK_SIZE)
 
-    with transaction.atomic():
-        ProjectWeeklyHoursRollup.objects.filter(project_id__in=ids).delete()
-        ProjectAssignmentCountsRollup.objects.filter(project_id__in=ids).delete()
-        if rollup_rows:
-            ProjectWeeklyHoursRollup.objects.bulk_create(rollup_rows)
-        if count_rows:
-            ProjectAssignmentCountsRollup.objects.bulk_create(count_rows)
+
+def _recount_pairs(pairs: set[tuple[int, int | None]]) -> dict[tuple[int, int | None], tuple[int, int]]:
+    """Membership counts for the given (project, effective department) pairs."""
+    people_sets: dict[tuple[int, int | None], set[int]] = {pair: set() for pair in pairs}
+    placeholder_counts: dict[tuple[int, int | None], int] = {pair: 0 for pair in pairs}
+    rows = (
+        Assignment.objects
+        .filter(is_active=True, project_id__in=sorted({pid for pid, _ in pairs}))
+        .values_list('project_id', 'person_id', 'department_id', 'person__department_id', 'person__is_active')
+    )
+    for project_id, person_id, department_id, person_department_id, person_is_active in rows:
+        state = _rollup_state(project_id, person_id, department_id, person_department_id, person_is_active, True, None)
+        if state is None:
+            continue
+        pair = (state.project_id, state.department_id)
+        if pair not in people_sets:
+            continue
+        if state.person_id:
+            people_sets[pair].add(state.person_id)
+        else:
+            placeholder_counts[pair] += 1
+    return {pair: (len(people_sets[pair]), placeholder_counts[pair]) for pair in pairs}
+
+
+def _recompute_cells(cells: set[tuple[int, int | None, date]]) -> dict[tuple[int, int | None, date], tuple[float, float]]:
+    """Current (person, placeholder) hours of the given cells, summed from assignments."""
+    totals: dict[tuple[int, int | None, date], tuple[float, float]] = {cell: (0.0, 0.0) for cell in cells}
+    rows = (
+        Assignment.objects
+        .filter(is_active=True, project_id__in=sorted({cell[0] for cell in cells}))
+        .values_list('id', *ROLLUP_STATE_FIELDS)
+    )
+    for row in iter_keyset(rows, key='id'):
+        for key, (person_hours, placeholder_hours) in _hour_contributions(rollup_state_from_row(row[1:])).items():
+            if key in totals:
+                current = totals[key]
+                totals[key] = (current[0] + person_hours, current[1] + placeholder_hours)
+    return {key: (round(ph, 2), round(plh, 2)) for key, (ph, plh) in totals.items()}
+
+
+def rollup_changes(
+    changes: Iterable[tuple[RollupState | None, RollupState | None]],
+) -> tuple[set[tuple[int, int | None, date]], set[tuple[int, int | None]]]:
+    """(hours cells, count pairs) whose rollup rows the (before, after) contributions touch."""
+    cells: set[tuple[int, int | None, date]] = set()
+    count_pairs: set[tuple[int, int | None]] = set()
+    for before, after in changes:
+        if before == after:
+            continue
+        before_hours = _hour_contributions(before)
+        after_hours = _hour_contributions(after)
+        cells.update(key for key in set(before_hours) | set(after_hours) if before_hours.get(key) != after_hours.get(key))
+        before_membership = before.membership if before else None
+        after_membership = after.membership if after else None
+        if before_membership != after_membership:
+            for state in (before, after):
+                if state is not None:
+                    count_pairs.add((state.project_id, state.department_id))
+    return cells, count_pairs
+
+
+def refresh_rollup_cells(
+    cells: set[tuple[int, int | None, date]],
+    count_pairs: set[tuple[int, int | None]],
+) -> dict:
+    """Rewrite only the given rollup cells and count pairs from the committed assignments.
+
+    Values are recomputed rather than adjusted, so a stale ``before`` from a
+    concurrent write cannot make the rollups drift. Existing rows are locked
+    while rewritten. If a concurrent writer inserts the same cell first, the
+    affected projects fall back to a full rebuild.
+    """
+    if not cells and not count_pairs:
+        return {'cells': 0, 'countPairs': 0}
+
+    project_ids = sorted({key[0] for key in cells} | {pid for pid, _ in count_pairs})
+    try:
+        with transaction.atomic():
+            if cells:
+                existing = list(
+                    ProjectWeeklyHoursRollup.objects.select_for_update().filter(
+                        project_id__in=sorted({key[0] for key in cells}),
+                        week_start__in=sorted({key[2] for key in cells}),
+                    )
+                )
+                _write_hour_rows(existing, _recompute_cells(cells), authoritative=False)
+            if count_pairs:
+                _write_count_rows(
+                    ProjectAssignmentCountsRollup.objects.select_for_update().filter(
+                        project_id__in=sorted({pid for pid, _ in count_pairs}),
+                    ),
+                    _recount_pairs(count_pairs),
+                    authoritative=False,
+                )
+    except IntegrityError:
+        rebuild_project_rollups(project_ids)
+        return {'cells': len(cells), 'countPairs': len(count_pairs), 'rebuilt': project_ids}
+    return {'cells': len(cells), 'countPairs': len(count_pairs)}
+
+
+def apply_rollup_deltas(changes: Iterable[tuple[RollupState | None, RollupState | None]]) -> dict:
+    """Refresh, in this process, only the rollup rows touched by (before, after) contributions."""
+    return refresh_rollup_cells(*rollup_changes(changes))
+
+
+def queue_rollup_deltas(changes: Iterable[tuple[RollupState | None, RollupState | None]]) -> None:
+    """Hand the touched cells to ``refresh_rollup_cells_task`` (inline without Celery).
+
+    Recomputing a cell reads every active assignment of its project, so it
+    stays off the request thread. An identical cell set that is queued but
+    not yet started is not queued twice; the task clears the marker before
+    reading, so later writes always get a run that sees them.
+    """
+    cells, count_pairs = rollup_changes(changes)
+    if not cells and not count_pairs:
+        return
+    cell_rows = sorted([pid, dept_id, wk_date.isoformat()] for pid, dept_id, wk_date in cells)
+    pair_rows = sorted([pid, dept_id] for pid, dept_id in count_pairs)
+    digest = hashlib.sha256(json.dumps([cell_rows, pair_rows], default=str).encode()).hexdigest()[:24]
+    debounce_key = f'rollup:cells:{digest}'
+    try:
+        if not cache.add(debounce_key, True, timeout=30):
+            return
+    except Exception:
+        debounce_key = None
+    try:
+        from assignments.tasks import refresh_rollup_cells_task
+        refresh_rollup_cells_task.delay(cell_rows, pair_rows, debounce_key)
+    except Exception:
+        if debounce_key:
+            cache.delete(debounce_key)
+        refresh_rollup_cells(cells, count_pairs)
 
 
 def queue_project_rollup_refresh(project_ids: Iterable[int]) -> None:
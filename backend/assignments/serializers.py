@@ -8,6 +8,7 @@ from drf_spectacular.utils import extend_schema_field
 from django.db import transaction
 from .models import Assignment
 from .week_hours_service import sync_assignment_week_hours
+from .projection import projected_weekly_hours
 from projects.models import Project, ProjectRole
 from skills.serializers import PersonSkillSummarySerializer
 
@@ -57,6 +58,21 @@ class AssignmentSerializer(serializers.ModelSerializer):
             'person': {'required': False, 'allow_null': True},
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Optional read projection (see assignments.projection); never set for writes.
+        projection = self.context.get('assignment_projection')
+        if projection is None:
+            return
+        for name in list(self.fields):
+            if not projection.includes(name):
+                self.fields.pop(name)
+        if projection.week_keys is not None and 'weeklyHours' in self.fields:
+            self.fields['weeklyHours'] = serializers.SerializerMethodField(method_name='get_projected_weekly_hours')
+
+    def get_projected_weekly_hours(self, obj) -> dict:
+        return projected_weekly_hours(obj, self.context['assignment_projection'])
+
     @extend_schema_field(serializers.CharField(allow_null=True))
     def get_roleName(self, obj) -> str | None:
         """Prefer FK role name; fallback to legacy role_on_project string."""
@@ -216,6 +232,8 @@ class AssignmentSerializer(serializers.ModelSerializer):
         data = super().to_representation(instance)
         
         # Add the list of next 12 weeks for the frontend
-        data['availableWeeks'] = Assignment.get_next_12_weeks()
+        projection = self.context.get('assignment_projection')
+        if projection is None or projection.includes('availableWeeks'):
+            data['availableWeeks'] = Assignment.get_next_12_weeks()
         
         return data
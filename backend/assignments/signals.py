@@ -1,11 +1,17 @@
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.core.cache import cache
 from django.utils import timezone
 
 from assignments.models import Assignment
-from assignments.rollup_service import queue_project_rollup_refresh
+from assignments.rollup_service import (
+    ROLLUP_STATE_FIELDS,
+    queue_project_rollup_refresh,
+    queue_rollup_deltas,
+    rollup_state_for,
+    rollup_state_from_row,
+)
 from assignments.week_hours_service import sync_assignment_week_hours
 from projects.assigned_names import enqueue_assigned_names_rebuild_on_commit
 from deliverables.models import DeliverableAssignment
@@ -28,15 +34,45 @@ def _bump_analytics_cache_version():
 def capture_assignment_project(sender, instance, **kwargs):
     if not instance.pk:
         instance._previous_project_id = None
+        instance._previous_department_ids = []
+        instance._previous_rollup_state = None
         return
     try:
-        instance._previous_project_id = (
-            Assignment.objects.filter(pk=instance.pk)
-            .values_list('project_id', flat=True)
-            .first()
-        )
+        qs = Assignment.objects.filter(pk=instance.pk)
+        if connection.in_atomic_block:
+            # Hold the row until this write commits so a concurrent save reads our result as its "before".
+            qs = qs.select_for_update(of=('self',))
+        row = qs.values_list(*ROLLUP_STATE_FIELDS).first()
     except Exception:  # nosec B110
-        instance._previous_project_id = None
+        row = None
+    instance._previous_project_id = row[0] if row else None
+    instance._previous_department_ids = [d for d in ((row[2], row[3]) if row else ()) if d]
+    if row is not None:
+        instance._previous_rollup_state = rollup_state_from_row(row)
+    else:
+        instance.__dict__.pop('_previous_rollup_state', None)
+
+
+def _queue_rollup_delta(instance, *, deleted: bool) -> None:
+    """Queue this write's touched rollup cells on commit; fall back to a project refresh."""
+    project_ids = {pid for pid in (instance.project_id, getattr(instance, '_previous_project_id', None)) if pid}
+    try:
+        if not hasattr(instance, '_previous_rollup_state') and not deleted:
+            raise LookupError('previous rollup state was not captured')
+        before = rollup_state_for(instance) if deleted else instance._previous_rollup_state
+        after = None if deleted else rollup_state_for(instance)
+    except Exception:
+        if project_ids:
+            transaction.on_commit(lambda: queue_project_rollup_refresh(sorted(project_ids)))
+        return
+
+    def _apply():
+        try:
+            queue_rollup_deltas([(before, after)])
+        except Exception:
+            queue_project_rollup_refresh(sorted(project_ids))
+
+    transaction.on_commit(_apply)
 
 
 @receiver([post_save, post_delete], sender=Assignment)
@@ -50,18 +86,20 @@ def invalidate_on_assignment_change(sender, instance, **kwargs):
             department_ids.append(instance.person.department_id)
     except Exception:  # nosec B110
         pass
-    bump_snapshot_scopes(
-        project_ids=[instance.project_id] if getattr(instance, 'project_id', None) else [],
-        department_ids=department_ids,
-    )
+    # Reassigned rows must also move the scopes they left.
+    department_ids.extend(getattr(instance, '_previous_department_ids', None) or [])
+    project_ids = [instance.project_id] if getattr(instance, 'project_id', None) else []
+    prev_project_id = getattr(instance, '_previous_project_id', None)
+    if prev_project_id and prev_project_id not in project_ids:
+        project_ids.append(prev_project_id)
+    bump_snapshot_scopes(project_ids=project_ids, department_ids=department_ids)
     if 'created' in kwargs:
         try:
             transaction.on_commit(lambda: sync_assignment_week_hours(instance, instance.weekly_hours, clear_missing=True))
         except Exception:  # nosec B110
             pass
     try:
-        if instance.project_id:
-            transaction.on_commit(lambda: queue_project_rollup_refresh([instance.project_id]))
+        _queue_rollup_delta(instance, deleted='created' not in kwargs)
     except Exception:  # nosec B110
         pass
     try:
@@ -77,6 +115,51 @@ def invalidate_on_assignment_change(sender, instance, **kwargs):
         pass
 
 
+def invalidate_for_bulk_hours_update(assignments, previous_states=None) -> None:
+    """Coalesced counterpart of ``invalidate_on_assignment_change`` for bulk hour writes.
+
+    Hours-only writes do not change membership, so the assigned-names rebuild
+    and task unassignment handlers are not needed here. ``previous_states``
+    ({assignment id: ``RollupState`` before the write, ``None`` for new rows})
+    lets the rollups be adjusted by delta instead of rebuilt per project.
+    """
+    assignments = list(assignments)
+    project_ids: set[int] = set()
+    department_ids: set[int] = set()
+    for instance in assignments:
+        if getattr(instance, 'project_id', None):
+            project_ids.add(instance.project_id)
+        if getattr(instance, 'department_id', None):
+            department_ids.add(instance.department_id)
+        try:
+            if getattr(instance, 'person', None) and instance.person and instance.person.department_id:
+                department_ids.add(instance.person.department_id)
+        except Exception:  # nosec B110
+            pass
+    _bump_analytics_cache_version()
+    bump_snapshot_scopes(project_ids=sorted(project_ids), department_ids=sorted(department_ids))
+    if project_ids:
+        try:
+            if previous_states is None:
+                raise LookupError('previous rollup states not provided')
+            changes = [(previous_states.get(a.id), rollup_state_for(a)) for a in assignments]
+        except Exception:
+            changes = None
+
+        def _apply():
+            try:
+                if changes is None:
+                    raise LookupError('rollup delta unavailable')
+                queue_rollup_deltas(changes)
+            except Exception:
+                queue_project_rollup_refresh(sorted(project_ids))
+
+        try:
+            transaction.on_commit(_apply)
+        except Exception:  # nosec B110
+            pass
+
+
 @receiver([post_save, post_delete], sender=DeliverableAssignment)
 def invalidate_on_deliverable_assignment_change(sender, instance, **kwargs):
     _bump_analytics_cache_version()
@@ -12,6 +12,8 @@ from typing import Dict, Iterable, List, Optional, Tuple
 from django.db import transaction, connection
 from django.utils import timezone
 
+from core.cache_scopes import bump_weekly_snapshot_version
+from core.chunked import chunked, iter_keyset, iter_keyset_chunks
 from core.week_utils import sunday_of_week, get_week_value
 from core.deliverable_phase import classify_week_for_project
 from core.choices import SnapshotSource, DeliverablePhase
@@ -20,6 +22,9 @@ from .models import Assignment, WeeklyAssignmentSnapshot, AssignmentMembershipEv
 import logging
 logger = logging.getLogger(__name__)
 
+# Assignments loaded (and snapshot rows upserted) per round trip.
+SNAPSHOT_CHUNK_SIZE = 1000
+
 
 def _try_acquire_week_lock(week_key: str) -> bool:
     vendor = connection.vendor
@@ -66,19 +71,89 @@ def _round2(n: float) -> float:
         return 0.0
 
 
-def _is_member_for_week(a: Assignment, week_start: date) -> bool:
-    if not a.is_active:
+def _is_member(is_active: bool, start_date: Optional[date], end_date: Optional[date], weekly_hours, week_start: date) -> bool:
+    if not is_active:
         return False
     start_of_week = week_start
     end_of_week = week_start + timedelta(days=6)
-    sd = getattr(a, 'start_date', None)
-    ed = getattr(a, 'end_date', None)
-    if sd and sd > end_of_week:
+    if start_date and start_date > end_of_week:
         return False
-    if ed and ed < start_of_week:
+    if end_date and end_date < start_of_week:
         return False
     # Membership events track effective participation for the week.
-    return float(get_week_value(a.weekly_hours or {}, week_start)) > 0
+    return float(get_week_value(weekly_hours or {}, week_start)) > 0
+
+
+def _is_member_for_week(a: Assignment, week_start: date) -> bool:
+    return _is_member(
+        a.is_active,
+        getattr(a, 'start_date', None),
+        getattr(a, 'end_date', None),
+        a.weekly_hours,
+        week_start,
+    )
+
+
+def _snapshot_row(
+    a: Assignment,
+    sunday: date,
+    source: str,
+    deliverables_by_pid: Dict[int, List[dict]],
+    now,
+) -> Optional[WeeklyAssignmentSnapshot]:
+    """Snapshot row for one assignment, or None when it has no positive hours."""
+    pid = a.project_id
+    person_id = a.person_id
+    if not pid or not person_id:
+        return None  # skip rows without both FKs
+    hours_val = float(get_week_value(a.weekly_hours or {}, sunday))
+    if hours_val <= 0:
+        # Only persist positive-hour rows to keep table compact
+        return None
+
+    proj = a.project
+    person = a.person
+    project_status = getattr(proj, 'status', None) or None
+    return WeeklyAssignmentSnapshot(
+        week_start=sunday,
+        person_id=person_id,
+        project_id=pid,
+        role_on_project_id=getattr(a, 'role_on_project_ref_id', None),
+        department_id=getattr(person, 'department_id', None),
+        project_status=project_status,
+        # Classify deliverable phase for this week
+        deliverable_phase=classify_week_for_project(
+            sunday.isoformat(),
+            project_status,
+            deliverables_by_pid.get(pid, []),
+        ),
+        hours=_round2(hours_val),
+        source=source,
+        person_name=getattr(person, 'name', '') or '',
+        project_name=getattr(proj, 'name', '') or '',
+        client=getattr(proj, 'client', '') or '',
+        person_is_active=bool(getattr(person, 'is_active', True)),
+        person_role_id=getattr(person, 'role_id', None),
+        person_role_name=getattr(getattr(person, 'role', None), 'name', '') or '',
+        updated_at=now,
+    )
+
+
+def _snapshot_source_queryset():
+    return (
+        Assignment.objects
+        .filter(is_active=True)
+        .select_related('person', 'person__department', 'person__role', 'project')
+    )
+
+
+def _active_project_ids() -> List[int]:
+    return list(
+        Assignment.objects
+        .filter(is_active=True, project_id__isnull=False)
+        .values_list('project_id', flat=True)
+        .distinct()
+    )
 
 
 def write_weekly_assignment_snapshots(week_start: date | str, *, source: str = SnapshotSource.ASSIGNED) -> dict:
@@ -103,157 +178,36 @@ def write_weekly_assignment_snapshots(week_start: date | str, *, source: str = S
         }
 
     try:
-        # Pull active assignments and prepare project list
-        qs = (
-            Assignment.objects
-            .filter(is_active=True)
-            .select_related('person', 'person__department', 'person__role', 'project')
-        )
+        qs = _snapshot_source_queryset()
         examined = 0
-        to_upsert: List[WeeklyAssignmentSnapshot] = []
-        now = timezone.now()
-
-        # Preload project deliverables for classification
-        project_ids = list(
-            {a.project_id for a in qs if getattr(a, 'project_id', None) is not None}
-        )
-        deliverables_by_pid = _load_deliverables_by_project(project_ids)
-
-        for a in qs:
-            examined += 1
-            pid = a.project_id
-            person_id = a.person_id
-            if not pid or not person_id:
-                continue  # skip rows without both FKs
-            hours_val = float(get_week_value(a.weekly_hours or {}, sunday))
-            if hours_val <= 0:
-                # Only persist positive-hour rows to keep table compact
-                continue
-
-            proj = a.project
-            person = a.person
-            dept_id = getattr(person, 'department_id', None)
-            role_id = getattr(a, 'role_on_project_ref_id', None)
-            project_status = getattr(proj, 'status', None) or None
-            # Classify deliverable phase for this week
-            phase = classify_week_for_project(
-                week_key,
-                project_status,
-                deliverables_by_pid.get(pid, []),
-            )
-
-            to_upsert.append(WeeklyAssignmentSnapshot(
-                week_start=sunday,
-                person_id=person_id,
-                project_id=pid,
-                role_on_project_id=role_id,
-                department_id=dept_id,
-                project_status=project_status,
-                deliverable_phase=phase,
-                hours=_round2(hours_val),
-                source=source,
-                person_name=getattr(person, 'name', '') or '',
-                project_name=getattr(proj, 'name', '') or '',
-                client=getattr(proj, 'client', '') or '',
-                person_is_active=bool(getattr(person, 'is_active', True)),
-                person_role_id=getattr(person, 'role_id', None),
-                person_role_name=getattr(getattr(person, 'role', None), 'name', '') or '',
-                updated_at=now,
-            ))
-
         inserted = 0
         updated = 0
-        # Perform batched transactional upserts.
-        #
-        # Postgres unique constraints treat NULLs as distinct, so rows keyed by
-        # (person, project, NULL, week_start, source) need explicit handling.
-        if to_upsert:
-            update_fields = [
-                'hours', 'project_status', 'deliverable_phase', 'department_id',
-                'person_name', 'project_name', 'client',
-                'person_is_active', 'person_role_id', 'person_role_name',
-                'updated_at',
-            ]
-            with_role = [row for row in to_upsert if row.role_on_project_id is not None]
-            without_role = [row for row in to_upsert if row.role_on_project_id is None]
-
-            with transaction.atomic():
-                if with_role:
-                    with_role_keys = {
-                        (r.person_id, r.project_id, r.role_on_project_id, r.week_start, r.source)
-                        for r in with_role
-                    }
-                    existing_with_role = set(
-                        WeeklyAssignmentSnapshot.objects.filter(
-                            person_id__in=[k[0] for k in with_role_keys],
-                            project_id__in=[k[1] for k in with_role_keys],
-                            role_on_project_id__in=[k[2] for k in with_role_keys],
-                            week_start=sunday,
-                            source=source,
-                        ).values_list('person_id', 'project_id', 'role_on_project_id', 'week_start', 'source')
-                    )
-                    WeeklyAssignmentSnapshot.objects.bulk_create(
-                        with_role,
-                        update_conflicts=True,
-                        update_fields=update_fields,
-                        unique_fields=['person', 'project', 'role_on_project_id', 'week_start', 'source'],
-                    )
-                    updated_with_role = len(with_role_keys & existing_with_role)
-                    updated += updated_with_role
-                    inserted += max(0, len(with_role) - updated_with_role)
-
-                if without_role:
-                    existing_null_rows = list(
-                        WeeklyAssignmentSnapshot.objects.filter(
-                            person_id__in=[row.person_id for row in without_role],
-                            project_id__in=[row.project_id for row in without_role],
-                            week_start=sunday,
-                            source=source,
-                            role_on_project_id__isnull=True,
-                        ).order_by('id')
-                    )
+        wrote_rows = False
+        now = timezone.now()
 
-                    existing_by_key: Dict[Tuple[int, int, date, str], WeeklyAssignmentSnapshot] = {}
-                    duplicate_ids: List[int] = []
-                    for row in existing_null_rows:
-                        key = (int(row.person_id), int(row.project_id), row.week_start, row.source)
-                        if key in existing_by_key:
-                            duplicate_ids.append(int(row.id))
-                        else:
-                            existing_by_key[key] = row
-                    if duplicate_ids:
-                        WeeklyAssignmentSnapshot.objects.filter(id__in=duplicate_ids).delete()
-
-                    to_create: List[WeeklyAssignmentSnapshot] = []
-                    to_update: List[WeeklyAssignmentSnapshot] = []
-                    for candidate in without_role:
-                        key = (int(candidate.person_id), int(candidate.project_id), candidate.week_start, candidate.source)
-                        existing = existing_by_key.get(key)
-                        if existing is None:
-                            to_create.append(candidate)
-                            continue
-                        existing.hours = candidate.hours
-                        existing.project_status = candidate.project_status
-                        existing.deliverable_phase = candidate.deliverable_phase
-                        existing.department_id = candidate.department_id
-                        existing.person_name = candidate.person_name
-                        existing.project_name = candidate.project_name
-                        existing.client = candidate.client
-                        existing.person_is_active = candidate.person_is_active
-                        existing.person_role_id = candidate.person_role_id
-                        existing.person_role_name = candidate.person_role_name
-                        existing.updated_at = candidate.updated_at
-                        to_update.append(existing)
-
-                    if to_create:
-                        WeeklyAssignmentSnapshot.objects.bulk_create(to_create)
-                        inserted += len(to_create)
-                    if to_update:
-                        WeeklyAssignmentSnapshot.objects.bulk_update(to_update, update_fields)
-                        updated += len(to_update)
+        # Preload project deliverables for classification
+        deliverables_by_pid = _load_deliverables_by_project(_active_project_ids())
+
+        # Stream assignments in keyset chunks and upsert each chunk, so memory
+        # is bounded by the chunk size rather than the assignment table.
+        with transaction.atomic():
+            for chunk in iter_keyset_chunks(qs, chunk_size=SNAPSHOT_CHUNK_SIZE):
+                to_upsert: List[WeeklyAssignmentSnapshot] = []
+                for a in chunk:
+                    examined += 1
+                    row = _snapshot_row(a, sunday, source, deliverables_by_pid, now)
+                    if row is not None:
+                        to_upsert.append(row)
+                if to_upsert:
+                    chunk_inserted, chunk_updated = _upsert_snapshot_rows(to_upsert, sunday, source)
+                    inserted += chunk_inserted
+                    updated += chunk_updated
+                    wrote_rows = True
 
         # Emit membership events
         events_inserted = _emit_membership_events(sunday, deliverables_by_pid)
+        if wrote_rows:
+            bump_weekly_snapshot_version()
 
         summary = {
             'week_start': week_key,
@@ -279,29 +233,124 @@ def write_weekly_assignment_snapshots(week_start: date | str, *, source: str = S
         _release_week_lock(week_key)
 
 
+def _upsert_snapshot_rows(to_upsert: List[WeeklyAssignmentSnapshot], sunday: date, source: str) -> Tuple[int, int]:
+    """Upsert one batch of snapshot rows; returns (inserted, updated)."""
+    inserted = 0
+    updated = 0
+    # Postgres unique constraints treat NULLs as distinct, so rows keyed by
+    # (person, project, NULL, week_start, source) need explicit handling.
+    update_fields = [
+        'hours', 'project_status', 'deliverable_phase', 'department_id',
+        'person_name', 'project_name', 'client',
+        'person_is_active', 'person_role_id', 'person_role_name',
+        'updated_at',
+    ]
+    with_role = [row for row in to_upsert if row.role_on_project_id is not None]
+    without_role = [row for row in to_upsert if row.role_on_project_id is None]
+
+    with transaction.atomic():
+        if with_role:
+            with_role_keys = {
+                (r.person_id, r.project_id, r.role_on_project_id, r.week_start, r.source)
+                for r in with_role
+            }
+            existing_with_role = set(
+                WeeklyAssignmentSnapshot.objects.filter(
+                    person_id__in=[k[0] for k in with_role_keys],
+                    project_id__in=[k[1] for k in with_role_keys],
+                    role_on_project_id__in=[k[2] for k in with_role_keys],
+                    week_start=sunday,
+                    source=source,
+                ).values_list('person_id', 'project_id', 'role_on_project_id', 'week_start', 'source')
+            )
+            WeeklyAssignmentSnapshot.objects.bulk_create(
+                with_role,
+                update_conflicts=True,
+                update_fields=update_fields,
+                unique_fields=['person', 'project', 'role_on_project_id', 'week_start', 'source'],
+            )
+            updated_with_role = len(with_role_keys & existing_with_role)
+            updated += updated_with_role
+            inserted += max(0, len(with_role) - updated_with_role)
+
+        if without_role:
+            existing_null_rows = list(
+                WeeklyAssignmentSnapshot.objects.filter(
+                    person_id__in=[row.person_id for row in without_role],
+                    project_id__in=[row.project_id for row in without_role],
+                    week_start=sunday,
+                    source=source,
+                    role_on_project_id__isnull=True,
+                ).order_by('id')
+            )
+
+            existing_by_key: Dict[Tuple[int, int, date, str], WeeklyAssignmentSnapshot] = {}
+            duplicate_ids: List[int] = []
+            for row in existing_null_rows:
+                key = (int(row.person_id), int(row.project_id), row.week_start, row.source)
+                if key in existing_by_key:
+                    duplicate_ids.append(int(row.id))
+                else:
+                    existing_by_key[key] = row
+            if duplicate_ids:
+                WeeklyAssignmentSnapshot.objects.filter(id__in=duplicate_ids).delete()
+
+            to_create: List[WeeklyAssignmentSnapshot] = []
+            to_update: List[WeeklyAssignmentSnapshot] = []
+            for candidate in without_role:
+                key = (int(candidate.person_id), int(candidate.project_id), candidate.week_start, candidate.source)
+                existing = existing_by_key.get(key)
+                if existing is None:
+                    to_create.append(candidate)
+                    continue
+                existing.hours = candidate.hours
+                existing.project_status = candidate.project_status
+                existing.deliverable_phase = candidate.deliverable_phase
+                existing.department_id = candidate.department_id
+                existing.person_name = candidate.person_name
+                existing.project_name = candidate.project_name
+                existing.client = candidate.client
+                existing.person_is_active = candidate.person_is_active
+                existing.person_role_id = candidate.person_role_id
+                existing.person_role_name = candidate.person_role_name
+                existing.updated_at = candidate.updated_at
+                to_update.append(existing)
+
+            if to_create:
+                WeeklyAssignmentSnapshot.objects.bulk_create(to_create)
+                inserted += len(to_create)
+            if to_update:
+                WeeklyAssignmentSnapshot.objects.bulk_update(to_update, update_fields)
+                updated += len(to_update)
+    return inserted, updated
+
+
 def _emit_membership_events(week_start: date, deliverables_by_pid: Dict[int, List[dict]]) -> int:
     """Emit joined/left events comparing current vs prior week memberships.
 
     Membership is defined by active assignment overlap with the week window and
-    positive weekly hours.
+    positive weekly hours. Memberships are computed in one streamed pass over a
+    narrow projection keeping only assignment ids; the changed assignments are
+    then loaded and their events inserted a chunk at a time.
     """
     prior_week = week_start - timedelta(days=7)
-    # Build membership sets
-    current_qs = (
-        Assignment.objects.filter(is_active=True)
-        .select_related('person', 'project')
+    # Build membership sets: key -> assignment id
+    rows_qs = Assignment.objects.filter(is_active=True).values_list(
+        'id', 'person_id', 'project_id', 'role_on_project_ref_id',
+        'start_date', 'end_date', 'weekly_hours', 'is_active',
     )
-    prior_qs = current_qs  # same filter; membership window check differs per row
-
-    current_members: Dict[Tuple[int, int, Optional[int]], Assignment] = {}
-    prior_members: Dict[Tuple[int, int, Optional[int]], Assignment] = {}
-
-    for a in current_qs:
-        if a.project_id and a.person_id and _is_member_for_week(a, week_start):
-            current_members[(a.person_id, a.project_id, getattr(a, 'role_on_project_ref_id', None))] = a
-    for a in prior_qs:
-        if a.project_id and a.person_id and _is_member_for_week(a, prior_week):
-            prior_members[(a.person_id, a.project_id, getattr(a, 'role_on_project_ref_id', None))] = a
+    current_members: Dict[Tuple[int, int, Optional[int]], int] = {}
+    prior_members: Dict[Tuple[int, int, Optional[int]], int] = {}
+    for aid, person_id, project_id, role_id, sd, ed, weekly, is_active in iter_keyset(
+        rows_qs, key='id', chunk_size=SNAPSHOT_CHUNK_SIZE
+    ):
+        if not project_id or not person_id:
+            continue
+        key = (person_id, project_id, role_id)
+        if _is_member(is_active, sd, ed, weekly, week_start):
+            current_members[key] = aid
+        if _is_member(is_active, sd, ed, weekly, prior_week):
+            prior_members[key] = aid
 
     joined_keys = set(current_members.keys()) - set(prior_members.keys())
     left_keys = set(prior_members.keys()) - set(current_members.keys())
@@ -309,66 +358,54 @@ def _emit_membership_events(week_start: date, deliverables_by_pid: Dict[int, Lis
     if not joined_keys and not left_keys:
         return 0
 
-    # Prepare rows
-    rows: List[AssignmentMembershipEvent] = []
+    changes = [('joined', key, current_members[key]) for key in sorted(joined_keys)]
+    changes += [('left', key, prior_members[key]) for key in sorted(left_keys)]
+    del current_members, prior_members
+
+    inserted = 0
     now = timezone.now()
-    for key in sorted(joined_keys):
-        a = current_members[key]
-        person_id, project_id, role_id = key
-        person = a.person
-        project = a.project
-        # Hours context
-        h_before = float(get_week_value(a.weekly_hours or {}, prior_week))
-        h_after = float(get_week_value(a.weekly_hours or {}, week_start))
-        phase = classify_week_for_project(
-            week_start.isoformat(),
-            getattr(project, 'status', None) or None,
-            deliverables_by_pid.get(project_id, []),
-        )
-        rows.append(AssignmentMembershipEvent(
-            week_start=week_start,
-            person_id=person_id,
-            project_id=project_id,
-            role_on_project_id=role_id,
-            event_type='joined',
-            deliverable_phase=phase,
-            hours_before=_round2(h_before),
-            hours_after=_round2(h_after),
-            person_name=getattr(person, 'name', '') or '',
-            project_name=getattr(project, 'name', '') or '',
-            client=getattr(project, 'client', '') or '',
-            updated_at=now,
-        ))
-
-    for key in sorted(left_keys):
-        a = prior_members[key]
-        person_id, project_id, role_id = key
-        person = a.person
-        project = a.project
-        h_before = float(get_week_value(a.weekly_hours or {}, prior_week))
-        phase = classify_week_for_project(
-            week_start.isoformat(),
-            getattr(project, 'status', None) or None,
-            deliverables_by_pid.get(project_id, []),
+    for batch in chunked(changes, SNAPSHOT_CHUNK_SIZE):
+        assignments = (
+            Assignment.objects
+            .select_related('person', 'project')
+            .in_bulk([aid for _event, _key, aid in batch])
         )
-        rows.append(AssignmentMembershipEvent(
-            week_start=week_start,
-            person_id=person_id,
-            project_id=project_id,
-            role_on_project_id=role_id,
-            event_type='left',
-            deliverable_phase=phase,
-            hours_before=_round2(h_before),
-            hours_after=0.0,
-            person_name=getattr(person, 'name', '') or '',
-            project_name=getattr(project, 'name', '') or '',
-            client=getattr(project, 'client', '') or '',
-            updated_at=now,
-        ))
-
-    if not rows:
-        return 0
+        rows: List[AssignmentMembershipEvent] = []
+        for event_type, key, aid in batch:
+            a = assignments.get(aid)
+            if a is None:
+                continue
+            person_id, project_id, role_id = key
+            person = a.person
+            project = a.project
+            # Hours context
+            h_before = float(get_week_value(a.weekly_hours or {}, prior_week))
+            h_after = float(get_week_value(a.weekly_hours or {}, week_start)) if event_type == 'joined' else 0.0
+            phase = classify_week_for_project(
+                week_start.isoformat(),
+                getattr(project, 'status', None) or None,
+                deliverables_by_pid.get(project_id, []),
+            )
+            rows.append(AssignmentMembershipEvent(
+                week_start=week_start,
+                person_id=person_id,
+                project_id=project_id,
+                role_on_project_id=role_id,
+                event_type=event_type,
+                deliverable_phase=phase,
+                hours_before=_round2(h_before),
+                hours_after=_round2(h_after),
+                person_name=getattr(person, 'name', '') or '',
+                project_name=getattr(project, 'name', '') or '',
+                client=getattr(project, 'client', '') or '',
+                updated_at=now,
+            ))
+        if rows:
+            inserted += _insert_membership_events(rows, week_start)
+    return inserted
+
 
+def _insert_membership_events(rows: List[AssignmentMembershipEvent], week_start: date) -> int:
     with_role = [row for row in rows if row.role_on_project_id is not None]
     without_role = [row for row in rows if row.role_on_project_id is None]
     inserted = 0
@@ -424,55 +461,24 @@ def backfill_weekly_assignment_snapshots(week_start: date | str, *, emit_events:
             'skipped_due_to_lock': True,
         }
     try:
-        qs = (
-            Assignment.objects
-            .filter(is_active=True)
-            .select_related('person', 'person__department', 'person__role', 'project')
-        )
         examined = 0
-        rows: List[WeeklyAssignmentSnapshot] = []
-        now = timezone.now()
-        project_ids = list({a.project_id for a in qs if getattr(a, 'project_id', None) is not None})
-        deliverables_by_pid = _load_deliverables_by_project(project_ids)
-
-        for a in qs:
-            examined += 1
-            pid = a.project_id
-            person_id = a.person_id
-            if not pid or not person_id:
-                continue
-            hours_val = float(get_week_value(a.weekly_hours or {}, sunday))
-            if hours_val <= 0:
-                continue
-            proj = a.project
-            person = a.person
-            dept_id = getattr(person, 'department_id', None)
-            role_id = getattr(a, 'role_on_project_ref_id', None)
-            project_status = getattr(proj, 'status', None) or None
-            phase = classify_week_for_project(week_key, project_status, deliverables_by_pid.get(pid, []))
-            rows.append(WeeklyAssignmentSnapshot(
-                week_start=sunday,
-                person_id=person_id,
-                project_id=pid,
-                role_on_project_id=role_id,
-                department_id=dept_id,
-                project_status=project_status,
-                deliverable_phase=phase,
-                hours=_round2(hours_val),
-                source=SnapshotSource.ASSIGNED_BACKFILL,
-                person_name=getattr(person, 'name', '') or '',
-                project_name=getattr(proj, 'name', '') or '',
-                client=getattr(proj, 'client', '') or '',
-                person_is_active=bool(getattr(person, 'is_active', True)),
-                person_role_id=getattr(person, 'role_id', None),
-                person_role_name=getattr(getattr(person, 'role', None), 'name', '') or '',
-                updated_at=now,
-            ))
-
         inserted = 0
         updated = 0
-        if rows:
-            with transaction.atomic():
+        wrote_rows = False
+        now = timezone.now()
+        deliverables_by_pid = _load_deliverables_by_project(_active_project_ids())
+
+        with transaction.atomic():
+            for chunk in iter_keyset_chunks(_snapshot_source_queryset(), chunk_size=SNAPSHOT_CHUNK_SIZE):
+                rows: List[WeeklyAssignmentSnapshot] = []
+                for a in chunk:
+                    examined += 1
+                    row = _snapshot_row(a, sunday, SnapshotSource.ASSIGNED_BACKFILL, deliverables_by_pid, now)
+                    if row is not None:
+                        rows.append(row)
+                if not rows:
+                    continue
+                wrote_rows = True
                 if force:
                     WeeklyAssignmentSnapshot.objects.bulk_create(
                         rows,
@@ -482,7 +488,9 @@ def backfill_weekly_assignment_snapshots(week_start: date | str, *, emit_events:
                     )
                 else:
                     res = WeeklyAssignmentSnapshot.objects.bulk_create(rows, ignore_conflicts=True)
-                    inserted = len(res)
+                    inserted += len(res)
+        if wrote_rows:
+            bump_weekly_snapshot_version()
         events_inserted = 0
         if emit_events:
             events_inserted = _emit_membership_events(sunday, deliverables_by_pid)
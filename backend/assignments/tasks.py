@@ -4,10 +4,11 @@ from typing import Iterable
 from celery import shared_task
 from zoneinfo import ZoneInfo
 
-from .rollup_service import rebuild_project_rollups
+from .rollup_service import rebuild_project_rollups, refresh_rollup_cells
 from .models import Assignment
 from .snapshot_service import write_weekly_assignment_snapshots
 from core.models import NetworkGraphSettings
+from core.perf import job_memory
 from core.week_utils import sunday_of_week
 from django.utils import timezone
 
@@ -19,16 +20,39 @@ def refresh_project_rollups_task(self, project_ids: Iterable[int] | None = None)
     return {'projectIds': ids}
 
 
+@shared_task(bind=True, soft_time_limit=120)
+def refresh_rollup_cells_task(self, cells: list, count_pairs: list, debounce_key: str | None = None) -> dict:
+    """Recompute the rollup cells ([project, department, week]) and count pairs a write touched."""
+    from datetime import date
+
+    from django.core.cache import cache
+
+    if debounce_key:
+        cache.delete(debounce_key)
+    return refresh_rollup_cells(
+        {(int(pid), dept_id, date.fromisoformat(week)) for pid, dept_id, week in cells},
+        {(int(pid), dept_id) for pid, dept_id in count_pairs},
+    )
+
+
 @shared_task(bind=True, soft_time_limit=600)
 def nightly_rebuild_project_rollups_task(self) -> dict:
-    project_ids = list(
+    """Repair pass: writes edits normally reach the rollups as deltas; this rewrites only drifted rows."""
+    from .models import ProjectAssignmentCountsRollup, ProjectWeeklyHoursRollup
+
+    project_ids = set(
         Assignment.objects.filter(is_active=True, project_id__isnull=False)
         .values_list('project_id', flat=True)
         .distinct()
     )
+    # Projects that lost all active assignments still need their rows cleared.
+    project_ids.update(ProjectWeeklyHoursRollup.objects.values_list('project_id', flat=True).distinct())
+    project_ids.update(ProjectAssignmentCountsRollup.objects.values_list('project_id', flat=True).distinct())
+    project_ids = sorted(project_ids)
     if not project_ids:
         return {'projectCount': 0}
-    rebuild_project_rollups(project_ids)
+    with job_memory('nightly_rebuild_project_rollups', {'projectCount': len(project_ids)}):
+        rebuild_project_rollups(project_ids)
     return {'projectCount': len(project_ids)}
 
 
@@ -56,10 +80,67 @@ def network_graph_weekly_snapshot_scheduler_task(self) -> dict:
     if settings_obj.last_snapshot_week_start == target_week:
         return {'status': 'skipped', 'reason': 'already_ran', 'weekStart': target_week.isoformat()}
 
-    result = write_weekly_assignment_snapshots(target_week)
+    with job_memory('weekly_assignment_snapshots', {'weekStart': target_week.isoformat()}):
+        result = write_weekly_assignment_snapshots(target_week)
     if not result.get('lock_acquired', True):
         return {'status': 'skipped', 'reason': 'lock_not_acquired', 'weekStart': target_week.isoformat()}
 
     settings_obj.last_snapshot_week_start = target_week
     settings_obj.save(update_fields=['last_snapshot_week_start', 'updated_at'])
     return {'status': 'ok', 'weekStart': target_week.isoformat(), 'snapshot': result}
+
+
+@shared_task(bind=True, soft_time_limit=300)
+def sync_overhead_assignments_task(
+    self,
+    person_ids: Iterable[int] | None = None,
+    role_ids: Iterable[int] | None = None,
+    project_ids: Iterable[int] | None = None,
+    weeks: int | None = None,
+) -> dict:
+    """Create/extend overhead assignments; no ids means a full (week-rollover) sync."""
+    from .overhead import DEFAULT_SYNC_WEEKS, run_overhead_sync
+
+    with job_memory('sync_overhead_assignments') as meter:
+        result = run_overhead_sync(
+            person_ids=list(person_ids or []),
+            role_ids=list(role_ids or []),
+            project_ids=list(project_ids or []),
+            weeks=int(weeks or DEFAULT_SYNC_WEEKS),
+        )
+        meter.tag('peopleCount', result.people_count)
+    return {
+        'created': result.created,
+        'updated': result.updated,
+        'skipped': result.skipped,
+        'peopleCount': result.people_count,
+        'projectCount': result.project_count,
+    }
+
+
+@shared_task(bind=True, soft_time_limit=600)
+def maintain_week_partitions_task(self) -> dict:
+    """Pre-create upcoming quarter partitions and apply retention on partitioned week tables."""
+    from django.conf import settings
+
+    from . import partitioning
+
+    if not partitioning.is_supported():
+        return {'status': 'skipped', 'reason': 'unsupported_database'}
+    result = {}
+    for model in partitioning.PARTITIONED_MODELS:
+        table = model._meta.db_table
+        if not partitioning.is_partitioned(table):
+            continue
+        created = partitioning.ensure_partitions(
+            model, ahead_quarters=settings.WEEK_PARTITION_AHEAD_QUARTERS,
+        ).created
+        detached = []
+        if settings.WEEK_PARTITION_RETAIN_QUARTERS is not None and model in partitioning.RETENTION_MODELS:
+            detached = partitioning.detach_old_partitions(
+                model,
+                retain_quarters=settings.WEEK_PARTITION_RETAIN_QUARTERS,
+                archive_schema=settings.WEEK_PARTITION_ARCHIVE_SCHEMA,
+            ).detached
+        result[table] = {'created': created, 'detached': detached}
+    return {'status': 'ok', 'tables': result}
@@ -0,0 +1,117 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from assignments.models import Assignment
+from assignments.projection import parse_assignment_projection
+from people.models import Person
+from projects.models import Project
+
+
+WEEKS = ['2026-01-04', '2026-01-11', '2026-01-18', '2026-01-25']
+
+
+class AssignmentProjectionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        user = get_user_model().objects.create_user(username='projection-user', password='pass')
+        self.client.force_authenticate(user)
+        self.project = Project.objects.create(name='Projection Project', status='active')
+        self.people = []
+        for idx in range(3):
+            person = Person.objects.create(name=f'Projection Person {idx}', weekly_capacity=36)
+            self.people.append(person)
+            Assignment.objects.create(
+                person=person,
+                project=self.project,
+                weekly_hours={wk: float(n + 1) for n, wk in enumerate(WEEKS)},
+                is_active=True,
+            )
+
+    def test_parse_projection_defaults(self):
+        self.assertIsNone(parse_assignment_projection({}))
+        projection = parse_assignment_projection({'weeks_from': '2026-01-06', 'window': '2'})
+        self.assertEqual(projection.week_keys, ('2026-01-04', '2026-01-11'))
+        projection = parse_assignment_projection({'weeks_from': '2026-01-04', 'weeks_to': '2026-01-25'})
+        self.assertEqual(len(projection.week_keys), 4)
+        projection = parse_assignment_projection({'fields': 'person,weeklyHours'})
+        self.assertEqual(projection.fields, frozenset({'id', 'person', 'weeklyHours'}))
+
+    def test_list_window_limits_weekly_hours_and_excludes_fields(self):
+        response = self.client.get('/api/assignments/', {
+            'project': self.project.id,
+            'weeks_from': '2026-01-11',
+            'window': 2,
+            'exclude': 'personSkills,availableWeeks',
+        })
+        self.assertEqual(response.status_code, 200, response.content)
+        rows = response.json()['results']
+        self.assertEqual(len(rows), 3)
+        for row in rows:
+            self.assertEqual(row['weeklyHours'], {'2026-01-11': 2.0, '2026-01-18': 3.0})
+            self.assertNotIn('personSkills', row)
+            self.assertNotIn('availableWeeks', row)
+            self.assertIn('personName', row)
+
+    def test_window_folds_off_sunday_keys_into_their_week(self):
+        assignment = Assignment.objects.filter(person=self.people[0]).get()
+        assignment.weekly_hours = {**assignment.weekly_hours, '2026-01-13': 5, '2026-01-20': 'x', '2026-02-02': 9}
+        assignment.save()
+        expected = {'2026-01-11': 7.0, '2026-01-18': 3.0, '2026-01-25': 4.0}
+        # 3 weeks use per-day columns; the wide window slices the full JSON.
+        for window in (3, 60):
+            response = self.client.get('/api/assignments/', {
+                'person': self.people[0].id,
+                'weeks_from': '2026-01-11',
+                'weeks_to': '2026-01-25' if window == 3 else '',
+                'window': window,
+            })
+            self.assertEqual(response.status_code, 200, response.content)
+            rows = response.json()['results']
+            self.assertEqual(len(rows), 1)
+            self.assertEqual(rows[0]['weeklyHours'], expected if window == 3 else {**expected, '2026-02-01': 9.0})
+
+    def test_fields_limits_output_keys(self):
+        response = self.client.get('/api/assignments/', {
+            'project': self.project.id,
+            'fields': 'person,weeklyHours',
+        })
+        self.assertEqual(response.status_code, 200, response.content)
+        row = response.json()['results'][0]
+        self.assertEqual(set(row.keys()), {'id', 'person', 'weeklyHours'})
+        self.assertEqual(len(row['weeklyHours']), len(WEEKS))
+
+    def test_projected_list_query_count_does_not_grow_per_row(self):
+        params = {'project': self.project.id, 'weeks_from': '2026-01-04', 'window': 4}
+        self.client.get('/api/assignments/', params)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get('/api/assignments/', params)
+        for idx in range(3, 8):
+            person = Person.objects.create(name=f'Projection Person {idx}', weekly_capacity=36)
+            Assignment.objects.create(person=person, project=self.project, weekly_hours={WEEKS[0]: 1}, is_active=True)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get('/api/assignments/', params)
+        self.assertEqual(len(response.json()['results']), 8)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_search_honours_projection_in_body(self):
+        response = self.client.post(
+            '/api/assignments/search/',
+            {
+                'project': self.project.id,
+                'page': 1,
+                'page_size': 25,
+                'weeks_from': '2026-01-25',
+                'window': 1,
+                'exclude': 'personSkills',
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        rows = response.json()['results']
+        self.assertEqual(len(rows), 3)
+        for row in rows:
+            self.assertEqual(row['weeklyHours'], {'2026-01-25': 4.0})
+            self.assertNotIn('personSkills', row)
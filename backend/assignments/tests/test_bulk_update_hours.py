@@ -2,7 +2,9 @@ from datetime import date, timedelta
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from accounts.models import UserProfile
@@ -209,3 +211,58 @@ class BulkUpdateHoursTests(TestCase):
         kwargs = dispatch_mock.call_args.kwargs
         self.assertEqual(kwargs.get('user_ids'), [self.affected_user.id])
         self.assertEqual(kwargs.get('event_key'), 'assignment.bulk_updated')
+
+    def test_bulk_update_hours_upserts_week_rows_and_drops_stale_weeks(self):
+        next_week = (date.fromisoformat(self.sunday) + timedelta(days=7)).isoformat()
+        payload = {
+            'updates': [
+                {'assignmentId': self.assignment_a.id, 'weeklyHours': {next_week: 6}},
+                {'assignmentId': self.assignment_b.id, 'weeklyHours': {self.sunday: 5, next_week: 3}},
+            ]
+        }
+        response = self.client.patch('/api/assignments/bulk_update_hours/', payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        rows = {
+            (row.assignment_id, row.week_start.isoformat()): row.hours
+            for row in AssignmentWeekHour.objects.filter(
+                assignment_id__in=[self.assignment_a.id, self.assignment_b.id]
+            )
+        }
+        self.assertEqual(rows, {
+            (self.assignment_a.id, next_week): 6.0,
+            (self.assignment_b.id, self.sunday): 5.0,
+            (self.assignment_b.id, next_week): 3.0,
+        })
+
+    def test_bulk_update_hours_query_count_does_not_grow_with_batch_size(self):
+        extra = [
+            Assignment.objects.create(person=self.person, project=self.project, weekly_hours={}, is_active=True)
+            for _ in range(10)
+        ]
+
+        def _run(assignments, hours):
+            payload = {'updates': [
+                {'assignmentId': a.id, 'weeklyHours': {self.sunday: hours}} for a in assignments
+            ]}
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.patch('/api/assignments/bulk_update_hours/', payload, format='json')
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+
+        _run(extra[:1], 1)  # warm per-request caches
+        small = _run(extra[:2], 2)
+        large = _run(extra, 3)
+        self.assertEqual(small, large)
+
+    @patch('assignments.signals.bump_snapshot_scopes')
+    def test_bulk_update_hours_coalesces_invalidation(self, bump_mock):
+        payload = {
+            'updates': [
+                {'assignmentId': self.assignment_a.id, 'weeklyHours': {self.sunday: 9}},
+                {'assignmentId': self.assignment_b.id, 'weeklyHours': {self.sunday: 10}},
+            ]
+        }
+        response = self.client.patch('/api/assignments/bulk_update_hours/', payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        bump_mock.assert_called_once()
+        self.assertEqual(bump_mock.call_args.kwargs.get('project_ids'), [self.project.id])
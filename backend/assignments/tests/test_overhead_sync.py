@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from assignments.models import Assignment, AssignmentWeekHour
+from assignments.overhead import (
+    _week_keys,
+    maybe_sync_overhead_assignments,
+    sync_overhead_assignments,
+)
+from departments.models import Department
+from people.models import Person
+from projects.models import Project
+from roles.models import Role
+
+
+class OverheadSyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.dept = Department.objects.create(name='Ops')
+        self.role = Role.objects.create(name='Lead', overhead_hours_per_week=4)
+        self.overhead = Project.objects.create(name='Overhead - Admin')
+        self.people = [
+            Person.objects.create(name=f'Person {i}', role=self.role, department=self.dept)
+            for i in range(3)
+        ]
+
+    def test_sync_creates_rows_fills_missing_weeks_and_week_hours(self):
+        existing = Assignment.objects.create(
+            person=self.people[0], project=self.overhead, weekly_hours={}, is_active=False,
+        )
+        weeks = _week_keys(2)
+        existing.weekly_hours = {weeks[0]: 1}
+        existing.save(update_fields=['weekly_hours'])
+
+        result = sync_overhead_assignments(weeks=2)
+
+        self.assertEqual((result.created, result.updated), (2, 1))
+        existing.refresh_from_db()
+        self.assertTrue(existing.is_active)
+        self.assertEqual(existing.weekly_hours, {weeks[0]: 1, weeks[1]: 4.0})
+        self.assertEqual(existing.department_id, self.dept.id)
+        self.assertEqual(
+            AssignmentWeekHour.objects.filter(project=self.overhead).count(),
+            6,
+        )
+        again = sync_overhead_assignments(weeks=2)
+        self.assertEqual((again.created, again.updated, again.skipped), (0, 0, 3))
+
+    def test_sync_query_count_does_not_grow_with_people(self):
+        with CaptureQueriesContext(connection) as small:
+            sync_overhead_assignments(people_qs=Person.objects.filter(id=self.people[0].id).select_related('role'), weeks=2)
+        for i in range(5):
+            Person.objects.create(name=f'Extra {i}', role=self.role, department=self.dept)
+        with CaptureQueriesContext(connection) as large:
+            sync_overhead_assignments(weeks=2)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    @patch('assignments.tasks.sync_overhead_assignments_task.delay')
+    def test_request_path_hook_only_enqueues(self, delay_mock):
+        before = Assignment.objects.count()
+        self.assertTrue(maybe_sync_overhead_assignments(weeks=2))
+        self.assertFalse(maybe_sync_overhead_assignments(weeks=2))
+        delay_mock.assert_called_once()
+        self.assertEqual(Assignment.objects.count(), before)
+
+    @patch('assignments.overhead.queue_overhead_sync')
+    def test_role_save_queues_sync_only_when_overhead_changes(self, queue_mock):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.role.name = 'Lead Renamed'
+            self.role.save()
+        queue_mock.assert_not_called()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.role.overhead_hours_per_week = 6
+            self.role.save()
+        queue_mock.assert_called_once_with(role_ids=[self.role.id])
@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from assignments.analytics import compute_role_capacity
+from assignments.models import Assignment
+from assignments.read_queries import build_grid_snapshot_payload, week_hours_by, week_hours_by_person
+from assignments.week_hours_service import bulk_sync_assignment_week_hours
+from core.week_utils import sunday_of_week
+from people.models import Person
+from projects.models import Project
+from roles.models import Role
+
+
+class AssignmentHoursReadLayerTests(TestCase):
+    def setUp(self):
+        self.week = sunday_of_week(date.today())
+        self.next_week = self.week + timedelta(weeks=1)
+        self.project = Project.objects.create(name='Read Layer Project', status='active')
+        self.alice = Person.objects.create(name='Alice Reader', weekly_capacity=40)
+        self.bob = Person.objects.create(name='Bob Reader', weekly_capacity=40, hire_date=self.next_week)
+        assignments = [
+            # Off-Sunday keys fold into the week that contains them.
+            Assignment.objects.create(
+                person=self.alice,
+                project=self.project,
+                weekly_hours={(self.week + timedelta(days=1)).isoformat(): 6, self.next_week.isoformat(): 4},
+            ),
+            Assignment.objects.create(
+                person=self.alice,
+                project=self.project,
+                weekly_hours={self.week.isoformat(): 2, (self.next_week + timedelta(days=3)).isoformat(): 'x'},
+            ),
+            Assignment.objects.create(
+                person=self.bob,
+                project=self.project,
+                weekly_hours={self.week.isoformat(): 8, self.next_week.isoformat(): 5},
+            ),
+            Assignment.objects.create(project=self.project, weekly_hours={self.week.isoformat(): 3}),
+        ]
+        bulk_sync_assignment_week_hours(assignments)
+        self.weeks = [self.week, self.next_week]
+
+    def _read_both(self, fn):
+        json_result = fn()
+        with override_settings(ASSIGNMENT_HOURS_STORAGE_MODE='normalized'):
+            normalized_result = fn()
+        self.assertEqual(json_result, normalized_result)
+        return json_result
+
+    def test_json_and_normalized_totals_agree(self):
+        qs = Assignment.objects.filter(is_active=True)
+        by_person = self._read_both(lambda: week_hours_by_person(qs, self.weeks))
+        self.assertEqual(by_person[self.alice.id], {self.week: 8.0, self.next_week: 4.0})
+        self.assertEqual(by_person[self.bob.id], {self.week: 8.0, self.next_week: 5.0})
+
+        gated = self._read_both(lambda: week_hours_by_person(qs, self.weeks, hire_gated=True))
+        self.assertEqual(gated[self.bob.id], {self.next_week: 5.0})
+
+        by_project = self._read_both(lambda: week_hours_by(qs, [self.week + timedelta(days=4)], 'project__name'))
+        self.assertEqual(by_project, {('Read Layer Project',): {self.week: 19.0}})
+
+    def test_role_capacity_matches_across_modes(self):
+        role = Role.objects.create(name='Read Layer Role', is_active=True)
+        Person.objects.filter(id__in=[self.alice.id, self.bob.id]).update(role=role)
+
+        def assigned():
+            cache.clear()
+            _, _, series, _ = compute_role_capacity(None, self.weeks, [role.id])
+            return series[0]['assigned']
+
+        # Alice's Monday key counts toward the current week in both modes.
+        self.assertEqual(self._read_both(assigned), [8.0, 9.0])
+
+    def test_grid_snapshot_payload_matches_across_modes(self):
+        payload = self._read_both(
+            lambda: build_grid_snapshot_payload(people_qs=Person.objects.filter(is_active=True), weeks=2)
+        )
+        self.assertEqual(payload['hoursByPerson'][self.alice.id], {self.week.isoformat(): 8.0, self.next_week.isoformat(): 4.0})
+        self.assertEqual(payload['weekKeys'], [w.isoformat() for w in self.weeks])
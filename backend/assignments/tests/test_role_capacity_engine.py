@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+
+from django.test import TestCase, override_settings
+
+from assignments.analytics import _role_capacity
+from assignments.models import Assignment
+from assignments.week_hours_service import sync_assignment_week_hours
+from core.models import AutoHoursTemplate, AutoHoursTemplateRoleSetting
+from departments.models import Department
+from people.models import Person
+from projects.models import Project, ProjectRole
+from roles.models import Role
+
+
+class RoleCapacityEngineTests(TestCase):
+    def setUp(self):
+        today = date.today()
+        self.week0 = today - timedelta(days=(today.weekday() + 1) % 7)
+        self.week_dates = [self.week0 + timedelta(days=7 * idx) for idx in range(6)]
+        wk = [d.isoformat() for d in self.week_dates]
+
+        self.department = Department.objects.create(name='Set Based Dept')
+        self.role_a = Role.objects.create(name='Set Based Role A', is_active=True, sort_order=1)
+        self.role_b = Role.objects.create(name='Set Based Role B', is_active=True, sort_order=2)
+        template = AutoHoursTemplate.objects.create(name='Set Based Template', phase_keys=['sd'], weeks_by_phase={'sd': 6})
+        project = Project.objects.create(name='Set Based Project', auto_hours_template=template, is_active=True)
+        project_role = ProjectRole.objects.create(
+            name='Set Based PM',
+            normalized_name='set based pm',
+            department=self.department,
+            is_active=True,
+        )
+        mapping = AutoHoursTemplateRoleSetting.objects.create(
+            template=template,
+            role=project_role,
+            ramp_percent_by_phase={'sd': {'0': 50}},
+            role_count_by_phase={'sd': 1},
+        )
+        mapping.people_roles.set([self.role_a, self.role_b])
+
+        veteran = Person.objects.create(name='Veteran', department=self.department, role=self.role_a, weekly_capacity=40)
+        # Hired mid-way through the window: excluded from earlier weeks.
+        new_hire = Person.objects.create(
+            name='New Hire',
+            department=self.department,
+            role=self.role_b,
+            weekly_capacity=32,
+            hire_date=self.week_dates[2] + timedelta(days=3),
+        )
+        light = Person.objects.create(name='Light', department=self.department, role=self.role_b, weekly_capacity=20)
+
+        self.assignments = [
+            Assignment.objects.create(person=veteran, project=project, department=self.department, weekly_hours={wk[0]: 10, wk[1]: 12, wk[4]: 6}),
+            Assignment.objects.create(person=new_hire, project=project, department=self.department, weekly_hours={wk[1]: 9, wk[2]: 8, wk[3]: 16}),
+            Assignment.objects.create(person=light, project=project, department=self.department, weekly_hours={wk[0]: 2, wk[1]: 2}),
+            Assignment.objects.create(
+                person=None,
+                project=project,
+                department=self.department,
+                role_on_project_ref=project_role,
+                weekly_hours={wk[0]: 12, wk[5]: 4},
+            ),
+        ]
+
+    def _series(self, **kwargs):
+        wk_strs, _, series, summary = _role_capacity(self.department.id, self.week_dates, None, **kwargs)
+        self.assertEqual(wk_strs, [d.isoformat() for d in self.week_dates])
+        return {row['roleId']: row for row in series}, summary
+
+    def _assert_series(self, *, filtered=False, irregular=False):
+        series, summary = self._series(filter_out_lt5h=filtered)
+        role_a, role_b = series[self.role_a.id], series[self.role_b.id]
+        # The new hire's week-1 hours predate the hire week and are dropped.
+        self.assertEqual(role_a['assigned'], [10.0, 12.0, 7.0 if irregular else 0.0, 0.0, 6.0, 0.0])
+        self.assertEqual(role_b['assigned'], [0.0 if filtered else 2.0, 0.0 if filtered else 2.0, 8.0, 16.0, 0.0, 0.0])
+        # Placeholder hours split evenly across the template's people roles.
+        projected = [6.0, 2.5 if irregular else 0.0, 0.0, 0.0, 0.0, 2.0]
+        self.assertEqual(role_a['projected'], projected)
+        self.assertEqual(role_b['projected'], projected)
+        self.assertEqual(role_b['demand'], [a + p for a, p in zip(role_b['assigned'], projected)])
+        self.assertEqual(role_a['capacity'], [40.0] * 6)
+        self.assertEqual(role_a['people'], [1] * 6)
+        # "Light" stays under the low-hours threshold and drops out when filtered.
+        early_b = (0.0, 0) if filtered else (20.0, 1)
+        late_b = (32.0, 1) if filtered else (52.0, 2)
+        self.assertEqual(role_b['capacity'], [early_b[0]] * 2 + [late_b[0]] * 4)
+        self.assertEqual(role_b['people'], [early_b[1]] * 2 + [late_b[1]] * 4)
+        self.assertEqual(summary, {
+            'mappedProjectedHours': 21.0 if irregular else 16.0,
+            'unmappedProjectRoleHours': 0.0,
+            'mappedTemplateRolePairsUsed': 1,
+        })
+
+    def test_json_source(self):
+        self._assert_series()
+        self._assert_series(filtered=True)
+
+    @override_settings(ASSIGNMENT_HOURS_STORAGE_MODE='normalized')
+    def test_normalized_source(self):
+        for assignment in self.assignments:
+            sync_assignment_week_hours(assignment)
+        self._assert_series()
+        self._assert_series(filtered=True)
+
+    def _add_irregular_keys(self):
+        # Monday of week 2 folds into that week; the non-numeric value is skipped.
+        veteran, _, light, placeholder = self.assignments
+        veteran.weekly_hours = {**veteran.weekly_hours, (self.week_dates[2] + timedelta(days=1)).isoformat(): 7}
+        veteran.save()
+        light.weekly_hours = {**light.weekly_hours, self.week_dates[3].isoformat(): 'x'}
+        light.save()
+        placeholder.weekly_hours = {**placeholder.weekly_hours, (self.week_dates[1] + timedelta(days=2)).isoformat(): 5}
+        placeholder.save()
+
+    def test_json_source_folds_off_sunday_keys_and_skips_bad_values(self):
+        self._add_irregular_keys()
+        self._assert_series(irregular=True)
+        self._assert_series(filtered=True, irregular=True)
+
+    @override_settings(ASSIGNMENT_HOURS_STORAGE_MODE='normalized')
+    def test_normalized_source_folds_off_sunday_keys_and_skips_bad_values(self):
+        self._add_irregular_keys()
+        for assignment in self.assignments:
+            sync_assignment_week_hours(assignment)
+        self._assert_series(irregular=True)
+        self._assert_series(filtered=True, irregular=True)
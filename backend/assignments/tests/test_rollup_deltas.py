@@ -0,0 +1,145 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from assignments import rollup_service
+from assignments.models import Assignment, ProjectAssignmentCountsRollup, ProjectWeeklyHoursRollup
+from assignments.signals import invalidate_for_bulk_hours_update
+from assignments.tasks import refresh_rollup_cells_task
+from core.week_utils import sunday_of_week
+from departments.models import Department
+from people.models import Person
+from projects.models import Project
+
+
+def _rollup_rows():
+    hours = sorted(
+        ProjectWeeklyHoursRollup.objects.values_list(
+            'project_id', 'department_id', 'week_start', 'person_hours', 'placeholder_hours',
+        ),
+        key=str,
+    )
+    counts = sorted(
+        ProjectAssignmentCountsRollup.objects.values_list(
+            'project_id', 'department_id', 'people_count', 'placeholder_count',
+        ),
+        key=str,
+    )
+    return hours, counts
+
+
+class ProjectRollupDeltaTests(TestCase):
+    def setUp(self):
+        self.week = sunday_of_week(date.today())
+        self.wk0 = self.week.isoformat()
+        self.wk1 = (self.week + timedelta(weeks=1)).isoformat()
+        self.dept_a = Department.objects.create(name='Rollup Dept A')
+        self.dept_b = Department.objects.create(name='Rollup Dept B')
+        self.project = Project.objects.create(name='Rollup Project', status='active')
+        self.other_project = Project.objects.create(name='Rollup Other', status='active')
+        self.alice = Person.objects.create(name='Rollup Alice', department=self.dept_a)
+        self.bob = Person.objects.create(name='Rollup Bob', department=self.dept_b)
+        # Other on-commit hooks enqueue Celery work; keep them off the broker.
+        patcher = mock.patch('celery.app.task.Task.apply_async')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        queue_patcher = mock.patch('assignments.signals.queue_project_rollup_refresh')
+        self.queue_refresh = queue_patcher.start()
+        self.addCleanup(queue_patcher.stop)
+        # Run the queued cell refresh as the worker would.
+        cells_patcher = mock.patch.object(
+            refresh_rollup_cells_task, 'delay', side_effect=lambda *args: refresh_rollup_cells_task.run(*args),
+        )
+        self.cells_delay = cells_patcher.start()
+        self.addCleanup(cells_patcher.stop)
+
+    def assertMatchesRebuild(self):
+        self.queue_refresh.assert_not_called()
+        incremental = _rollup_rows()
+        rollup_service.rebuild_project_rollups([self.project.id, self.other_project.id])
+        self.assertEqual(incremental, _rollup_rows())
+
+    def test_single_writes_apply_deltas_matching_a_rebuild(self):
+        with mock.patch.object(rollup_service, 'rebuild_project_rollups', wraps=rollup_service.rebuild_project_rollups) as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                a1 = Assignment.objects.create(person=self.alice, project=self.project, weekly_hours={self.wk0: 10, self.wk1: 4})
+                Assignment.objects.create(person=self.bob, project=self.project, weekly_hours={self.wk0: 6})
+                placeholder = Assignment.objects.create(project=self.project, department=self.dept_b, weekly_hours={self.wk1: 3})
+            with self.captureOnCommitCallbacks(execute=True):
+                a1.weekly_hours = {self.wk0: 12, self.wk1: 0}
+                a1.save()
+            rebuild.assert_not_called()
+        hours, counts = _rollup_rows()
+        self.assertIn((self.project.id, self.dept_a.id, self.week, 12.0, 0.0), hours)
+        self.assertIn((self.project.id, self.dept_b.id, self.week + timedelta(weeks=1), 0.0, 3.0), hours)
+        self.assertIn((self.project.id, self.dept_b.id, 1, 1), counts)
+        self.assertMatchesRebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            a1.project = self.other_project
+            a1.save()
+        self.assertMatchesRebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            placeholder.is_active = False
+            placeholder.save()
+        self.assertMatchesRebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            a1.delete()
+        self.assertMatchesRebuild()
+        self.assertFalse(ProjectWeeklyHoursRollup.objects.filter(project=self.other_project).exists())
+
+    def test_bulk_writes_use_previous_states_and_rebuild_skips_unchanged_rows(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            a1 = Assignment.objects.create(person=self.alice, project=self.project, weekly_hours={self.wk0: 8})
+            a2 = Assignment.objects.create(person=self.bob, project=self.project, weekly_hours={self.wk1: 5})
+        previous = {a.id: rollup_service.rollup_state_for(a) for a in (a1, a2)}
+        a1.weekly_hours = {self.wk0: 2, self.wk1: 2}
+        a2.weekly_hours = {}
+        Assignment.objects.bulk_update([a1, a2], ['weekly_hours'])
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_for_bulk_hours_update([a1, a2], previous)
+        self.assertMatchesRebuild()
+
+        before = list(ProjectWeeklyHoursRollup.objects.order_by('id').values_list('id', 'updated_at'))
+        rollup_service.rebuild_project_rollups([self.project.id])
+        self.assertEqual(before, list(ProjectWeeklyHoursRollup.objects.order_by('id').values_list('id', 'updated_at')))
+
+    def test_concurrent_saves_with_the_same_before_state_do_not_drift(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            a1 = Assignment.objects.create(person=self.alice, project=self.project, weekly_hours={self.wk0: 10})
+        before = rollup_service.rollup_state_for(a1)
+        # Two writers both read ``before``; the second one's hours win.
+        a1.weekly_hours = {self.wk0: 4, self.wk1: 6}
+        first = rollup_service.rollup_state_for(a1)
+        a1.weekly_hours = {self.wk0: 7}
+        second = rollup_service.rollup_state_for(a1)
+        Assignment.objects.filter(pk=a1.pk).update(weekly_hours=a1.weekly_hours)
+        rollup_service.apply_rollup_deltas([(before, first)])
+        rollup_service.apply_rollup_deltas([(before, second)])
+        hours, _ = _rollup_rows()
+        self.assertEqual(hours, [(self.project.id, self.dept_a.id, self.week, 7.0, 0.0)])
+        self.assertMatchesRebuild()
+
+    def test_writes_queue_touched_cells_instead_of_recomputing_inline(self):
+        self.cells_delay.side_effect = None
+        self.addCleanup(cache.clear)
+        with mock.patch.object(rollup_service, '_recompute_cells') as recompute:
+            with self.captureOnCommitCallbacks(execute=True):
+                a1 = Assignment.objects.create(person=self.alice, project=self.project, weekly_hours={self.wk0: 10})
+            with self.captureOnCommitCallbacks(execute=True):
+                a1.weekly_hours = {self.wk0: 12}
+                a1.save()
+            with self.captureOnCommitCallbacks(execute=True):
+                Assignment.objects.filter(pk=a1.pk).update(weekly_hours={self.wk0: 10})
+                a1.refresh_from_db()
+                a1.weekly_hours = {self.wk0: 12}
+                a1.save()
+        recompute.assert_not_called()
+        cells = [call.args[0] for call in self.cells_delay.call_args_list]
+        self.assertIn([[self.project.id, self.dept_a.id, self.wk0]], cells)
+        # The second identical edit is coalesced into the run still queued.
+        self.assertEqual(len(self.cells_delay.call_args_list), 2)
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
 from django.test import TestCase
 from rest_framework.test import APIClient
 from datetime import date
@@ -156,3 +157,54 @@ class AssignmentSearchPeopleRolesTests(TestCase):
         self.assertEqual(list_resp.status_code, 200, list_resp.content)
         list_people = {row.get('person') for row in list_resp.json().get('results', [])}
         self.assertEqual(list_people, {p_available.id})
+
+    def test_search_cursor_mode_pages_without_offsets(self):
+        person = Person.objects.create(name='Cursor Person', weekly_capacity=36)
+        projects = [Project.objects.create(name=f'Cursor Project {i}', client='Cursor', status='active') for i in range(5)]
+        for project in projects:
+            Assignment.objects.create(person=person, project=project, weekly_hours={}, is_active=True)
+
+        seen = []
+        body = {'cursor': None, 'page_size': 2}
+        for _ in range(5):
+            response = self.client.post('/api/assignments/search/', body, format='json')
+            self.assertEqual(response.status_code, 200, response.content)
+            payload = response.json()
+            self.assertEqual(payload['count'], 5)
+            seen.extend(row['id'] for row in payload['results'])
+            if not payload['nextCursor']:
+                break
+            self.assertIn('cursor=', payload['next'])
+            body = {'cursor': payload['nextCursor'], 'page_size': 2}
+        expected = list(
+            Assignment.objects.order_by(Lower('project__name'), 'id').values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_filtered_totals_fold_hours_over_the_workload_window(self):
+        person = Person.objects.create(name='Totals Person', weekly_capacity=36)
+        project = Project.objects.create(name='Totals Project', status='active')
+        Assignment.objects.create(
+            person=person,
+            project=project,
+            # Monday key folds into its Sunday; weeks outside the window are left out.
+            weekly_hours={'2026-03-01': 10, '2026-03-09': 4, '2026-03-15': 'x', '2026-04-05': 9},
+            is_active=True,
+        )
+        Assignment.objects.create(person=person, project=project, weekly_hours={'2026-03-08': 3}, is_active=True)
+
+        response = self.client.post(
+            '/api/assignments/search/',
+            {
+                'person': person.id,
+                'workload_week_start': '2026-03-01',
+                'workload_weeks': 3,
+                'meta_only': 1,
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            response.json()['filteredTotals'],
+            {str(person.id): {'2026-03-01': 10.0, '2026-03-08': 7.0}},
+        )
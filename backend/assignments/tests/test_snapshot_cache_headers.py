@@ -1,3 +1,4 @@
+import json
 from datetime import date, timedelta
 
 from django.contrib.auth.models import User
@@ -61,3 +62,47 @@ class SnapshotCacheHeaderTests(TestCase):
         self.assertIn('firstEligibleWeek', person)
         expected = sunday_of_week(self.person.hire_date).isoformat()
         self.assertEqual(person['firstEligibleWeek'], expected)
+
+    def test_grid_snapshot_columnar_format(self):
+        response = self.client.get('/api/assignments/grid_snapshot/?weeks=2&format=columnar')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('application/vnd.workload.columnar+json'))
+        payload = json.loads(response.content)
+        self.assertEqual(payload['format'], 'columnar')
+        self.assertEqual(payload['people']['id'], [self.person.id])
+        self.assertEqual(payload['hours'], {'encoding': 'dense', 'values': [[6.0, 0.0]]})
+
+        self.assertIn('Accept', response['Vary'])
+        json_response = self.client.get('/api/assignments/grid_snapshot/?weeks=2')
+        self.assertIn('Accept', [part.strip() for part in json_response['Vary'].split(',')])
+        self.assertNotEqual(json_response['ETag'], response['ETag'])
+        not_modified = self.client.get(
+            '/api/assignments/grid_snapshot/?weeks=2',
+            HTTP_ACCEPT='application/vnd.workload.columnar+json',
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_grid_snapshot_cache_hit_serves_encoded_bytes(self):
+        from unittest import mock
+        import gzip
+
+        from core.aggregate_cache import aggregate_cache
+
+        aggregate_cache.clear_local()
+        first = self.client.get('/api/assignments/grid_snapshot/?weeks=1&department=')
+        self.assertEqual(first.status_code, 200)
+        with mock.patch('rest_framework.renderers.JSONRenderer.render') as render:
+            second = self.client.get('/api/assignments/grid_snapshot/?weeks=1&department=', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(render.call_count, 0)
+        self.assertEqual(second.status_code, 200)
+        body = gzip.decompress(second.content) if second.headers.get('Content-Encoding') == 'gzip' else second.content
+        self.assertEqual(json.loads(body), first.json())
+        self.assertEqual(second.headers.get('ETag'), first.headers.get('ETag'))
+
+    def test_ui_assignments_page_keeps_nested_grid_snapshot(self):
+        response = self.client.get('/api/ui/assignments-page/?weeks=1&include=assignment')
+        self.assertEqual(response.status_code, 200)
+        snapshot = response.json().get('assignmentGridSnapshot')
+        self.assertIsInstance(snapshot, dict)
+        self.assertIn(self.person.id, [p['id'] for p in snapshot['people']])
@@ -1,10 +1,15 @@
 from datetime import date, timedelta
+from io import StringIO
 
 from django.core.management import call_command
 from django.test import TestCase
 
 from assignments.models import Assignment, AssignmentWeekHour
-from assignments.week_hours_service import parity_for_assignment, sync_assignment_week_hours
+from assignments.week_hours_service import (
+    parity_for_assignment,
+    parity_for_assignments,
+    sync_assignment_week_hours,
+)
 from people.models import Person
 from projects.models import Project
 
@@ -50,3 +55,20 @@ class AssignmentWeekHoursServiceTests(TestCase):
     def test_commands_sync_and_verify(self):
         call_command("sync_assignment_week_hours", "--full")
         call_command("verify_assignment_hours_parity", "--fail-on-mismatch")
+
+    def test_verify_repairs_drifted_rows(self):
+        sync_assignment_week_hours(self.assignment, self.assignment.weekly_hours, clear_missing=True)
+        other = Person.objects.create(name="Week Hours Other")
+        Assignment.objects.filter(id=self.assignment.id).update(person=other)
+        self.assignment.refresh_from_db()
+        self.assertFalse(parity_for_assignments([self.assignment])[0].matches)
+        with self.assertRaises(SystemExit):
+            call_command("verify_assignment_hours_parity", "--fail-on-mismatch", stdout=StringIO())
+
+        out = StringIO()
+        call_command("verify_assignment_hours_parity", "--repair", "--fail-on-mismatch", "--chunk-size", "1", stdout=out)
+        self.assertIn("mismatches=0 mismatch_rate=0.0000% repaired=1", out.getvalue())
+        self.assertEqual(
+            list(AssignmentWeekHour.objects.filter(assignment_id=self.assignment.id).values_list('person_id', flat=True)),
+            [other.id],
+        )
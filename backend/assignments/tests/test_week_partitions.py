@@ -0,0 +1,105 @@
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from assignments import partitioning
+from assignments.models import AssignmentWeekHour, WeeklyAssignmentSnapshot
+from assignments.tasks import maintain_week_partitions_task
+
+AWH = AssignmentWeekHour._meta.db_table
+WAS = WeeklyAssignmentSnapshot._meta.db_table
+
+
+class WeekPartitioningTests(TestCase):
+    def test_quarter_ranges_and_names(self):
+        self.assertEqual(partitioning.quarter_start(date(2026, 5, 17)), date(2026, 4, 1))
+        self.assertEqual(partitioning.add_quarters(date(2026, 10, 1), 1), date(2027, 1, 1))
+        self.assertEqual(partitioning.add_quarters(date(2026, 1, 1), -1), date(2025, 10, 1))
+        self.assertEqual(
+            partitioning.quarter_ranges(date(2026, 3, 29), date(2026, 7, 5)),
+            [
+                (date(2026, 1, 1), date(2026, 4, 1)),
+                (date(2026, 4, 1), date(2026, 7, 1)),
+                (date(2026, 7, 1), date(2026, 10, 1)),
+            ],
+        )
+        name = partitioning.partition_name('assignments_assignmentweekhour', date(2026, 7, 1))
+        self.assertEqual(name, 'assignments_assignmentweekhour_p2026q3')
+        self.assertEqual(partitioning.partition_start(name), date(2026, 7, 1))
+        self.assertIsNone(partitioning.partition_start(partitioning.default_partition_name('assignments_assignmentweekhour')))
+
+    def test_non_postgres_databases_are_left_alone(self):
+        if partitioning.is_supported():
+            self.skipTest('PostgreSQL backend')
+        with self.assertRaises(CommandError):
+            call_command('manage_week_partitions', '--dry-run')
+        self.assertEqual(maintain_week_partitions_task.run()['status'], 'skipped')
+
+    def _dry_run(self, *args, partitioned: bool, partitions=()):
+        out = StringIO()
+        with mock.patch.object(partitioning, 'is_supported', return_value=True), \
+                mock.patch.object(partitioning, 'is_partitioned', return_value=partitioned), \
+                mock.patch.object(partitioning, 'list_partitions', side_effect=lambda table: [
+                    partitioning.partition_name(table, start) for start in partitions
+                ]), \
+                mock.patch.object(partitioning, '_week_bounds', return_value=(date(2020, 2, 9), date(2020, 5, 3))), \
+                mock.patch.object(partitioning, '_model_index_and_constraint_sql', side_effect=lambda model: [
+                    f'CREATE INDEX "{model._meta.db_table}_idx" ON "{model._meta.db_table}" ("week_start")'
+                ]), \
+                mock.patch.object(partitioning, '_run') as run:
+            call_command('manage_week_partitions', '--dry-run', *args, stdout=out)
+        self.assertTrue(all(call.args[1] for call in run.call_args_list))
+        return out.getvalue().splitlines()
+
+    def test_dry_run_prints_the_convert_plan(self):
+        lines = self._dry_run('--convert', '--table', AWH, partitioned=False)
+        self.assertEqual(lines[:3], [
+            f'LOCK TABLE "{AWH}" IN ACCESS EXCLUSIVE MODE;',
+            f'ALTER TABLE "{AWH}" RENAME TO "{AWH}_unpartitioned";',
+            f'CREATE TABLE "{AWH}" (LIKE "{AWH}_unpartitioned" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            'PARTITION BY RANGE ("week_start");',
+        ])
+        self.assertIn(
+            f'CREATE TABLE "{AWH}_p2020q1" PARTITION OF "{AWH}" '
+            "FOR VALUES FROM ('2020-01-01') TO ('2020-04-01');",
+            lines,
+        )
+        tail = lines.index(f'CREATE TABLE "{AWH}_pdefault" PARTITION OF "{AWH}" DEFAULT;')
+        self.assertEqual(lines[tail + 1:tail + 7], [
+            f'INSERT INTO "{AWH}" SELECT * FROM "{AWH}_unpartitioned";',
+            f"SELECT setval('{AWH}_pid_seq', COALESCE((SELECT MAX(\"id\") FROM \"{AWH}\"), 0) + 1, false);",
+            f'DROP TABLE "{AWH}_unpartitioned";',
+            f'ALTER SEQUENCE "{AWH}_pid_seq" OWNED BY "{AWH}"."id";',
+            f'ALTER TABLE "{AWH}" ADD PRIMARY KEY ("id", "week_start");',
+            f'CREATE INDEX "{AWH}_idx" ON "{AWH}" ("week_start");',
+        ])
+        self.assertNotIn(WAS, '\n'.join(lines))
+        self.assertEqual(AssignmentWeekHour.objects.count(), 0)
+
+    def test_retention_detaches_snapshot_quarters_only(self):
+        old = date(2020, 1, 1)
+        lines = self._dry_run('--retain-quarters', '2', '--drop-detached', partitioned=True, partitions=[old])
+        detaches = [line for line in lines if 'DETACH PARTITION' in line]
+        self.assertEqual(detaches, [f'ALTER TABLE "{WAS}" DETACH PARTITION "{WAS}_p2020q1";'])
+        self.assertIn(f'DROP TABLE "{WAS}_p2020q1";', lines)
+        summaries = [line for line in lines if line.startswith(f'{AWH}:')]
+        self.assertEqual(len(summaries), 1)
+        self.assertTrue(summaries[0].endswith('detached=-'))
+        with self.assertRaises(ValueError):
+            partitioning.detach_old_partitions(AssignmentWeekHour, retain_quarters=2, archive_schema=None, dry_run=True)
+
+    def test_maintenance_task_applies_retention_to_snapshots_only(self):
+        with self.settings(WEEK_PARTITION_RETAIN_QUARTERS=2), \
+                mock.patch.object(partitioning, 'is_supported', return_value=True), \
+                mock.patch.object(partitioning, 'is_partitioned', return_value=True), \
+                mock.patch.object(partitioning, 'list_partitions', side_effect=lambda table: [
+                    partitioning.partition_name(table, date(2020, 1, 1))
+                ]), \
+                mock.patch.object(partitioning, '_run'):
+            tables = maintain_week_partitions_task.run()['tables']
+        self.assertEqual(tables[AWH]['detached'], [])
+        self.assertEqual(tables[WAS]['detached'], [f'{WAS}_p2020q1'])
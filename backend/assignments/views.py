@@ -6,7 +6,7 @@ Uses AutoMapped serializers for naming prevention
 from rest_framework import viewsets, status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from core.etag import ETagConditionalMixin
+from core.etag import ETagConditionalMixin, not_modified_response, scope_validators
 from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer
 from rest_framework import serializers
 from rest_framework.response import Response
@@ -15,15 +15,35 @@ from rest_framework.throttling import UserRateThrottle
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.settings import api_settings
 from django.db import transaction
-from django.db.models import Sum, Max, Min, Prefetch, Value, Count, Q, Exists, OuterRef  # noqa: F401
+from django.db.models import Sum, Max, Min, Value, Count, Q, Exists, OuterRef  # noqa: F401
 from core.deliverable_phase import build_project_week_classification
 from core.choices import MembershipEventType
 from django.db.models.functions import Coalesce, Lower
 from .models import Assignment, ProjectWeeklyHoursRollup, ProjectAssignmentCountsRollup
 from .analytics import compute_role_capacity
 from .overhead import maybe_sync_overhead_assignments
-from .week_hours_service import sync_assignment_week_hours
-from .read_queries import build_grid_snapshot_payload_normalized
+from .week_hours_service import bulk_sync_assignment_week_hours
+from .rollup_service import rollup_state_for
+from .projection import PROJECTION_PARAMS, apply_projection_to_queryset, parse_assignment_projection
+from core.cursors import KeysetPage, cursor_page_url, paginate_keyset, requested_cursor
+from core.columnar import (
+    columnar_etag,
+    columnar_renderer_classes,
+    columnar_response,
+    grid_snapshot_to_columnar,
+    wants_columnar,
+)
+from .signals import invalidate_for_bulk_hours_update
+from .read_queries import (
+    apply_people_department_filters,
+    build_grid_snapshot_payload,
+    build_scoped_grid_snapshot,
+    grid_snapshot_cache_key,
+    grid_snapshot_querysets,
+    week_hours_by,
+    week_hours_by_person,
+    week_hours_by_project,
+)
 from departments.models import Department
 from departments.serializers import DepartmentSerializer
 from .serializers import AssignmentSerializer
@@ -45,15 +65,17 @@ from core.models import (
 from core.serializers import UtilizationSchemeSerializer
 from deliverables.models import Deliverable
 from .services import WorkloadRebalancingService
-from accounts.permissions import IsAdminOrManager, is_admin_or_manager
+from accounts.permissions import IsAdminOrManager, get_user_person_id, is_admin_or_manager
 from accounts.models import UserProfile
 from core.notification_dispatch import dispatch_event_to_users
 from django.conf import settings
 from django.core.cache import cache
 from django.http import HttpResponseNotModified
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from django.utils.http import http_date
 from datetime import date, datetime, timedelta
+from core.week_utils import sunday_of_week
 import hashlib
 import json
 import os
@@ -61,7 +83,7 @@ import time
 from typing import List, Dict, Tuple, Set, Optional
 import logging
 from roles.models import Role
-from people.eligibility import first_eligible_week_start, is_hired_in_week
+from people.eligibility import is_hired_in_week
 from core.search_tokens import parse_search_tokens, apply_token_filter
 from core.workload_search import (
     UtilizationBands,
@@ -70,8 +92,11 @@ from core.workload_search import (
     match_people_for_expression,
     parse_workload_expression,
     resolve_workload_window,
+    week_window_dates,
 )
 from core.job_access import JobAccessRegistrationError, enqueue_user_facing_task
+from core.aggregate_cache import aggregate_cache, refresh_spec
+from core.encoded_responses import cached_encoded_response
 from core.cache_keys import build_aggregate_cache_key
 from core.cache_scopes import request_scope_version
 from core.perf import endpoint_timing
@@ -104,6 +129,15 @@ class SnapshotsThrottle(UserRateThrottle):
     scope = 'snapshots'
 
 
+PROJECTION_SCHEMA_PARAMETERS = [
+    OpenApiParameter(name='weeks_from', type=str, required=False, description='YYYY-MM-DD; limit weeklyHours to weeks from this Sunday'),
+    OpenApiParameter(name='weeks_to', type=str, required=False, description='YYYY-MM-DD; inclusive end of the weeklyHours window'),
+    OpenApiParameter(name='window', type=int, required=False, description='Number of weeks in the weeklyHours window (default 12)'),
+    OpenApiParameter(name='fields', type=str, required=False, description='CSV of response fields to include'),
+    OpenApiParameter(name='exclude', type=str, required=False, description='CSV of response fields to omit (e.g. personSkills,availableWeeks)'),
+]
+
+
 class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
     """
     Assignment CRUD API with utilization tracking
@@ -114,6 +148,9 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
     # Override global role-based write guard: regular users can update assignments.
     # Lifecycle operations (create/delete) remain manager/admin only.
     permission_classes = [IsAuthenticated]
+    # Set by AssignmentsPageSnapshotView, which reads ``response.data`` from
+    # snapshot actions and must not receive pre-encoded bytes.
+    nested_snapshot_call = False
     # Allow optional page_size for list endpoints (opt-in via query param)
     class AssignmentsPagination(PageNumberPagination):
         page_size_query_param = 'page_size'
@@ -138,15 +175,7 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         return str(value or '').strip().lower() in ('1', 'true', 'yes', 'on')
 
     def _request_person_id(self, request) -> Optional[int]:
-        try:
-            person_id = getattr(getattr(request.user, 'profile', None), 'person_id', None)
-        except Exception:
-            person_id = None
-        try:
-            person_id = int(person_id)
-        except Exception:
-            return None
-        return person_id if person_id > 0 else None
+        return get_user_person_id(getattr(request, 'user', None))
 
     def _mine_project_ids_queryset(self, request):
         person_id = self._request_person_id(request)
@@ -160,6 +189,28 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             .distinct()
         )
 
+    def _request_projection(self):
+        """Return the weeklyHours window / fields projection for read actions."""
+        if getattr(self, 'action', None) not in ('list', 'by_person', 'search'):
+            return None
+        request = getattr(self, 'request', None)
+        if request is None:
+            return None
+        if not hasattr(request, '_assignment_projection'):
+            params = {key: request.query_params.get(key) for key in PROJECTION_PARAMS}
+            body = request.data if getattr(self, 'action', None) == 'search' else None
+            if isinstance(body, dict):
+                params.update({key: body[key] for key in PROJECTION_PARAMS if body.get(key) not in (None, '')})
+            request._assignment_projection = parse_assignment_projection(params)
+        return request._assignment_projection
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        projection = self._request_projection()
+        if projection is not None:
+            context['assignment_projection'] = projection
+        return context
+
     def get_queryset(self):
         qs = (
             Assignment.objects.filter(is_active=True)
@@ -298,6 +349,27 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         except (TypeError, ValueError):  # nosec B110
             return queryset
 
+    def _grid_snapshot_db_validators(self, people_qs, weeks, cache_scope, scope_version, mine_only, mine_project_ids_qs):
+        """Conservative validators from People + Assignments, used when change sequences are unavailable."""
+        ppl_aggr = people_qs.aggregate(last_modified=Max('updated_at'))
+        asn_for_lm = Assignment.objects.filter(person__in=people_qs)
+        if mine_only:
+            if mine_project_ids_qs is None:
+                asn_for_lm = asn_for_lm.none()
+            else:
+                asn_for_lm = asn_for_lm.filter(project_id__in=mine_project_ids_qs)
+        asn_aggr = asn_for_lm.aggregate(last_modified=Max('updated_at'))
+        lm_candidates = [ppl_aggr.get('last_modified'), asn_aggr.get('last_modified')]
+        last_modified = max([dt for dt in lm_candidates if dt]) if any(lm_candidates) else None
+        try:
+            active_count = people_qs.count()
+        except Exception:
+            active_count = 0
+        etag_content = f"{weeks}-{cache_scope}-{active_count}-{scope_version}-" + (
+            last_modified.isoformat() if last_modified else 'none'
+        )
+        return hashlib.sha256(etag_content.encode()).hexdigest(), last_modified
+
     def _parse_department_filters(self, raw_filters):
         if raw_filters is None:
             return []
@@ -360,31 +432,7 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         return queryset
 
     def _apply_people_department_filters(self, queryset, filters):
-        if not filters:
-            return queryset
-        include_all = set()
-        include_any = set()
-        exclude_only = set()
-        for f in filters:
-            op = f.get('op')
-            dept_id = f.get('departmentId')
-            if not dept_id:
-                continue
-            if op == 'not':
-                exclude_only.add(dept_id)
-            elif op == 'or':
-                include_any.add(dept_id)
-            else:
-                include_all.add(dept_id)
-        if len(include_all) > 1:
-            return queryset.none()
-        if include_all:
-            queryset = queryset.filter(department_id__in=list(include_all))
-        if include_any:
-            queryset = queryset.filter(department_id__in=list(include_any))
-        if exclude_only:
-            queryset = queryset.exclude(department_id__in=list(exclude_only))
-        return queryset
+        return apply_people_department_filters(queryset, filters)
 
     @staticmethod
     def _coerce_week_hours_map(weekly_hours: dict | None) -> dict[str, float]:
@@ -539,7 +587,7 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         return queryset
 
     def _paginate_post_queryset(self, request, queryset, data=None):
-        """Paginate using body-provided page/page_size for POST search endpoints."""
+        """Paginate using body-provided page/page_size (or cursor) for POST search endpoints."""
         from django.core.paginator import Paginator
         from rest_framework.settings import api_settings
 
@@ -558,6 +606,17 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         if page_size <= 0:
             page_size = api_settings.PAGE_SIZE or 100
 
+        # Opt-in keyset mode: O(page size) per page, count carried in the cursor.
+        cursor_mode, cursor_token = requested_cursor(request, payload)
+        if cursor_mode:
+            page = paginate_keyset(queryset, cursor_token, page_size)
+            return (
+                page,
+                page,
+                cursor_page_url(request, page.next_cursor, page_size),
+                cursor_page_url(request, page.previous_cursor, page_size),
+            )
+
         paginator = Paginator(queryset, page_size)
         page_obj = paginator.get_page(page_number)
 
@@ -685,6 +744,7 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         final_matches = combine_token_match_sets(tokens=tokens, token_sets=token_sets, universe=universe_ids)
         return final_matches, text_matches, workload_matches
     
+    @extend_schema(parameters=PROJECTION_SCHEMA_PARAMETERS)
     def list(self, request, *args, **kwargs):
         """
         Get all assignments with person details and optional project
@@ -808,6 +868,8 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 except Exception:  # nosec B110
                     pass
 
+        queryset = apply_projection_to_queryset(queryset, self._request_projection())
+
         # Check if bulk loading is requested (Phase 2 optimization)
         if request.query_params.get('all') == 'true':
             serializer = self.get_serializer(queryset, many=True)
@@ -843,6 +905,7 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             fields={
                 'page': serializers.IntegerField(required=False),
                 'page_size': serializers.IntegerField(required=False),
+                'cursor': serializers.CharField(required=False, allow_null=True, allow_blank=True),
                 'department': serializers.IntegerField(required=False),
                 'include_children': serializers.IntegerField(required=False),
                 'department_filters': serializers.ListField(
@@ -864,6 +927,11 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 'meta_only': serializers.BooleanField(required=False),
                 'workload_week_start': serializers.DateField(required=False),
                 'workload_weeks': serializers.IntegerField(required=False),
+                'weeks_from': serializers.DateField(required=False),
+                'weeks_to': serializers.DateField(required=False),
+                'window': serializers.IntegerField(required=False),
+                'fields': serializers.CharField(required=False),
+                'exclude': serializers.CharField(required=False),
                 'search_tokens': serializers.ListField(
                     child=inline_serializer(
                         name='SearchToken',
@@ -882,6 +950,8 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 'count': serializers.IntegerField(),
                 'next': serializers.CharField(allow_null=True, required=False),
                 'previous': serializers.CharField(allow_null=True, required=False),
+                'nextCursor': serializers.CharField(allow_null=True, required=False),
+                'previousCursor': serializers.CharField(allow_null=True, required=False),
                 'results': AssignmentSerializer(many=True),
                 'people': serializers.ListField(child=inline_serializer(name='PersonLite', fields={
                     'id': serializers.IntegerField(),
@@ -1079,27 +1149,19 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 reason = 'assignment'
             people_match_reason[str(pid)] = reason
 
-        # Filtered totals for visible assignments
-        filtered_totals: Dict[str, Dict[str, float]] = {}
-        for row in queryset.values('person_id', 'weekly_hours'):
-            try:
-                pid = row.get('person_id')
-                if not pid:
-                    continue
-                wk = row.get('weekly_hours') or {}
-                if not isinstance(wk, dict):
-                    continue
-                target = filtered_totals.setdefault(str(pid), {})
-                for key, value in wk.items():
-                    try:
-                        v = float(value or 0)
-                    except Exception:
-                        continue
-                    if v == 0:
-                        continue
-                    target[key] = round(target.get(key, 0.0) + v, 2)
-            except Exception:
-                continue
+        # Filtered totals for visible assignments over the grid's workload window
+        totals_week_start, totals_weeks = resolve_workload_window(
+            week_start_raw=workload_week_start,
+            weeks_raw=workload_weeks,
+            today=timezone.now().date(),
+        )
+        filtered_totals: Dict[str, Dict[str, float]] = {
+            str(pid): {week.isoformat(): round(hours, 2) for week, hours in by_week.items()}
+            for pid, by_week in week_hours_by_person(
+                queryset,
+                week_window_dates(totals_week_start, totals_weeks),
+            ).items()
+        }
 
         if meta_only:
             try:
@@ -1112,14 +1174,22 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             prev_url = None
             results_payload = []
         else:
-            page_obj, paginator, next_url, prev_url = self._paginate_post_queryset(request, queryset, data)
+            page_obj, paginator, next_url, prev_url = self._paginate_post_queryset(
+                request,
+                apply_projection_to_queryset(queryset, self._request_projection()),
+                data,
+            )
             serializer = self.get_serializer(page_obj.object_list, many=True)
             results_payload = serializer.data
 
+        cursor_fields = {}
+        if isinstance(page_obj, KeysetPage):
+            cursor_fields = {'nextCursor': page_obj.next_cursor, 'previousCursor': page_obj.previous_cursor}
         return Response({
             'count': paginator.count,
             'next': next_url,
             'previous': prev_url,
+            **cursor_fields,
             'results': results_payload,
             'people': [
                 {
@@ -1314,7 +1384,8 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         from core.week_utils import sunday_of_week
         today = date.today()
         start_sunday = sunday_of_week(today)
-        week_keys = [(start_sunday + timedelta(weeks=i)).isoformat() for i in range(weeks)]
+        week_dates = [start_sunday + timedelta(weeks=i) for i in range(weeks)]
+        week_keys = [wk.isoformat() for wk in week_dates]
 
         def _assignment_scope_queryset(project_ids: set[int] | None = None):
             qs = Assignment.objects.filter(is_active=True).exclude(project_id__isnull=True)
@@ -1341,34 +1412,25 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             return qs
 
         def _compute_from_assignments(project_ids: set[int] | None = None):
-            qs = _assignment_scope_queryset(project_ids).select_related('project', 'person')
+            qs = _assignment_scope_queryset(project_ids)
 
             project_hours_local: dict[int, dict[str, float]] = {}
             people_counts: dict[int, int] = {}
             placeholders_counts: dict[int, int] = {}
 
-            def hours_for_week_from_json(weekly_hours, sunday_key):
-                try:
-                    v = weekly_hours.get(sunday_key)
-                    return float(v or 0)
-                except Exception:
-                    return 0.0
-
             people_sets: dict[int, set[int]] = {}
-            for a in qs:
-                pid = a.project_id
+            for pid, person_id in qs.values_list('project_id', 'person_id'):
                 if pid is None:
                     continue
                 project_hours_local.setdefault(pid, {})
-                if a.person_id:
-                    people_sets.setdefault(pid, set()).add(a.person_id)
+                if person_id:
+                    people_sets.setdefault(pid, set()).add(person_id)
                 elif include_placeholders:
                     placeholders_counts[pid] = placeholders_counts.get(pid, 0) + 1
-                wh = a.weekly_hours or {}
-                for wk in week_keys:
-                    h = hours_for_week_from_json(wh, wk)
-                    if h:
-                        project_hours_local[pid][wk] = round(project_hours_local[pid].get(wk, 0.0) + h, 2)
+            for pid, by_week in week_hours_by_project(qs, week_dates).items():
+                target = project_hours_local.setdefault(pid, {})
+                for week, hours in by_week.items():
+                    target[week.isoformat()] = round(hours, 2)
 
             for pid, people_set in people_sets.items():
                 people_counts[pid] = len(people_set)
@@ -2517,7 +2579,8 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         from core.week_utils import sunday_of_week
         today = date.today()
         start_sunday = sunday_of_week(today)
-        week_keys = [(start_sunday + timedelta(weeks=i)).isoformat() for i in range(weeks)]
+        week_dates = [start_sunday + timedelta(weeks=i) for i in range(weeks)]
+        week_keys = [wk.isoformat() for wk in week_dates]
 
         project_id_set = set(project_ids)
 
@@ -2538,26 +2601,14 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             return qs
 
         def _compute_hours_from_assignments(project_ids_scope: set[int]):
-            qs = _assignment_scope_queryset(project_ids_scope).select_related('person', 'project')
-            project_hours_local: dict[int, dict[str, float]] = {}
-
-            def hours_for_week_from_json(weekly_hours, sunday_key):
-                try:
-                    v = weekly_hours.get(sunday_key)
-                    return float(v or 0)
-                except Exception:
-                    return 0.0
-
-            for a in qs:
-                pid = a.project_id
-                if pid is None:
-                    continue
-                project_hours_local.setdefault(pid, {})
-                wh = a.weekly_hours or {}
-                for wk in week_keys:
-                    h = hours_for_week_from_json(wh, wk)
-                    if h:
-                        project_hours_local[pid][wk] = round(project_hours_local[pid].get(wk, 0.0) + h, 2)
+            qs = _assignment_scope_queryset(project_ids_scope)
+            project_hours_local: dict[int, dict[str, float]] = {
+                pid: {} for pid in qs.exclude(project_id__isnull=True).values_list('project_id', flat=True).distinct()
+            }
+            for pid, by_week in week_hours_by_project(qs, week_dates).items():
+                target = project_hours_local.setdefault(pid, {})
+                for week, hours in by_week.items():
+                    target[week.isoformat()] = round(hours, 2)
             return project_hours_local
 
         project_hours: dict[int, dict[str, float]] = {}
@@ -2748,31 +2799,11 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             project_id_field='project_id',
         )
 
-        # Aggregate hours by project/week
-        def hours_for_week_from_json(weekly_hours, sunday_key):
-            try:
-                v = weekly_hours.get(sunday_key)
-                return float(v or 0)
-            except Exception:
-                return 0.0
-
-        project_hours = {}
-        for a in qs:
-            pid = a.project_id
-            if pid is None:
-                continue
-            hire_date = getattr(getattr(a, 'person', None), 'hire_date', None)
-            wh = a.weekly_hours or {}
-            for wk in week_keys:
-                week_start = week_starts.get(wk)
-                if week_start is None:
-                    continue
-                if not is_hired_in_week(hire_date, week_start):
-                    continue
-                h = hours_for_week_from_json(wh, wk)
-                if h:
-                    project_hours.setdefault(pid, 0.0)
-                    project_hours[pid] = round(project_hours[pid] + h, 2)
+        # Aggregate hours by project (hire-gated per person)
+        project_hours = {
+            pid: round(sum(by_week.values()), 2)
+            for pid, by_week in week_hours_by_project(qs, week_starts.values(), hire_gated=True).items()
+        }
 
         # Join to projects for client labels
         pids = list(project_hours.keys())
@@ -2915,32 +2946,10 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             project_id_field='project_id',
         )
 
-        def hours_for_week_from_json(weekly_hours, sunday_key):
-            try:
-                v = weekly_hours.get(sunday_key)
-                return float(v or 0)
-            except Exception:
-                return 0.0
-
-        totals = {}
-        for a in qs:
-            pid = a.project_id
-            if pid is None:
-                continue
-            hire_date = getattr(getattr(a, 'person', None), 'hire_date', None)
-            wh = a.weekly_hours or {}
-            s = 0.0
-            for wk in week_keys:
-                week_start = week_starts.get(wk)
-                if week_start is None:
-                    continue
-                if not is_hired_in_week(hire_date, week_start):
-                    continue
-                h = hours_for_week_from_json(wh, wk)
-                if h:
-                    s += float(h)
-            if s:
-                totals[pid] = round(totals.get(pid, 0.0) + s, 2)
+        totals = {
+            pid: round(sum(by_week.values()), 2)
+            for pid, by_week in week_hours_by_project(qs, week_starts.values(), hire_gated=True).items()
+        }
 
         projects = [
             {'id': pid, 'name': proj_map.get(pid, str(pid)), 'hours': hours}
@@ -3068,31 +3077,11 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             project_id_field='project_id',
         )
 
-        # Aggregate per project per week
-        def hours_for_week_from_json(weekly_hours, sunday_key):
-            try:
-                v = weekly_hours.get(sunday_key)
-                return float(v or 0)
-            except Exception:
-                return 0.0
-
-        by_project = {}
-        for a in qs:
-            pid = a.project_id
-            if pid is None:
-                continue
-            hire_date = getattr(getattr(a, 'person', None), 'hire_date', None)
-            wh = a.weekly_hours or {}
-            m = by_project.setdefault(pid, {})
-            for wk in week_keys:
-                week_start = week_starts.get(wk)
-                if week_start is None:
-                    continue
-                if not is_hired_in_week(hire_date, week_start):
-                    continue
-                h = hours_for_week_from_json(wh, wk)
-                if h:
-                    m[wk] = round(m.get(wk, 0.0) + h, 2)
+        # Aggregate per project per week (hire-gated per person)
+        by_project = {
+            pid: {week.isoformat(): round(hours, 2) for week, hours in by_week.items()}
+            for pid, by_week in week_hours_by_project(qs, week_starts.values(), hire_gated=True).items()
+        }
 
         pids = list(by_project.keys())
         status_map = {}
@@ -3297,31 +3286,11 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             project_id_field='project_id',
         )
 
-        # Aggregate per project per week
-        def hours_for_week_from_json(weekly_hours, sunday_key):
-            try:
-                v = weekly_hours.get(sunday_key)
-                return float(v or 0)
-            except Exception:
-                return 0.0
-
-        by_project_week = {}
-        for a in qs:
-            pid = a.project_id
-            if pid is None:
-                continue
-            hire_date = getattr(getattr(a, 'person', None), 'hire_date', None)
-            m = by_project_week.setdefault(pid, {})
-            wh = a.weekly_hours or {}
-            for wk in week_keys:
-                week_start = week_starts.get(wk)
-                if week_start is None:
-                    continue
-                if not is_hired_in_week(hire_date, week_start):
-                    continue
-                h = hours_for_week_from_json(wh, wk)
-                if h:
-                    m[wk] = round(m.get(wk, 0.0) + h, 2)
+        # Aggregate per project per week (hire-gated per person)
+        by_project_week = {
+            pid: {week.isoformat(): round(hours, 2) for week, hours in by_week.items()}
+            for pid, by_week in week_hours_by_project(qs, week_starts.values(), hire_gated=True).items()
+        }
 
         pids = list(by_project_week.keys())
         def _empty_payload():
@@ -3517,6 +3486,7 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             OpenApiParameter(name='department_filters', type=str, required=False, description='JSON array of department filter clauses'),
             OpenApiParameter(name='vertical', type=int, required=False, description='Filter by vertical id'),
             OpenApiParameter(name='mine_only', type=bool, required=False, description='1|true to scope to projects assigned to current user'),
+            OpenApiParameter(name='format', type=str, required=False, description="'columnar' for the compact columnar representation (or Accept: application/vnd.workload.columnar+json)"),
         ],
         responses=inline_serializer(
             name='GridSnapshotResponse',
@@ -3533,7 +3503,13 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             }
         )
     )
-    @action(detail=False, methods=['get'], url_path='grid_snapshot', throttle_classes=[GridSnapshotThrottle])
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='grid_snapshot',
+        throttle_classes=[GridSnapshotThrottle],
+        renderer_classes=columnar_renderer_classes(),
+    )
     def grid_snapshot(self, request):
         """Provide a compact, pre-aggregated structure for the grid in one request.
 
@@ -3555,39 +3531,25 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             except Exception:  # nosec B110
                 pass
 
-            # Build people queryset with optional department scoping
-            people_qs = Person.objects.filter(is_active=True).select_related('department')
+            # Resolve the scope to plain values so a refresh can rebuild it.
             dept_param = request.query_params.get('department')
             include_children = request.query_params.get('include_children') == '1'
             vertical_param = self._effective_vertical_param(request.query_params.get('vertical'))
             mine_only = self._is_truthy(request.query_params.get('mine_only'))
             mine_person_id = self._request_person_id(request) if mine_only else None
+            grid_scope: dict = {'include_children': include_children, 'mine_only': mine_only}
             cache_scope = 'all'
             if dept_param not in (None, ""):
                 try:
                     dept_id = int(dept_param)
-                    if include_children:
-                        ids = set()
-                        stack = [dept_id]
-                        while stack:
-                            current = stack.pop()
-                            if current in ids:
-                                continue
-                            ids.add(current)
-                            for d in Department.objects.filter(parent_department_id=current).values_list('id', flat=True):
-                                if d not in ids:
-                                    stack.append(d)
-                        people_qs = people_qs.filter(department_id__in=list(ids))
-                        cache_scope = f'dept_{dept_id}_children'
-                    else:
-                        people_qs = people_qs.filter(department_id=dept_id)
-                        cache_scope = f'dept_{dept_id}'
+                    grid_scope['department'] = dept_id
+                    cache_scope = f'dept_{dept_id}_children' if include_children else f'dept_{dept_id}'
                 except (TypeError, ValueError):  # nosec B110
                     pass
             dept_filters_raw = request.query_params.get('department_filters') or request.query_params.get('departmentFilters')
             dept_filters = self._parse_department_filters(dept_filters_raw)
             if dept_filters:
-                people_qs = self._apply_people_department_filters(people_qs, dept_filters)
+                grid_scope['department_filters'] = dept_filters
                 try:
                     df_key = hashlib.sha256(
                         json.dumps(
@@ -3601,219 +3563,117 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                     cache_scope = f"{cache_scope}_df"
             if vertical_param not in (None, ""):
                 try:
-                    people_qs = people_qs.filter(department__vertical_id=int(vertical_param))
+                    grid_scope['vertical'] = int(vertical_param)
                     cache_scope = f"{cache_scope}_v{int(vertical_param)}"
                 except Exception:  # nosec B110
                     pass
-
-            mine_project_ids_qs = None
-            if mine_only:
-                if not mine_person_id:
-                    people_qs = people_qs.none()
-                    cache_scope = f"{cache_scope}_mine_none"
-                else:
-                    mine_project_ids_qs = self._mine_project_ids_queryset(request)
-                    has_assignment = Assignment.objects.filter(
-                        is_active=True,
-                        person_id=OuterRef('pk'),
-                        project_id__in=mine_project_ids_qs,
-                    )
-                    people_qs = people_qs.annotate(_mine_project_match=Exists(has_assignment)).filter(_mine_project_match=True)
-                    cache_scope = f"{cache_scope}_mine_{mine_person_id}"
-
-            # Prefetch active assignments with minimal fields
-            asn_qs = Assignment.objects.filter(is_active=True)
-            if vertical_param not in (None, ""):
-                try:
-                    asn_qs = asn_qs.filter(project__vertical_id=int(vertical_param))
-                except Exception:  # nosec B110
-                    pass
             if mine_only:
-                if mine_project_ids_qs is None:
-                    asn_qs = asn_qs.none()
-                else:
-                    asn_qs = asn_qs.filter(project_id__in=mine_project_ids_qs)
-            asn_qs = asn_qs.only('weekly_hours', 'person_id', 'updated_at')
-            people_qs = people_qs.prefetch_related(Prefetch('assignments', queryset=asn_qs))
+                grid_scope['mine_person_id'] = mine_person_id
+                cache_scope = f"{cache_scope}_mine_{mine_person_id}" if mine_person_id else f"{cache_scope}_mine_none"
+            people_qs, asn_qs, mine_project_ids_qs = grid_snapshot_querysets(**grid_scope)
 
-            # Build cache key and endpoint-specific short TTL caching.
-            try:
-                version = cache.get('analytics_cache_version', 1)
-            except Exception:
-                version = 1
+            # Build cache key and endpoint-specific short TTL caching. The
+            # versions are appended by grid_snapshot_cache_key so warming can
+            # resolve the current key after a scope bump.
             scope_version = request_scope_version(request)
-            cache_key = build_aggregate_cache_key(
-                'assignments.grid_snapshot',
-                request,
-                filters={
-                    'version': int(version),
-                    'scope_version': int(scope_version),
-                    'weeks': weeks,
-                    'scope': cache_scope,
-                },
+            key_spec = refresh_spec(
+                grid_snapshot_cache_key,
+                base_key=build_aggregate_cache_key(
+                    'assignments.grid_snapshot',
+                    request,
+                    filters={'weeks': weeks, 'scope': cache_scope},
+                ),
+                department=grid_scope.get('department'),
             )
+            cache_key = key_spec.build()
             cache_ttl_seconds = max(0, int(getattr(settings, 'GRID_SNAPSHOT_CACHE_TTL_SECONDS', 20)))
             swr_seconds = max(0, int(getattr(settings, 'SNAPSHOT_CACHE_SWR_SECONDS', 30)))
             use_cache = cache_ttl_seconds > 0 and request.query_params.get('nocache') != '1'
 
-            # Compute conservative validators across People + Assignments
-            ppl_aggr = people_qs.aggregate(last_modified=Max('updated_at'))
-            asn_for_lm = Assignment.objects.filter(person__in=people_qs)
-            if mine_only:
-                if mine_project_ids_qs is None:
-                    asn_for_lm = asn_for_lm.none()
-                else:
-                    asn_for_lm = asn_for_lm.filter(project_id__in=mine_project_ids_qs)
-            asn_aggr = asn_for_lm.aggregate(last_modified=Max('updated_at'))
-            lm_candidates = [ppl_aggr.get('last_modified'), asn_aggr.get('last_modified')]
-            last_modified = max([dt for dt in lm_candidates if dt]) if any(lm_candidates) else None
-            try:
-                active_count = people_qs.count()
-            except Exception:
-                active_count = 0
-            etag_content = f"{weeks}-{cache_scope}-{active_count}-{scope_version}-" + (
-                last_modified.isoformat() if last_modified else 'none'
+            # Validators come from per-scope change sequences (cache only, no SQL).
+            # A plain department view only changes when that department is
+            # bumped; every other shape follows the global sequence.
+            plain_department = (
+                cache_scope.startswith('dept_') and cache_scope.count('_') == 1
             )
-            etag = hashlib.sha256(etag_content.encode()).hexdigest()
+            scopes = [('department', cache_scope[len('dept_'):])] if plain_department else [('global', 'global')]
+            # Same Sunday week the payload's weekKeys start from.
+            week_start = sunday_of_week(date.today())
+            validators = scope_validators(f"grid_snapshot|{weeks}|{cache_scope}|{week_start.isoformat()}", scopes)
+            if validators is not None:
+                etag, last_modified = validators
+            else:
+                etag, last_modified = self._grid_snapshot_db_validators(
+                    people_qs, weeks, cache_scope, scope_version, mine_only, mine_project_ids_qs,
+                )
+            columnar = wants_columnar(request)
+            if columnar:
+                etag = columnar_etag(etag)
 
             # Conditional request handling
-            inm = request.META.get('HTTP_IF_NONE_MATCH')
-            if inm and inm.strip('"') == etag:
-                resp = HttpResponseNotModified()
-                resp['ETag'] = f'"{etag}"'
-                if last_modified:
-                    resp['Last-Modified'] = http_date(last_modified.timestamp())
+            not_modified = not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                # JSON and columnar bodies share the URL; caches key on Accept.
+                patch_vary_headers(not_modified, ('Accept',))
                 perf.tag('cache_hit', True)
-                perf.tag('status_code', resp.status_code)
-                return resp
-            ims = request.META.get('HTTP_IF_MODIFIED_SINCE')
-            if last_modified and ims:
-                try:
-                    from django.utils.http import parse_http_date
-                    if_modified_ts = parse_http_date(ims)
-                    if int(last_modified.timestamp()) <= if_modified_ts:
-                        resp = HttpResponseNotModified()
-                        resp['ETag'] = f'"{etag}"'
-                        resp['Last-Modified'] = http_date(last_modified.timestamp())
-                        perf.tag('cache_hit', True)
-                        perf.tag('status_code', resp.status_code)
-                        return resp
-                except Exception:  # nosec B110
-                    pass
+                perf.tag('status_code', not_modified.status_code)
+                return not_modified
 
-            payload = None
-            if use_cache:
-                try:
-                    payload = cache.get(cache_key)
-                except Exception:
-                    payload = None
-            perf.tag('cache_hit', payload is not None)
+            refresh = refresh_spec(build_scoped_grid_snapshot, weeks=weeks, **grid_scope)
 
-            if payload is None:
-                lock_key = f"lock:{cache_key}"
-                got_lock = False
-                if use_cache:
-                    try:
-                        got_lock = cache.add(lock_key, '1', timeout=10)
-                    except Exception:
-                        got_lock = True
-                try:
-                    if not got_lock and use_cache:
-                        t0 = time.time()
-                        while time.time() - t0 < 2.0:
-                            try:
-                                payload = cache.get(cache_key)
-                                if payload is not None:
-                                    break
-                            except Exception:  # nosec B110
-                                pass
-                            time.sleep(0.05)
-                    if payload is None:
-                        storage_mode = getattr(settings, 'ASSIGNMENT_HOURS_STORAGE_MODE', 'dual')
-                        use_normalized = storage_mode == 'normalized' and not mine_only
-                        if use_normalized:
-                            try:
-                                payload = build_grid_snapshot_payload_normalized(
-                                    people_qs=people_qs,
-                                    weeks=weeks,
-                                    vertical_id=int(vertical_param) if vertical_param not in (None, "") else None,
-                                )
-                            except Exception:
-                                payload = None
-
-                        if payload is None:
-                            # Compute week keys (Sundays) from legacy JSON map.
-                            from core.week_utils import sunday_of_week
-                            today = date.today()
-                            start_sunday = sunday_of_week(today)
-                            week_keys = [(start_sunday + timedelta(weeks=w)).isoformat() for w in range(weeks)]
-                            week_key_set = set(week_keys)
-
-                            people = list(people_qs)
-                            people_list = []
-                            hours_by_person = {}
-                            for person in people:
-                                people_list.append(
-                                    {
-                                        'id': person.id,
-                                        'name': person.name,
-                                        'weeklyCapacity': person.weekly_capacity or 0,
-                                        'department': person.department_id,
-                                        'firstEligibleWeek': (
-                                            first_eligible.isoformat()
-                                            if (first_eligible := first_eligible_week_start(getattr(person, 'hire_date', None))) is not None
-                                            else None
-                                        ),
-                                    }
-                                )
-                                totals: dict[str, float] = {}
-                                for assignment in getattr(person, 'assignments').all():
-                                    weekly_hours = assignment.weekly_hours or {}
-                                    if not isinstance(weekly_hours, dict):
-                                        continue
-                                    for raw_week_key, raw_hours in weekly_hours.items():
-                                        week_key = str(raw_week_key)
-                                        if week_key not in week_key_set:
-                                            continue
-                                        try:
-                                            hours = float(raw_hours or 0)
-                                        except (TypeError, ValueError):
-                                            continue
-                                        if hours == 0.0:
-                                            continue
-                                        totals[week_key] = totals.get(week_key, 0.0) + hours
-                                compact_totals = {
-                                    week_key: round(hours, 2)
-                                    for week_key, hours in totals.items()
-                                    if round(hours, 2) != 0.0
-                                }
-                                hours_by_person[person.id] = compact_totals
-
-                            payload = {
-                                'weekKeys': week_keys,
-                                'people': people_list,
-                                'hoursByPerson': hours_by_person,
-                            }
-                        if use_cache:
-                            try:
-                                cache.set(cache_key, payload, timeout=cache_ttl_seconds)
-                            except Exception:  # nosec B110
-                                pass
-                finally:
-                    if use_cache:
-                        try:
-                            cache.delete(lock_key)
-                        except Exception:  # nosec B110
-                            pass
+            def _build_payload():
+                return build_grid_snapshot_payload(
+                    people_qs=people_qs,
+                    weeks=weeks,
+                    assignments_qs=asn_qs,
+                )
 
-            response = Response(payload)
-            response['ETag'] = f'"{etag}"'
+            def _cached_payload():
+                if not use_cache:
+                    perf.tag('cache_hit', False)
+                    return _build_payload()
+                cached = aggregate_cache.get_or_build(
+                    cache_key,
+                    _build_payload,
+                    ttl=cache_ttl_seconds,
+                    stale_ttl=swr_seconds,
+                    refresh=refresh,
+                )
+                perf.tag('cache_hit', cached.hit)
+                perf.tag('cache_state', cached.state)
+                return cached.value
+
+            if columnar:
+                response = columnar_response(
+                    request,
+                    endpoint='assignments.grid_snapshot',
+                    etag=etag,
+                    build=lambda: grid_snapshot_to_columnar(_cached_payload()),
+                )
+            elif use_cache and not self.nested_snapshot_call:
+                # Hits serve the stored JSON/gzip bytes without re-rendering.
+                response, cached = cached_encoded_response(
+                    request,
+                    cache_key,
+                    _build_payload,
+                    ttl=cache_ttl_seconds,
+                    stale_ttl=swr_seconds,
+                    etag=etag,
+                    refresh=refresh,
+                    warm_key=key_spec,
+                )
+                perf.tag('cache_hit', cached.hit)
+                perf.tag('cache_state', cached.state)
+            else:
+                response = Response(_cached_payload())
+                response['ETag'] = f'"{etag}"'
             if last_modified:
                 response['Last-Modified'] = http_date(last_modified.timestamp())
             if cache_ttl_seconds > 0:
                 response['Cache-Control'] = f'private, max-age={cache_ttl_seconds}, stale-while-revalidate={swr_seconds}'
             else:
                 response['Cache-Control'] = 'private, no-store'
+            patch_vary_headers(response, ('Accept',))
             perf.tag('status_code', response.status_code)
             return response
 
@@ -3969,8 +3829,15 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
 
         results: list[dict] = []
         changed_person_ids: list[int] = []
+        changed_assignments: list[Assignment] = []
+        previous_rollup_states: dict = {}
+        now = timezone.now()
         with transaction.atomic():
-            assignments = Assignment.objects.select_for_update().filter(id__in=dedup_order)
+            assignments = (
+                Assignment.objects.select_for_update(of=('self',))
+                .select_related('person')
+                .filter(id__in=dedup_order)
+            )
             assignment_map = {assignment.id: assignment for assignment in assignments}
             for aid in dedup_order:
                 assignment = assignment_map.get(aid)
@@ -3988,16 +3855,24 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                     results.append({'assignmentId': assignment.id, 'status': 'noop', 'etag': _etag_for_assignment(assignment)})
                     continue
 
+                previous_rollup_states[assignment.id] = rollup_state_for(assignment)
                 assignment.weekly_hours = incoming_weekly_hours
-                assignment.save(update_fields=['weekly_hours', 'updated_at'])
-                try:
-                    sync_assignment_week_hours(assignment, incoming_weekly_hours, clear_missing=True)
-                except Exception:  # nosec B110
-                    pass
+                assignment.updated_at = now
+                changed_assignments.append(assignment)
                 if assignment.person_id:
                     changed_person_ids.append(assignment.person_id)
                 results.append({'assignmentId': assignment.id, 'status': 'ok', 'etag': _etag_for_assignment(assignment)})
 
+            # Persist all changed rows together; per-row save() signals are replaced
+            # by one coalesced invalidation for the affected projects/departments.
+            if changed_assignments:
+                Assignment.objects.bulk_update(changed_assignments, ['weekly_hours', 'updated_at'], batch_size=500)
+                try:
+                    bulk_sync_assignment_week_hours(changed_assignments)
+                except Exception:  # nosec B110
+                    pass
+                invalidate_for_bulk_hours_update(changed_assignments, previous_rollup_states)
+
         success = all(item['status'] in ('ok', 'noop') for item in results)
         if changed_person_ids:
             actor_user_id = getattr(getattr(request, 'user', None), 'id', None)
@@ -4141,6 +4016,7 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             OpenApiParameter(name='page_size', type=int, required=False, description='Page size (optional pagination)'),
             OpenApiParameter(name='vertical', type=int, required=False, description='Filter by vertical id'),
             OpenApiParameter(name='mine_only', type=bool, required=False, description='1|true to scope to projects assigned to current user'),
+            *PROJECTION_SCHEMA_PARAMETERS,
         ]
     )
     @action(detail=False, methods=['get'])
@@ -4163,6 +4039,7 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 queryset = queryset.none()
             else:
                 queryset = queryset.filter(project_id__in=mine_project_ids_qs)
+        queryset = apply_projection_to_queryset(queryset, self._request_projection())
 
         # Opt-in pagination: only paginate when page/page_size is provided
         if request.query_params.get('page') or request.query_params.get('page_size'):
@@ -4276,30 +4153,31 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             
             person_capacity = person.weekly_capacity or 36
             
-            # Get ALL assignments for this person in a single query
-            # with project info
+            # Hours of the person's active assignments in the requested week
             person_assignments = Assignment.objects.filter(
                 person_id=person_id,
                 is_active=True
-            ).select_related('project')
-            
+            )
+            try:
+                week_date = date.fromisoformat(str(week_key))
+            except ValueError:
+                week_date = None
+            week_rows = (
+                week_hours_by(person_assignments, [week_date], 'id', 'project_id', 'project__name')
+                if week_date is not None else {}
+            )
+
             # Calculate current week hours and collect project assignments
             total_hours = 0
             current_assignments = []
             project_assignments = {}
             
-            for assignment in person_assignments:
-                # Get hours for the specific week from JSON field
-                weekly_hours = assignment.weekly_hours or {}
-                week_hours = weekly_hours.get(week_key, 0)
+            for (assignment_id, asn_project_id, name), by_week in sorted(week_rows.items()):
+                week_hours = sum(by_week.values())
                 
                 if week_hours > 0:
                     total_hours += week_hours
-                    project_name = (
-                        assignment.project.name
-                        if assignment.project
-                        else f"Project {assignment.project_id}"
-                    )
+                    project_name = name or f"Project {asn_project_id}"
                     
                     # Group by project
                     if project_name not in project_assignments:
@@ -4309,7 +4187,7 @@ class AssignmentViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                     current_assignments.append({
                         'projectName': project_name,
                         'hours': week_hours,
-                        'assignmentId': assignment.id
+                        'assignmentId': assignment_id
                     })
             
             # Add proposed hours to total
@@ -4414,15 +4292,7 @@ class AssignmentsPageSnapshotView(APIView):
         return str(value or '').strip().lower() in ('1', 'true', 'yes', 'on')
 
     def _request_person_id(self, request) -> Optional[int]:
-        try:
-            person_id = getattr(getattr(request.user, 'profile', None), 'person_id', None)
-        except Exception:
-            person_id = None
-        try:
-            person_id = int(person_id)
-        except Exception:
-            return None
-        return person_id if person_id > 0 else None
+        return get_user_person_id(getattr(request, 'user', None))
 
     def _mine_project_ids_queryset(self, request):
         person_id = self._request_person_id(request)
@@ -4745,6 +4615,11 @@ class AssignmentsPageSnapshotView(APIView):
         return bundle
 
     def _build_snapshot_payload(self, request, body: dict | None = None, *, allow_cache: bool = True):
+        """Return ``(payload, response)``; exactly one is set.
+
+        ``response`` carries validation errors or, when caching is enabled, the
+        cached pre-rendered body.
+        """
         include_tokens, include_err = self._parse_include(request, body)
         if include_err:
             return None, Response({'error': include_err}, status=status.HTTP_400_BAD_REQUEST)
@@ -4793,17 +4668,49 @@ class AssignmentsPageSnapshotView(APIView):
                     'template_ids': template_ids if bundle_enabled else [],
                 }
                 cache_key = build_aggregate_cache_key('ui.assignments_page', request, filters=cache_filters)
-                cached = cache.get(cache_key)
-                if cached is not None:
-                    return cached, None
             except Exception:
                 cache_key = None
 
+        def _build():
+            return self._compute_snapshot_payload(
+                request,
+                include_tokens=include_tokens,
+                include_set=include_set,
+                mine_only=mine_only,
+                mine_project_ids_qs=mine_project_ids_qs,
+                bundle_enabled=bundle_enabled,
+                auto_hours_phases=auto_hours_phases,
+                template_ids=template_ids,
+            )
+
+        if use_cache and cache_key:
+            response, _ = cached_encoded_response(
+                request,
+                cache_key,
+                _build,
+                ttl=page_cache_ttl_seconds,
+                stale_ttl=max(0, int(getattr(settings, 'SNAPSHOT_CACHE_SWR_SECONDS', 30))),
+            )
+            return None, response
+        return _build(), None
+
+    def _compute_snapshot_payload(
+        self,
+        request,
+        *,
+        include_tokens,
+        include_set,
+        mine_only,
+        mine_project_ids_qs,
+        bundle_enabled,
+        auto_hours_phases,
+        template_ids,
+    ):
         # Avoid conditional-GET short-circuit inside nested snapshot calls
         request.META.pop('HTTP_IF_NONE_MATCH', None)
         request.META.pop('HTTP_IF_MODIFIED_SINCE', None)
 
-        viewset = AssignmentViewSet()
+        viewset = AssignmentViewSet(nested_snapshot_call=True)
         assignment_snapshot = None
         project_snapshot = None
         try:
@@ -4851,7 +4758,7 @@ class AssignmentsPageSnapshotView(APIView):
                             people_qs = people_qs.filter(department__vertical_id=vertical_id)
                         except Exception:
                             vertical_id = None
-                    assignment_snapshot = build_grid_snapshot_payload_normalized(
+                    assignment_snapshot = build_grid_snapshot_payload(
                         people_qs=people_qs,
                         weeks=weeks,
                         vertical_id=vertical_id,
@@ -5022,20 +4929,16 @@ class AssignmentsPageSnapshotView(APIView):
                 template_ids or [],
             )
 
-        if use_cache and cache_key:
-            try:
-                cache.set(cache_key, payload, timeout=page_cache_ttl_seconds)
-            except Exception:  # nosec B110
-                pass
-        return payload, None
+        return payload
 
     def get(self, request):
         with endpoint_timing('ui_assignments_page', request) as perf:
-            payload, error_response = self._build_snapshot_payload(request, allow_cache=True)
-            if error_response is not None:
-                perf.tag('status_code', error_response.status_code)
-                return error_response
-            response = Response(payload)
+            payload, response = self._build_snapshot_payload(request, allow_cache=True)
+            if response is not None and response.status_code >= 400:
+                perf.tag('status_code', response.status_code)
+                return response
+            if response is None:
+                response = Response(payload)
             cache_ttl_seconds = max(0, int(getattr(settings, 'ASSIGNMENTS_PAGE_CACHE_TTL_SECONDS', 20)))
             swr_seconds = max(0, int(getattr(settings, 'SNAPSHOT_CACHE_SWR_SECONDS', 30)))
             if cache_ttl_seconds > 0:
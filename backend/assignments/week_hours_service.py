@@ -16,6 +16,7 @@ class ParityResult:
     json_map: dict[str, float]
     normalized_map: dict[str, float]
     matches: bool
+    scope_matches: bool = True
 
 
 def _to_sunday_key(raw_key: str) -> str:
@@ -123,6 +124,55 @@ def sync_assignment_week_hours(
     return normalized
 
 
+def bulk_sync_assignment_week_hours(assignments: Iterable[Assignment]) -> int:
+    """Upsert normalized week-hour rows for many assignments at once.
+
+    Stale weeks are removed with one DELETE and all current weeks are written
+    with a single ``INSERT ... ON CONFLICT (assignment, week_start) DO UPDATE``.
+    Returns the number of rows upserted.
+    """
+    items = [a for a in assignments if getattr(a, 'id', None)]
+    if not items:
+        return 0
+    rows: list[AssignmentWeekHour] = []
+    keep: dict[int, set[date]] = {}
+    for assignment in items:
+        weeks = keep.setdefault(int(assignment.id), set())
+        for week_key, hours in normalize_weekly_hours_map(assignment.weekly_hours).items():
+            week_date = date.fromisoformat(week_key)
+            weeks.add(week_date)
+            rows.append(
+                AssignmentWeekHour(
+                    assignment_id=assignment.id,
+                    person_id=assignment.person_id,
+                    project_id=assignment.project_id,
+                    department_id=assignment.department_id,
+                    week_start=week_date,
+                    hours=hours,
+                )
+            )
+
+    with transaction.atomic():
+        stale_ids = [
+            row_id
+            for row_id, assignment_id, week_start in AssignmentWeekHour.objects.filter(
+                assignment_id__in=list(keep.keys())
+            ).values_list('id', 'assignment_id', 'week_start')
+            if week_start not in keep.get(assignment_id, ())
+        ]
+        if stale_ids:
+            AssignmentWeekHour.objects.filter(id__in=stale_ids).delete()
+        if rows:
+            AssignmentWeekHour.objects.bulk_create(
+                rows,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['assignment', 'week_start'],
+                update_fields=['hours', 'person', 'project', 'department', 'updated_at'],
+            )
+    return len(rows)
+
+
 def sync_assignment_week_hours_queryset(assignments: Iterable[Assignment], *, clear_missing: bool = True) -> int:
     count = 0
     for assignment in assignments:
@@ -143,3 +193,40 @@ def parity_for_assignment(assignment: Assignment) -> ParityResult:
         normalized_map=normalized_map,
         matches=json_map == normalized_map,
     )
+
+
+def parity_for_assignments(assignments: Iterable[Assignment]) -> list[ParityResult]:
+    """Batched ``parity_for_assignment``: one row query for many assignments.
+
+    Besides the hours map, rows must carry the assignment's current person,
+    project and department, since normalized reads group on those columns.
+    """
+    items = [a for a in assignments if getattr(a, 'id', None)]
+    if not items:
+        return []
+    rows_by_assignment: dict[int, list[tuple]] = {}
+    for row in AssignmentWeekHour.objects.filter(
+        assignment_id__in=[a.id for a in items]
+    ).values_list('assignment_id', 'week_start', 'hours', 'person_id', 'project_id', 'department_id'):
+        rows_by_assignment.setdefault(row[0], []).append(row)
+
+    results: list[ParityResult] = []
+    for assignment in items:
+        rows = rows_by_assignment.get(assignment.id, [])
+        json_map = normalize_weekly_hours_map(assignment.weekly_hours)
+        normalized_map: dict[str, float] = {}
+        for _, week_start, hours, *_ in rows:
+            key = week_start.isoformat()
+            normalized_map[key] = round(normalized_map.get(key, 0.0) + _to_hours(hours), 4)
+        scope = (assignment.person_id, assignment.project_id, assignment.department_id)
+        scope_matches = all(tuple(row[3:]) == scope for row in rows)
+        results.append(
+            ParityResult(
+                assignment_id=assignment.id,
+                json_map=json_map,
+                normalized_map=normalized_map,
+                matches=json_map == normalized_map and scope_matches,
+                scope_matches=scope_matches,
+            )
+        )
+    return results
@@ -0,0 +1,14 @@
+"""
+ASGI config for workload-tracker project.
+
+Serves the same URLconf as ``config.wsgi``; async views (job status
+long-polling) hold no worker thread while they wait.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+application = get_asgi_application()
@@ -151,6 +151,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 # Database
 DATABASES = {
@@ -517,12 +518,62 @@ AGGREGATE_CACHE_TTL = int(os.getenv('AGGREGATE_CACHE_TTL', '30'))
 ASSIGNMENTS_PAGE_CACHE_TTL_SECONDS = _int_non_negative('ASSIGNMENTS_PAGE_CACHE_TTL_SECONDS', 20)
 GRID_SNAPSHOT_CACHE_TTL_SECONDS = _int_non_negative('GRID_SNAPSHOT_CACHE_TTL_SECONDS', 20)
 SNAPSHOT_CACHE_SWR_SECONDS = _int_non_negative('SNAPSHOT_CACHE_SWR_SECONDS', 30)
+# Aggregate cache facade (core.aggregate_cache): per-process LRU front tier in
+# front of the shared cache. 0 disables the local tier.
+AGGREGATE_LOCAL_CACHE_TTL_SECONDS = _int_non_negative('AGGREGATE_LOCAL_CACHE_TTL_SECONDS', 2)
+AGGREGATE_LOCAL_CACHE_MAX_ENTRIES = _int_non_negative('AGGREGATE_LOCAL_CACHE_MAX_ENTRIES', 64)
+AGGREGATE_CACHE_LOCK_SECONDS = _int_non_negative('AGGREGATE_CACHE_LOCK_SECONDS', 10)
+# Snapshot warming (core.snapshot_warming): after a snapshot scope bump, rebuild
+# the most-requested grid snapshot cache keys in Celery via their builders.
+SNAPSHOT_WARMING_ENABLED = os.getenv('SNAPSHOT_WARMING_ENABLED', 'true').lower() == 'true'
+SNAPSHOT_WARM_MAX_KEYS = _int_non_negative('SNAPSHOT_WARM_MAX_KEYS', 20)
+SNAPSHOT_WARM_CONCURRENCY = _int_non_negative('SNAPSHOT_WARM_CONCURRENCY', 2)
+SNAPSHOT_WARM_DEBOUNCE_SECONDS = _int_non_negative('SNAPSHOT_WARM_DEBOUNCE_SECONDS', 10)
+SNAPSHOT_WARM_TRACK_SECONDS = _int_non_negative('SNAPSHOT_WARM_TRACK_SECONDS', 7 * 24 * 3600)
+# Long-poll (/api/jobs/<id>/wait/) and SSE (/api/jobs/<id>/events/) job
+# progress. Each waiting client holds a request slot for the whole wait, so
+# only enable this when the API is served by an ASGI server (config.asgi, e.g.
+# `uvicorn config.asgi:application`); under the shipped gunicorn WSGI workers
+# /wait/ answers immediately and /events/ returns 404.
+JOB_STREAMING_ENABLED = os.getenv('JOB_STREAMING_ENABLED', 'false').lower() == 'true'
+# Async job status long-poll: max wait per request and the interval between
+# Celery result checks while waiting.
+JOB_STATUS_WAIT_MAX_SECONDS = _int_non_negative('JOB_STATUS_WAIT_MAX_SECONDS', 25)
+JOB_STATUS_WAIT_INTERVAL_MS = _int_non_negative('JOB_STATUS_WAIT_INTERVAL_MS', 500)
+# Job progress bus (core.job_progress): latest-event retention, SSE stream
+# lifetime per connection (clients reconnect) and keepalive interval.
+JOB_PROGRESS_TTL_SECONDS = _int_non_negative('JOB_PROGRESS_TTL_SECONDS', 3600)
+JOB_EVENTS_MAX_SECONDS = _int_non_negative('JOB_EVENTS_MAX_SECONDS', 300)
+JOB_EVENTS_HEARTBEAT_SECONDS = _int_non_negative('JOB_EVENTS_HEARTBEAT_SECONDS', 15)
+# Cross-request cache of per-user authorization facts (accounts.principal);
+# entries are versioned and invalidated by signals. 0 disables the cache.
+AUTHZ_PRINCIPAL_CACHE_TTL_SECONDS = _int_non_negative('AUTHZ_PRINCIPAL_CACHE_TTL_SECONDS', 300)
+# Company holidays (comma-separated ISO dates) excluded from business-day math
+# (core.business_calendar), e.g. pre-deliverable generated dates.
+BUSINESS_HOLIDAYS = [d.strip() for d in os.getenv('BUSINESS_HOLIDAYS', '').split(',') if d.strip()]
+# Network graph results are keyed by the weekly snapshot version; TTL bounds
+# staleness of live joins (active flags, verticals). 0 disables caching.
+NETWORK_GRAPH_CACHE_TTL_SECONDS = _int_non_negative('NETWORK_GRAPH_CACHE_TTL_SECONDS', 600)
+# Role capacity results are keyed by analytics/snapshot scope versions. 0 disables.
+ROLE_CAPACITY_CACHE_TTL_SECONDS = _int_non_negative('ROLE_CAPACITY_CACHE_TTL_SECONDS', 120)
 # Assignment hours storage strategy:
-# - dual: write JSON + normalized rows, read path may progressively adopt normalized queries
-# - normalized: canonical read/write through normalized rows (JSON kept for compatibility window)
+# - dual: write JSON + normalized rows; assignments.read_queries folds hours from JSON
+# - normalized: assignments.read_queries aggregates AssignmentWeekHour rows (JSON kept for compatibility window)
+# Switch only after `verify_assignment_hours_parity --repair --fail-on-mismatch` passes.
 ASSIGNMENT_HOURS_STORAGE_MODE = os.getenv('ASSIGNMENT_HOURS_STORAGE_MODE', 'dual').strip().lower() or 'dual'
 if ASSIGNMENT_HOURS_STORAGE_MODE not in ('dual', 'normalized'):
     ASSIGNMENT_HOURS_STORAGE_MODE = 'dual'
+# Optional quarterly week_start range partitions for AssignmentWeekHour and
+# WeeklyAssignmentSnapshot (PostgreSQL). Convert once with
+# `manage_week_partitions --convert`; beat then keeps future quarters created.
+WEEK_PARTITION_AHEAD_QUARTERS = int(os.getenv('WEEK_PARTITION_AHEAD_QUARTERS', '4'))
+# Retention detaches old WeeklyAssignmentSnapshot quarters only.
+_week_partition_retain = os.getenv('WEEK_PARTITION_RETAIN_QUARTERS', '').strip()
+WEEK_PARTITION_RETAIN_QUARTERS = int(_week_partition_retain) if _week_partition_retain else None
+WEEK_PARTITION_ARCHIVE_SCHEMA = os.getenv('WEEK_PARTITION_ARCHIVE_SCHEMA', 'archive').strip() or None
+# Per-request/per-task memoization of repeated lookups (core.request_memo),
+# e.g. visibility settings, department trees, the utilization scheme.
+REQUEST_MEMO_ENABLED = os.getenv('REQUEST_MEMO_ENABLED', 'true').lower() == 'true'
 # Scoped snapshot invalidation controls for read-after-write guarantees.
 SNAPSHOT_SCOPE_INVALIDATION_ENABLED = os.getenv('SNAPSHOT_SCOPE_INVALIDATION_ENABLED', 'true').lower() == 'true'
 SNAPSHOT_INVALIDATION_CHANNEL = os.getenv('SNAPSHOT_INVALIDATION_CHANNEL', 'snapshot_invalidation')
@@ -734,6 +785,15 @@ CELERY_BEAT_SCHEDULE['network-graph-weekly-snapshot-scheduler'] = {
     'task': 'assignments.tasks.network_graph_weekly_snapshot_scheduler_task',
     'schedule': timedelta(minutes=int(os.getenv('NETWORK_GRAPH_SNAPSHOT_SCHEDULER_INTERVAL_MINUTES', '15'))),
 }
+CELERY_BEAT_SCHEDULE['overhead-assignment-sync'] = {
+    'task': 'assignments.tasks.sync_overhead_assignments_task',
+    'schedule': timedelta(hours=int(os.getenv('OVERHEAD_SYNC_INTERVAL_HOURS', '6'))),
+}
+CELERY_BEAT_SCHEDULE['week-partition-maintenance'] = {
+    'task': 'assignments.tasks.maintain_week_partitions_task',
+    'schedule': timedelta(hours=int(os.getenv('WEEK_PARTITION_MAINTENANCE_HOURS', '24'))),
+    'options': {'queue': 'db_maintenance'},
+}
 CELERY_BEAT_SCHEDULE['backup-automation-scheduler'] = {
     'task': 'core.backup_tasks.automatic_backup_scheduler_task',
     'schedule': timedelta(minutes=int(os.getenv('BACKUP_AUTOMATION_SCHEDULER_INTERVAL_MINUTES', '15'))),
@@ -15,7 +15,7 @@ from django.conf import settings
 from django.utils.module_loading import import_string
 import json
 from dashboard.views import DashboardView, DashboardBootstrapView
-from core.job_views import JobStatusView, JobDownloadView
+from core.job_views import JobStatusView, JobDownloadView, JobEventsView, JobStatusWaitView
 from core import backup_views as backups
 import os
 from accounts.token_views import (
@@ -244,6 +244,8 @@ urlpatterns = [
     # Async job status and file download
     path('api/jobs/<str:job_id>/', JobStatusView.as_view(), name='job_status'),
     path('api/jobs/<str:job_id>/download/', JobDownloadView.as_view(), name='job_download'),
+    path('api/jobs/<str:job_id>/wait/', JobStatusWaitView.as_view(), name='job_status_wait'),
+    path('api/jobs/<str:job_id>/events/', JobEventsView.as_view(), name='job_events'),
     # Database backups API
     path('api/backups/', backups.BackupListCreateView.as_view(), name='backups_list_create'),
     path('api/backups/status/', backups.BackupStatusView.as_view(), name='backups_status'),
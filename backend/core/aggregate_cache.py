@@ -0,0 +1,309 @@
+"""Two-tier cache facade for aggregate endpoints.
+
+Keys come from ``core.cache_keys.build_aggregate_cache_key``. Lookups go
+through a small per-process LRU first and the shared Django cache (Redis in
+production) second. Shared entries are stored as an envelope carrying a
+``fresh_until`` timestamp and are kept for ``ttl + stale_ttl`` seconds:
+
+- fresh hit: returned as is (and copied into the local tier);
+- stale hit: returned immediately while one caller per key (guarded by a
+  ``cache.add`` lock) schedules a rebuild. When the caller supplies a
+  ``RefreshSpec`` (a registered ``@aggregate_builder`` plus JSON kwargs) the
+  rebuild runs in Celery by calling that builder; otherwise the lock holder
+  rebuilds inline;
+- miss: concurrent callers in the same process coalesce on a single build
+  (followers block on an event, never sleep-poll). Callers in other processes
+  build independently instead of polling for the winner.
+
+Values are shared between callers of the local tier and must be treated as
+read-only.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from core.request_memo import memo_scope
+
+_FORCE_REFRESH: contextvars.ContextVar[bool] = contextvars.ContextVar('aggregate_cache_force_refresh', default=False)
+
+
+@dataclass(frozen=True)
+class CacheResult:
+    value: Any
+    # local | fresh | stale | coalesced | generated
+    state: str
+
+    @property
+    def hit(self) -> bool:
+        return self.state != 'generated'
+
+
+def aggregate_builder(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Mark ``fn`` as a payload builder background refreshes may call.
+
+    Builders are module-level functions taking only JSON-serializable keyword
+    arguments, so a worker can rebuild an entry without the original request.
+    """
+    fn._aggregate_builder = True  # type: ignore[attr-defined]
+    return fn
+
+
+@dataclass(frozen=True)
+class RefreshSpec:
+    """How to rebuild one cache entry: a registered builder and its kwargs."""
+
+    builder: str
+    kwargs: dict = field(default_factory=dict)
+    # Store ``encode_payload(value)`` instead of the payload (``:encoded`` entries).
+    encoded: bool = False
+
+    def build(self) -> Any:
+        fn = import_string(self.builder)
+        if not getattr(fn, '_aggregate_builder', False):
+            raise ValueError(f'{self.builder} is not an aggregate builder')
+        value = fn(**self.kwargs)
+        if self.encoded:
+            from core.encoded_responses import encode_payload
+            value = encode_payload(value)
+        return value
+
+    def as_encoded(self) -> 'RefreshSpec':
+        return replace(self, encoded=True)
+
+    def to_dict(self) -> dict:
+        return {'builder': self.builder, 'kwargs': self.kwargs, 'encoded': self.encoded}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RefreshSpec':
+        return cls(data['builder'], dict(data.get('kwargs') or {}), bool(data.get('encoded')))
+
+
+def refresh_spec(fn: Callable[..., Any], **kwargs) -> RefreshSpec:
+    """Describe ``fn(**kwargs)`` for ``get_or_build(refresh=...)``."""
+    return RefreshSpec(f'{fn.__module__}.{fn.__qualname__}', kwargs)
+
+
+class _Flight:
+    __slots__ = ('event', 'value', 'ok')
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+        self.ok = False
+
+
+class _LocalLRU:
+    def __init__(self) -> None:
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return False, None
+            expires_at, value = item
+            if expires_at <= now:
+                self._data.pop(key, None)
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: float, max_entries: int) -> None:
+        if ttl <= 0 or max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class AggregateCache:
+    def __init__(self, backend=None) -> None:
+        self._backend = backend
+        self._local = _LocalLRU()
+        self._inflight: dict[str, _Flight] = {}
+        self._inflight_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        return self._backend if self._backend is not None else cache
+
+    def _local_ttl(self) -> int:
+        return max(0, int(getattr(settings, 'AGGREGATE_LOCAL_CACHE_TTL_SECONDS', 2) or 0))
+
+    def _local_max_entries(self) -> int:
+        return max(0, int(getattr(settings, 'AGGREGATE_LOCAL_CACHE_MAX_ENTRIES', 64) or 0))
+
+    def _read(self, key: str) -> Optional[dict]:
+        try:
+            envelope = self.backend.get(key)
+        except Exception:
+            return None
+        if isinstance(envelope, dict) and '__aggregate__' in envelope:
+            return envelope
+        return None
+
+    def _store(self, key: str, value: Any, *, ttl: int, stale_ttl: int, jitter: int) -> None:
+        fresh = max(1, int(ttl) + (random.randint(-jitter, jitter) if jitter > 0 else 0))  # nosec B311
+        envelope = {'__aggregate__': 1, 'value': value, 'fresh_until': time.time() + fresh}
+        try:
+            self.backend.set(key, envelope, timeout=fresh + max(0, int(stale_ttl)))
+        except Exception:  # nosec B110
+            pass
+        self._local.set(key, value, min(self._local_ttl(), fresh), self._local_max_entries())
+
+    def _acquire_refresh_lock(self, key: str, lock_ttl: int) -> bool:
+        try:
+            return bool(self.backend.add(f'lock:{key}', '1', timeout=lock_ttl))
+        except Exception:
+            return False
+
+    def _release_refresh_lock(self, key: str) -> None:
+        try:
+            self.backend.delete(f'lock:{key}')
+        except Exception:  # nosec B110
+            pass
+
+    def get_or_build(
+        self,
+        key: str,
+        build: Callable[[], Any],
+        *,
+        ttl: int,
+        stale_ttl: int = 0,
+        lock_ttl: int | None = None,
+        jitter: int = 0,
+        refresh: RefreshSpec | None = None,
+    ) -> CacheResult:
+        """Return the cached value for ``key`` or build and store it.
+
+        ``refresh`` enables background refresh of stale entries through
+        ``core.tasks.refresh_aggregate_cache_task``; it must rebuild the same
+        value ``build`` does.
+        """
+        if lock_ttl is None:
+            lock_ttl = max(1, int(getattr(settings, 'AGGREGATE_CACHE_LOCK_SECONDS', 10) or 10))
+        if _FORCE_REFRESH.get():
+            try:
+                value = build()
+                self._store(key, value, ttl=ttl, stale_ttl=stale_ttl, jitter=jitter)
+            finally:
+                self._release_refresh_lock(key)
+            return CacheResult(value, 'generated')
+
+        found, value = self._local.get(key)
+        if found:
+            return CacheResult(value, 'local')
+
+        envelope = self._read(key)
+        if envelope is not None:
+            value = envelope.get('value')
+            fresh_for = float(envelope.get('fresh_until') or 0) - time.time()
+            if fresh_for > 0:
+                self._local.set(key, value, min(self._local_ttl(), fresh_for), self._local_max_entries())
+                return CacheResult(value, 'fresh')
+            if not self._acquire_refresh_lock(key, lock_ttl):
+                return CacheResult(value, 'stale')
+            if refresh is not None and enqueue_aggregate_refresh(
+                key, refresh, ttl=ttl, stale_ttl=stale_ttl, jitter=jitter,
+            ):
+                return CacheResult(value, 'stale')
+            try:
+                value = build()
+                self._store(key, value, ttl=ttl, stale_ttl=stale_ttl, jitter=jitter)
+            finally:
+                self._release_refresh_lock(key)
+            return CacheResult(value, 'generated')
+
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+        if not leader:
+            flight.event.wait(timeout=lock_ttl)
+            if flight.ok:
+                return CacheResult(flight.value, 'coalesced')
+            value = build()
+            self._store(key, value, ttl=ttl, stale_ttl=stale_ttl, jitter=jitter)
+            return CacheResult(value, 'generated')
+        try:
+            value = build()
+            flight.value = value
+            flight.ok = True
+            self._store(key, value, ttl=ttl, stale_ttl=stale_ttl, jitter=jitter)
+            return CacheResult(value, 'generated')
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def delete(self, key: str) -> None:
+        self._local.delete(key)
+        try:
+            self.backend.delete(key)
+        except Exception:  # nosec B110
+            pass
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+
+aggregate_cache = AggregateCache()
+
+
+@contextmanager
+def forced_refresh():
+    """Make ``get_or_build`` rebuild and overwrite instead of reading."""
+    token = _FORCE_REFRESH.set(True)
+    try:
+        yield
+    finally:
+        _FORCE_REFRESH.reset(token)
+
+
+def is_forced_refresh() -> bool:
+    return _FORCE_REFRESH.get()
+
+
+def enqueue_aggregate_refresh(key: str, spec: RefreshSpec, *, ttl: int, stale_ttl: int = 0, jitter: int = 0) -> bool:
+    """Queue a background rebuild of ``key``; False when Celery is unavailable."""
+    try:
+        from core.tasks import refresh_aggregate_cache_task
+    except Exception:
+        return False
+    try:
+        refresh_aggregate_cache_task.delay(key, spec.to_dict(), ttl, stale_ttl, jitter)
+        return True
+    except Exception:
+        return False
+
+
+def rebuild_aggregate_entry(key: str, spec: RefreshSpec, *, ttl: int, stale_ttl: int = 0, jitter: int = 0) -> Any:
+    """Run ``spec``'s builder and overwrite ``key``, releasing its refresh lock."""
+    with memo_scope(), forced_refresh():
+        return aggregate_cache.get_or_build(key, spec.build, ttl=ttl, stale_ttl=stale_ttl, jitter=jitter).value
@@ -0,0 +1,296 @@
+"""In-process benchmarks for service-layer hot paths.
+
+``run_suite`` seeds one deterministic dataset per scale with
+``core.load_test_data.LoadTestSeeder`` inside a transaction, times the
+registered service calls directly (no HTTP client, no DEBUG requirement)
+and rolls everything back. Per benchmark it reports
+wall time over several rounds, the query count of one round and the peak
+Python allocation of one round (``tracemalloc``).
+
+Reports can be saved as a JSON baseline and later compared with
+``compare_reports``; a benchmark regresses when its median time or peak
+memory grows beyond the relative threshold (times also need to grow by
+``min_time_delta_ms`` to filter out jitter) or it issues more queries.
+Driven by ``manage.py benchmark_services``; works on SQLite and PostgreSQL.
+"""
+from __future__ import annotations
+
+import statistics
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from time import perf_counter
+from typing import Any, Callable, Iterable, Optional
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.load_test_data import LoadTestSeeder, resolve_profile
+
+BENCH_PREFIX = 'BENCH_'
+
+# Scale name -> (seed profile, overrides). Every scale builds its own
+# verticals and departments so results do not depend on existing data.
+SCALES: dict[str, tuple[str, dict[str, int]]] = {
+    'xs': ('medium', dict(
+        manager_count=2, user_count=4, project_count=30, person_count=80, assignment_count=400,
+        week_count=12, history_weeks=8, hot_assignment_count=10, vertical_count=2, department_count=6,
+        deliverables_per_project=2, skill_count=10, skills_per_person=2, notifications_per_user=0,
+    )),
+    's': ('medium', dict(
+        manager_count=5, user_count=15, project_count=150, person_count=500, assignment_count=4000,
+        week_count=26, history_weeks=26, hot_assignment_count=50, vertical_count=3, department_count=20,
+        deliverables_per_project=3, skill_count=30, skills_per_person=3, notifications_per_user=0,
+    )),
+    'm': ('medium', dict(notifications_per_user=0)),
+    'l': ('enterprise', dict(notifications_per_user=0)),
+}
+
+# Result caches would turn every round after the first into a cache hit.
+UNCACHED_SETTINGS = dict(ROLE_CAPACITY_CACHE_TTL_SECONDS=0, NETWORK_GRAPH_CACHE_TTL_SECONDS=0)
+
+
+@dataclass
+class BenchContext:
+    seeder: LoadTestSeeder
+    scale: str
+    week_starts: list[date] = field(default_factory=list)
+    current_weeks: list[date] = field(default_factory=list)
+    project_ids: list[int] = field(default_factory=list)
+    person_ids: list[int] = field(default_factory=list)
+
+
+BenchFactory = Callable[[BenchContext], Callable[[], Any]]
+BENCHMARKS: dict[str, BenchFactory] = {}
+
+
+def benchmark(name: str) -> Callable[[BenchFactory], BenchFactory]:
+    """Register ``factory(ctx) -> callable``; the callable is what gets timed."""
+
+    def decorator(factory: BenchFactory) -> BenchFactory:
+        BENCHMARKS[name] = factory
+        return factory
+
+    return decorator
+
+
+@benchmark('rebuild_project_rollups')
+def _bench_rollups(ctx: BenchContext):
+    from assignments.rollup_service import rebuild_project_rollups
+
+    return lambda: rebuild_project_rollups(ctx.project_ids)
+
+
+@benchmark('write_weekly_assignment_snapshots')
+def _bench_snapshots(ctx: BenchContext):
+    from assignments.snapshot_service import write_weekly_assignment_snapshots
+
+    return lambda: write_weekly_assignment_snapshots(ctx.current_weeks[0])
+
+
+@benchmark('compute_role_capacity')
+def _bench_role_capacity(ctx: BenchContext):
+    from assignments.analytics import compute_role_capacity
+
+    return lambda: compute_role_capacity(None, ctx.current_weeks, None)
+
+
+@benchmark('evaluate_forecast_planner')
+def _bench_forecast_planner(ctx: BenchContext):
+    from reports.forecast_planner import build_scope, evaluate_forecast_planner, get_default_status_keys
+
+    scope = build_scope(weeks=len(ctx.current_weeks), department_id=None, include_children=False, vertical_id=None)
+    status_keys = get_default_status_keys()
+    return lambda: evaluate_forecast_planner(
+        scope=scope,
+        status_keys=status_keys,
+        projects_payload=[],
+        thresholds_payload=None,
+        use_probability_weighting=False,
+    )
+
+
+@benchmark('build_grid_snapshot_payload')
+def _bench_grid_snapshot(ctx: BenchContext):
+    from assignments.read_queries import build_grid_snapshot_payload
+    from people.models import Person
+
+    people_qs = Person.objects.filter(id__in=ctx.person_ids, is_active=True)
+    return lambda: build_grid_snapshot_payload(people_qs=people_qs, weeks=len(ctx.current_weeks))
+
+
+@benchmark('reallocate_weekly_hours')
+def _bench_reallocate(ctx: BenchContext):
+    from deliverables.reallocation import reallocate_weekly_hours
+
+    maps = [a.weekly_hours for a in ctx.seeder.assignments]
+    old = ctx.current_weeks[0]
+    new = old + timedelta(weeks=2)
+
+    def run():
+        for weekly_hours in maps:
+            reallocate_weekly_hours(weekly_hours, old, new)
+
+    return run
+
+
+def _network_bench(mode: str) -> BenchFactory:
+    def factory(ctx: BenchContext):
+        from core.models import NetworkGraphSettings
+        from reports.network_views import NetworkGraphView
+
+        view = NetworkGraphView()
+        settings_obj = NetworkGraphSettings.get_active()
+        qs = view._base_queryset(
+            settings_obj=settings_obj,
+            start_week=ctx.week_starts[0],
+            end_week=ctx.week_starts[-1],
+            vertical_id=None,
+            department_id=None,
+            include_children=False,
+            include_inactive=True,
+            client_name=None,
+        )
+        if mode == 'project_people':
+            return lambda: view._build_project_people(qs=qs)
+        builder = view._build_coworker if mode == 'coworker' else view._build_client_experience
+        return lambda: builder(qs=qs, settings_obj=settings_obj)
+
+    return factory
+
+
+for _mode in ('project_people', 'coworker', 'client_experience'):
+    benchmark(f'network_graph_{_mode}')(_network_bench(_mode))
+
+
+def measure(fn: Callable[[], Any], *, rounds: int = 5, warmup: int = 1) -> dict[str, Any]:
+    """Time ``fn`` and record one round's query count and peak allocation."""
+    for _ in range(max(0, warmup)):
+        fn()
+    times = []
+    for _ in range(max(1, rounds)):
+        started = perf_counter()
+        fn()
+        times.append((perf_counter() - started) * 1000.0)
+    with CaptureQueriesContext(connection) as ctx:
+        fn()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    if not was_tracing:
+        tracemalloc.stop()
+    return {
+        'rounds': len(times),
+        'min_ms': round(min(times), 3),
+        'median_ms': round(statistics.median(times), 3),
+        'mean_ms': round(statistics.fmean(times), 3),
+        'stdev_ms': round(statistics.stdev(times), 3) if len(times) > 1 else 0.0,
+        'queries': len(ctx.captured_queries),
+        'peak_kib': round(peak / 1024.0, 1),
+    }
+
+
+def _seed(scale: str, seed: int) -> BenchContext:
+    profile_name, overrides = SCALES[scale]
+    seeder = LoadTestSeeder(
+        prefix=f'{BENCH_PREFIX}{scale}_',
+        seed=seed,
+        profile=resolve_profile(profile_name, overrides),
+        password='bench-password',
+    )
+    seeder.run()
+    current = seeder.week_starts[seeder.current_week_index:]
+    return BenchContext(
+        seeder=seeder,
+        scale=scale,
+        week_starts=list(seeder.week_starts),
+        current_weeks=list(current),
+        project_ids=[p.id for p in seeder.projects],
+        person_ids=[p.id for p in seeder.people],
+    )
+
+
+class _Rollback(Exception):
+    pass
+
+
+def run_suite(
+    scales: Iterable[str],
+    *,
+    names: Optional[Iterable[str]] = None,
+    rounds: int = 5,
+    warmup: int = 1,
+    seed: int = 1,
+    on_result: Optional[Callable[[str, dict[str, Any]], None]] = None,
+) -> dict[str, Any]:
+    """Seed each scale, run the selected benchmarks and roll the data back.
+
+    Returns ``{'results': {'<scale>:<benchmark>': measurement, ...}, 'counts': {...}}``.
+    """
+    selected = list(names) if names else list(BENCHMARKS)
+    unknown = [n for n in selected if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"unknown benchmarks: {', '.join(unknown)}")
+    results: dict[str, Any] = {}
+    counts: dict[str, Any] = {}
+    for scale in scales:
+        if scale not in SCALES:
+            raise ValueError(f'unknown scale: {scale}')
+        try:
+            with override_settings(**UNCACHED_SETTINGS), transaction.atomic():
+                ctx = _seed(scale, seed)
+                counts[scale] = dict(ctx.seeder.counts)
+                for name in selected:
+                    fn = BENCHMARKS[name](ctx)
+                    key = f'{scale}:{name}'
+                    # Savepoint per benchmark keeps writes from leaking into the next one.
+                    sid = transaction.savepoint()
+                    try:
+                        results[key] = measure(fn, rounds=rounds, warmup=warmup)
+                    finally:
+                        transaction.savepoint_rollback(sid)
+                    if on_result is not None:
+                        on_result(key, results[key])
+                raise _Rollback
+        except _Rollback:
+            pass
+    return {'results': results, 'counts': counts}
+
+
+def compare_reports(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    time_threshold: float = 0.25,
+    memory_threshold: float = 0.25,
+    min_time_delta_ms: float = 2.0,
+) -> list[dict[str, Any]]:
+    """Return one entry per regressed metric of benchmarks present in both reports."""
+    regressions = []
+    base_results = baseline.get('results') or {}
+    for key, result in (current.get('results') or {}).items():
+        base = base_results.get(key)
+        if not base:
+            continue
+        checks = (
+            ('median_ms', max(
+                float(base.get('median_ms') or 0) * (1 + time_threshold),
+                float(base.get('median_ms') or 0) + min_time_delta_ms,
+            )),
+            ('peak_kib', float(base.get('peak_kib') or 0) * (1 + memory_threshold)),
+            ('queries', int(base.get('queries') or 0)),
+        )
+        for metric, limit in checks:
+            value = result.get(metric)
+            if value is not None and base.get(metric) is not None and value > limit:
+                regressions.append({
+                    'benchmark': key,
+                    'metric': metric,
+                    'baseline': base.get(metric),
+                    'current': value,
+                    'limit': round(limit, 3),
+                })
+    return regressions
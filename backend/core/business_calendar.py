@@ -0,0 +1,177 @@
+"""Precomputed business-day calendar for O(1) working-day arithmetic.
+
+``BusinessCalendar`` indexes every day of a fixed range (1990–2069 by
+default) with the cumulative number of working days up to and including that
+day, plus the ordered list of working days. Offsets and counts then reduce to
+index arithmetic:
+
+- ``count(a, b)`` = ``cum[b] - cum[a - 1]``
+- ``before(d, n)`` = the working day with ordinal ``cum[d - 1] - n``
+- ``after(d, n)`` = the working day with ordinal ``cum[d] + n``
+
+Working days are Monday–Friday minus the calendar's holidays. Dates outside
+the indexed range fall back to stepping one day at a time, so results never
+depend on the range. ``get_calendar()`` returns the process-wide calendar
+built from ``settings.BUSINESS_HOLIDAYS``; ``core.week_utils`` delegates to it.
+"""
+from __future__ import annotations
+
+from array import array
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Sequence, Union
+
+DEFAULT_START = date(1990, 1, 1)
+DEFAULT_END = date(2069, 12, 31)
+
+
+def _parse_holidays(values: Iterable[Union[date, str]]) -> frozenset[date]:
+    out = set()
+    for value in values or ():
+        if isinstance(value, date):
+            out.add(value)
+            continue
+        try:
+            out.add(date.fromisoformat(str(value).strip()))
+        except ValueError:
+            continue
+    return frozenset(out)
+
+
+class BusinessCalendar:
+    """Working-day index over ``[start, end]`` with optional holidays."""
+
+    def __init__(
+        self,
+        holidays: Iterable[Union[date, str]] = (),
+        *,
+        start: date = DEFAULT_START,
+        end: date = DEFAULT_END,
+    ):
+        if start > end:
+            raise ValueError("start cannot be after end")
+        self.start = start
+        self.end = end
+        self.holidays = _parse_holidays(holidays)
+        self._start_ordinal = start.toordinal()
+        size = end.toordinal() - self._start_ordinal + 1
+        # _cum[i] = working days in [start, start + i - 1]; _cum[0] = 0 so that
+        # "working days strictly before day i" is simply _cum[i].
+        self._cum = array('l', [0]) * (size + 1)
+        # _working[k] = day index of the (k + 1)-th working day in the range.
+        self._working = array('l')
+        running = 0
+        weekday = start.weekday()
+        for i in range(size):
+            if weekday < 5 and (not self.holidays or date.fromordinal(self._start_ordinal + i) not in self.holidays):
+                running += 1
+                self._working.append(i)
+            self._cum[i + 1] = running
+            weekday = (weekday + 1) % 7
+        self._size = size
+
+    def with_holidays(self, holidays: Iterable[Union[date, str]]) -> 'BusinessCalendar':
+        """Return a new calendar over the same range with ``holidays`` added."""
+        return BusinessCalendar(self.holidays | _parse_holidays(holidays), start=self.start, end=self.end)
+
+    # -- lookups ---------------------------------------------------------
+
+    def _index(self, d: date) -> Optional[int]:
+        i = d.toordinal() - self._start_ordinal
+        return i if 0 <= i < self._size else None
+
+    def _date(self, i: int) -> date:
+        return date.fromordinal(self._start_ordinal + i)
+
+    def is_working_day(self, d: date) -> bool:
+        return d.weekday() < 5 and d not in self.holidays
+
+    def before(self, d: date, business_days: int) -> date:
+        """The date ``business_days`` working days before ``d`` (``d`` itself when 0)."""
+        if business_days == 0:
+            return d
+        i = self._index(d)
+        if i is not None:
+            k = self._cum[i] - business_days
+            if k >= 0:
+                return self._date(self._working[k])
+        return self._step(d, business_days, -1)
+
+    def after(self, d: date, business_days: int) -> date:
+        """The date ``business_days`` working days after ``d`` (``d`` itself when 0)."""
+        if business_days == 0:
+            return d
+        i = self._index(d)
+        if i is not None:
+            k = self._cum[i + 1] + business_days - 1
+            if k < len(self._working):
+                return self._date(self._working[k])
+        return self._step(d, business_days, 1)
+
+    def count(self, start: date, end: date) -> int:
+        """Working days in ``[start, end]`` inclusive (0 when ``start > end``)."""
+        if start > end:
+            return 0
+        i, j = self._index(start), self._index(end)
+        if i is not None and j is not None:
+            return self._cum[j + 1] - self._cum[i]
+        total = 0
+        cur = start
+        while cur <= end:
+            if self.is_working_day(cur):
+                total += 1
+            cur += timedelta(days=1)
+        return total
+
+    def _step(self, d: date, business_days: int, direction: int) -> date:
+        cur = d
+        remaining = business_days
+        step = timedelta(days=direction)
+        while remaining > 0:
+            cur += step
+            if self.is_working_day(cur):
+                remaining -= 1
+        return cur
+
+    # -- vectorised forms ------------------------------------------------
+
+    def before_many(self, dates: Sequence[date], business_days: Union[int, Sequence[int]]) -> List[date]:
+        """``before`` for each date; ``business_days`` is one count or one per date."""
+        counts = _broadcast(business_days, len(dates))
+        return [self.before(d, n) for d, n in zip(dates, counts)]
+
+    def after_many(self, dates: Sequence[date], business_days: Union[int, Sequence[int]]) -> List[date]:
+        """``after`` for each date; ``business_days`` is one count or one per date."""
+        counts = _broadcast(business_days, len(dates))
+        return [self.after(d, n) for d, n in zip(dates, counts)]
+
+
+def _broadcast(value: Union[int, Sequence[int]], size: int) -> Sequence[int]:
+    if isinstance(value, int):
+        return [value] * size
+    if len(value) != size:
+        raise ValueError("business_days must be an int or match the number of dates")
+    return value
+
+
+_calendar: Optional[BusinessCalendar] = None
+
+
+def get_calendar() -> BusinessCalendar:
+    """Process-wide calendar using ``settings.BUSINESS_HOLIDAYS``."""
+    global _calendar
+    if _calendar is None:
+        holidays: Iterable = ()
+        try:
+            from django.conf import settings
+
+            holidays = getattr(settings, 'BUSINESS_HOLIDAYS', ()) or ()
+        except Exception:  # nosec B110
+            pass
+        _calendar = BusinessCalendar(holidays)
+    return _calendar
+
+
+def reset_calendar() -> None:
+    """Drop the cached calendar so the next ``get_calendar()`` rereads settings."""
+    global _calendar
+    _calendar = None
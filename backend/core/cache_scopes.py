@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import time
+from datetime import datetime, timezone
 from typing import Iterable
 
 from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
 
 
 def _channel_namespace() -> str:
@@ -15,6 +18,14 @@ def _scope_key(scope: str, token: str) -> str:
     return f"{_channel_namespace()}:snapshot_scope_version:{scope}:{token}"
 
 
+def _changed_at_key(scope: str, token: str) -> str:
+    return f"{_channel_namespace()}:snapshot_scope_changed_at:{scope}:{token}"
+
+
+def _epoch_key() -> str:
+    return f"{_channel_namespace()}:snapshot_scope_epoch"
+
+
 def _incr_key(key: str) -> int:
     try:
         return int(cache.incr(key))
@@ -32,6 +43,27 @@ def get_snapshot_scope_version(scope: str, token: str = "global") -> int:
         return 1
 
 
+def _bump_scopes(scopes: list[tuple[str, str]]) -> None:
+    reseeded = False
+    for scope, token in scopes:
+        key = _scope_key(scope, token)
+        try:
+            cache.incr(key)
+        except Exception:
+            # Counter missing (first bump or evicted): restart it under a new
+            # epoch so change sequences never repeat.
+            _incr_key(key)
+            reseeded = True
+    try:
+        now = time.time()
+        stamps = {_changed_at_key(scope, token): now for scope, token in scopes}
+        if reseeded:
+            stamps[_epoch_key()] = now
+        cache.set_many(stamps, None)
+    except Exception:  # nosec B110
+        pass
+
+
 def bump_snapshot_scopes(
     *,
     project_ids: Iterable[int] | None = None,
@@ -39,11 +71,62 @@ def bump_snapshot_scopes(
 ) -> None:
     if not getattr(settings, "SNAPSHOT_SCOPE_INVALIDATION_ENABLED", True):
         return
-    _incr_key(_scope_key("global", "global"))
-    for project_id in set(int(v) for v in (project_ids or []) if v):
-        _incr_key(_scope_key("project", str(project_id)))
-    for department_id in set(int(v) for v in (department_ids or []) if v):
-        _incr_key(_scope_key("department", str(department_id)))
+    scopes = [("global", "global")]
+    scopes += [("project", str(v)) for v in sorted(set(int(v) for v in (project_ids or []) if v))]
+    scopes += [("department", str(v)) for v in sorted(set(int(v) for v in (department_ids or []) if v))]
+    # Bump now so this process stops serving the old entries, and again after
+    # commit so validators/keys taken from pre-commit rows are discarded.
+    _bump_scopes(scopes)
+    try:
+        transaction.on_commit(lambda: _bump_scopes(scopes))
+    except Exception:  # nosec B110
+        pass
+    try:
+        from core.snapshot_warming import queue_snapshot_warming
+        queue_snapshot_warming()
+    except Exception:  # nosec B110
+        pass
+
+
+def bump_weekly_snapshot_version() -> int:
+    """Mark weekly assignment snapshot rows as changed.
+
+    Snapshot-derived reports (network graph) key their caches on this marker
+    instead of the global scope so live assignment edits do not evict them.
+    """
+    return _incr_key(_scope_key("weekly_snapshots", "global"))
+
+
+def scope_change_validators(scopes: Iterable[tuple[str, str]]) -> tuple[str, datetime | None] | None:
+    """Return ``(sequence, last_modified)`` for the given scopes from the cache alone.
+
+    ``sequence`` joins the per-scope change counters with a cache epoch, so it
+    changes whenever any of the scopes is bumped and never repeats after the
+    counters are lost (cache flush/eviction). ``last_modified`` is the latest
+    bump time among the scopes, or the epoch when none has been bumped yet.
+    Returns None when scope invalidation is disabled or the cache is unusable;
+    callers should then fall back to computing validators from the database.
+    """
+    if not getattr(settings, "SNAPSHOT_SCOPE_INVALIDATION_ENABLED", True):
+        return None
+    scopes = sorted(set(scopes)) or [("global", "global")]
+    version_keys = [_scope_key(scope, token) for scope, token in scopes]
+    changed_keys = [_changed_at_key(scope, token) for scope, token in scopes]
+    try:
+        values = cache.get_many([_epoch_key(), *version_keys, *changed_keys])
+        epoch = values.get(_epoch_key())
+        if epoch is None:
+            cache.add(_epoch_key(), time.time(), None)
+            epoch = cache.get(_epoch_key())
+        if epoch is None:
+            return None
+    except Exception:
+        return None
+    parts = [f"{scope}:{token}={int(values.get(key, 1) or 1)}" for (scope, token), key in zip(scopes, version_keys)]
+    sequence = f"{float(epoch):.6f}|" + ",".join(parts)
+    changed = [float(values[key]) for key in changed_keys if values.get(key) is not None]
+    last_modified_ts = max(changed + [float(epoch)])
+    return sequence, datetime.fromtimestamp(last_modified_ts, tz=timezone.utc)
 
 
 def request_scope_version(request) -> int:
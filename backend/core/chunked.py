@@ -0,0 +1,77 @@
+"""Memory-bounded iteration over large querysets.
+
+Background jobs should never ``list()`` a whole table. ``iter_keyset_chunks``
+walks a queryset in primary-key order with ``WHERE key > last ORDER BY key
+LIMIT n`` queries, so each round trip holds at most ``chunk_size`` rows and
+nothing stays open between chunks (safe with transaction-pooling proxies,
+unlike server-side cursors, and stable while rows are being written).
+Combine it with ``values_list`` projections to avoid building model
+instances at all.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Sequence, TypeVar
+
+from django.db.models.query import FlatValuesListIterable, ModelIterable, ValuesIterable
+
+DEFAULT_CHUNK_SIZE = 2000
+
+T = TypeVar('T')
+
+
+def _key_getter(queryset, key: str):
+    iterable = getattr(queryset, '_iterable_class', ModelIterable)
+    fields: Sequence[str] = getattr(queryset, '_fields', ()) or ()
+    if issubclass(iterable, ModelIterable):
+        attr = 'pk' if key in ('pk', 'id') else key
+        return lambda row: getattr(row, attr)
+    if key not in fields:
+        raise ValueError(f"keyset field {key!r} must be selected in values()/values_list()")
+    if issubclass(iterable, FlatValuesListIterable):
+        return lambda row: row
+    if issubclass(iterable, ValuesIterable):
+        return lambda row: row[key]
+    index = list(fields).index(key)
+    return lambda row: row[index]
+
+
+def iter_keyset_chunks(queryset, *, chunk_size: int = DEFAULT_CHUNK_SIZE, key: str = 'pk') -> Iterator[list]:
+    """Yield lists of at most ``chunk_size`` rows from ``queryset`` in ``key`` order.
+
+    ``queryset`` may be a model, ``values()`` or ``values_list()`` queryset;
+    for the latter two ``key`` (normally ``'id'``) must be one of the selected
+    fields. Any existing ordering is replaced by ``key``.
+    """
+    chunk_size = max(1, int(chunk_size))
+    ordered = queryset.order_by(key)
+    get_key = _key_getter(ordered, key)
+    lookup = f'{key}__gt'
+    last = None
+    while True:
+        page = ordered if last is None else ordered.filter(**{lookup: last})
+        rows = list(page[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last = get_key(rows[-1])
+
+
+def iter_keyset(queryset, *, chunk_size: int = DEFAULT_CHUNK_SIZE, key: str = 'pk') -> Iterator[Any]:
+    """Row-by-row form of ``iter_keyset_chunks``."""
+    for rows in iter_keyset_chunks(queryset, chunk_size=chunk_size, key=key):
+        yield from rows
+
+
+def chunked(values: Iterable[T], size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list[T]]:
+    """Split any iterable (e.g. a list of ids) into lists of at most ``size``."""
+    size = max(1, int(size))
+    batch: list[T] = []
+    for value in values:
+        batch.append(value)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,161 @@
+"""Opt-in columnar wire format for large week-matrix endpoints.
+
+``grid_snapshot`` and ``capacity_heatmap`` normally return one JSON object per
+person keyed by ISO week strings. The columnar representation sends the week
+keys once, people as parallel arrays and hours as either a dense matrix
+(``hours[personIndex][weekIndex]``) or sparse triplets, whichever is smaller.
+
+Clients opt in with ``?format=columnar`` or
+``Accept: application/vnd.workload.columnar+json``. Bodies go through
+``cached_encoded_response`` (keyed by ETag), so they share the JSON bodies'
+byte cache, gzip policy and conditional handling.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Iterable, Optional
+
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from core.encoded_responses import cached_encoded_response
+
+COLUMNAR_MEDIA_TYPE = 'application/vnd.workload.columnar+json'
+COLUMNAR_FORMAT = 'columnar'
+# Below this fill ratio the sparse triplet encoding is smaller than a dense matrix.
+DENSE_MIN_FILL_RATIO = 0.4
+ENCODED_CACHE_TTL_SECONDS = 60
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """Negotiation hook for the columnar representation (body is plain JSON)."""
+
+    media_type = COLUMNAR_MEDIA_TYPE
+    format = COLUMNAR_FORMAT
+
+
+def columnar_renderer_classes() -> list:
+    """Default renderers plus the columnar one (JSON stays the default)."""
+    return list(api_settings.DEFAULT_RENDERER_CLASSES) + [ColumnarJSONRenderer]
+
+
+def wants_columnar(request) -> bool:
+    renderer = getattr(request, 'accepted_renderer', None)
+    return getattr(renderer, 'format', None) == COLUMNAR_FORMAT
+
+
+def columnar_etag(etag: str) -> str:
+    """Derive a distinct validator so JSON and columnar bodies never share an ETag."""
+    return hashlib.sha256(f"{etag}:{COLUMNAR_FORMAT}".encode()).hexdigest()
+
+
+def encode_week_matrix(
+    row_maps: Iterable[Optional[dict]],
+    week_keys: list[str],
+) -> dict[str, Any]:
+    """Encode per-row ``{weekKey: value}`` maps against ``week_keys``.
+
+    Returns ``{'encoding': 'dense', 'values': [[...], ...]}`` or
+    ``{'encoding': 'sparse', 'row': [...], 'week': [...], 'values': [...]}``.
+    Zero/missing cells are omitted from the sparse form.
+    """
+    week_index = {wk: idx for idx, wk in enumerate(week_keys)}
+    rows_i: list[int] = []
+    weeks_i: list[int] = []
+    values: list[float] = []
+    row_count = 0
+    for row_idx, mapping in enumerate(row_maps):
+        row_count = row_idx + 1
+        if not isinstance(mapping, dict):
+            continue
+        for wk, raw in mapping.items():
+            col = week_index.get(str(wk))
+            if col is None:
+                continue
+            try:
+                value = round(float(raw or 0), 2)
+            except (TypeError, ValueError):
+                continue
+            if value == 0.0:
+                continue
+            rows_i.append(row_idx)
+            weeks_i.append(col)
+            values.append(value)
+    cells = row_count * len(week_keys)
+    if cells and len(values) >= cells * DENSE_MIN_FILL_RATIO:
+        dense = [[0.0] * len(week_keys) for _ in range(row_count)]
+        for r, c, v in zip(rows_i, weeks_i, values):
+            dense[r][c] = v
+        return {'encoding': 'dense', 'values': dense}
+    return {'encoding': 'sparse', 'row': rows_i, 'week': weeks_i, 'values': values}
+
+
+def grid_snapshot_to_columnar(payload: dict) -> dict:
+    week_keys = [str(wk) for wk in (payload.get('weekKeys') or [])]
+    people = payload.get('people') or []
+    hours_by_person = payload.get('hoursByPerson') or {}
+    ids = [p.get('id') for p in people]
+    return {
+        'format': COLUMNAR_FORMAT,
+        'weekKeys': week_keys,
+        'people': {
+            'id': ids,
+            'name': [p.get('name') for p in people],
+            'weeklyCapacity': [p.get('weeklyCapacity') for p in people],
+            'department': [p.get('department') for p in people],
+            'firstEligibleWeek': [p.get('firstEligibleWeek') for p in people],
+        },
+        'hours': encode_week_matrix(
+            (hours_by_person.get(pid, hours_by_person.get(str(pid))) for pid in ids),
+            week_keys,
+        ),
+    }
+
+
+def capacity_heatmap_to_columnar(items: list[dict]) -> dict:
+    """Columnar heatmap; percent/available maps are derivable from hours and capacity."""
+    week_keys: list[str] = []
+    for item in items:
+        if item.get('weekKeys'):
+            week_keys = [str(wk) for wk in item['weekKeys']]
+            break
+    week_index = {wk: idx for idx, wk in enumerate(week_keys)}
+    peak_week: list[Optional[int]] = []
+    peak_pct: list[Any] = []
+    for item in items:
+        peak = item.get('peak') or {}
+        peak_week.append(week_index.get(peak.get('weekKey')))
+        peak_pct.append(peak.get('percentage'))
+    return {
+        'format': COLUMNAR_FORMAT,
+        'weekKeys': week_keys,
+        'people': {
+            'id': [item.get('id') for item in items],
+            'name': [item.get('name') for item in items],
+            'weeklyCapacity': [item.get('weeklyCapacity') for item in items],
+            'department': [item.get('department') for item in items],
+            'averagePercentage': [item.get('averagePercentage') for item in items],
+            'peakWeekIndex': peak_week,
+            'peakPercentage': peak_pct,
+        },
+        'hours': encode_week_matrix((item.get('weekTotals') for item in items), week_keys),
+    }
+
+
+def columnar_response(request, *, endpoint: str, etag: str, build) -> HttpResponse:
+    """Return the columnar body for ``etag`` from the shared encoded-bytes cache.
+
+    ``build`` is called only on a cache miss and must return the columnar
+    dict. Entries are keyed by ETag, so stale bodies are never served.
+    """
+    response, _ = cached_encoded_response(
+        request,
+        f'columnar:{endpoint}:{etag}',
+        build,
+        ttl=ENCODED_CACHE_TTL_SECONDS,
+        etag=etag,
+        content_type=COLUMNAR_MEDIA_TYPE,
+    )
+    return response
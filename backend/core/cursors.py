@@ -0,0 +1,166 @@
+"""Opaque cursor tokens and keyset pagination helpers."""
+
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from django.db.models import F, OrderBy, Q
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encode a keyset position (list of JSON-safe sort values) as a URL-safe token."""
+    raw = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[list[Any]]:
+    """Decode a cursor produced by ``encode_cursor``; returns None when invalid."""
+    if not token:
+        return None
+    try:
+        padded = str(token) + "=" * (-len(str(token)) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception:
+        return None
+    if not isinstance(values, list):
+        return None
+    return values
+
+
+# --- Keyset pagination over ordered querysets --------------------------------
+
+@dataclass
+class KeysetPage:
+    """One keyset page; also quacks like Paginator (``count``) and Page (``object_list``)."""
+
+    object_list: list
+    count: Optional[int]
+    next_cursor: Optional[str]
+    previous_cursor: Optional[str]
+
+
+def _ordering_terms(queryset) -> list[tuple[str, Any, bool]]:
+    """Return (alias, expression, descending) for the queryset ordering, ending on pk."""
+    items = list(queryset.query.order_by) or list(queryset.model._meta.ordering or [])
+    terms: list[tuple[str, Any, bool]] = []
+    has_pk = False
+    for idx, item in enumerate(items):
+        alias = f"keyset_{idx}"
+        if isinstance(item, str):
+            desc = item.startswith('-')
+            name = item.lstrip('-')
+            if name in ('id', 'pk'):
+                has_pk = True
+            terms.append((alias, F(name), desc))
+        elif isinstance(item, OrderBy):
+            terms.append((alias, item.expression, bool(item.descending)))
+        else:
+            terms.append((alias, item, False))
+    if not has_pk:
+        terms.append((f"keyset_{len(terms)}", F('pk'), False))
+    return terms
+
+
+def _after_q(alias: str, value: Any, desc: bool, reverse: bool) -> Optional[Q]:
+    """Rows strictly after ``value`` on one term; forward order puts NULLs last."""
+    if not reverse:
+        if value is None:
+            return None
+        return Q(**{f"{alias}__{'lt' if desc else 'gt'}": value}) | Q(**{f"{alias}__isnull": True})
+    if value is None:
+        return Q(**{f"{alias}__isnull": False})
+    return Q(**{f"{alias}__{'gt' if desc else 'lt'}": value})
+
+
+def _equal_q(alias: str, value: Any) -> Q:
+    if value is None:
+        return Q(**{f"{alias}__isnull": True})
+    return Q(**{alias: value})
+
+
+def _keyset_q(terms, values: list, reverse: bool) -> Q:
+    clause = Q(pk__in=[])
+    prefix = Q()
+    for (alias, _expr, desc), value in zip(terms, values):
+        after = _after_q(alias, value, desc, reverse)
+        if after is not None:
+            clause |= prefix & after
+        prefix &= _equal_q(alias, value)
+    return clause
+
+
+def paginate_keyset(queryset, cursor: Optional[str], page_size: int) -> KeysetPage:
+    """Return one page of ``queryset`` after/before an opaque ``cursor``.
+
+    Cursors encode the boundary row's ordering values plus the total count
+    computed on the first page, so later pages run no ``COUNT(*)`` and no
+    ``OFFSET`` scan. Undecodable or stale cursors restart at the first page.
+    """
+    terms = _ordering_terms(queryset)
+    state = decode_cursor(cursor)
+    direction, count, values = 'n', None, None
+    if state and len(state) == 3 and state[0] in ('n', 'p') and isinstance(state[2], list) \
+            and len(state[2]) == len(terms):
+        direction, count, values = state
+    reverse = direction == 'p'
+
+    ordered = queryset.annotate(**{alias: expr for alias, expr, _desc in terms})
+    order_by = []
+    for alias, _expr, desc in terms:
+        if reverse:
+            order_by.append(F(alias).asc(nulls_first=True) if desc else F(alias).desc(nulls_first=True))
+        else:
+            order_by.append(F(alias).desc(nulls_last=True) if desc else F(alias).asc(nulls_last=True))
+    ordered = ordered.order_by(*order_by)
+
+    rows = None
+    if values is not None:
+        try:
+            rows = list(ordered.filter(_keyset_q(terms, values, reverse))[:page_size + 1])
+        except Exception:
+            direction, count, values, reverse = 'n', None, None, False
+    if rows is None:
+        rows = list(ordered[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+
+    if not isinstance(count, int):
+        count = queryset.count()
+
+    def _boundary(obj) -> list:
+        return [getattr(obj, alias, None) for alias, _expr, _desc in terms]
+
+    next_cursor = previous_cursor = None
+    if rows:
+        if has_more or reverse:
+            next_cursor = encode_cursor(['n', count, _boundary(rows[-1])])
+        if (values is not None and not reverse) or (reverse and has_more):
+            previous_cursor = encode_cursor(['p', count, _boundary(rows[0])])
+    return KeysetPage(object_list=rows, count=count, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+
+def requested_cursor(request, payload: Optional[dict]) -> tuple[bool, Optional[str]]:
+    """Return (cursor mode requested, token) from a POST body or query string."""
+    if isinstance(payload, dict) and 'cursor' in payload:
+        return True, payload.get('cursor') or None
+    if 'cursor' in request.query_params:
+        return True, request.query_params.get('cursor') or None
+    return False, None
+
+
+def cursor_page_url(request, token: Optional[str], page_size: int) -> Optional[str]:
+    if not token:
+        return None
+    try:
+        params = request.query_params.copy()
+        params.pop('page', None)
+        params['cursor'] = token
+        params['page_size'] = str(page_size)
+        return f"{request.build_absolute_uri(request.path)}?{params.urlencode()}"
+    except Exception:
+        return None
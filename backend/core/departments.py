@@ -1,19 +1,32 @@
 """
 Shared department helpers (BFS include-children expansion).
 """
-from typing import List
+from typing import Dict, List
+
+from core.request_memo import request_memoized
+
+
+@request_memoized(invalidated_by=('departments.Department',))
+def department_children_map() -> Dict[int, List[int]]:
+    """Map each parent ``Department`` ID to its child IDs (one query per request)."""
+    from departments.models import Department
+
+    children: Dict[int, List[int]] = {}
+    for dept_id, parent_id in Department.objects.values_list('id', 'parent_department_id'):
+        children.setdefault(parent_id, []).append(dept_id)
+    return children
 
 
 def get_descendant_department_ids(root_id: int) -> List[int]:
     """Return a list of ``Department`` IDs including the root and all descendants.
 
-    Uses an explicit BFS to avoid recursion depth issues and to keep queries
-    predictable. Import is inside the function to avoid circular imports.
+    Walks ``department_children_map`` with an explicit BFS to avoid recursion
+    depth issues; the map is loaded once per request/task scope.
     """
     if root_id is None:
         return []
     try:
-        from departments.models import Department
+        children = department_children_map()
     except Exception:
         return [root_id]
 
@@ -24,8 +37,7 @@ def get_descendant_department_ids(root_id: int) -> List[int]:
         if cur in ids:
             continue
         ids.add(cur)
-        for d in Department.objects.filter(parent_department_id=cur).values_list('id', flat=True):
+        for d in children.get(cur, ()):
             if d not in ids:
                 stack.append(d)
     return list(ids)
-
@@ -0,0 +1,107 @@
+"""Cache final response bytes for hot snapshot endpoints.
+
+On a hit the view returns the stored bytes as an ``HttpResponse`` without
+unpickling a payload dict or running DRF's renderer. Each entry holds the
+identity body, a gzip body (when large enough to be worth it) and a strong
+ETag derived from the identity bytes, so one build serves both kinds of
+clients and ``If-None-Match`` can be answered from the cache alone.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.renderers import JSONRenderer
+
+GZIP_MIN_BYTES = 1024
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    identity: bytes
+    gzipped: Optional[bytes]
+    etag: str
+
+
+def accepts_gzip(request) -> bool:
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '') or ''
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        if token.strip().lower() == 'gzip':
+            return params.replace(' ', '') not in ('q=0', 'q=0.0')
+    return False
+
+
+def encode_payload(payload: Any) -> EncodedBody:
+    """Render ``payload`` exactly as DRF's JSON renderer would and pre-compress it."""
+    body = JSONRenderer().render(payload)
+    gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+    return EncodedBody(identity=body, gzipped=gzipped, etag=hashlib.sha256(body).hexdigest())
+
+
+def encoded_response(
+    request,
+    encoded: EncodedBody,
+    *,
+    etag: str | None = None,
+    content_type: str = 'application/json',
+) -> HttpResponse:
+    """Serve ``encoded`` bytes, honouring ``If-None-Match`` and ``Accept-Encoding``."""
+    etag = etag or encoded.etag
+    inm = request.META.get('HTTP_IF_NONE_MATCH')
+    if inm and inm.strip('"') == etag:
+        response = HttpResponseNotModified()
+        response['ETag'] = f'"{etag}"'
+        return response
+    if encoded.gzipped is not None and accepts_gzip(request):
+        response = HttpResponse(encoded.gzipped, content_type=content_type)
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(encoded.identity, content_type=content_type)
+    response['Vary'] = 'Accept-Encoding'
+    response['ETag'] = f'"{etag}"'
+    return response
+
+
+def encoded_cache_key(cache_key: str) -> str:
+    return f'{cache_key}:encoded'
+
+
+def cached_encoded_response(
+    request,
+    cache_key: str,
+    build: Callable[[], Any],
+    *,
+    ttl: int,
+    stale_ttl: int = 0,
+    etag: str | None = None,
+    refresh=None,
+    warm_key=None,
+    content_type: str = 'application/json',
+):
+    """Return ``(response, CacheResult)`` for ``build()`` cached as encoded bytes.
+
+    Entries live next to the payload cache key under ``<cache_key>:encoded``
+    and go through the aggregate cache facade (local tier, single-flight, SWR).
+    ``refresh`` is the payload's ``RefreshSpec``; ``warm_key`` is a spec that
+    resolves the current ``cache_key`` and opts the entry into snapshot warming.
+    """
+    from core.aggregate_cache import aggregate_cache
+
+    key = encoded_cache_key(cache_key)
+    spec = refresh.as_encoded() if refresh is not None else None
+    if warm_key is not None and spec is not None:
+        from core.snapshot_warming import record_snapshot_build
+        record_snapshot_build(warm_key, spec, ttl=ttl, stale_ttl=stale_ttl)
+    result = aggregate_cache.get_or_build(
+        key,
+        lambda: encode_payload(build()),
+        ttl=ttl,
+        stale_ttl=stale_ttl,
+        refresh=spec,
+    )
+    return encoded_response(request, result.value, etag=etag, content_type=content_type), result
@@ -1,10 +1,46 @@
-from django.utils.http import http_date
+from django.utils.http import http_date, parse_http_date
 from rest_framework.response import Response
 from rest_framework import status
 from django.http import HttpResponseNotModified
 import hashlib
 
 
+def scope_validators(seed: str, scopes):
+    """Return ``(etag, last_modified)`` for a scoped collection without SQL.
+
+    ``seed`` carries the request shape (filters, weeks, ...) and ``scopes`` the
+    ``(scope, token)`` pairs from ``core.cache_scopes`` whose change sequence
+    covers the response. Returns None when sequences are unavailable.
+    """
+    from core.cache_scopes import scope_change_validators
+
+    state = scope_change_validators(scopes)
+    if state is None:
+        return None
+    sequence, last_modified = state
+    return hashlib.sha256(f"{seed}|{sequence}".encode()).hexdigest(), last_modified
+
+
+def not_modified_response(request, etag: str, last_modified=None):
+    """Return a 304 when ``If-None-Match``/``If-Modified-Since`` match, else None."""
+    inm = request.META.get('HTTP_IF_NONE_MATCH')
+    matched = bool(inm) and inm.strip('"') == etag
+    if not matched and not inm and last_modified is not None:
+        ims = request.META.get('HTTP_IF_MODIFIED_SINCE')
+        if ims:
+            try:
+                matched = int(last_modified.timestamp()) <= parse_http_date(ims)
+            except Exception:
+                matched = False
+    if not matched:
+        return None
+    resp = HttpResponseNotModified()
+    resp['ETag'] = f'"{etag}"'
+    if last_modified is not None:
+        resp['Last-Modified'] = http_date(last_modified.timestamp())
+    return resp
+
+
 class ETagConditionalMixin:
     """Adds ETag on detail GET and optional If-Match handling on mutations.
 
@@ -41,12 +77,7 @@ class ETagConditionalMixin:
         current_etag = self._compute_etag_from_instance(instance)
         inm = request.META.get('HTTP_IF_NONE_MATCH')
         if inm and inm.strip('"') == current_etag:
-            resp = HttpResponseNotModified()
-            resp['ETag'] = f'"{current_etag}"'
-            lm = getattr(instance, 'updated_at', None)
-            if lm:
-                resp['Last-Modified'] = http_date(lm.timestamp())
-            return resp
+            return not_modified_response(request, current_etag, getattr(instance, 'updated_at', None))
         response: Response = super().retrieve(request, *args, **kwargs)  # type: ignore
         self._attach_etag_headers(response, instance)
         return response
@@ -0,0 +1,245 @@
+"""Job progress bus: tasks publish progress, clients subscribe over SSE.
+
+``report_progress`` keeps Celery's ``update_state`` meta (so
+``JobStatusView`` polling still works) and also publishes the event on the
+Redis channel ``job_progress:<job_id>``, and keeps the latest event in the
+cache so late subscribers start from the current state. A ``task_postrun``
+hook publishes the terminal SUCCESS/FAILURE event for jobs that reported
+progress.
+
+``iter_job_events``/``aiter_job_events`` yield events for one job. They use
+Redis pub/sub when ``REDIS_URL`` is configured and otherwise poll the cached
+latest event (cache reads only, never the DB or the Celery result backend).
+They yield ``None`` as a heartbeat when nothing happened for
+``JOB_EVENTS_HEARTBEAT_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:  # pragma: no cover - defensive import
+    from celery.signals import task_postrun  # type: ignore
+except Exception:  # pragma: no cover
+    task_postrun = None  # type: ignore
+
+TERMINAL_STATES = frozenset({'SUCCESS', 'FAILURE', 'REVOKED'})
+POLL_INTERVAL_SECONDS = 0.5
+
+
+def _setting(name: str, default: int) -> int:
+    try:
+        return max(0, int(getattr(settings, name, default)))
+    except Exception:
+        return default
+
+
+def _channel(job_id: str) -> str:
+    return f'job_progress:{job_id}'
+
+
+def _last_key(job_id: str) -> str:
+    return f'job_progress:last:{job_id}'
+
+
+def _redis_url() -> Optional[str]:
+    return getattr(settings, 'REDIS_URL', None) or None
+
+
+_client_lock = threading.Lock()
+_client: Optional[tuple[str, Any]] = None
+
+
+def _redis_client():
+    """Process-wide sync client for ``REDIS_URL``; its pool is reused by every publish."""
+    global _client
+    url = _redis_url()
+    if not url:
+        return None
+    cached = _client
+    if cached is not None and cached[0] == url:
+        return cached[1]
+    with _client_lock:
+        if _client is None or _client[0] != url:
+            try:
+                import redis  # type: ignore
+
+                _client = (url, redis.Redis.from_url(url, socket_connect_timeout=1))
+            except Exception:
+                return None
+        return _client[1]
+
+
+def latest_job_event(job_id: str) -> Optional[dict[str, Any]]:
+    try:
+        event = cache.get(_last_key(job_id))
+    except Exception:
+        return None
+    return event if isinstance(event, dict) else None
+
+
+def publish_job_event(job_id: str, state: str, progress: int = 0, message: str | None = None, **extra: Any) -> dict[str, Any]:
+    """Store ``job_id``'s latest event and publish it on the progress channel."""
+    event = {'id': job_id, 'state': state, 'progress': int(progress or 0), 'message': message, **extra}
+    try:
+        cache.set(_last_key(job_id), event, _setting('JOB_PROGRESS_TTL_SECONDS', 3600) or None)
+    except Exception:  # nosec B110
+        pass
+    client = _redis_client()
+    if client is not None:
+        try:
+            client.publish(_channel(job_id), json.dumps(event, default=str))
+        except Exception:  # nosec B110
+            pass
+    return event
+
+
+def report_progress(task, state: str, progress: int, message: str | None = None) -> None:
+    """Drop-in for ``task.update_state(state=..., meta={'progress': ..., 'message': ...})``."""
+    meta: dict[str, Any] = {'progress': progress}
+    if message is not None:
+        meta['message'] = message
+    try:
+        task.update_state(state=state, meta=meta)
+    except Exception:  # nosec B110
+        pass
+    job_id = getattr(getattr(task, 'request', None), 'id', None)
+    if job_id:
+        publish_job_event(job_id, state, progress, message)
+
+
+def _on_task_postrun(sender=None, task_id=None, retval=None, state=None, **kwargs):
+    if not task_id or state not in TERMINAL_STATES or latest_job_event(task_id) is None:
+        return
+    download_ready = state == 'SUCCESS' and isinstance(retval, dict) and retval.get('type') == 'file' and bool(retval.get('path'))
+    publish_job_event(
+        task_id,
+        state,
+        100 if state == 'SUCCESS' else 0,
+        None if state == 'SUCCESS' else (str(retval) if retval else 'Task failed'),
+        downloadReady=download_ready,
+    )
+
+
+if task_postrun is not None:
+    task_postrun.connect(_on_task_postrun, weak=False, dispatch_uid='core.job_progress.postrun')
+
+
+def _decode(message) -> Optional[dict[str, Any]]:
+    if not message or message.get('type') != 'message':
+        return None
+    try:
+        data = message.get('data')
+        event = json.loads(data.decode() if isinstance(data, bytes) else data)
+    except Exception:
+        return None
+    return event if isinstance(event, dict) else None
+
+
+def iter_job_events(job_id: str, *, timeout: float) -> Iterator[Optional[dict[str, Any]]]:
+    """Blocking event iterator for WSGI workers (gevent-friendly sockets)."""
+    heartbeat = max(1, _setting('JOB_EVENTS_HEARTBEAT_SECONDS', 15))
+    client = _redis_client()
+    pubsub = None
+    if client is not None:
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(_channel(job_id))
+        except Exception:
+            pubsub = None
+    try:
+        # Subscribe first, then read the latest event, so nothing falls in between.
+        last = latest_job_event(job_id)
+        if last is not None:
+            yield last
+            if last.get('state') in TERMINAL_STATES:
+                return
+        deadline = time.monotonic() + timeout
+        quiet_since = time.monotonic()
+        while (remaining := deadline - time.monotonic()) > 0:
+            if pubsub is not None:
+                event = _decode(pubsub.get_message(timeout=min(heartbeat, remaining)))
+            else:
+                time.sleep(min(POLL_INTERVAL_SECONDS, remaining))
+                event = latest_job_event(job_id)
+                if event == last:
+                    event = None
+            if event is not None:
+                last, quiet_since = event, time.monotonic()
+                yield event
+                if event.get('state') in TERMINAL_STATES:
+                    return
+            elif time.monotonic() - quiet_since >= heartbeat:
+                quiet_since = time.monotonic()
+                yield None
+    finally:
+        if pubsub is not None:
+            try:
+                pubsub.close()
+            except Exception:  # nosec B110
+                pass
+
+
+async def aiter_job_events(job_id: str, *, timeout: float) -> AsyncIterator[Optional[dict[str, Any]]]:
+    """Async counterpart of ``iter_job_events`` for ASGI; holds no thread while idle."""
+    from asgiref.sync import sync_to_async
+
+    heartbeat = max(1, _setting('JOB_EVENTS_HEARTBEAT_SECONDS', 15))
+    read_latest = sync_to_async(latest_job_event, thread_sensitive=False)
+    client = pubsub = None
+    url = _redis_url()
+    if url:
+        try:
+            import redis.asyncio as aioredis  # type: ignore
+
+            client = aioredis.Redis.from_url(url, socket_connect_timeout=1)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(_channel(job_id))
+        except Exception:
+            client = pubsub = None
+    loop = asyncio.get_running_loop()
+    try:
+        last = await read_latest(job_id)
+        if last is not None:
+            yield last
+            if last.get('state') in TERMINAL_STATES:
+                return
+        deadline = loop.time() + timeout
+        quiet_since = loop.time()
+        while (remaining := deadline - loop.time()) > 0:
+            if pubsub is not None:
+                event = _decode(await pubsub.get_message(timeout=min(heartbeat, remaining)))
+            else:
+                await asyncio.sleep(min(POLL_INTERVAL_SECONDS, remaining))
+                event = await read_latest(job_id)
+                if event == last:
+                    event = None
+            if event is not None:
+                last, quiet_since = event, loop.time()
+                yield event
+                if event.get('state') in TERMINAL_STATES:
+                    return
+            elif loop.time() - quiet_since >= heartbeat:
+                quiet_since = loop.time()
+                yield None
+    finally:
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+                await client.aclose()
+            except Exception:  # nosec B110
+                pass
+
+
+def format_sse(event: Optional[dict[str, Any]]) -> bytes:
+    """Encode one event (or a heartbeat comment for ``None``) as an SSE frame."""
+    if event is None:
+        return b': keepalive\n\n'
+    return f"event: progress\ndata: {json.dumps(event, default=str)}\n\n".encode()
@@ -1,13 +1,21 @@
+import asyncio
+import math
+
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.authentication import BaseAuthentication
 from rest_framework import status
-from django.http import FileResponse, Http404
+from rest_framework.exceptions import APIException, Throttled
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views import View
 from django.conf import settings
 from django.core.files.storage import default_storage
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes, OpenApiResponse
 from core.job_access import can_user_access_job, is_job_authz_enforced
+from core.job_progress import aiter_job_events, format_sse, iter_job_events
 from core.restore_tokens import (
     extract_restore_token,
     is_restore_mode_active,
@@ -69,6 +77,61 @@ class _BaseJobView(APIView):
         return Response({'detail': 'You do not have permission to access this job.'}, status=status.HTTP_403_FORBIDDEN)
 
 
+def job_status_payload(request, job_id: str) -> dict:
+    """Build the ``JobStatusView`` body for ``job_id`` (access already checked)."""
+    result = AsyncResult(job_id)
+    state = result.state or 'PENDING'
+    info = result.info or {}
+
+    # Celery can encode exception in info when FAILURE
+    error = None
+    if state == 'FAILURE':
+        error = str(info) if info else 'Task failed'
+
+    # Progress/meta protocol: use keys 'progress' and 'message'
+    progress = 0
+    message = None
+    download_ready = False
+    download_url = None
+    payload_result = None
+
+    try:
+        if isinstance(info, dict):
+            progress = int(info.get('progress', 0))
+            message = info.get('message')
+            # If the task returns a file descriptor dict, surface download readiness
+            if info.get('type') == 'file' and info.get('path'):
+                download_ready = state == 'SUCCESS'
+            # Non-file results (e.g., import summary) may be the final result
+    except Exception:  # nosec B110
+        pass
+
+    if state == 'SUCCESS':
+        try:
+            res = result.get(propagate=False)
+            if isinstance(res, dict) and res.get('type') == 'file' and res.get('path'):
+                download_ready = True
+            else:
+                payload_result = res
+        except Exception:  # nosec B110
+            # If reading result fails, keep defaults
+            pass
+
+    if download_ready:
+        download_url = request.build_absolute_uri(f"/api/jobs/{job_id}/download/")
+
+    return {
+        'id': job_id,
+        'state': state,
+        'progress': progress,
+        'message': message,
+        'downloadReady': download_ready,
+        'downloadUrl': download_url,
+        'result': payload_result,
+        'error': error,
+    }
+
+
 class JobStatusView(_BaseJobView):
     @extend_schema(
         parameters=[
@@ -119,57 +182,7 @@ class JobStatusView(_BaseJobView):
         if authz is not None:
             return authz
 
-        result = AsyncResult(job_id)
-        state = result.state or 'PENDING'
-        info = result.info or {}
-
-        # Celery can encode exception in info when FAILURE
-        error = None
-        if state == 'FAILURE':
-            error = str(info) if info else 'Task failed'
-
-        # Progress/meta protocol: use keys 'progress' and 'message'
-        progress = 0
-        message = None
-        download_ready = False
-        download_url = None
-        payload_result = None
-
-        try:
-            if isinstance(info, dict):
-                progress = int(info.get('progress', 0))
-                message = info.get('message')
-                # If the task returns a file descriptor dict, surface download readiness
-                if info.get('type') == 'file' and info.get('path'):
-                    download_ready = state == 'SUCCESS'
-                # Non-file results (e.g., import summary) may be the final result
-        except Exception:  # nosec B110
-            pass
-
-        if state == 'SUCCESS':
-            try:
-                res = result.get(propagate=False)
-                if isinstance(res, dict) and res.get('type') == 'file' and res.get('path'):
-                    download_ready = True
-                else:
-                    payload_result = res
-            except Exception:  # nosec B110
-                # If reading result fails, keep defaults
-                pass
-
-        if download_ready:
-            download_url = request.build_absolute_uri(f"/api/jobs/{job_id}/download/")
-
-        return Response({
-            'id': job_id,
-            'state': state,
-            'progress': progress,
-            'message': message,
-            'downloadReady': download_ready,
-            'downloadUrl': download_url,
-            'result': payload_result,
-            'error': error,
-        })
+        return Response(job_status_payload(request, job_id))
 
 
 class JobDownloadView(_BaseJobView):
@@ -216,6 +229,180 @@ class JobDownloadView(_BaseJobView):
         except Exception:
             raise Http404('File not found')
 
+        byte_range = request.META.get('HTTP_RANGE')
+        if byte_range:
+            try:
+                size = default_storage.size(file_path)
+            except Exception:
+                size = None
+            if size is not None:
+                parsed = _parse_byte_range(byte_range, size)
+                if parsed is None:
+                    f.close()
+                    response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+                    response['Content-Range'] = f'bytes */{size}'
+                    return response
+                start, end = parsed
+                f.seek(start)
+                response = StreamingHttpResponse(
+                    _iter_file_range(f, end - start + 1),
+                    status=status.HTTP_206_PARTIAL_CONTENT,
+                    content_type=content_type,
+                )
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+                response['Content-Length'] = str(end - start + 1)
+                response['Accept-Ranges'] = 'bytes'
+                response['Content-Disposition'] = f'attachment; filename="{filename}"'
+                return response
+
         response = FileResponse(f, content_type=content_type)
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+
+def _parse_byte_range(header: str, size: int):
+    """Parse a single ``bytes=`` range into inclusive ``(start, end)``; None if unsatisfiable."""
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, _, last = spec.strip().partition('-')
+    try:
+        if first == '':
+            length = int(last)
+            if length <= 0:
+                return None
+            start, end = max(0, size - length), size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start < 0 or start > end:
+        return None
+    return start, end
+
+
+def _iter_file_range(f, length: int, chunk_size: int = 64 * 1024):
+    try:
+        while length > 0:
+            chunk = f.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+TERMINAL_JOB_STATES = frozenset({'SUCCESS', 'FAILURE', 'REVOKED'})
+
+
+def _authorize_plain_request(request, job_id: str):
+    """Run the ``_BaseJobView`` authentication, authorization and throttling for a plain Django request.
+
+    Returns None when allowed, else the error ``JsonResponse``.
+    """
+    view = _BaseJobView()
+    view.args, view.kwargs, view.headers, view.format_kwarg = (), {'job_id': job_id}, {}, None
+    drf_request = view.initialize_request(request)
+    view.request = drf_request
+    try:
+        denied = view._authorize_job_access(drf_request, job_id)
+        if denied is None:
+            view.check_throttles(drf_request)
+    except Throttled as exc:
+        response = JsonResponse({'detail': str(exc.detail)}, status=exc.status_code)
+        if exc.wait is not None:
+            response['Retry-After'] = str(math.ceil(exc.wait))
+        return response
+    except APIException as exc:
+        return JsonResponse({'detail': str(exc.detail)}, status=exc.status_code)
+    if denied is not None:
+        return JsonResponse(denied.data, status=denied.status_code)
+    return None
+
+
+def _streaming_enabled() -> bool:
+    return bool(getattr(settings, 'JOB_STREAMING_ENABLED', False))
+
+
+class JobStatusWaitView(View):
+    """Long-poll variant of ``JobStatusView`` served as an async view.
+
+    ``GET /api/jobs/<id>/wait/?state=<last state>&progress=<last progress>&timeout=<s>``
+    returns as soon as the job state or progress differs from what the client
+    last saw (immediately when no ``state`` is given, or when the job has
+    finished), otherwise after ``timeout`` seconds with the unchanged status.
+    Under ASGI the wait holds no worker thread; Celery result reads run in a
+    thread pool between ``asyncio.sleep`` intervals. Unless
+    ``JOB_STREAMING_ENABLED`` is set (ASGI deployments only) it never waits
+    and answers like ``JobStatusView``.
+    """
+
+    async def get(self, request, job_id: str):
+        if AsyncResult is None:
+            return JsonResponse({'detail': 'Async jobs not available'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        denied = await sync_to_async(_authorize_plain_request)(request, job_id)
+        if denied is not None:
+            return denied
+
+        max_wait = max(0, int(getattr(settings, 'JOB_STATUS_WAIT_MAX_SECONDS', 25) or 0)) if _streaming_enabled() else 0
+        try:
+            timeout = min(max(0.0, float(request.GET.get('timeout', max_wait))), float(max_wait))
+        except (TypeError, ValueError):
+            timeout = float(max_wait)
+        interval = max(50, int(getattr(settings, 'JOB_STATUS_WAIT_INTERVAL_MS', 500) or 500)) / 1000.0
+        known_state = request.GET.get('state')
+        known_progress = request.GET.get('progress')
+
+        read_status = sync_to_async(job_status_payload, thread_sensitive=False)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            payload = await read_status(request, job_id)
+            changed = (
+                not known_state
+                or payload['state'] != known_state
+                or (known_progress not in (None, '') and str(payload['progress']) != str(known_progress))
+            )
+            remaining = deadline - loop.time()
+            if changed or payload['state'] in TERMINAL_JOB_STATES or remaining <= 0:
+                return JsonResponse(payload)
+            await asyncio.sleep(min(interval, remaining))
+
+
+class JobEventsView(View):
+    """Server-sent events stream of a job's progress, fed by ``core.job_progress``.
+
+    Access is checked once per connection. Each ``progress`` event carries
+    ``id``, ``state``, ``progress`` and ``message`` (plus ``downloadReady`` on
+    completion). The stream ends on a terminal state or after
+    ``JOB_EVENTS_MAX_SECONDS``; clients then reconnect or fetch
+    ``/api/jobs/<id>/`` for the final result. Returns 404 unless
+    ``JOB_STREAMING_ENABLED`` is set (ASGI deployments only).
+    """
+
+    async def get(self, request, job_id: str):
+        if not _streaming_enabled():
+            return JsonResponse({'detail': 'Job event streaming is disabled'}, status=status.HTTP_404_NOT_FOUND)
+        if AsyncResult is None:
+            return JsonResponse({'detail': 'Async jobs not available'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        denied = await sync_to_async(_authorize_plain_request)(request, job_id)
+        if denied is not None:
+            return denied
+
+        timeout = float(max(1, int(getattr(settings, 'JOB_EVENTS_MAX_SECONDS', 300) or 300)))
+        if isinstance(request, ASGIRequest):
+            async def stream():
+                async for event in aiter_job_events(job_id, timeout=timeout):
+                    yield format_sse(event)
+        else:
+            def stream():
+                for event in iter_job_events(job_id, timeout=timeout):
+                    yield format_sse(event)
+        response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
         return response
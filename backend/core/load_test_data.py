@@ -0,0 +1,507 @@
+"""Deterministic synthetic data engine for load tests.
+
+Used by the ``seed_load_test_data`` / ``cleanup_load_test_data`` commands.
+Everything created is tagged with an ``LT_<run_id>_`` prefix so a run can be
+purged without touching real data.
+
+Profiles size the dataset (``small`` matches the historical defaults,
+``enterprise`` approximates a large production tenant). Rows are written
+with ``bulk_create``; the largest tables (normalized week hours and weekly
+snapshots) use PostgreSQL ``COPY`` when available. Signals do not fire for
+bulk writes, so derived data (``AssignmentWeekHour``, project rollups,
+weekly snapshots) is produced here from the same generated hours, keeping
+every read path consistent with the JSON ``weekly_hours``.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import random
+from dataclasses import dataclass, fields, replace
+from datetime import date, timedelta
+from typing import Any, Iterable, Sequence
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from assignments.models import Assignment, AssignmentWeekHour, WeeklyAssignmentSnapshot
+from assignments.rollup_service import rebuild_project_rollups
+from core.choices import SnapshotSource
+from core.models import InAppNotification
+from deliverables.models import Deliverable
+from departments.models import Department
+from people.models import Person
+from projects.models import Project
+from roles.models import Role
+from skills.models import PersonSkill, SkillTag
+from verticals.models import Vertical
+
+BATCH_SIZE = 2000
+ROLLUP_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class SeedProfile:
+    manager_count: int
+    user_count: int
+    project_count: int
+    person_count: int
+    assignment_count: int
+    week_count: int
+    history_weeks: int
+    hot_assignment_count: int
+    vertical_count: int
+    department_count: int
+    deliverables_per_project: int
+    skill_count: int
+    skills_per_person: int
+    notifications_per_user: int
+
+
+PROFILES: dict[str, SeedProfile] = {
+    # Historical defaults; uses the existing departments and roles.
+    'small': SeedProfile(
+        manager_count=48, user_count=72, project_count=200, person_count=600, assignment_count=4000,
+        week_count=12, history_weeks=0, hot_assignment_count=120, vertical_count=0, department_count=0,
+        deliverables_per_project=0, skill_count=0, skills_per_person=0, notifications_per_user=0,
+    ),
+    'medium': SeedProfile(
+        manager_count=100, user_count=300, project_count=1000, person_count=2500, assignment_count=25000,
+        week_count=26, history_weeks=52, hot_assignment_count=300, vertical_count=3, department_count=40,
+        deliverables_per_project=4, skill_count=80, skills_per_person=4, notifications_per_user=10,
+    ),
+    'enterprise': SeedProfile(
+        manager_count=200, user_count=800, project_count=4000, person_count=10000, assignment_count=100000,
+        week_count=52, history_weeks=104, hot_assignment_count=1000, vertical_count=4, department_count=120,
+        deliverables_per_project=6, skill_count=150, skills_per_person=5, notifications_per_user=25,
+    ),
+}
+
+PROFILE_FIELDS = tuple(f.name for f in fields(SeedProfile))
+
+# Share of people/projects per vertical (largest first); padded for more verticals.
+VERTICAL_WEIGHTS = (0.45, 0.3, 0.15, 0.1)
+PROJECT_STATUSES = ('planning', 'active', 'active', 'active_ca', 'on_hold')
+DELIVERABLE_LABELS = ('SD', 'DD', '50% CD', '90% CD', 'IFP', 'IFC', 'CA')
+
+
+def resolve_profile(name: str, overrides: dict[str, Any]) -> SeedProfile:
+    """Return profile ``name`` with any non-None ``overrides`` applied."""
+    profile = PROFILES[name]
+    return replace(profile, **{k: int(v) for k, v in overrides.items() if k in PROFILE_FIELDS and v is not None})
+
+
+def sunday_week_starts(history_weeks: int, week_count: int) -> list[date]:
+    today = date.today()
+    first_sunday = today - timedelta(days=(today.weekday() + 1) % 7)
+    return [first_sunday + timedelta(days=7 * idx) for idx in range(-history_weeks, week_count)]
+
+
+def copy_or_bulk_insert(model, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """Insert raw rows into ``model``'s table.
+
+    Uses ``COPY ... FROM STDIN`` on PostgreSQL (psycopg2) and batched
+    ``bulk_create`` elsewhere. ``columns`` are concrete column names and rows
+    must supply every non-defaulted column (auto_now values included).
+    """
+    if connection.vendor == 'postgresql':
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        count = 0
+        for row in rows:
+            writer.writerow(['\\N' if v is None else v for v in row])
+            count += 1
+        buf.seek(0)
+        cols = ', '.join(connection.ops.quote_name(c) for c in columns)
+        table = connection.ops.quote_name(model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({cols}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buf)
+        return count
+    attnames = {f.column: f.attname for f in model._meta.concrete_fields}
+    batch: list = []
+    count = 0
+    for row in rows:
+        batch.append(model(**{attnames[c]: v for c, v in zip(columns, row)}))
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+            count += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+        count += len(batch)
+    return count
+
+
+def _count_and_delete(queryset) -> int:
+    count = queryset.count()
+    queryset.delete()
+    return count
+
+
+def purge_prefix(prefix: str) -> dict[str, int]:
+    """Delete everything a seed run with ``prefix`` created; returns per-kind counts."""
+    lower_prefix = prefix.lower()
+    User = get_user_model()
+    projects = Project.objects.filter(name__startswith=prefix)
+    deleted = {
+        # Snapshots SET_NULL on project delete, so remove them explicitly.
+        'snapshots': _count_and_delete(WeeklyAssignmentSnapshot.objects.filter(project_name__startswith=prefix)),
+        'assignments': _count_and_delete(Assignment.objects.filter(project__name__startswith=prefix)),
+        'projects': _count_and_delete(projects),
+        'profiles': _count_and_delete(UserProfile.objects.filter(user__username__startswith=lower_prefix)),
+        'users': _count_and_delete(User.objects.filter(username__startswith=lower_prefix)),
+        'skills': _count_and_delete(SkillTag.objects.filter(name__startswith=prefix)),
+        'people': _count_and_delete(Person.objects.filter(name__startswith=prefix)),
+    }
+    departments = Department.objects.filter(name__startswith=prefix)
+    departments.update(parent_department=None)
+    deleted['departments'] = _count_and_delete(departments)
+    deleted['verticals'] = _count_and_delete(Vertical.objects.filter(name__startswith=prefix))
+    return deleted
+
+
+class LoadTestSeeder:
+    """Generate one run's dataset. Call ``run()`` inside a transaction."""
+
+    def __init__(self, *, prefix: str, seed: int, profile: SeedProfile, password: str, stdout=None):
+        self.prefix = prefix
+        self.lower_prefix = prefix.lower()
+        self.rng = random.Random(seed)
+        self.profile = profile
+        self.password = password
+        self.stdout = stdout
+        self.now = timezone.now()
+        self.week_starts = sunday_week_starts(profile.history_weeks, profile.week_count)
+        self.current_week_index = profile.history_weeks
+        self.counts: dict[str, int] = {}
+
+    def _log(self, message: str) -> None:
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def _weighted_index(self, weights: Sequence[float]) -> int:
+        return self.rng.choices(range(len(weights)), weights=weights, k=1)[0]
+
+    # Organisation -------------------------------------------------------
+
+    def build_org(self) -> None:
+        p = self.profile
+        if p.vertical_count <= 0 or p.department_count <= 0:
+            self.verticals: list[Vertical] = []
+            self.departments = list(Department.objects.all().order_by('id'))
+            self.department_weights = [1.0] * len(self.departments)
+            self.vertical_weights: list[float] = []
+            self.department_lookup = {d.id: d for d in self.departments}
+            return
+        self.verticals = Vertical.objects.bulk_create([
+            Vertical(name=f'{self.prefix}Vertical {idx + 1:02d}', short_name=f'V{idx + 1}')
+            for idx in range(p.vertical_count)
+        ])
+        self.vertical_weights = [
+            VERTICAL_WEIGHTS[idx] if idx < len(VERTICAL_WEIGHTS) else VERTICAL_WEIGHTS[-1] / 2
+            for idx in range(p.vertical_count)
+        ]
+        # Department tree: one root per vertical, then each new department
+        # hangs off a random existing department of a weighted vertical, up
+        # to three levels deep.
+        depth: dict[int, int] = {}
+        self.departments = []
+        for idx in range(p.department_count):
+            v_idx = idx if idx < p.vertical_count else self._weighted_index(self.vertical_weights)
+            vertical = self.verticals[v_idx]
+            candidates = [d for d in self.departments if d.vertical_id == vertical.id and depth[d.id] < 3]
+            parent = self.rng.choice(candidates) if idx >= p.vertical_count and candidates else None
+            dept = Department.objects.create(
+                name=f'{self.prefix}Dept {idx + 1:03d}',
+                short_name=f'D{idx + 1}',
+                parent_department=parent,
+                vertical=vertical,
+            )
+            depth[dept.id] = (depth[parent.id] + 1) if parent else 1
+            self.departments.append(dept)
+        # Zipf-like headcount: a few large departments, a long tail of small ones.
+        order = list(range(len(self.departments)))
+        self.rng.shuffle(order)
+        self.department_weights = [0.0] * len(self.departments)
+        for rank, idx in enumerate(order, start=1):
+            self.department_weights[idx] = 1.0 / (rank ** 0.8)
+        self.department_lookup = {d.id: d for d in self.departments}
+        self.counts['verticals'] = len(self.verticals)
+        self.counts['departments'] = len(self.departments)
+
+    def _pick_department(self):
+        if not self.departments:
+            return None
+        return self.departments[self._weighted_index(self.department_weights)]
+
+    # People and accounts -------------------------------------------------
+
+    def build_people(self) -> None:
+        p = self.profile
+        roles = list(Role.objects.filter(is_active=True).order_by('id'))
+        self.roles = roles
+        hire_floor = self.week_starts[0] - timedelta(days=365)
+
+        def person(name: str, capacity: int) -> Person:
+            return Person(
+                name=name,
+                weekly_capacity=capacity,
+                department=self._pick_department(),
+                role=self.rng.choice(roles) if roles else None,
+                hire_date=hire_floor + timedelta(days=self.rng.randrange(0, 365 * 3)),
+                is_active=self.rng.random() > 0.03,
+            )
+
+        managers = [person(f'{self.prefix}Manager Person {idx:03d}', 40) for idx in range(1, p.manager_count + 1)]
+        users = [person(f'{self.prefix}User Person {idx:03d}', 36) for idx in range(1, p.user_count + 1)]
+        for row in managers + users:
+            row.is_active = True
+        extra_count = max(p.person_count - len(managers) - len(users), 0)
+        extras = [person(f'{self.prefix}Extra Person {idx:05d}', self.rng.choice((32, 36, 40, 40))) for idx in range(1, extra_count + 1)]
+        self.manager_people = Person.objects.bulk_create(managers, batch_size=BATCH_SIZE)
+        self.user_people = Person.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        self.extra_people = Person.objects.bulk_create(extras, batch_size=BATCH_SIZE)
+        self.people = self.manager_people + self.user_people + self.extra_people
+        self.counts['people'] = len(self.people)
+
+    def build_accounts(self) -> None:
+        User = get_user_model()
+        password_hash = make_password(self.password)
+        manager_group, _ = Group.objects.get_or_create(name='Manager')
+        user_group, _ = Group.objects.get_or_create(name='User')
+        specs = (
+            [(f'{self.lower_prefix}mgr_{idx:03d}', 'manager', manager_group, person) for idx, person in enumerate(self.manager_people, start=1)]
+            + [(f'{self.lower_prefix}usr_{idx:03d}', 'user', user_group, person) for idx, person in enumerate(self.user_people, start=1)]
+        )
+        users = User.objects.bulk_create([
+            User(username=uname, email=f'{uname}@load.test', password=password_hash, is_staff=False, is_superuser=False)
+            for uname, _, _, _ in specs
+        ], batch_size=BATCH_SIZE)
+        Membership = User.groups.through
+        Membership.objects.bulk_create([
+            Membership(user_id=user.id, group_id=group.id) for user, (_, _, group, _) in zip(users, specs)
+        ], batch_size=BATCH_SIZE)
+        UserProfile.objects.bulk_create([
+            UserProfile(user=user, person=person) for user, (_, _, _, person) in zip(users, specs)
+        ], batch_size=BATCH_SIZE)
+        self.users = users
+        self.manager_users = [
+            {'username': uname, 'password': self.password, 'role': role, 'personId': person.id}
+            for uname, role, _, person in specs if role == 'manager'
+        ]
+        self.user_users = [
+            {'username': uname, 'password': self.password, 'role': role, 'personId': person.id}
+            for uname, role, _, person in specs if role == 'user'
+        ]
+
+    # Projects -------------------------------------------------------------
+
+    def build_projects(self) -> None:
+        p = self.profile
+        first_week, last_week = self.week_starts[0], self.week_starts[-1]
+        span_days = max(7, (last_week - first_week).days)
+        projects = []
+        for idx in range(1, p.project_count + 1):
+            start = first_week + timedelta(days=self.rng.randrange(0, span_days))
+            vertical = self.verticals[self._weighted_index(self.vertical_weights)] if self.verticals else None
+            projects.append(Project(
+                name=f'{self.prefix}Project {idx:05d}',
+                client=f'{self.prefix}Client {((idx - 1) % 25) + 1:03d}',
+                status=PROJECT_STATUSES[idx % len(PROJECT_STATUSES)],
+                project_number=f'{self.lower_prefix}{idx:06d}',
+                is_active=True,
+                description='Load-test seeded project',
+                start_date=start,
+                end_date=start + timedelta(weeks=self.rng.randint(12, 104)),
+                vertical=vertical,
+            ))
+        self.projects = Project.objects.bulk_create(projects, batch_size=BATCH_SIZE)
+        self.projects_by_vertical: dict[int | None, list[Project]] = {}
+        for project in self.projects:
+            self.projects_by_vertical.setdefault(project.vertical_id, []).append(project)
+        self.counts['projects'] = len(self.projects)
+
+        per_project = p.deliverables_per_project
+        if per_project > 0:
+            deliverables = []
+            for project in self.projects:
+                total_days = max(7, (project.end_date - project.start_date).days)
+                for order in range(per_project):
+                    due = project.start_date + timedelta(days=int(total_days * (order + 1) / (per_project + 1)))
+                    deliverables.append(Deliverable(
+                        project=project,
+                        description=DELIVERABLE_LABELS[order % len(DELIVERABLE_LABELS)],
+                        percentage=min(100, int(100 * (order + 1) / per_project)),
+                        date=due,
+                        sort_order=order * 10,
+                        is_completed=due < date.today(),
+                    ))
+            self.counts['deliverables'] = len(Deliverable.objects.bulk_create(deliverables, batch_size=BATCH_SIZE))
+
+    def _pick_project(self, person: Person) -> Project:
+        department = self.department_lookup.get(person.department_id) if self.verticals else None
+        pool = self.projects_by_vertical.get(department.vertical_id) if department is not None else None
+        # Mostly in-vertical work, with some cross-vertical staffing.
+        if pool and self.rng.random() < 0.8:
+            return self.rng.choice(pool)
+        return self.rng.choice(self.projects)
+
+    # Assignments and derived hours -----------------------------------------
+
+    def _hours_for(self, person: Person) -> dict[int, float]:
+        """Contiguous staffing span with jittered weekly hours, keyed by week index."""
+        weeks = len(self.week_starts)
+        length = self.rng.randint(2, max(2, min(weeks, 40)))
+        start = self.rng.randrange(0, max(1, weeks - 1))
+        base = self.rng.uniform(2.0, 18.0) * (person.weekly_capacity or 36) / 36
+        out: dict[int, float] = {}
+        for idx in range(start, min(weeks, start + length)):
+            if self.rng.random() < 0.1:
+                continue
+            out[idx] = round(max(0.5, self.rng.gauss(base, base * 0.2)), 2)
+        return out
+
+    def build_assignments(self) -> None:
+        p = self.profile
+        if not self.people or not self.projects:
+            self.assignments = []
+            return
+        person_weights = [4.0 if person.is_active else 0.2 for person in self.people]
+        chosen = self.rng.choices(self.people, weights=person_weights, k=p.assignment_count)
+        week_keys = [w.isoformat() for w in self.week_starts]
+        rows: list[Assignment] = []
+        hours_by_row: list[dict[int, float]] = []
+        for person in chosen:
+            project = self._pick_project(person)
+            hours = self._hours_for(person)
+            rows.append(Assignment(
+                person=person,
+                project=project,
+                project_name=project.name,
+                department_id=person.department_id,
+                weekly_hours={week_keys[idx]: value for idx, value in hours.items()},
+                is_active=True,
+            ))
+            hours_by_row.append(hours)
+        created = Assignment.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        self.assignments = created
+        self.counts['assignments'] = len(created)
+
+        week_hour_columns = ('assignment_id', 'person_id', 'project_id', 'department_id', 'week_start', 'hours', 'updated_at')
+        self.counts['assignmentWeekHours'] = copy_or_bulk_insert(
+            AssignmentWeekHour,
+            week_hour_columns,
+            (
+                (a.id, a.person_id, a.project_id, a.person.department_id, self.week_starts[idx], value, self.now)
+                for a, hours in zip(created, hours_by_row)
+                for idx, value in hours.items()
+            ),
+        )
+        self._build_snapshots(created, hours_by_row)
+
+    def _build_snapshots(self, assignments: Sequence[Assignment], hours_by_row: Sequence[dict[int, float]]) -> None:
+        """Weekly snapshots for past weeks, aggregated per (person, project, week)."""
+        totals: dict[tuple[int, int, int], float] = {}
+        for a, hours in zip(assignments, hours_by_row):
+            for idx, value in hours.items():
+                if idx < self.current_week_index:
+                    key = (a.person_id, a.project_id, idx)
+                    totals[key] = totals.get(key, 0.0) + value
+        if not totals:
+            return
+        people = {person.id: person for person in self.people}
+        projects = {project.id: project for project in self.projects}
+        roles = {role.id: role.name for role in getattr(self, 'roles', [])}
+        columns = (
+            'week_start', 'person_id', 'project_id', 'role_on_project_id', 'department_id', 'project_status',
+            'deliverable_phase', 'hours', 'source', 'person_name', 'project_name', 'client', 'person_is_active',
+            'person_role_id', 'person_role_name', 'captured_at', 'updated_at',
+        )
+
+        def rows():
+            for (person_id, project_id, idx), value in sorted(totals.items()):
+                person, project = people[person_id], projects[project_id]
+                yield (
+                    self.week_starts[idx], person_id, project_id, None, person.department_id, project.status,
+                    WeeklyAssignmentSnapshot._meta.get_field('deliverable_phase').default, round(value, 2),
+                    SnapshotSource.ASSIGNED, person.name, project.name, project.client, person.is_active,
+                    person.role_id, roles.get(person.role_id, ''), self.now, self.now,
+                )
+
+        self.counts['weeklySnapshots'] = copy_or_bulk_insert(WeeklyAssignmentSnapshot, columns, rows())
+
+    def build_rollups(self) -> None:
+        project_ids = [project.id for project in self.projects]
+        for start in range(0, len(project_ids), ROLLUP_CHUNK):
+            rebuild_project_rollups(project_ids[start:start + ROLLUP_CHUNK])
+
+    # Skills and notifications ------------------------------------------------
+
+    def build_skills(self) -> None:
+        p = self.profile
+        if p.skill_count <= 0 or p.skills_per_person <= 0:
+            return
+        categories = ('Technical', 'Design', 'Management', 'Software')
+        tags = SkillTag.objects.bulk_create([
+            SkillTag(
+                name=f'{self.prefix}Skill {idx + 1:03d}',
+                category=categories[idx % len(categories)],
+                department=self._pick_department(),
+            )
+            for idx in range(p.skill_count)
+        ], batch_size=BATCH_SIZE)
+        # Popular skills are shared widely; the tail is niche.
+        weights = [1.0 / (rank ** 0.7) for rank in range(1, len(tags) + 1)]
+        types = [choice for choice, _ in PersonSkill.SKILL_TYPE_CHOICES]
+        levels = [choice for choice, _ in PersonSkill.PROFICIENCY_CHOICES]
+        rows = []
+        for person in self.people:
+            picked = {tags[i].id for i in self.rng.choices(range(len(tags)), weights=weights, k=p.skills_per_person)}
+            for tag_id in picked:
+                rows.append(PersonSkill(
+                    person_id=person.id,
+                    skill_tag_id=tag_id,
+                    skill_type=self.rng.choice(types),
+                    proficiency_level=self.rng.choice(levels),
+                ))
+        self.counts['skillTags'] = len(tags)
+        self.counts['personSkills'] = len(PersonSkill.objects.bulk_create(rows, batch_size=BATCH_SIZE))
+
+    def build_notifications(self) -> None:
+        per_user = self.profile.notifications_per_user
+        if per_user <= 0 or not getattr(self, 'users', None):
+            return
+        rows = []
+        for user in self.users:
+            for _ in range(per_user):
+                project = self.rng.choice(self.projects)
+                rows.append(InAppNotification(
+                    user=user,
+                    event_key='assignment.changed',
+                    title=f'Assignment updated on {project.name}',
+                    url=f'/projects/{project.id}',
+                    project_id=project.id,
+                    read_at=self.now if self.rng.random() < 0.6 else None,
+                ))
+        self.counts['notifications'] = len(InAppNotification.objects.bulk_create(rows, batch_size=BATCH_SIZE))
+
+    def run(self) -> None:
+        steps = (
+            ('organisation', self.build_org),
+            ('people', self.build_people),
+            ('accounts', self.build_accounts),
+            ('projects', self.build_projects),
+            ('assignments', self.build_assignments),
+            ('rollups', self.build_rollups),
+            ('skills', self.build_skills),
+            ('notifications', self.build_notifications),
+        )
+        for label, step in steps:
+            started = timezone.now()
+            step()
+            self._log(f'seeded {label} in {(timezone.now() - started).total_seconds():.1f}s')
@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import BENCHMARKS, SCALES, compare_reports, run_suite
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark service-layer hot paths in-process against deterministic seeded datasets "
+        "(rolled back afterwards). Reports wall time, query count and peak memory; optionally "
+        "saves a JSON baseline or fails when results regress against one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", default="xs", help=f"Comma-separated scales: {', '.join(SCALES)}.")
+        parser.add_argument("--only", default="", help="Comma-separated benchmark names (default: all).")
+        parser.add_argument("--list", action="store_true", default=False, help="List benchmarks and exit.")
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument("--warmup", type=int, default=1)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--save-baseline", help="Write the report to this JSON file.")
+        parser.add_argument("--compare", help="Compare against a baseline JSON file; exit non-zero on regression.")
+        parser.add_argument("--time-threshold", type=float, default=0.25, help="Allowed relative median-time growth.")
+        parser.add_argument("--memory-threshold", type=float, default=0.25, help="Allowed relative peak-memory growth.")
+        parser.add_argument("--json", action="store_true", default=False, help="Emit the report as JSON only.")
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for name in BENCHMARKS:
+                self.stdout.write(name)
+            return
+
+        scales = [s.strip() for s in options["scale"].split(",") if s.strip()]
+        names = [n.strip() for n in options["only"].split(",") if n.strip()] or None
+        if options["rounds"] < 1:
+            raise CommandError("--rounds must be >= 1")
+
+        baseline = None
+        if options["compare"]:
+            try:
+                baseline = json.loads(Path(options["compare"]).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not read baseline: {exc}")
+
+        def on_result(key, result):
+            if not options["json"]:
+                self.stdout.write(
+                    f"{key:<55} median {result['median_ms']:>10.2f} ms  "
+                    f"queries {result['queries']:>5}  peak {result['peak_kib']:>10.1f} KiB"
+                )
+
+        try:
+            report = run_suite(
+                scales,
+                names=names,
+                rounds=options["rounds"],
+                warmup=options["warmup"],
+                seed=options["seed"],
+                on_result=on_result,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        report["params"] = {"scales": scales, "rounds": options["rounds"], "seed": options["seed"]}
+
+        if options["save_baseline"]:
+            Path(options["save_baseline"]).write_text(json.dumps(report, indent=2, sort_keys=True))
+
+        regressions = []
+        if baseline is not None:
+            regressions = compare_reports(
+                report,
+                baseline,
+                time_threshold=options["time_threshold"],
+                memory_threshold=options["memory_threshold"],
+            )
+            report["regressions"] = regressions
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report))
+        else:
+            for reg in regressions:
+                self.stdout.write(self.style.ERROR(
+                    f"REGRESSION {reg['benchmark']} {reg['metric']}: {reg['current']} > {reg['limit']} "
+                    f"(baseline {reg['baseline']})"
+                ))
+        if regressions:
+            raise CommandError(f"{len(regressions)} benchmark regression(s) against {options['compare']}")
@@ -1,11 +1,7 @@
-from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
-from accounts.models import UserProfile
-from assignments.models import Assignment
-from people.models import Person
-from projects.models import Project
+from core.load_test_data import purge_prefix
 
 
 class Command(BaseCommand):
@@ -21,35 +17,8 @@ class Command(BaseCommand):
             raise CommandError("--run-id is required")
 
         prefix = f"LT_{run_id}_"
-        lower_prefix = prefix.lower()
-
-        assignments_qs = Assignment.objects.filter(project__name__startswith=prefix)
-        projects_qs = Project.objects.filter(name__startswith=prefix)
-        profiles_qs = UserProfile.objects.filter(user__username__startswith=lower_prefix)
-        people_qs = Person.objects.filter(name__startswith=prefix)
-
-        assignment_deleted = assignments_qs.count()
-        project_deleted = projects_qs.count()
-        profile_deleted = profiles_qs.count()
-        people_deleted = people_qs.count()
-
-        assignments_qs.delete()
-        projects_qs.delete()
-        profiles_qs.delete()
-        User = get_user_model()
-        users_qs = User.objects.filter(username__startswith=lower_prefix)
-        user_deleted = users_qs.count()
-        users_qs.delete()
-        people_qs.delete()
-
         summary = {
             "prefix": prefix,
-            "deleted": {
-                "assignments": assignment_deleted,
-                "projects": project_deleted,
-                "profiles": profile_deleted,
-                "users": user_deleted,
-                "people": people_deleted,
-            },
+            "deleted": purge_prefix(prefix),
         }
         self.stdout.write(self.style.SUCCESS(str(summary)))
@@ -8,6 +8,7 @@ from django.conf import settings
 from django.db import connections
 
 from core.request_context import set_current_request_id, reset_request_id
+from core.request_memo import memo_scope, memo_stats
 from core.backup_config import resolve_backups_dir
 
 try:
@@ -22,6 +23,7 @@ class RequestIDLogMiddleware:
     - Preserves incoming X-Request-ID; otherwise generates a UUID4 hex.
     - Adds X-Request-ID to the response headers.
     - Logs JSON with path, method, status, duration, remote_addr, user_id, request_id.
+    - Opens the request memo scope (core.request_memo) and logs its hit/miss counts.
     - Sets Sentry tag 'request_id' to correlate traces, when Sentry is available.
     """
 
@@ -50,7 +52,9 @@ class RequestIDLogMiddleware:
 
         token = set_current_request_id(rid)
         try:
-            response = self.get_response(request)
+            with memo_scope():
+                response = self.get_response(request)
+                memo = memo_stats() or {}
 
             duration_ms = int((time.monotonic() - start) * 1000)
             remote = request.META.get('HTTP_X_FORWARDED_FOR') or request.META.get('REMOTE_ADDR')
@@ -101,6 +105,8 @@ class RequestIDLogMiddleware:
                         'remote_addr': remote,
                         'db_queries': db_queries,
                         'db_time_ms': db_time_ms,
+                        'memo_hits': memo.get('hits'),
+                        'memo_misses': memo.get('misses'),
                     },
                 )
             except Exception:  # nosec B110
@@ -10,6 +10,7 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 from django.utils import timezone
+from core.request_memo import request_memoized
 
 from core.notification_matrix import (
     default_notification_channel_matrix,
@@ -473,6 +474,7 @@ class ProjectVisibilitySettings(models.Model):
         return f"ProjectVisibilitySettings({self.key})"
 
     @classmethod
+    @request_memoized(invalidated_by=('core.ProjectVisibilitySettings',))
     def get_active(cls):
         obj, _ = cls.objects.get_or_create(key='default')
         return obj
@@ -1173,6 +1175,7 @@ class UtilizationScheme(models.Model):
             raise ValidationError('Full capacity hours must be >= 1')
 
     @classmethod
+    @request_memoized(invalidated_by=('core.UtilizationScheme',))
     def get_active(cls):
         """Return the singleton scheme, creating defaults if missing."""
         obj, _ = cls.objects.get_or_create(
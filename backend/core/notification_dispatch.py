@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import timedelta
 from typing import Iterable, Any
 
@@ -18,9 +19,10 @@ from core.notification_policy import (
     CHANNEL_EMAIL,
     CHANNEL_IN_BROWSER,
     CHANNEL_MOBILE_PUSH,
-    is_project_channel_muted,
+    active_web_user_ids,
+    muted_project_channels,
     notifications_template_rendering_enabled,
-    should_suppress_channel_for_active_user,
+    notifications_v2_enabled,
 )
 from core.notification_matrix import (
     EVENT_KEYS,
@@ -165,6 +167,224 @@ def filter_user_ids_for_channel(
     return recipients
 
 
+@dataclass(frozen=True)
+class DispatchEvent:
+    """One notification event for ``dispatch_events``; mirrors ``dispatch_event_to_users`` kwargs."""
+
+    user_ids: tuple[int, ...]
+    event_key: str
+    title: str
+    body: str
+    url: str
+    tag: str | None = None
+    priority: str | None = 'normal'
+    project_id: int | None = None
+    entity_type: str | None = None
+    entity_id: int | None = None
+    actions: list[dict[str, str]] | None = None
+    template_context: dict[str, Any] | None = None
+
+
+class _DispatchPlan:
+    """Accumulates rows for a batch of events, sharing every per-batch lookup.
+
+    Preferences, channel availability, templates, project mutes and
+    active-web state are loaded once for all recipients of all events; rows
+    are written with one ``bulk_create`` per table in ``flush``.
+    """
+
+    def __init__(self, events: list[DispatchEvent]):
+        all_user_ids = _normalized_user_ids(uid for event in events for uid in event.user_ids)
+        self.availability = _build_global_availability()
+        self.pref_map = ensure_preferences_for_users(all_user_ids)
+        self.templates: dict[str, NotificationTemplate | None] = {}
+        self.mutes = muted_project_channels(all_user_ids, {event.project_id for event in events})
+        self.active_user_ids = active_web_user_ids(all_user_ids) if notifications_v2_enabled() else set()
+        try:
+            cfg = WebPushGlobalSettings.get_active()
+            in_app_retention_days = max(1, int(getattr(cfg, 'in_app_retention_days', 7) or 7))
+        except Exception:
+            in_app_retention_days = 7
+        self.expires_at = timezone.now() + timedelta(days=in_app_retention_days)
+        self.in_app_rows: list[InAppNotification] = []
+        self.email_rows: list[EmailNotificationDigestItem] = []
+        self.delivery_logs: list[NotificationDeliveryLog] = []
+        self.push_batches: list[tuple[list[int], dict[str, Any]]] = []
+
+    def _template(self, event_key: str) -> NotificationTemplate | None:
+        if event_key not in self.templates:
+            self.templates[event_key] = _template_for_event(event_key)
+        return self.templates[event_key]
+
+    def _muted(self, user_id: int, project_id: int | None, channel: str) -> bool:
+        return project_id is not None and channel in self.mutes.get((user_id, int(project_id)), ())
+
+    def _suppressed(self, user_id: int, channel: str, priority: str | None) -> tuple[bool, str]:
+        # Same rules as notification_policy.should_suppress_channel_for_active_user.
+        if str(priority or 'normal').strip().lower() == 'critical' or channel == CHANNEL_IN_BROWSER:
+            return False, ''
+        if user_id not in self.active_user_ids:
+            return False, ''
+        return True, 'active_web_prefers_in_browser'
+
+    def _log(self, event: DispatchEvent, user_id: int, channel: str, status: str, reason: str) -> None:
+        self.delivery_logs.append(
+            NotificationDeliveryLog(
+                event_key=event.event_key,
+                user_id=user_id,
+                channel=channel,
+                status=status,
+                reason=reason,
+                project_id=event.project_id,
+            )
+        )
+
+    def add(self, event: DispatchEvent) -> dict[str, int]:
+        normalized_user_ids = _normalized_user_ids(event.user_ids)
+        if not normalized_user_ids or event.event_key not in EVENT_KEYS:
+            return {'pushQueued': 0, 'inAppCreated': 0, 'emailQueued': 0}
+
+        event_key = event.event_key
+        project_id = event.project_id
+        template_obj = self._template(event_key)
+        render_ctx = {
+            'event_key': event_key,
+            'title': event.title,
+            'body': event.body,
+            'url': event.url,
+            'project_id': project_id or '',
+            'entity_type': event.entity_type or '',
+            'entity_id': event.entity_id or '',
+        }
+        if isinstance(event.template_context, dict):
+            render_ctx.update(event.template_context)
+
+        push_title = _render_template(getattr(template_obj, 'push_title_template', ''), render_ctx) or event.title
+        push_body = _render_template(getattr(template_obj, 'push_body_template', ''), render_ctx) or event.body
+        email_subject = _render_template(getattr(template_obj, 'email_subject_template', ''), render_ctx) or event.title
+        email_body = _render_template(getattr(template_obj, 'email_body_template', ''), render_ctx) or event.body
+        in_app_title = _render_template(getattr(template_obj, 'in_app_title_template', ''), render_ctx) or event.title
+        in_app_body = _render_template(getattr(template_obj, 'in_app_body_template', ''), render_ctx) or event.body
+
+        push_ttl_seconds = int(getattr(template_obj, 'push_ttl_seconds', 3600) or 3600)
+        push_urgency = str(getattr(template_obj, 'push_urgency', NotificationTemplate.PUSH_URGENCY_NORMAL) or NotificationTemplate.PUSH_URGENCY_NORMAL)
+        push_topic = _topic_for_mode(
+            topic_mode=str(getattr(template_obj, 'push_topic_mode', NotificationTemplate.PUSH_TOPIC_EVENT) or NotificationTemplate.PUSH_TOPIC_EVENT),
+            event_key=event_key,
+            project_id=project_id,
+        )
+
+        payload = build_push_payload(
+            event_type=event_key,
+            title=push_title,
+            body=push_body,
+            url=event.url,
+            tag=event.tag,
+            priority=event.priority,
+            project_id=project_id,
+            entity_type=event.entity_type,
+            entity_id=event.entity_id,
+            actions=event.actions,
+            ttl_seconds=push_ttl_seconds,
+            urgency=push_urgency,
+            topic=push_topic,
+        )
+
+        push_recipient_ids: list[int] = []
+        in_app_created = 0
+        email_queued = 0
+        for user_id in normalized_user_ids:
+            pref = self.pref_map.get(user_id)
+
+            if channel_enabled_for_preference(pref, event_key=event_key, channel=CHANNEL_MOBILE_PUSH, availability=self.availability):
+                if self._muted(user_id, project_id, CHANNEL_MOBILE_PUSH):
+                    self._log(event, user_id, CHANNEL_MOBILE_PUSH, NotificationDeliveryLog.STATUS_SUPPRESSED, 'project_mute')
+                else:
+                    suppressed, suppress_reason = self._suppressed(user_id, CHANNEL_MOBILE_PUSH, event.priority)
+                    if suppressed:
+                        self._log(event, user_id, CHANNEL_MOBILE_PUSH, NotificationDeliveryLog.STATUS_SUPPRESSED, suppress_reason)
+                    else:
+                        push_recipient_ids.append(user_id)
+                        self._log(event, user_id, CHANNEL_MOBILE_PUSH, NotificationDeliveryLog.STATUS_QUEUED, 'dispatch')
+
+            if channel_enabled_for_preference(pref, event_key=event_key, channel=CHANNEL_IN_BROWSER, availability=self.availability):
+                if self._muted(user_id, project_id, CHANNEL_IN_BROWSER):
+                    self._log(event, user_id, CHANNEL_IN_BROWSER, NotificationDeliveryLog.STATUS_SUPPRESSED, 'project_mute')
+                else:
+                    self.in_app_rows.append(
+                        InAppNotification(
+                            user_id=user_id,
+                            event_key=event_key,
+                            title=in_app_title,
+                            body=in_app_body,
+                            url=event.url,
+                            payload=payload,
+                            project_id=project_id,
+                            delivery_reason='dispatch',
+                            channel_origin=CHANNEL_IN_BROWSER,
+                            expires_at=self.expires_at,
+                        )
+                    )
+                    in_app_created += 1
+                    self._log(event, user_id, CHANNEL_IN_BROWSER, NotificationDeliveryLog.STATUS_SENT, 'dispatch')
+
+            email_enabled = channel_enabled_for_preference(pref, event_key=event_key, channel=CHANNEL_EMAIL, availability=self.availability)
+            if event_key != 'pred.digest' and email_enabled:
+                if self._muted(user_id, project_id, CHANNEL_EMAIL):
+                    self._log(event, user_id, CHANNEL_EMAIL, NotificationDeliveryLog.STATUS_SUPPRESSED, 'project_mute')
+                else:
+                    suppressed, suppress_reason = self._suppressed(user_id, CHANNEL_EMAIL, event.priority)
+                    if suppressed:
+                        self._log(event, user_id, CHANNEL_EMAIL, NotificationDeliveryLog.STATUS_SUPPRESSED, suppress_reason)
+                    else:
+                        self.email_rows.append(
+                            EmailNotificationDigestItem(
+                                user_id=user_id,
+                                event_key=event_key,
+                                title=email_subject,
+                                body=email_body,
+                                url=event.url,
+                                payload=payload,
+                            )
+                        )
+                        email_queued += 1
+                        self._log(event, user_id, CHANNEL_EMAIL, NotificationDeliveryLog.STATUS_QUEUED, 'digest_queue')
+
+        if push_recipient_ids:
+            self.push_batches.append((push_recipient_ids, payload))
+        return {
+            'pushQueued': len(push_recipient_ids),
+            'inAppCreated': in_app_created,
+            'emailQueued': email_queued,
+        }
+
+    def flush(self) -> None:
+        with transaction.atomic():
+            if self.in_app_rows:
+                InAppNotification.objects.bulk_create(self.in_app_rows, batch_size=1000)
+            if self.email_rows:
+                EmailNotificationDigestItem.objects.bulk_create(self.email_rows, batch_size=1000)
+            if self.delivery_logs:
+                NotificationDeliveryLog.objects.bulk_create(self.delivery_logs, batch_size=1000)
+        for recipient_ids, payload in self.push_batches:
+            queue_push_to_users(recipient_ids, payload, preference_field=None)
+
+
+def dispatch_events(events: Iterable[DispatchEvent]) -> list[dict[str, int]]:
+    """Dispatch many events at once; returns per-event counts in input order.
+
+    Equivalent to calling ``dispatch_event_to_users`` for each event, but
+    with shared lookups and one bulk insert per table for the whole batch.
+    """
+    events = list(events)
+    if not events:
+        return []
+    plan = _DispatchPlan(events)
+    results = [plan.add(event) for event in events]
+    plan.flush()
+    return results
+
+
 def dispatch_event_to_users(
     *,
     user_ids: Iterable[int],
@@ -185,232 +405,22 @@ def dispatch_event_to_users(
         return {'pushQueued': 0, 'inAppCreated': 0, 'emailQueued': 0}
     if event_key not in EVENT_KEYS:
         return {'pushQueued': 0, 'inAppCreated': 0, 'emailQueued': 0}
-
-    availability = _build_global_availability()
-    pref_map = ensure_preferences_for_users(normalized_user_ids)
-    template_obj = _template_for_event(event_key)
-    render_ctx = {
-        'event_key': event_key,
-        'title': title,
-        'body': body,
-        'url': url,
-        'project_id': project_id or '',
-        'entity_type': entity_type or '',
-        'entity_id': entity_id or '',
-    }
-    if isinstance(template_context, dict):
-        render_ctx.update(template_context)
-
-    push_title = _render_template(getattr(template_obj, 'push_title_template', ''), render_ctx) or title
-    push_body = _render_template(getattr(template_obj, 'push_body_template', ''), render_ctx) or body
-    email_subject = _render_template(getattr(template_obj, 'email_subject_template', ''), render_ctx) or title
-    email_body = _render_template(getattr(template_obj, 'email_body_template', ''), render_ctx) or body
-    in_app_title = _render_template(getattr(template_obj, 'in_app_title_template', ''), render_ctx) or title
-    in_app_body = _render_template(getattr(template_obj, 'in_app_body_template', ''), render_ctx) or body
-
-    push_ttl_seconds = int(getattr(template_obj, 'push_ttl_seconds', 3600) or 3600)
-    push_urgency = str(getattr(template_obj, 'push_urgency', NotificationTemplate.PUSH_URGENCY_NORMAL) or NotificationTemplate.PUSH_URGENCY_NORMAL)
-    push_topic = _topic_for_mode(
-        topic_mode=str(getattr(template_obj, 'push_topic_mode', NotificationTemplate.PUSH_TOPIC_EVENT) or NotificationTemplate.PUSH_TOPIC_EVENT),
-        event_key=event_key,
-        project_id=project_id,
-    )
-
-    payload = build_push_payload(
-        event_type=event_key,
-        title=push_title,
-        body=push_body,
-        url=url,
-        tag=tag,
-        priority=priority,
-        project_id=project_id,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        actions=actions,
-        ttl_seconds=push_ttl_seconds,
-        urgency=push_urgency,
-        topic=push_topic,
-    )
-
-    push_recipient_ids: list[int] = []
-    in_app_rows: list[InAppNotification] = []
-    email_rows: list[EmailNotificationDigestItem] = []
-    delivery_logs: list[NotificationDeliveryLog] = []
-    try:
-        cfg = WebPushGlobalSettings.get_active()
-        in_app_retention_days = max(1, int(getattr(cfg, 'in_app_retention_days', 7) or 7))
-    except Exception:
-        in_app_retention_days = 7
-    expires_at = timezone.now() + timedelta(days=in_app_retention_days)
-
-    for user_id in normalized_user_ids:
-        pref = pref_map.get(user_id)
-
-        push_enabled = channel_enabled_for_preference(
-            pref,
-            event_key=event_key,
-            channel=CHANNEL_MOBILE_PUSH,
-            availability=availability,
-        )
-        if push_enabled:
-            if is_project_channel_muted(user_id, project_id, CHANNEL_MOBILE_PUSH):
-                delivery_logs.append(
-                    NotificationDeliveryLog(
-                        event_key=event_key,
-                        user_id=user_id,
-                        channel=CHANNEL_MOBILE_PUSH,
-                        status=NotificationDeliveryLog.STATUS_SUPPRESSED,
-                        reason='project_mute',
-                        project_id=project_id,
-                    )
-                )
-            else:
-                suppressed, suppress_reason = should_suppress_channel_for_active_user(
-                    user_id=user_id,
-                    channel=CHANNEL_MOBILE_PUSH,
-                    priority=priority,
-                )
-                if suppressed:
-                    delivery_logs.append(
-                        NotificationDeliveryLog(
-                            event_key=event_key,
-                            user_id=user_id,
-                            channel=CHANNEL_MOBILE_PUSH,
-                            status=NotificationDeliveryLog.STATUS_SUPPRESSED,
-                            reason=suppress_reason,
-                            project_id=project_id,
-                        )
-                    )
-                else:
-                    push_recipient_ids.append(user_id)
-                    delivery_logs.append(
-                        NotificationDeliveryLog(
-                            event_key=event_key,
-                            user_id=user_id,
-                            channel=CHANNEL_MOBILE_PUSH,
-                            status=NotificationDeliveryLog.STATUS_QUEUED,
-                            reason='dispatch',
-                            project_id=project_id,
-                        )
-                    )
-
-        in_browser_enabled = channel_enabled_for_preference(
-            pref,
+    return dispatch_events([
+        DispatchEvent(
+            user_ids=tuple(normalized_user_ids),
             event_key=event_key,
-            channel=CHANNEL_IN_BROWSER,
-            availability=availability,
+            title=title,
+            body=body,
+            url=url,
+            tag=tag,
+            priority=priority,
+            project_id=project_id,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            actions=actions,
+            template_context=template_context,
         )
-        if in_browser_enabled:
-            if is_project_channel_muted(user_id, project_id, CHANNEL_IN_BROWSER):
-                delivery_logs.append(
-                    NotificationDeliveryLog(
-                        event_key=event_key,
-                        user_id=user_id,
-                        channel=CHANNEL_IN_BROWSER,
-                        status=NotificationDeliveryLog.STATUS_SUPPRESSED,
-                        reason='project_mute',
-                        project_id=project_id,
-                    )
-                )
-            else:
-                in_app_rows.append(
-                    InAppNotification(
-                        user_id=user_id,
-                        event_key=event_key,
-                        title=in_app_title,
-                        body=in_app_body,
-                        url=url,
-                        payload=payload,
-                        project_id=project_id,
-                        delivery_reason='dispatch',
-                        channel_origin=CHANNEL_IN_BROWSER,
-                        expires_at=expires_at,
-                    )
-                )
-                delivery_logs.append(
-                    NotificationDeliveryLog(
-                        event_key=event_key,
-                        user_id=user_id,
-                        channel=CHANNEL_IN_BROWSER,
-                        status=NotificationDeliveryLog.STATUS_SENT,
-                        reason='dispatch',
-                        project_id=project_id,
-                    )
-                )
-
-        email_enabled = channel_enabled_for_preference(
-            pref,
-            event_key=event_key,
-            channel=CHANNEL_EMAIL,
-            availability=availability,
-        )
-        if event_key != 'pred.digest' and email_enabled:
-            if is_project_channel_muted(user_id, project_id, CHANNEL_EMAIL):
-                delivery_logs.append(
-                    NotificationDeliveryLog(
-                        event_key=event_key,
-                        user_id=user_id,
-                        channel=CHANNEL_EMAIL,
-                        status=NotificationDeliveryLog.STATUS_SUPPRESSED,
-                        reason='project_mute',
-                        project_id=project_id,
-                    )
-                )
-            else:
-                suppressed, suppress_reason = should_suppress_channel_for_active_user(
-                    user_id=user_id,
-                    channel=CHANNEL_EMAIL,
-                    priority=priority,
-                )
-                if suppressed:
-                    delivery_logs.append(
-                        NotificationDeliveryLog(
-                            event_key=event_key,
-                            user_id=user_id,
-                            channel=CHANNEL_EMAIL,
-                            status=NotificationDeliveryLog.STATUS_SUPPRESSED,
-                            reason=suppress_reason,
-                            project_id=project_id,
-                        )
-                    )
-                else:
-                    email_rows.append(
-                        EmailNotificationDigestItem(
-                            user_id=user_id,
-                            event_key=event_key,
-                            title=email_subject,
-                            body=email_body,
-                            url=url,
-                            payload=payload,
-                        )
-                    )
-                    delivery_logs.append(
-                        NotificationDeliveryLog(
-                            event_key=event_key,
-                            user_id=user_id,
-                            channel=CHANNEL_EMAIL,
-                            status=NotificationDeliveryLog.STATUS_QUEUED,
-                            reason='digest_queue',
-                            project_id=project_id,
-                        )
-                    )
-
-    with transaction.atomic():
-        if in_app_rows:
-            InAppNotification.objects.bulk_create(in_app_rows)
-        if email_rows:
-            EmailNotificationDigestItem.objects.bulk_create(email_rows)
-        if delivery_logs:
-            NotificationDeliveryLog.objects.bulk_create(delivery_logs)
-
-    if push_recipient_ids:
-        queue_push_to_users(push_recipient_ids, payload, preference_field=None)
-
-    return {
-        'pushQueued': len(push_recipient_ids),
-        'inAppCreated': len(in_app_rows),
-        'emailQueued': len(email_rows),
-    }
+    ])[0]
 
 
 def queue_email_digest_items_for_users(
@@ -109,3 +109,45 @@ def should_suppress_channel_for_active_user(
     if not is_user_active_in_web(user_id):
         return False, ''
     return True, 'active_web_prefers_in_browser'
+
+
+def muted_project_channels(user_ids, project_ids, *, now_ts=None) -> dict[tuple[int, int], set[str]]:
+    """Batch form of ``is_project_channel_muted``: ``{(user_id, project_id): {channel, ...}}``."""
+    if not notifications_v2_enabled():
+        return {}
+    user_ids = {int(u) for u in user_ids if u is not None}
+    project_ids = {int(p) for p in project_ids if p is not None}
+    if not user_ids or not project_ids:
+        return {}
+    now_val = now_ts or timezone.now()
+    out: dict[tuple[int, int], set[str]] = {}
+    rows = NotificationProjectMute.objects.filter(user_id__in=user_ids, project_id__in=project_ids).values_list(
+        'user_id', 'project_id', 'mobile_push_muted_until', 'email_muted_until', 'in_browser_muted_until',
+    )
+    for user_id, project_id, push_until, email_until, browser_until in rows:
+        channels = {
+            channel
+            for channel, until in (
+                (CHANNEL_MOBILE_PUSH, push_until),
+                (CHANNEL_EMAIL, email_until),
+                (CHANNEL_IN_BROWSER, browser_until),
+            )
+            if until is not None and until > now_val
+        }
+        if channels:
+            out.setdefault((user_id, project_id), set()).update(channels)
+    return out
+
+
+def active_web_user_ids(user_ids) -> set[int]:
+    """Batch form of ``is_user_active_in_web`` (one settings read, one cache round-trip)."""
+    if not active_web_suppression_enabled():
+        return set()
+    ids = {int(u) for u in user_ids if u is not None}
+    if not ids:
+        return set()
+    try:
+        found = cache.get_many([_active_cache_key(uid) for uid in ids])
+    except Exception:
+        return set()
+    return {uid for uid in ids if found.get(_active_cache_key(uid)) is not None}
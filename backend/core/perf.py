@@ -1,5 +1,6 @@
 import json
 import logging
+import os
 import time
 from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass, field
@@ -79,3 +80,74 @@ def endpoint_timing(endpoint: str, request=None, tags: dict[str, Any] | None = N
                 LOGGER.info("endpoint_timing %s", json.dumps(payload, sort_keys=True, default=str))
             except Exception:  # nosec B110
                 pass
+
+
+def current_rss_mb() -> float | None:
+    """Resident set size of this process in MiB (None where unavailable)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            resident_pages = int(fh.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+    except Exception:
+        pass
+    try:
+        import resource
+
+        # ru_maxrss is the peak, not the current value; best effort off Linux.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    except Exception:
+        return None
+
+
+def peak_rss_mb() -> float | None:
+    try:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    except Exception:
+        return None
+
+
+@dataclass
+class JobMemory:
+    job: str
+    tags: dict[str, Any] = field(default_factory=dict)
+    rss_start_mb: float | None = None
+    rss_end_mb: float | None = None
+    peak_rss_mb: float | None = None
+    duration_ms: float = 0.0
+
+    def tag(self, key: str, value: Any) -> None:
+        self.tags[key] = value
+
+
+@contextmanager
+def job_memory(job: str, tags: dict[str, Any] | None = None) -> Iterator[JobMemory]:
+    """Log RSS before/after a background job so memory growth shows up per job.
+
+    ``peak_rss_mb`` is the process high-water mark, so a job that raised it
+    is the one whose ``peak_rss_mb`` exceeds the previous jobs' values.
+    """
+    meter = JobMemory(job=job, rss_start_mb=current_rss_mb())
+    if tags:
+        meter.tags.update(tags)
+    started_at = time.perf_counter()
+    try:
+        yield meter
+    finally:
+        meter.duration_ms = (time.perf_counter() - started_at) * 1000.0
+        meter.rss_end_mb = current_rss_mb()
+        meter.peak_rss_mb = peak_rss_mb()
+        payload: dict[str, Any] = {
+            "job": job,
+            "duration_ms": round(meter.duration_ms, 2),
+            "rss_start_mb": round(meter.rss_start_mb, 1) if meter.rss_start_mb is not None else None,
+            "rss_end_mb": round(meter.rss_end_mb, 1) if meter.rss_end_mb is not None else None,
+            "peak_rss_mb": round(meter.peak_rss_mb, 1) if meter.peak_rss_mb is not None else None,
+        }
+        if meter.tags:
+            payload["tags"] = meter.tags
+        try:
+            LOGGER.info("job_memory %s", json.dumps(payload, sort_keys=True, default=str))
+        except Exception:  # nosec B110
+            pass
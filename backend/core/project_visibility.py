@@ -5,6 +5,7 @@ from typing import Any
 
 from django.db.models import Q
 
+from core.request_memo import request_memoized
 from projects.models import Project
 
 VISIBILITY_SCOPE_CATALOG: tuple[dict[str, str], ...] = (
@@ -97,6 +98,7 @@ def get_scope_keywords(scope_key: str) -> ScopeKeywords:
     )
 
 
+@request_memoized(invalidated_by=('projects.Project', 'core.ProjectVisibilitySettings'))
 def get_hidden_project_ids_for_scope(scope_key: str) -> set[int]:
     keywords = get_scope_keywords(scope_key)
     if not keywords.project_keywords and not keywords.client_keywords:
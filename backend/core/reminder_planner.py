@@ -0,0 +1,130 @@
+"""Plan nightly reminder and digest notifications in bulk.
+
+Each planner resolves every due ``(user, item)`` pair with one joined query
+(items → assignments → linked user profile) and applies the per-user
+``reminder_days_before`` horizon in Python, so the cost of a run grows with
+the number of due items rather than users × queries. Tasks then dispatch
+through ``core.notification_dispatch.dispatch_events`` and write
+``NotificationLog`` rows with ``bulk_create``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ReminderPreference:
+    user_id: int
+    horizon_days: int
+    daily_digest: bool
+    email: str
+
+
+def reminder_preferences() -> dict[int, ReminderPreference]:
+    from core.models import NotificationPreference
+
+    rows = NotificationPreference.objects.values_list('user_id', 'reminder_days_before', 'daily_digest', 'user__email')
+    return {
+        user_id: ReminderPreference(
+            user_id=user_id,
+            horizon_days=max(0, int(days or 1)),
+            daily_digest=bool(digest),
+            email=email or '',
+        )
+        for user_id, days, digest, email in rows
+    }
+
+
+def _max_horizon(prefs: dict[int, ReminderPreference]) -> Optional[int]:
+    return max((p.horizon_days for p in prefs.values()), default=None)
+
+
+def plan_pre_deliverable_reminders(prefs: dict[int, ReminderPreference], *, today: date | None = None):
+    """Return ``(items_by_id, {item_id: [user_id, ...]})`` for upcoming pre-deliverable items.
+
+    Matches ``PreDeliverableService.get_upcoming_for_user`` for every user
+    with notification preferences: active items within the user's horizon
+    on deliverables the user's person is actively assigned to.
+    """
+    from deliverables.models import PreDeliverableItem
+
+    max_horizon = _max_horizon(prefs)
+    if max_horizon is None:
+        return {}, {}
+    today = today or date.today()
+    rows = (
+        PreDeliverableItem.objects
+        .filter(
+            generated_date__gte=today,
+            generated_date__lte=today + timedelta(days=max_horizon),
+            is_active=True,
+            deliverable__assignments__is_active=True,
+            deliverable__assignments__person__user_profile__isnull=False,
+        )
+        .values_list('id', 'generated_date', 'deliverable__assignments__person__user_profile__user_id')
+        .distinct()
+    )
+    users_by_item: dict[int, list[int]] = {}
+    for item_id, generated_date, user_id in rows:
+        pref = prefs.get(user_id)
+        if pref is None or generated_date > today + timedelta(days=pref.horizon_days):
+            continue
+        users = users_by_item.setdefault(item_id, [])
+        if user_id not in users:
+            users.append(user_id)
+    items = (
+        PreDeliverableItem.objects
+        .filter(id__in=list(users_by_item))
+        .select_related('deliverable', 'deliverable__project', 'pre_deliverable_type')
+        .in_bulk()
+    )
+    return items, users_by_item
+
+
+def plan_deliverable_reminders(prefs: dict[int, ReminderPreference], *, today: date | None = None):
+    """Return ``(deliverables_by_id, {deliverable_id: [user_id, ...]})`` for deliverables due
+    within each user's horizon on projects their person is actively assigned to."""
+    from deliverables.models import Deliverable
+
+    max_horizon = _max_horizon(prefs)
+    if max_horizon is None:
+        return {}, {}
+    today = today or date.today()
+    rows = (
+        Deliverable.objects
+        .filter(
+            date__isnull=False,
+            date__gte=today,
+            date__lte=today + timedelta(days=max_horizon),
+            project__assignment__is_active=True,
+            project__assignment__person__user_profile__isnull=False,
+        )
+        .values_list('id', 'date', 'project__assignment__person__user_profile__user_id')
+        .distinct()
+    )
+    users_by_deliverable: dict[int, list[int]] = {}
+    for deliverable_id, due, user_id in rows:
+        pref = prefs.get(user_id)
+        if pref is None or due > today + timedelta(days=pref.horizon_days):
+            continue
+        users = users_by_deliverable.setdefault(deliverable_id, [])
+        if user_id not in users:
+            users.append(user_id)
+    deliverables = (
+        Deliverable.objects
+        .filter(id__in=list(users_by_deliverable))
+        .select_related('project')
+        .in_bulk()
+    )
+    return deliverables, users_by_deliverable
+
+
+def items_by_user(users_by_item: dict[int, list[int]]) -> dict[int, list[int]]:
+    out: dict[int, list[int]] = {}
+    for item_id, user_ids in users_by_item.items():
+        for user_id in user_ids:
+            out.setdefault(user_id, []).append(item_id)
+    return out
@@ -0,0 +1,169 @@
+"""Request-scoped memoization of repeated lookups.
+
+A single request (or Celery task) often asks the same question several
+times: the visibility settings row, the hidden project ids for a scope, the
+department tree, the utilization scheme. ``request_memoized`` caches such
+pure lookups in a context-local store that ``RequestIDLogMiddleware`` and the
+Celery ``task_prerun``/``task_postrun`` hooks open and discard, so nothing
+leaks across requests. Outside a scope the decorated function simply runs.
+
+Functions list the models they read in ``invalidated_by``; saving or
+deleting one of those clears the function's entries in the active scope.
+"""
+
+from __future__ import annotations
+
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+
+try:  # pragma: no cover - defensive import
+    from celery.signals import task_postrun, task_prerun  # type: ignore
+except Exception:  # pragma: no cover
+    task_prerun = None  # type: ignore
+    task_postrun = None  # type: ignore
+
+
+@dataclass
+class MemoScope:
+    store: dict = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+    by_function: dict = field(default_factory=dict)
+
+
+_scope: ContextVar[Optional[MemoScope]] = ContextVar('request_memo_scope', default=None)
+_MISSING = object()
+# model label -> names of memoized functions reading it
+_dependents: dict[str, set[str]] = {}
+# celery task_id -> ContextVar token
+_task_tokens: dict[str, Any] = {}
+
+
+def _enabled() -> bool:
+    return bool(getattr(settings, 'REQUEST_MEMO_ENABLED', True))
+
+
+@contextmanager
+def memo_scope():
+    """Open a memo scope, reusing the enclosing one when nested."""
+    current = _scope.get()
+    if current is not None:
+        yield current
+        return
+    scope = MemoScope()
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+def memo_stats() -> Optional[dict]:
+    """Hit/miss counters of the active scope, or None outside one."""
+    scope = _scope.get()
+    if scope is None:
+        return None
+    return {
+        'hits': scope.hits,
+        'misses': scope.misses,
+        'by_function': {name: dict(counts) for name, counts in scope.by_function.items()},
+    }
+
+
+def _copy(value):
+    # Callers may mutate what they get back; never hand out the cached container.
+    if isinstance(value, (list, set, dict)):
+        return value.copy()
+    return value
+
+
+def _invalidate(name: str) -> None:
+    scope = _scope.get()
+    if scope is None:
+        return
+    for key in [k for k in scope.store if k[0] == name]:
+        del scope.store[key]
+
+
+def request_memoized(func: Callable | None = None, *, invalidated_by: Iterable[str] = ()):
+    """Memoize ``func`` per request/task scope, keyed by its (hashable) arguments.
+
+    Usable bare (``@request_memoized``) or with ``invalidated_by`` model
+    labels such as ``('projects.Project',)``. The wrapper exposes
+    ``invalidate()`` to drop its entries from the active scope.
+    """
+
+    def decorate(fn: Callable) -> Callable:
+        name = f'{fn.__module__}.{fn.__qualname__}'
+        for label in invalidated_by:
+            _dependents.setdefault(label.lower(), set()).add(name)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            scope = _scope.get()
+            if scope is None or not _enabled():
+                return fn(*args, **kwargs)
+            try:
+                key = (name, args, tuple(sorted(kwargs.items())))
+                cached = scope.store.get(key, _MISSING)
+            except TypeError:
+                return fn(*args, **kwargs)
+            counts = scope.by_function.setdefault(name, {'hits': 0, 'misses': 0})
+            if cached is not _MISSING:
+                scope.hits += 1
+                counts['hits'] += 1
+                return _copy(cached)
+            scope.misses += 1
+            counts['misses'] += 1
+            value = fn(*args, **kwargs)
+            scope.store[key] = value
+            return _copy(value)
+
+        wrapper.invalidate = lambda: _invalidate(name)  # type: ignore[attr-defined]
+        return wrapper
+
+    if func is not None:
+        return decorate(func)
+    return decorate
+
+
+def _on_model_change(sender=None, **kwargs):
+    if _scope.get() is None:
+        return
+    try:
+        label = sender._meta.label_lower
+    except Exception:
+        return
+    for name in _dependents.get(label, ()):
+        _invalidate(name)
+
+
+post_save.connect(_on_model_change, weak=False, dispatch_uid='core.request_memo.post_save')
+post_delete.connect(_on_model_change, weak=False, dispatch_uid='core.request_memo.post_delete')
+
+
+def _on_task_prerun(sender=None, task_id=None, **kwargs):
+    if not task_id or _scope.get() is not None:
+        return
+    _task_tokens[task_id] = _scope.set(MemoScope())
+
+
+def _on_task_postrun(sender=None, task_id=None, **kwargs):
+    token = _task_tokens.pop(task_id, None) if task_id else None
+    if token is None:
+        return
+    try:
+        _scope.reset(token)
+    except Exception:  # nosec B110
+        _scope.set(None)
+
+
+if task_prerun is not None and task_postrun is not None:
+    task_prerun.connect(_on_task_prerun, weak=False, dispatch_uid='core.request_memo.prerun')
+    task_postrun.connect(_on_task_postrun, weak=False, dispatch_uid='core.request_memo.postrun')
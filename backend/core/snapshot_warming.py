@@ -0,0 +1,167 @@
+"""Warm the most-requested snapshot bundles after scope invalidation.
+
+Snapshot views call ``record_snapshot_build`` on every cached GET with two
+``RefreshSpec``s: one resolving the entry's *current* cache key and one
+rebuilding its value. Entries are counted under a signature of those specs,
+which carry the filters and authz scope but not the scope/analytics
+versions, so a shape keeps its hits across invalidations and warming writes
+the versioned key the next request will read.
+
+``bump_snapshot_scopes`` calls ``queue_snapshot_warming``, which debounces a
+burst of invalidations into one ``warm_snapshot_caches_task`` run. That task
+picks the top ``SNAPSHOT_WARM_MAX_KEYS`` keys by hits and rebuilds them
+through their registered builders across at most
+``SNAPSHOT_WARM_CONCURRENCY`` batch tasks, so the next user finds a warm
+cache. No request is replayed, so warming never runs middleware, permission
+checks or throttles on a user's behalf.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.aggregate_cache import RefreshSpec, is_forced_refresh, rebuild_aggregate_entry
+from core.encoded_responses import encoded_cache_key
+
+REGISTRY_KEY = 'snapshot_warm:registry'
+PENDING_KEY = 'snapshot_warm:pending'
+MAX_REGISTRY_ENTRIES = 500
+
+
+def _setting(name: str, default: int) -> int:
+    try:
+        return max(0, int(getattr(settings, name, default)))
+    except Exception:
+        return default
+
+
+def _hits_key(signature: str) -> str:
+    return f'snapshot_warm:hits:{signature}'
+
+
+def warming_enabled() -> bool:
+    return bool(getattr(settings, 'SNAPSHOT_WARMING_ENABLED', True)) and _setting('SNAPSHOT_WARM_MAX_KEYS', 20) > 0
+
+
+def record_snapshot_build(key_spec: RefreshSpec, spec: RefreshSpec, *, ttl: int, stale_ttl: int = 0) -> None:
+    """Count a cached snapshot GET so warming can rebuild popular shapes."""
+    if not warming_enabled() or is_forced_refresh():
+        return
+    try:
+        shape = json.dumps([key_spec.to_dict(), spec.to_dict()], sort_keys=True, default=str)
+        signature = hashlib.sha256(shape.encode()).hexdigest()[:24]
+        track_seconds = _setting('SNAPSHOT_WARM_TRACK_SECONDS', 7 * 24 * 3600)
+        cache.add(_hits_key(signature), 0, timeout=track_seconds)
+        cache.incr(_hits_key(signature))
+        # The registry update is an unlocked read-modify-write, so a racing
+        # writer can drop an entry; checking on every hit re-adds it.
+        registry = cache.get(REGISTRY_KEY) or {}
+        if signature not in registry:
+            registry[signature] = {
+                'keySpec': key_spec.to_dict(),
+                'spec': spec.to_dict(),
+                'ttl': int(ttl),
+                'staleTtl': int(stale_ttl),
+            }
+            if len(registry) > MAX_REGISTRY_ENTRIES:
+                registry = _prune_registry(registry)
+            cache.set(REGISTRY_KEY, registry, timeout=None)
+    except Exception:  # nosec B110
+        pass
+
+
+def _prune_registry(registry: dict[str, dict]) -> dict[str, dict]:
+    hits = cache.get_many([_hits_key(sig) for sig in registry])
+    live = {sig: entry for sig, entry in registry.items() if _hits_key(sig) in hits}
+    ranked = sorted(live, key=lambda sig: -int(hits.get(_hits_key(sig)) or 0))
+    return {sig: live[sig] for sig in ranked[:MAX_REGISTRY_ENTRIES]}
+
+
+def warm_candidates(limit: int | None = None) -> list[dict[str, Any]]:
+    """Return the most-requested registry entries, most hits first."""
+    if limit is None:
+        limit = _setting('SNAPSHOT_WARM_MAX_KEYS', 20)
+    try:
+        registry = cache.get(REGISTRY_KEY) or {}
+        hits = cache.get_many([_hits_key(sig) for sig in registry])
+    except Exception:
+        return []
+    ranked = sorted(
+        (sig for sig in registry if _hits_key(sig) in hits),
+        key=lambda sig: (-int(hits.get(_hits_key(sig)) or 0), sig),
+    )
+    return [dict(registry[sig], hits=int(hits.get(_hits_key(sig)) or 0)) for sig in ranked[:limit]]
+
+
+def _dispatch_warming(countdown: int) -> None:
+    try:
+        from core.tasks import warm_snapshot_caches_task
+        warm_snapshot_caches_task.apply_async(countdown=countdown)
+    except Exception:
+        try:
+            cache.delete(PENDING_KEY)
+        except Exception:  # nosec B110
+            pass
+
+
+def queue_snapshot_warming() -> bool:
+    """Schedule one warming run per debounce window, after the current commit."""
+    if not warming_enabled():
+        return False
+    debounce = _setting('SNAPSHOT_WARM_DEBOUNCE_SECONDS', 10)
+    try:
+        if not cache.add(PENDING_KEY, time.time(), timeout=max(1, debounce)):
+            return False
+    except Exception:
+        return False
+    transaction.on_commit(lambda: _dispatch_warming(debounce))
+    return True
+
+
+def warm_entries(entries: list[dict[str, Any]]) -> dict[str, int]:
+    warmed = failed = 0
+    for entry in entries:
+        try:
+            spec = RefreshSpec.from_dict(entry['spec'])
+            key = RefreshSpec.from_dict(entry['keySpec']).build()
+            if spec.encoded:
+                key = encoded_cache_key(key)
+            rebuild_aggregate_entry(
+                key,
+                spec,
+                ttl=int(entry.get('ttl') or 1),
+                stale_ttl=int(entry.get('staleTtl') or 0),
+            )
+            warmed += 1
+        except Exception:
+            failed += 1
+    return {'warmed': warmed, 'failed': failed}
+
+
+def run_snapshot_warming(*, dispatch: bool = True) -> dict[str, int]:
+    """Rebuild the top cache keys, fanned out over bounded batch tasks."""
+    entries = warm_candidates()
+    if not entries:
+        return {'candidates': 0, 'batches': 0, 'warmed': 0, 'failed': 0}
+    concurrency = max(1, _setting('SNAPSHOT_WARM_CONCURRENCY', 2))
+    batches = [entries[i::concurrency] for i in range(min(concurrency, len(entries)))]
+    summary = {'candidates': len(entries), 'batches': len(batches), 'warmed': 0, 'failed': 0}
+    for batch in batches:
+        if dispatch:
+            try:
+                from core.tasks import warm_snapshot_batch_task
+                warm_snapshot_batch_task.delay(batch)
+                continue
+            except Exception:  # nosec B110
+                pass
+        result = warm_entries(batch)
+        summary['warmed'] += result['warmed']
+        summary['failed'] += result['failed']
+    return summary
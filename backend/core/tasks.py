@@ -13,15 +13,13 @@ from django.db.models import Prefetch
 from django.conf import settings
 from django.utils import timezone
 from django.core.cache import cache
+from core.job_progress import report_progress
 from core.webpush import (
     flush_due_deferred_push_notifications,
     run_web_push_subscription_health_check,
     send_push_to_users,
 )
-from core.notification_dispatch import (
-    channel_enabled_for_preference,
-    dispatch_event_to_users,
-)
+from core.notification_dispatch import channel_enabled_for_preference
 
 
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=2, retry_kwargs={"max_retries": 3}, soft_time_limit=120)
@@ -37,9 +35,8 @@ def generate_grid_snapshot_async(
     Returns a dict with keys: { weekKeys, people, hoursByPerson }.
     """
     from people.models import Person  # local import for task autodiscovery safety
-    from people.eligibility import first_eligible_week_start
     from departments.models import Department
-    from assignments.models import Assignment
+    from assignments.read_queries import build_grid_snapshot_payload
 
     # clamp weeks 1..52
     weeks = max(1, min(int(weeks or 12), 52))
@@ -71,61 +68,17 @@ def generate_grid_snapshot_async(
         except Exception:
             pass
 
-    asn_qs = Assignment.objects.filter(is_active=True)
-    if vertical is not None:
-        try:
-            asn_qs = asn_qs.filter(project__vertical_id=int(vertical))
-        except Exception:
-            pass
-    asn_qs = asn_qs.only('weekly_hours', 'person_id')
-    people_qs = people_qs.prefetch_related(Prefetch('assignments', queryset=asn_qs))
-
-    # Sundays for requested horizon (Sunday-only policy)
-    from core.week_utils import sunday_of_week
-    today = date.today()
-    start_sunday = sunday_of_week(today)
-    week_keys = [(start_sunday + timedelta(weeks=w)).isoformat() for w in range(weeks)]
-
-    # helper: tolerate +/- 3 days against provided Monday key
-    def hours_for_week_from_json(weekly_hours: dict, sunday_key: str) -> float:
-        if not weekly_hours:
-            return 0.0
-        try:
-            return float(weekly_hours.get(sunday_key) or 0)
-        except Exception:
-            return 0.0
-
-    total = max(1, people_qs.count())
-    processed = 0
-
-    people_list: List[Dict[str, Any]] = []
-    hours_by_person: Dict[int, Dict[str, float]] = {}
-
     try:
-        for p in people_qs.iterator():
-            first_eligible = first_eligible_week_start(getattr(p, 'hire_date', None))
-            people_list.append({
-                'id': p.id,
-                'name': p.name,
-                'weeklyCapacity': p.weekly_capacity or 0,
-                'department': p.department_id,
-                'firstEligibleWeek': first_eligible.isoformat() if first_eligible is not None else None,
-            })
-            wk_map: Dict[str, float] = {}
-            for wk in week_keys:
-                wk_total = 0.0
-                for a in getattr(p, 'assignments').all():
-                    wk_total += hours_for_week_from_json(a.weekly_hours or {}, wk)
-                if wk_total != 0.0:
-                    wk_map[wk] = round(wk_total, 2)
-            hours_by_person[p.id] = wk_map
+        vertical_id = int(vertical) if vertical is not None else None
+    except Exception:
+        vertical_id = None
 
-            processed += 1
-            if processed % 25 == 0 or processed == total:
-                try:
-                    self.update_state(state='PROGRESS', meta={'progress': int(processed * 100 / total), 'message': f'Processed {processed}/{total} people'})
-                except Exception:  # nosec B110
-                    pass
+    try:
+        payload = build_grid_snapshot_payload(people_qs=people_qs, weeks=weeks, vertical_id=vertical_id)
+        try:
+            report_progress(self, 'PROGRESS', 100, f"Processed {len(payload['people'])} people")
+        except Exception:  # nosec B110
+            pass
     except Exception as e:
         try:
             import sentry_sdk  # type: ignore
@@ -134,7 +87,7 @@ def generate_grid_snapshot_async(
             pass
         raise
 
-    return {'weekKeys': week_keys, 'people': people_list, 'hoursByPerson': hours_by_person}
+    return payload
 
 
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=2, retry_kwargs={"max_retries": 3}, soft_time_limit=120)
@@ -147,6 +100,8 @@ def bulk_skill_matching_async(self, skills: List[str], filters: Dict[str, Any])
     from people.eligibility import is_hired_in_week, is_hired_on_date
     from skills.models import PersonSkill, SkillTag
     from assignments.models import Assignment
+    from assignments.read_queries import week_hours_by_person
+    from core.week_utils import sunday_of_week
     from departments.models import Department
     from datetime import datetime as _dt, timedelta as _td
 
@@ -195,23 +150,26 @@ def bulk_skill_matching_async(self, skills: List[str], filters: Dict[str, Any])
             pass
 
     skill_qs = PersonSkill.objects.select_related('skill_tag')
-    prefetches = [Prefetch('skills', queryset=skill_qs)]
+    people_qs = people_qs.prefetch_related(Prefetch('skills', queryset=skill_qs))
+    allocated_by_person: Dict[int, float] = {}
     if week_monday is not None:
-        asn_qs = Assignment.objects.filter(is_active=True)
+        asn_qs = Assignment.objects.filter(is_active=True, person__in=people_qs.order_by().values('id'))
         if vertical_param not in (None, ""):
             try:
                 asn_qs = asn_qs.filter(project__vertical_id=int(vertical_param))
             except Exception:  # nosec B110
                 pass
-        asn_qs = asn_qs.only('weekly_hours', 'person_id')
-        prefetches.append(Prefetch('assignments', queryset=asn_qs))
-    people_qs = people_qs.prefetch_related(*prefetches)
+        week_sunday = sunday_of_week(week_monday)
+        allocated_by_person = {
+            pid: by_week.get(week_sunday, 0.0)
+            for pid, by_week in week_hours_by_person(asn_qs, [week_sunday]).items()
+        }
 
     results: List[Dict[str, Any]] = []
     total = max(1, people_qs.count())
     processed = 0
     try:
-        for p in people_qs.iterator():
+        for p in people_qs.iterator(chunk_size=500):
             if week_monday is not None:
                 if not is_hired_in_week(getattr(p, 'hire_date', None), week_monday):
                     continue
@@ -235,27 +193,7 @@ def bulk_skill_matching_async(self, skills: List[str], filters: Dict[str, Any])
             if week_monday is not None:
                 cap = float(p.weekly_capacity or 0)
                 if cap > 0:
-                    wk_key = week_monday.strftime('%Y-%m-%d')
-                    allocated = 0.0
-                    for a in getattr(p, 'assignments').all():
-                        wh = a.weekly_hours or {}
-                        val = 0.0
-                        if wk_key in wh:
-                            try:
-                                val = float(wh[wk_key] or 0)
-                            except Exception:
-                                val = 0.0
-                        else:
-                            for off in range(-3, 4):
-                                d = week_monday + _td(days=off)
-                                k = d.strftime('%Y-%m-%d')
-                                if k in wh:
-                                    try:
-                                        val = float(wh[k] or 0)
-                                    except Exception:
-                                        val = 0.0
-                                    break
-                        allocated += val
+                    allocated = allocated_by_person.get(p.id, 0.0)
                     avail_pct = max(0.0, (cap - allocated) / cap * 100.0)
                     base_score = 0.7 * base_score + 0.3 * avail_pct
 
@@ -272,7 +210,7 @@ def bulk_skill_matching_async(self, skills: List[str], filters: Dict[str, Any])
             processed += 1
             if processed % 50 == 0 or processed == total:
                 try:
-                    self.update_state(state='PROGRESS', meta={'progress': int(processed * 100 / total)})
+                    report_progress(self, 'PROGRESS', int(processed * 100 / total))
                 except Exception:  # nosec B110
                     pass
     except Exception as e:
@@ -292,93 +230,83 @@ def send_pre_deliverable_reminders(self):
     # Gated by env flags
     if os.getenv('PRED_ITEMS_NOTIFICATIONS_ENABLED', 'false').lower() != 'true':
         return {'sent': 0, 'dispatches': 0}
-    from core.models import NotificationPreference, NotificationLog
-    from assignments.models import Assignment
-    from deliverables.models import Deliverable
-    from deliverables.services import PreDeliverableService
+    from core.models import NotificationLog
+    from core.notification_dispatch import DispatchEvent, dispatch_events
+    from core.reminder_planner import plan_deliverable_reminders, plan_pre_deliverable_reminders, reminder_preferences
     from datetime import date as _date
+
+    # Reminder horizon remains controlled by each user's preference days-before.
+    prefs = reminder_preferences()
+    items, users_by_item = plan_pre_deliverable_reminders(prefs)
+    deliverables, users_by_deliverable = plan_deliverable_reminders(prefs)
+
+    events: list = []
+    logs: list = []
     sent = 0
-    dispatches = 0
-    for pref in NotificationPreference.objects.select_related('user'):
-        # Reminder horizon remains controlled by existing user preference days-before.
-        if int(getattr(pref, 'reminder_days_before', 1) or 1) < 0:
-            continue
-        upcoming = PreDeliverableService.get_upcoming_for_user(pref.user, days_ahead=max(0, int(pref.reminder_days_before or 1)))
-        for it in upcoming:
-            subject = f"Reminder: {getattr(it.pre_deliverable_type, 'name', 'Pre-Deliverable')} ({it.generated_date})"
-            body = f"{getattr(it.deliverable.project, 'name', 'Project')} • {it.generated_date}"
-            result = dispatch_event_to_users(
-                user_ids=[pref.user_id],
-                event_key='pred.reminder',
-                title='Pre-Deliverable Reminder',
-                body=body,
-                url=f"/deliverables/calendar?project={it.deliverable.project_id}&deliverable={it.deliverable_id}&preItem={it.id}",
-                tag=f"pred.reminder.{it.id}",
-                project_id=getattr(it.deliverable, 'project_id', None),
-                entity_type='pre_deliverable',
-                entity_id=getattr(it, 'id', None),
-                priority='normal',
-            )
-            dispatches += int(result.get('pushQueued', 0)) + int(result.get('inAppCreated', 0)) + int(result.get('emailQueued', 0))
-            sent += 1
-            NotificationLog.objects.create(
-                user=pref.user,
+    for item_id in sorted(users_by_item, key=lambda i: (items[i].generated_date, i)):
+        it = items[item_id]
+        user_ids = users_by_item[item_id]
+        subject = f"Reminder: {getattr(it.pre_deliverable_type, 'name', 'Pre-Deliverable')} ({it.generated_date})"
+        events.append(DispatchEvent(
+            user_ids=tuple(user_ids),
+            event_key='pred.reminder',
+            title='Pre-Deliverable Reminder',
+            body=f"{getattr(it.deliverable.project, 'name', 'Project')} • {it.generated_date}",
+            url=f"/deliverables/calendar?project={it.deliverable.project_id}&deliverable={it.deliverable_id}&preItem={it.id}",
+            tag=f"pred.reminder.{it.id}",
+            project_id=getattr(it.deliverable, 'project_id', None),
+            entity_type='pre_deliverable',
+            entity_id=getattr(it, 'id', None),
+            priority='normal',
+        ))
+        sent += len(user_ids)
+        logs.extend(
+            NotificationLog(
+                user_id=user_id,
                 pre_deliverable_item=it,
                 notification_type='reminder',
                 sent_at=_date.today(),
                 email_subject=subject,
                 success=True,
             )
-        # Standard deliverable reminder stream (separate from pre-deliverables).
-        person_id = getattr(getattr(pref.user, 'profile', None), 'person_id', None)
-        if person_id:
-            project_ids = list(
-                Assignment.objects.filter(
-                    person_id=person_id,
-                    is_active=True,
-                    project_id__isnull=False,
-                ).values_list('project_id', flat=True).distinct()
+            for user_id in user_ids
+        )
+    # Standard deliverable reminder stream (separate from pre-deliverables).
+    for deliverable_id in sorted(users_by_deliverable, key=lambda d: (deliverables[d].date, d)):
+        deliverable = deliverables[deliverable_id]
+        user_ids = users_by_deliverable[deliverable_id]
+        project_name = getattr(getattr(deliverable, 'project', None), 'name', None) or 'Project'
+        deliverable_name = (deliverable.description or '').strip() or f"Deliverable {deliverable.id}"
+        events.append(DispatchEvent(
+            user_ids=tuple(user_ids),
+            event_key='deliverable.reminder',
+            title='Deliverable Reminder',
+            body=f"{project_name} • {deliverable_name} • due {deliverable.date.isoformat()}",
+            url=f"/deliverables/calendar?project={deliverable.project_id}&deliverable={deliverable.id}",
+            tag=f"deliverable.reminder.{deliverable.id}",
+            project_id=deliverable.project_id,
+            entity_type='deliverable',
+            entity_id=deliverable.id,
+            priority='normal',
+        ))
+        logs.extend(
+            NotificationLog(
+                user_id=user_id,
+                pre_deliverable_item=None,
+                notification_type='deliverable_reminder',
+                sent_at=_date.today(),
+                email_subject=f"Deliverable Reminder: {deliverable_name} ({deliverable.date.isoformat()})",
+                success=True,
             )
-            if project_ids:
-                horizon_days = max(0, int(pref.reminder_days_before or 1))
-                today = _date.today()
-                horizon_end = today + timedelta(days=horizon_days)
-                deliverables = (
-                    Deliverable.objects
-                    .filter(
-                        project_id__in=project_ids,
-                        date__isnull=False,
-                        date__gte=today,
-                        date__lte=horizon_end,
-                    )
-                    .select_related('project')
-                    .order_by('date', 'id')
-                )
-                for deliverable in deliverables:
-                    project_name = getattr(getattr(deliverable, 'project', None), 'name', None) or 'Project'
-                    deliverable_name = (deliverable.description or '').strip() or f"Deliverable {deliverable.id}"
-                    body = f"{project_name} • {deliverable_name} • due {deliverable.date.isoformat()}"
-                    result = dispatch_event_to_users(
-                        user_ids=[pref.user_id],
-                        event_key='deliverable.reminder',
-                        title='Deliverable Reminder',
-                        body=body,
-                        url=f"/deliverables/calendar?project={deliverable.project_id}&deliverable={deliverable.id}",
-                        tag=f"deliverable.reminder.{deliverable.id}",
-                        project_id=deliverable.project_id,
-                        entity_type='deliverable',
-                        entity_id=deliverable.id,
-                        priority='normal',
-                    )
-                    dispatches += int(result.get('pushQueued', 0)) + int(result.get('inAppCreated', 0)) + int(result.get('emailQueued', 0))
-                    NotificationLog.objects.create(
-                        user=pref.user,
-                        pre_deliverable_item=None,
-                        notification_type='deliverable_reminder',
-                        sent_at=_date.today(),
-                        email_subject=f"Deliverable Reminder: {deliverable_name} ({deliverable.date.isoformat()})",
-                        success=True,
-                    )
+            for user_id in user_ids
+        )
+
+    dispatches = sum(
+        int(result.get('pushQueued', 0)) + int(result.get('inAppCreated', 0)) + int(result.get('emailQueued', 0))
+        for result in dispatch_events(events)
+    )
+    if logs:
+        NotificationLog.objects.bulk_create(logs, batch_size=1000)
     return {'sent': sent, 'dispatches': dispatches}
 
 
@@ -386,35 +314,64 @@ def send_pre_deliverable_reminders(self):
 def send_daily_digest(self):
     if os.getenv('PRED_ITEMS_DIGEST_ENABLED', 'false').lower() != 'true':
         return {'sent': 0}
-    from core.models import NotificationPreference, NotificationLog
-    from deliverables.services import PreDeliverableService
-    from django.core.mail import send_mail
+    from core.models import NotificationLog, NotificationPreference
+    from core.notification_dispatch import DispatchEvent, dispatch_events, get_effective_channel_availability
+    from core.reminder_planner import items_by_user, plan_pre_deliverable_reminders, reminder_preferences
+    from django.core.mail import EmailMessage, get_connection
     from datetime import date as _date
+
+    prefs = {uid: pref for uid, pref in reminder_preferences().items() if pref.daily_digest}
+    if not prefs:
+        return {'sent': 0}
+    items, users_by_item = plan_pre_deliverable_reminders(prefs)
+    item_ids_by_user = items_by_user(users_by_item)
+    pref_rows = NotificationPreference.objects.filter(user_id__in=list(prefs)).in_bulk(field_name='user_id')
+    availability = get_effective_channel_availability()
+    subject = 'Daily Pre-Deliverables Digest'
+
     sent = 0
-    for pref in NotificationPreference.objects.select_related('user'):
-        if not pref.daily_digest:
-            continue
-        items = PreDeliverableService.get_upcoming_for_user(pref.user, days_ahead=max(0, int(pref.reminder_days_before or 1)))
-        subject = 'Daily Pre-Deliverables Digest'
-        lines = [f"- {getattr(it.pre_deliverable_type, 'name', '')} • {getattr(it.deliverable.project, 'name', '')} • {it.generated_date}" for it in items]
-        body = '\n'.join(lines) if lines else 'No upcoming items.'
-        ok = True
-        try:
-            if pref.user.email and channel_enabled_for_preference(pref, event_key='pred.digest', channel='email'):
-                send_mail(subject, body, None, [pref.user.email])
-                sent += 1
-        except Exception:
-            ok = False
-        dispatch_event_to_users(
-            user_ids=[pref.user_id],
-            event_key='pred.digest',
-            title='Daily Pre-Deliverables Digest',
-            body=f"{len(items)} upcoming item(s).",
-            url='/deliverables/calendar?mine_only=1',
-            tag='pred.digest',
-            priority='normal',
-        )
-        NotificationLog.objects.create(user=pref.user, pre_deliverable_item=None, notification_type='digest', sent_at=_date.today(), email_subject=subject, success=ok)
+    events: list = []
+    logs: list = []
+    # One SMTP connection for the whole run instead of one per send_mail call.
+    connection = get_connection(fail_silently=False)
+    opened = False
+    try:
+        for user_id in sorted(prefs):
+            user_items = sorted(
+                (items[i] for i in item_ids_by_user.get(user_id, [])),
+                key=lambda it: (it.generated_date, getattr(it.deliverable.project, 'name', '') or ''),
+            )
+            lines = [f"- {getattr(it.pre_deliverable_type, 'name', '')} • {getattr(it.deliverable.project, 'name', '')} • {it.generated_date}" for it in user_items]
+            body = '\n'.join(lines) if lines else 'No upcoming items.'
+            ok = True
+            try:
+                email = prefs[user_id].email
+                if email and channel_enabled_for_preference(pref_rows.get(user_id), event_key='pred.digest', channel='email', availability=availability):
+                    if not opened:
+                        connection.open()
+                        opened = True
+                    connection.send_messages([EmailMessage(subject, body, None, [email], connection=connection)])
+                    sent += 1
+            except Exception:
+                ok = False
+            events.append(DispatchEvent(
+                user_ids=(user_id,),
+                event_key='pred.digest',
+                title='Daily Pre-Deliverables Digest',
+                body=f"{len(user_items)} upcoming item(s).",
+                url='/deliverables/calendar?mine_only=1',
+                tag='pred.digest',
+                priority='normal',
+            ))
+            logs.append(NotificationLog(user_id=user_id, pre_deliverable_item=None, notification_type='digest', sent_at=_date.today(), email_subject=subject, success=ok))
+    finally:
+        if opened:
+            try:
+                connection.close()
+            except Exception:  # nosec B110
+                pass
+    dispatch_events(events)
+    NotificationLog.objects.bulk_create(logs, batch_size=1000)
     return {'sent': sent}
 
 
@@ -580,6 +537,41 @@ def web_push_subscription_health_check_task(self) -> Dict[str, Any]:
     return run_web_push_subscription_health_check()
 
 
+@shared_task(bind=True, soft_time_limit=120)
+def refresh_aggregate_cache_task(
+    self,
+    key: str,
+    spec: Dict[str, Any],
+    ttl: int,
+    stale_ttl: int = 0,
+    jitter: int = 0,
+) -> Dict[str, Any]:
+    """Rebuild a stale aggregate cache entry from its registered payload builder."""
+    from core.aggregate_cache import RefreshSpec, rebuild_aggregate_entry
+
+    rebuild_aggregate_entry(key, RefreshSpec.from_dict(spec), ttl=ttl, stale_ttl=stale_ttl, jitter=jitter)
+    return {'key': key, 'builder': spec.get('builder')}
+
+
+@shared_task(bind=True, soft_time_limit=60)
+def warm_snapshot_caches_task(self) -> Dict[str, Any]:
+    """Fan out rebuilds of the most-requested snapshot bundles."""
+    from core.snapshot_warming import PENDING_KEY, run_snapshot_warming
+
+    try:
+        cache.delete(PENDING_KEY)
+    except Exception:  # nosec B110
+        pass
+    return run_snapshot_warming()
+
+
+@shared_task(bind=True, soft_time_limit=300)
+def warm_snapshot_batch_task(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from core.snapshot_warming import warm_entries
+
+    return warm_entries(entries)
+
+
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=2, retry_kwargs={"max_retries": 1}, soft_time_limit=600)
 def backfill_pre_deliverables_async(self, project_id: int | None = None, start: str | None = None, end: str | None = None, regenerate: bool = False) -> dict:
     """Background backfill of PreDeliverableItem records.
@@ -610,33 +602,17 @@ def backfill_pre_deliverables_async(self, project_id: int | None = None, start:
     if end_d:
         qs = qs.filter(date__lte=end_d)
 
-    total = max(1, qs.count())
-    created = 0
-    deleted = 0
-    preserved = 0
-    processed = 0
-
-    for d in qs.iterator():
+    def _progress(processed: int, total: int) -> None:
         try:
-            if regenerate:
-                summary = PreDeliverableService.regenerate_pre_deliverables(d)
-                created += int(summary.created)
-                deleted += int(summary.deleted)
-                preserved += int(summary.preserved_completed)
-            else:
-                created += len(PreDeliverableService.generate_pre_deliverables(d))
-        except Exception as e:
-            # Continue; surface error via state message
-            try:
-                self.update_state(state='PROGRESS', meta={'progress': int(processed * 100 / total), 'message': f'Error on {getattr(d, "id", "?")}: {e}'})
-            except Exception:  # nosec B110
-                pass
-        processed += 1
-        if processed % 50 == 0 or processed == total:
-            try:
-                self.update_state(state='PROGRESS', meta={'progress': int(processed * 100 / total), 'message': f'Processed {processed}/{total}'})
-            except Exception:  # nosec B110
-                pass
+            report_progress(self, 'PROGRESS', int(processed * 100 / max(1, total)), f'Processed {processed}/{total}')
+        except Exception:  # nosec B110
+            pass
+
+    summary = PreDeliverableService.backfill(qs, regenerate=bool(regenerate), on_progress=_progress)
+    processed = summary['processed']
+    created = summary['created']
+    deleted = summary['deleted']
+    preserved = summary['preservedCompleted']
 
     return {
         'processed': processed,
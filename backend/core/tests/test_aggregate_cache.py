@@ -0,0 +1,122 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from core.aggregate_cache import (
+    AggregateCache,
+    RefreshSpec,
+    aggregate_builder,
+    aggregate_cache,
+    forced_refresh,
+    rebuild_aggregate_entry,
+    refresh_spec,
+)
+
+
+@aggregate_builder
+def _build_scaled(*, value, scale=1):
+    return {'value': value * scale}
+
+
+def _not_a_builder(**kwargs):
+    return kwargs
+
+
+class AggregateCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.agg = AggregateCache()
+        self.calls = []
+
+    def build(self, value='v1'):
+        def _build():
+            self.calls.append(value)
+            return {'value': value}
+        return _build
+
+    def _expire(self, key):
+        envelope = cache.get(key)
+        envelope['fresh_until'] = time.time() - 1
+        cache.set(key, envelope, timeout=60)
+        self.agg.clear_local()
+
+    def test_miss_then_local_then_fresh(self):
+        first = self.agg.get_or_build('agg:t', self.build(), ttl=30)
+        self.assertEqual((first.value, first.state), ({'value': 'v1'}, 'generated'))
+        self.assertEqual(self.agg.get_or_build('agg:t', self.build(), ttl=30).state, 'local')
+        self.agg.clear_local()
+        self.assertEqual(self.agg.get_or_build('agg:t', self.build(), ttl=30).state, 'fresh')
+        self.assertEqual(self.calls, ['v1'])
+
+    @override_settings(AGGREGATE_LOCAL_CACHE_TTL_SECONDS=0)
+    def test_local_tier_can_be_disabled(self):
+        self.agg.get_or_build('agg:t', self.build(), ttl=30)
+        self.assertEqual(self.agg.get_or_build('agg:t', self.build(), ttl=30).state, 'fresh')
+
+    def test_stale_entry_served_while_lock_holder_rebuilds(self):
+        self.agg.get_or_build('agg:t', self.build(), ttl=30, stale_ttl=60)
+        self._expire('agg:t')
+        cache.set('lock:agg:t', '1', timeout=5)
+        stale = self.agg.get_or_build('agg:t', self.build('v2'), ttl=30, stale_ttl=60)
+        self.assertEqual((stale.value, stale.state), ({'value': 'v1'}, 'stale'))
+        cache.delete('lock:agg:t')
+        rebuilt = self.agg.get_or_build('agg:t', self.build('v2'), ttl=30, stale_ttl=60)
+        self.assertEqual((rebuilt.value, rebuilt.state), ({'value': 'v2'}, 'generated'))
+        self.assertIsNone(cache.get('lock:agg:t'))
+
+    def test_stale_entry_with_refresh_spec_rebuilds_in_background(self):
+        self.agg.get_or_build('agg:t', self.build(), ttl=30, stale_ttl=60)
+        self._expire('agg:t')
+        spec = refresh_spec(_build_scaled, value=2, scale=3)
+        with mock.patch('core.tasks.refresh_aggregate_cache_task.delay') as delay:
+            result = self.agg.get_or_build('agg:t', self.build('v2'), ttl=30, stale_ttl=60, refresh=spec)
+        self.assertEqual(result.state, 'stale')
+        delay.assert_called_once_with('agg:t', spec.to_dict(), 30, 60, 0)
+        self.assertEqual(self.calls, ['v1'])
+
+        # The worker side calls the builder directly; no request is involved.
+        args = delay.call_args.args
+        rebuild_aggregate_entry(args[0], RefreshSpec.from_dict(args[1]), ttl=args[2], stale_ttl=args[3])
+        aggregate_cache.clear_local()
+        self.assertEqual(aggregate_cache.get_or_build('agg:t', self.build('v3'), ttl=30).value, {'value': 6})
+        self.assertIsNone(cache.get('lock:agg:t'))
+
+    def test_refresh_refuses_unregistered_callables(self):
+        spec = RefreshSpec(f'{__name__}._not_a_builder', {'value': 1})
+        with self.assertRaises(ValueError):
+            rebuild_aggregate_entry('agg:t', spec, ttl=30)
+
+    def test_forced_refresh_rebuilds_and_releases_lock(self):
+        self.agg.get_or_build('agg:t', self.build(), ttl=30)
+        cache.set('lock:agg:t', '1', timeout=5)
+        with forced_refresh():
+            result = self.agg.get_or_build('agg:t', self.build('v2'), ttl=30)
+        self.assertEqual(result.state, 'generated')
+        self.assertIsNone(cache.get('lock:agg:t'))
+        self.assertEqual(self.agg.get_or_build('agg:t', self.build('v3'), ttl=30).value, {'value': 'v2'})
+
+    def test_concurrent_misses_coalesce_on_one_build(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_build():
+            self.calls.append('slow')
+            started.set()
+            release.wait(timeout=5)
+            return {'value': 'slow'}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(self.agg.get_or_build('agg:t', slow_build, ttl=30)))
+        leader.start()
+        started.wait(timeout=5)
+        follower = threading.Thread(target=lambda: results.append(self.agg.get_or_build('agg:t', slow_build, ttl=30)))
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join(timeout=5)
+        follower.join(timeout=5)
+        self.assertEqual(self.calls, ['slow'])
+        self.assertEqual(sorted(r.state for r in results), ['coalesced', 'generated'])
@@ -0,0 +1,46 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.benchmarks import BENCHMARKS, compare_reports
+from projects.models import Project
+
+
+class BenchmarkServicesCommandTests(TestCase):
+    def _run(self, *args):
+        out = StringIO()
+        call_command('benchmark_services', '--scale', 'xs', '--rounds', '1', '--warmup', '0', '--json', *args, stdout=out)
+        return json.loads(out.getvalue())
+
+    def test_runs_every_benchmark_and_rolls_back_seed_data(self):
+        report = self._run()
+        self.assertEqual(set(report['results']), {f'xs:{name}' for name in BENCHMARKS})
+        for result in report['results'].values():
+            self.assertGreaterEqual(result['median_ms'], 0)
+            self.assertIsInstance(result['queries'], int)
+            self.assertGreater(result['peak_kib'], 0)
+        self.assertGreater(report['counts']['xs']['assignments'], 0)
+        self.assertFalse(Project.objects.filter(name__startswith='BENCH_').exists())
+
+    def test_baseline_round_trip_and_regression_detection(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'baseline.json')
+            self._run('--only', 'rebuild_project_rollups', '--save-baseline', path)
+            with open(path) as fh:
+                baseline = json.load(fh)
+            baseline['results']['xs:rebuild_project_rollups']['queries'] = 0
+            with open(path, 'w') as fh:
+                json.dump(baseline, fh)
+            with self.assertRaises(CommandError):
+                self._run('--only', 'rebuild_project_rollups', '--compare', path)
+
+        current = {'results': {'xs:a': {'median_ms': 10.0, 'peak_kib': 100.0, 'queries': 3}}}
+        base = {'results': {'xs:a': {'median_ms': 9.0, 'peak_kib': 100.0, 'queries': 3}}}
+        self.assertEqual(compare_reports(current, base), [])
+        base['results']['xs:a']['median_ms'] = 5.0
+        self.assertEqual([r['metric'] for r in compare_reports(current, base)], ['median_ms'])
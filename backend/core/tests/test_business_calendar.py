@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+
+from django.test import SimpleTestCase, override_settings
+
+from core.business_calendar import BusinessCalendar, get_calendar, reset_calendar
+from core.week_utils import working_days_before, working_days_before_many
+
+
+def _step(d, n, direction, holidays=frozenset()):
+    cur = d
+    while n > 0:
+        cur += timedelta(days=direction)
+        if cur.weekday() < 5 and cur not in holidays:
+            n -= 1
+    return cur
+
+
+class BusinessCalendarTests(SimpleTestCase):
+    def test_index_arithmetic_matches_stepping(self):
+        holidays = {date(2024, 12, 25), date(2025, 1, 1), date(2024, 11, 28)}
+        cal = BusinessCalendar(holidays, start=date(2024, 1, 1), end=date(2025, 12, 31))
+        # Include dates near and beyond the range edges to exercise the fallback.
+        day = date(2023, 12, 20)
+        while day <= date(2026, 1, 10):
+            for n in (0, 1, 3, 10):
+                self.assertEqual(cal.before(day, n), _step(day, n, -1, holidays), (day, n))
+                self.assertEqual(cal.after(day, n), _step(day, n, 1, holidays), (day, n))
+            day += timedelta(days=3)
+        expected = sum(
+            1 for i in range(38)
+            if (date(2024, 12, 1) + timedelta(days=i)).weekday() < 5
+            and date(2024, 12, 1) + timedelta(days=i) not in holidays
+        )
+        self.assertEqual(cal.count(date(2024, 12, 1), date(2025, 1, 7)), expected)
+        self.assertEqual(cal.count(date(2025, 1, 7), date(2024, 12, 1)), 0)
+
+    def test_vectorised_offsets(self):
+        cal = BusinessCalendar(start=date(2024, 1, 1), end=date(2024, 12, 31))
+        dates = [date(2024, 1, 15), date(2024, 1, 8), date(2024, 1, 7)]
+        self.assertEqual(cal.before_many(dates, 1), [date(2024, 1, 12), date(2024, 1, 5), date(2024, 1, 5)])
+        self.assertEqual(cal.after_many(dates, [1, 2, 0]), [date(2024, 1, 16), date(2024, 1, 10), date(2024, 1, 7)])
+        with self.assertRaises(ValueError):
+            cal.before_many(dates, [1, 2])
+
+    def test_settings_holidays_flow_through_week_utils(self):
+        try:
+            with override_settings(BUSINESS_HOLIDAYS=['2024-01-12']):
+                reset_calendar()
+                # Mon 2024-01-15 minus one working day skips the Friday holiday.
+                self.assertEqual(working_days_before(date(2024, 1, 15), 1), date(2024, 1, 11))
+                self.assertEqual(working_days_before_many([date(2024, 1, 15)], [2]), [date(2024, 1, 10)])
+                self.assertFalse(get_calendar().is_working_day(date(2024, 1, 12)))
+        finally:
+            reset_calendar()
+        self.assertEqual(working_days_before(date(2024, 1, 15), 1), date(2024, 1, 12))
@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.test import TestCase
+
+from assignments import snapshot_service
+from assignments.models import Assignment, AssignmentMembershipEvent, WeeklyAssignmentSnapshot
+from core.chunked import chunked, iter_keyset, iter_keyset_chunks
+from core.week_utils import sunday_of_week
+from people.models import Person
+from projects.models import Project
+
+
+class ChunkedIterationTests(TestCase):
+    def setUp(self):
+        self.people = [Person.objects.create(name=f'Chunk {i:02d}') for i in range(7)]
+        self.ids = sorted(p.id for p in self.people)
+
+    def test_keyset_chunks_cover_models_and_projections(self):
+        chunks = list(iter_keyset_chunks(Person.objects.filter(id__in=self.ids).order_by('-name'), chunk_size=3))
+        self.assertEqual([len(c) for c in chunks], [3, 3, 1])
+        self.assertEqual([p.id for c in chunks for p in c], self.ids)
+
+        qs = Person.objects.filter(id__in=self.ids)
+        self.assertEqual([row[0] for row in iter_keyset(qs.values_list('id', 'name'), key='id', chunk_size=2)], self.ids)
+        self.assertEqual([row['id'] for row in iter_keyset(qs.values('name', 'id'), key='id', chunk_size=2)], self.ids)
+        self.assertEqual(list(iter_keyset(qs.values_list('id', flat=True), key='id', chunk_size=4)), self.ids)
+        with self.assertRaises(ValueError):
+            list(iter_keyset(qs.values_list('name'), key='id'))
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+    def test_weekly_snapshots_do_not_depend_on_chunk_size(self):
+        wk = sunday_of_week(date.today())
+        project = Project.objects.create(name='Chunked Snapshot Project', status='active')
+        for idx, person in enumerate(self.people):
+            hours = {wk.isoformat(): 5 + idx}
+            if idx % 2:
+                hours[(wk - timedelta(days=7)).isoformat()] = 3
+            Assignment.objects.create(person=person, project=project, weekly_hours=hours)
+
+        def run(chunk_size):
+            WeeklyAssignmentSnapshot.objects.all().delete()
+            AssignmentMembershipEvent.objects.all().delete()
+            with mock.patch.object(snapshot_service, 'SNAPSHOT_CHUNK_SIZE', chunk_size):
+                summary = snapshot_service.write_weekly_assignment_snapshots(wk)
+            snapshots = sorted(WeeklyAssignmentSnapshot.objects.values_list('person_id', 'hours'))
+            events = sorted(AssignmentMembershipEvent.objects.values_list('person_id', 'event_type', 'hours_after'))
+            return summary, snapshots, events
+
+        big = run(1000)
+        small = run(2)
+        self.assertEqual(big, small)
+        self.assertEqual(big[0]['inserted'], len(self.people))
+        self.assertEqual(len(big[2]), 4)  # people without prior-week hours joined
@@ -0,0 +1,51 @@
+import gzip
+import json
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase
+
+from core.aggregate_cache import aggregate_cache
+from core.columnar import COLUMNAR_MEDIA_TYPE, columnar_response, encode_week_matrix
+from core.encoded_responses import encoded_cache_key
+
+
+class EncodeWeekMatrixTests(SimpleTestCase):
+    def test_dense_when_mostly_filled(self):
+        out = encode_week_matrix([{'w0': 1, 'w1': 2}, {'w1': 3.333}], ['w0', 'w1'])
+        self.assertEqual(out, {'encoding': 'dense', 'values': [[1.0, 2.0], [0.0, 3.33]]})
+
+    def test_sparse_when_mostly_empty(self):
+        weeks = [f'w{i}' for i in range(10)]
+        out = encode_week_matrix([{'w3': 4}, None, {'w9': 1, 'other': 7}], weeks)
+        self.assertEqual(out, {'encoding': 'sparse', 'row': [0, 2], 'week': [3, 9], 'values': [4.0, 1.0]})
+
+
+class ColumnarResponseTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        aggregate_cache.clear_local()
+        self.factory = RequestFactory()
+
+    def test_gzip_bytes_are_cached_per_etag(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {'weekKeys': ['2025-01-05'] * 200}
+
+        request = self.factory.get('/x', HTTP_ACCEPT_ENCODING='gzip, br')
+        first = columnar_response(request, endpoint='t', etag='abc', build=build)
+        second = columnar_response(request, endpoint='t', etag='abc', build=build)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first['Content-Encoding'], 'gzip')
+        self.assertEqual(first['Content-Type'], COLUMNAR_MEDIA_TYPE)
+        self.assertEqual(first['ETag'], '"abc"')
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(json.loads(gzip.decompress(second.content)), {'weekKeys': ['2025-01-05'] * 200})
+
+        # The identity body comes from the same encoded entry.
+        plain = columnar_response(self.factory.get('/x'), endpoint='t', etag='abc', build=build)
+        self.assertEqual(len(calls), 1)
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(json.loads(plain.content)['weekKeys'][0], '2025-01-05')
+        self.assertIsNotNone(cache.get(encoded_cache_key('columnar:t:abc')))
@@ -0,0 +1,60 @@
+from django.db import connection
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Lower
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.cursors import decode_cursor, encode_cursor, paginate_keyset
+from projects.models import Project
+
+
+class CursorTokenTests(TestCase):
+    def test_round_trip_and_invalid_tokens(self):
+        token = encode_cursor(['n', 3, ['abc', None, 7]])
+        self.assertEqual(decode_cursor(token), ['n', 3, ['abc', None, 7]])
+        self.assertIsNone(decode_cursor('not-a-cursor!'))
+        self.assertIsNone(decode_cursor(''))
+
+
+class PaginateKeysetTests(TestCase):
+    def setUp(self):
+        numbers = ['P-03', None, 'P-01', 'P-02', None, 'P-05', 'P-04']
+        for idx, number in enumerate(numbers):
+            Project.objects.create(name=f'Project {idx}', client='Acme' if idx % 2 else 'Beta', project_number=number)
+
+    def _walk(self, queryset, page_size):
+        ids, token, pages = [], None, []
+        while True:
+            page = paginate_keyset(queryset, token, page_size)
+            pages.append(page)
+            ids.extend(obj.id for obj in page.object_list)
+            token = page.next_cursor
+            if not token:
+                return ids, pages
+
+    def test_forward_walk_matches_ordering_with_nulls_last(self):
+        qs = Project.objects.order_by('-project_number', 'id')
+        ids, pages = self._walk(qs, 3)
+        expected = list(Project.objects.exclude(project_number=None).order_by('-project_number').values_list('id', flat=True))
+        expected += list(Project.objects.filter(project_number=None).order_by('id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual([p.count for p in pages], [7, 7, 7])
+        self.assertIsNone(pages[0].previous_cursor)
+
+    def test_expression_ordering_and_previous_page(self):
+        qs = Project.objects.order_by(Coalesce(Lower('client'), Value('zzz')), Lower('name'), 'id')
+        expected = list(qs.values_list('id', flat=True))
+        first = paginate_keyset(qs, None, 3)
+        second = paginate_keyset(qs, first.next_cursor, 3)
+        self.assertEqual([o.id for o in second.object_list], expected[3:6])
+        back = paginate_keyset(qs, second.previous_cursor, 3)
+        self.assertEqual([o.id for o in back.object_list], expected[:3])
+        self.assertIsNone(back.previous_cursor)
+
+    def test_later_pages_skip_count_query(self):
+        qs = Project.objects.order_by('name', 'id')
+        first = paginate_keyset(qs, None, 2)
+        with CaptureQueriesContext(connection) as ctx:
+            paginate_keyset(qs, first.next_cursor, 2)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('COUNT', ctx.captured_queries[0]['sql'].upper())
@@ -0,0 +1,34 @@
+import gzip
+import json
+
+from django.test import RequestFactory, SimpleTestCase
+
+from core.encoded_responses import encode_payload, encoded_response
+
+
+class EncodedResponseTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.payload = {'rows': [{'id': i, 'name': f'Person {i}'} for i in range(100)]}
+
+    def test_gzip_served_when_accepted(self):
+        encoded = encode_payload(self.payload)
+        request = self.factory.get('/x', HTTP_ACCEPT_ENCODING='br, gzip;q=0.8')
+        response = encoded_response(request, encoded)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content)), self.payload)
+        self.assertEqual(response['ETag'], f'"{encoded.etag}"')
+
+    def test_identity_and_small_bodies_skip_gzip(self):
+        encoded = encode_payload({'ok': True})
+        self.assertIsNone(encoded.gzipped)
+        response = encoded_response(self.factory.get('/x', HTTP_ACCEPT_ENCODING='gzip'), encoded)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(json.loads(response.content), {'ok': True})
+
+    def test_if_none_match_returns_304(self):
+        encoded = encode_payload(self.payload)
+        request = self.factory.get('/x', HTTP_IF_NONE_MATCH=f'"{encoded.etag}"')
+        self.assertEqual(encoded_response(request, encoded).status_code, 304)
+        request = self.factory.get('/x', HTTP_IF_NONE_MATCH='"custom"')
+        self.assertEqual(encoded_response(request, encoded, etag='custom').status_code, 304)
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core import job_progress
+from core.job_progress import _on_task_postrun, latest_job_event, publish_job_event, report_progress
+
+
+class _FileAsyncResult:
+    path = None
+
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.state = 'SUCCESS'
+        self.info = {}
+
+    def get(self, propagate=False):
+        return {'type': 'file', 'path': type(self).path, 'filename': 'out.bin', 'content_type': 'application/octet-stream'}
+
+
+class JobProgressBusTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='bus-user', password='x')
+        self.client.force_authenticate(self.user)
+
+    @override_settings(REDIS_URL='redis://localhost:6399/0')
+    def test_publishes_reuse_one_redis_client(self):
+        with patch.object(job_progress, '_client', None), patch('redis.Redis.from_url') as from_url:
+            publish_job_event('job-pool', 'PROGRESS', 10)
+            publish_job_event('job-pool', 'PROGRESS', 20)
+        from_url.assert_called_once()
+        self.assertEqual(from_url.return_value.publish.call_count, 2)
+
+    def test_report_progress_updates_celery_meta_and_latest_event(self):
+        calls = []
+        task = SimpleNamespace(request=SimpleNamespace(id='job-bus'), update_state=lambda **kw: calls.append(kw))
+        report_progress(task, 'PROGRESS', 40, 'Halfway')
+        self.assertEqual(calls, [{'state': 'PROGRESS', 'meta': {'progress': 40, 'message': 'Halfway'}}])
+        self.assertEqual(latest_job_event('job-bus')['progress'], 40)
+
+    def test_postrun_publishes_terminal_event_for_tracked_jobs_only(self):
+        _on_task_postrun(task_id='untracked', retval={'ok': True}, state='SUCCESS')
+        self.assertIsNone(latest_job_event('untracked'))
+        publish_job_event('job-bus', 'PROGRESS', 80)
+        _on_task_postrun(task_id='job-bus', retval={'type': 'file', 'path': 'exports/x.xlsx'}, state='SUCCESS')
+        event = latest_job_event('job-bus')
+        self.assertEqual((event['state'], event['progress'], event['downloadReady']), ('SUCCESS', 100, True))
+
+    @override_settings(JOB_STREAMING_ENABLED=True)
+    def test_events_stream_replays_latest_and_ends_on_terminal_state(self):
+        publish_job_event('job-bus', 'SUCCESS', 100, downloadReady=False)
+        with patch('core.job_views.AsyncResult', _FileAsyncResult):
+            resp = self.client.get('/api/jobs/job-bus/events/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['Content-Type'], 'text/event-stream')
+        body = b''.join(resp.streaming_content).decode()
+        self.assertTrue(body.startswith('event: progress\ndata: '))
+        self.assertIn('"state": "SUCCESS"', body)
+
+    def test_download_honours_byte_ranges(self):
+        path = default_storage.save('exports/test/job_range.bin', ContentFile(b'0123456789'))
+        _FileAsyncResult.path = path
+        try:
+            with patch('core.job_views.AsyncResult', _FileAsyncResult):
+                partial = self.client.get('/api/jobs/job-file/download/', HTTP_RANGE='bytes=2-5')
+                suffix = self.client.get('/api/jobs/job-file/download/', HTTP_RANGE='bytes=-3')
+                invalid = self.client.get('/api/jobs/job-file/download/', HTTP_RANGE='bytes=20-')
+            self.assertEqual(partial.status_code, 206)
+            self.assertEqual(b''.join(partial.streaming_content), b'2345')
+            self.assertEqual(partial['Content-Range'], 'bytes 2-5/10')
+            self.assertEqual(b''.join(suffix.streaming_content), b'789')
+            self.assertEqual(invalid.status_code, 416)
+            self.assertEqual(invalid['Content-Range'], 'bytes */10')
+        finally:
+            default_storage.delete(path)
@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework.throttling import BaseThrottle
+
+from core.models import JobAccessRecord
+
+
+def _feature_flags(**updates):
+    from django.conf import settings
+
+    merged = {**getattr(settings, 'FEATURES', {})}
+    merged.update(updates)
+    return merged
+
+
+class _SteppingAsyncResult:
+    """Reports PROGRESS 10 for the first two reads, then 50."""
+
+    reads = 0
+
+    def __init__(self, job_id: str):
+        type(self).reads += 1
+        self.id = job_id
+        self.state = 'PROGRESS'
+        self.info = {'progress': 10 if type(self).reads <= 2 else 50, 'message': 'working'}
+
+    def get(self, propagate=False):
+        return None
+
+
+class _DenyThrottle(BaseThrottle):
+    def allow_request(self, request, view):
+        return False
+
+    def wait(self):
+        return 7
+
+
+@override_settings(JOB_STREAMING_ENABLED=True, JOB_STATUS_WAIT_INTERVAL_MS=50, FEATURES=_feature_flags(JOB_AUTHZ_ENFORCED=True))
+class JobStatusWaitTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = User.objects.create_user(username='wait-owner', password='x')
+        self.other = User.objects.create_user(username='wait-other', password='x')
+        JobAccessRecord.objects.create(job_id='job-wait', created_by=self.owner, is_admin_only=False, purpose='test')
+        _SteppingAsyncResult.reads = 0
+
+    def test_returns_when_progress_changes(self):
+        self.client.force_authenticate(self.owner)
+        with patch('core.job_views.AsyncResult', _SteppingAsyncResult):
+            resp = self.client.get('/api/jobs/job-wait/wait/?state=PROGRESS&progress=10&timeout=5')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['progress'], 50)
+        self.assertEqual(_SteppingAsyncResult.reads, 3)
+
+    def test_timeout_returns_unchanged_status(self):
+        self.client.force_authenticate(self.owner)
+        with patch('core.job_views.AsyncResult', _SteppingAsyncResult):
+            resp = self.client.get('/api/jobs/job-wait/wait/?state=PROGRESS&progress=10&timeout=0')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['progress'], 10)
+
+    def test_access_rules_match_status_endpoint(self):
+        with patch('core.job_views.AsyncResult', _SteppingAsyncResult):
+            self.assertIn(self.client.get('/api/jobs/job-wait/wait/').status_code, (401, 403))
+            self.client.force_authenticate(self.other)
+            self.assertEqual(self.client.get('/api/jobs/job-wait/wait/').status_code, 403)
+        self.assertEqual(_SteppingAsyncResult.reads, 0)
+
+    @override_settings(JOB_STREAMING_ENABLED=False)
+    def test_disabled_streaming_answers_without_waiting(self):
+        self.client.force_authenticate(self.owner)
+        with patch('core.job_views.AsyncResult', _SteppingAsyncResult):
+            resp = self.client.get('/api/jobs/job-wait/wait/?state=PROGRESS&progress=10&timeout=5')
+            self.assertEqual(self.client.get('/api/jobs/job-wait/events/').status_code, 404)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['progress'], 10)
+        self.assertEqual(_SteppingAsyncResult.reads, 1)
+
+    def test_requests_are_throttled_like_drf_views(self):
+        self.client.force_authenticate(self.owner)
+        with patch('core.job_views._BaseJobView.throttle_classes', [_DenyThrottle]):
+            with patch('core.job_views.AsyncResult', _SteppingAsyncResult):
+                resp = self.client.get('/api/jobs/job-wait/wait/')
+        self.assertEqual(resp.status_code, 429)
+        self.assertEqual(resp['Retry-After'], '7')
+        self.assertEqual(_SteppingAsyncResult.reads, 0)
@@ -0,0 +1,73 @@
+import json
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from assignments.models import Assignment, AssignmentWeekHour, WeeklyAssignmentSnapshot
+from departments.models import Department
+from people.models import Person
+from projects.models import Project
+from skills.models import PersonSkill
+from verticals.models import Vertical
+
+
+class LoadTestDataCommandTests(TestCase):
+    def _seed(self, **options):
+        out = StringIO()
+        call_command('seed_load_test_data', json=True, stdout=out, **options)
+        return json.loads(out.getvalue())
+
+    def test_enterprise_profile_seeds_consistent_derived_rows_and_cleans_up(self):
+        manifest = self._seed(
+            run_id='ent',
+            profile='enterprise',
+            manager_count=2,
+            user_count=3,
+            project_count=12,
+            person_count=30,
+            assignment_count=80,
+            week_count=4,
+            history_weeks=6,
+            hot_assignment_count=5,
+        )
+        counts = manifest['counts']
+        self.assertEqual(counts['assignments'], 80)
+        self.assertEqual(len(manifest['weekKeys']), 4)
+        self.assertEqual(len(manifest['historyWeekKeys']), 6)
+        self.assertEqual(Department.objects.filter(name__startswith='LT_ent_').count(), counts['departments'])
+        self.assertTrue(Department.objects.filter(name__startswith='LT_ent_', parent_department__isnull=False).exists())
+        self.assertEqual(User.objects.filter(username__startswith='lt_ent_', profile__person__isnull=False).count(), 5)
+
+        # Normalized hours mirror the JSON weekly_hours exactly.
+        json_total = sum(
+            sum(a.weekly_hours.values())
+            for a in Assignment.objects.filter(project__name__startswith='LT_ent_')
+        )
+        awh_rows = AssignmentWeekHour.objects.filter(project__name__startswith='LT_ent_')
+        self.assertEqual(awh_rows.count(), counts['assignmentWeekHours'])
+        self.assertAlmostEqual(sum(awh_rows.values_list('hours', flat=True)), json_total, places=3)
+        history = set(manifest['historyWeekKeys'])
+        snapshot_weeks = {w.isoformat() for w in WeeklyAssignmentSnapshot.objects.filter(project_name__startswith='LT_ent_').values_list('week_start', flat=True)}
+        self.assertTrue(snapshot_weeks <= history)
+        self.assertGreater(PersonSkill.objects.filter(person__name__startswith='LT_ent_').count(), 0)
+
+        call_command('cleanup_load_test_data', run_id='ent', stdout=StringIO())
+        self.assertFalse(Project.objects.filter(name__startswith='LT_ent_').exists())
+        self.assertFalse(Person.objects.filter(name__startswith='LT_ent_').exists())
+        self.assertFalse(WeeklyAssignmentSnapshot.objects.filter(project_name__startswith='LT_ent_').exists())
+        self.assertFalse(Department.objects.filter(name__startswith='LT_ent_').exists())
+        self.assertFalse(Vertical.objects.filter(name__startswith='LT_ent_').exists())
+
+    def test_small_profile_is_deterministic_per_run_id(self):
+        options = dict(run_id='det', manager_count=1, user_count=1, project_count=3, person_count=5, assignment_count=10, week_count=3)
+        first = self._seed(**options)
+        hours_first = [a.weekly_hours for a in Assignment.objects.filter(project__name__startswith='LT_det_').order_by('id')]
+        second = self._seed(purge_existing=True, **options)
+        hours_second = [a.weekly_hours for a in Assignment.objects.filter(project__name__startswith='LT_det_').order_by('id')]
+        self.assertEqual(first['profile'], 'small')
+        self.assertEqual(first['counts']['people'], 5)
+        self.assertEqual(hours_first, hours_second)
+        self.assertEqual(first['ids']['verticalIds'], [])
+        self.assertEqual(second['counts']['assignments'], 10)
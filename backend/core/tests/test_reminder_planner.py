@@ -0,0 +1,84 @@
+import os
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import UserProfile
+from assignments.models import Assignment
+from core.models import NotificationLog, NotificationPreference
+from core.tasks import send_daily_digest, send_pre_deliverable_reminders
+from deliverables.models import Deliverable, DeliverableAssignment, PreDeliverableItem, PreDeliverableType
+from deliverables.services import PreDeliverableService
+from people.models import Person
+from projects.models import Project
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class ReminderPlannerTests(TestCase):
+    def setUp(self):
+        PreDeliverableType.objects.get_or_create(name='Planner Review', defaults={'default_days_before': 1})
+        self.project = Project.objects.create(name='Planner Project')
+        self.deliverable = Deliverable.objects.create(
+            project=self.project,
+            description='Planner Deliverable',
+            date=date.today() + timedelta(days=2),
+        )
+        if not PreDeliverableItem.objects.filter(deliverable=self.deliverable).exists():
+            PreDeliverableService.generate_pre_deliverables(self.deliverable)
+
+    def _add_user(self, name, *, days_before=3, digest=False):
+        user = User.objects.create_user(username=name, password='x', email=f'{name}@example.com')
+        person = Person.objects.create(name=f'{name} person')
+        profile, _ = UserProfile.objects.get_or_create(user=user)
+        profile.person = person
+        profile.save(update_fields=['person'])
+        NotificationPreference.objects.update_or_create(
+            user=user, defaults={'reminder_days_before': days_before, 'daily_digest': digest},
+        )
+        Assignment.objects.create(person=person, project=self.project, weekly_hours={}, is_active=True)
+        DeliverableAssignment.objects.create(deliverable=self.deliverable, person=person, is_active=True)
+        return user
+
+    def _run_reminders(self):
+        with mock.patch.dict(os.environ, {'PRED_ITEMS_NOTIFICATIONS_ENABLED': 'true'}):
+            return send_pre_deliverable_reminders()
+
+    def test_reminders_match_per_user_service_and_bulk_log(self):
+        users = [self._add_user('planner-a'), self._add_user('planner-b', days_before=1)]
+        result = self._run_reminders()
+
+        expected = sum(PreDeliverableService.get_upcoming_for_user(u, days_ahead=NotificationPreference.objects.get(user=u).reminder_days_before).count() for u in users)
+        self.assertGreater(expected, 0)
+        self.assertEqual(result['sent'], expected)
+        self.assertEqual(NotificationLog.objects.filter(notification_type='reminder').count(), expected)
+        # Deliverable due in 2 days: inside planner-a's 3-day horizon, outside planner-b's 1-day one.
+        reminded = set(NotificationLog.objects.filter(notification_type='deliverable_reminder').values_list('user_id', flat=True))
+        self.assertEqual(reminded, {users[0].id})
+
+    def test_reminder_query_count_does_not_grow_with_users(self):
+        self._add_user('planner-c')
+        self._run_reminders()  # warm up lazily created settings rows
+        with CaptureQueriesContext(connection) as one_user:
+            self._run_reminders()
+        NotificationLog.objects.all().delete()
+        for idx in range(4):
+            self._add_user(f'planner-extra-{idx}')
+        with CaptureQueriesContext(connection) as many_users:
+            self._run_reminders()
+        self.assertEqual(len(many_users.captured_queries), len(one_user.captured_queries))
+
+    def test_daily_digest_sends_each_email_over_one_connection(self):
+        self._add_user('digest-a', digest=True)
+        self._add_user('digest-b', digest=True)
+        self._add_user('digest-none')
+        with mock.patch.dict(os.environ, {'PRED_ITEMS_DIGEST_ENABLED': 'true'}), \
+                mock.patch('django.core.mail.backends.locmem.EmailBackend.open') as open_mock:
+            result = send_daily_digest()
+        self.assertEqual(NotificationLog.objects.filter(notification_type='digest').count(), 2)
+        self.assertEqual(result['sent'], len(mail.outbox))
+        self.assertLessEqual(open_mock.call_count, 1)
@@ -0,0 +1,86 @@
+from django.test import TestCase, override_settings
+
+from core.departments import get_descendant_department_ids
+from core.models import ProjectVisibilitySettings, UtilizationScheme
+from core.project_visibility import get_hidden_project_ids_for_scope
+from core.request_memo import _on_task_postrun, _on_task_prerun, memo_scope, memo_stats, request_memoized
+from departments.models import Department
+from projects.models import Project
+
+_calls = []
+
+
+@request_memoized
+def _lookup(value, scale=1):
+    _calls.append(value)
+    return [value * scale]
+
+
+class RequestMemoTests(TestCase):
+    def setUp(self):
+        _calls.clear()
+
+    def test_memoizes_only_inside_a_scope(self):
+        _lookup(2)
+        _lookup(2)
+        self.assertEqual(_calls, [2, 2])
+        self.assertIsNone(memo_stats())
+
+        with memo_scope():
+            first = _lookup(3)
+            first.append('mutated')
+            self.assertEqual(_lookup(3), [3])
+            self.assertEqual(_lookup(3, scale=2), [6])
+            _lookup(([1],))
+            with memo_scope():
+                _lookup(3)
+            stats = memo_stats()
+        self.assertEqual(_calls, [2, 2, 3, 3, ([1],)])
+        self.assertEqual((stats['hits'], stats['misses']), (2, 2))
+
+        with memo_scope():
+            _lookup(3)
+            _lookup.invalidate()
+            _lookup(3)
+        self.assertEqual(_calls[-2:], [3, 3])
+
+    @override_settings(REQUEST_MEMO_ENABLED=False)
+    def test_disabled_setting_calls_through(self):
+        with memo_scope():
+            _lookup(4)
+            _lookup(4)
+        self.assertEqual(_calls, [4, 4])
+
+    def test_celery_hooks_scope_each_task(self):
+        _on_task_prerun(task_id='memo-task')
+        try:
+            _lookup(5)
+            _lookup(5)
+            self.assertEqual(memo_stats()['hits'], 1)
+        finally:
+            _on_task_postrun(task_id='memo-task')
+        self.assertIsNone(memo_stats())
+        self.assertEqual(_calls, [5])
+
+    def test_repeated_lookups_hit_the_database_once_per_scope(self):
+        root = Department.objects.create(name='Memo Root')
+        child = Department.objects.create(name='Memo Child', parent_department=root)
+        Project.objects.create(name='Memo Hidden Project')
+        settings_obj = ProjectVisibilitySettings.get_active()
+        settings_obj.config_json = {'dashboard.executive': {'projectKeywords': ['hidden'], 'clientKeywords': []}}
+        settings_obj.save()
+        UtilizationScheme.get_active()
+
+        with memo_scope():
+            get_descendant_department_ids(root.id)
+            hidden = get_hidden_project_ids_for_scope('dashboard.executive')
+            scheme = UtilizationScheme.get_active()
+            with self.assertNumQueries(0):
+                self.assertEqual(sorted(get_descendant_department_ids(root.id)), sorted([root.id, child.id]))
+                self.assertEqual(get_hidden_project_ids_for_scope('dashboard.executive'), hidden)
+                self.assertIs(UtilizationScheme.get_active(), scheme)
+
+            grandchild = Department.objects.create(name='Memo Grandchild', parent_department=child)
+            self.assertIn(grandchild.id, get_descendant_department_ids(root.id))
+            extra = Project.objects.create(name='Another hidden one')
+            self.assertIn(extra.id, get_hidden_project_ids_for_scope('dashboard.executive'))
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from assignments import read_queries
+from core.aggregate_cache import aggregate_cache, refresh_spec
+from core.cache_scopes import bump_snapshot_scopes
+from core.snapshot_warming import (
+    PENDING_KEY,
+    REGISTRY_KEY,
+    queue_snapshot_warming,
+    record_snapshot_build,
+    run_snapshot_warming,
+    warm_candidates,
+)
+from people.models import Person
+
+GRID_URL = '/api/assignments/grid_snapshot/'
+
+
+class SnapshotWarmingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        aggregate_cache.clear_local()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(username='warm-user', password='pw', is_staff=True)
+        self.client.force_authenticate(self.user)
+        Person.objects.create(name='Warm Person', weekly_capacity=36)
+
+    def test_candidates_ranked_by_request_count(self):
+        for _ in range(3):
+            self.client.get(GRID_URL, {'weeks': 4})
+        self.client.get(GRID_URL, {'weeks': 8})
+        candidates = warm_candidates()
+        self.assertEqual([c['spec']['kwargs']['weeks'] for c in candidates], [4, 8])
+        self.assertEqual(candidates[0]['hits'], 3)
+        self.assertEqual(candidates[0]['spec']['builder'], 'assignments.read_queries.build_scoped_grid_snapshot')
+        self.assertTrue(candidates[0]['spec']['encoded'])
+        self.assertEqual(candidates[0]['keySpec']['builder'], 'assignments.read_queries.grid_snapshot_cache_key')
+
+    def test_entry_lost_to_a_racing_registry_write_is_re_added(self):
+        key_spec = refresh_spec(read_queries.grid_snapshot_cache_key, base_key='agg:warm:a')
+        spec = refresh_spec(read_queries.build_scoped_grid_snapshot, weeks=4)
+        record_snapshot_build(key_spec, spec, ttl=20)
+        # A concurrent first request for another key wrote a registry read
+        # before ours landed, dropping our entry.
+        cache.set(REGISTRY_KEY, {}, timeout=None)
+        record_snapshot_build(key_spec, spec, ttl=20)
+        candidates = warm_candidates()
+        self.assertEqual([(c['keySpec'], c['hits']) for c in candidates], [(key_spec.to_dict(), 2)])
+
+    @override_settings(SNAPSHOT_WARMING_ENABLED=False)
+    def test_disabled_warming_records_nothing(self):
+        self.client.get(GRID_URL)
+        self.assertEqual(warm_candidates(), [])
+        self.assertFalse(queue_snapshot_warming())
+
+    def test_scope_bumps_are_debounced_into_one_run(self):
+        cache.delete(PENDING_KEY)
+        with mock.patch('core.tasks.warm_snapshot_caches_task.apply_async') as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                bump_snapshot_scopes(project_ids=[1])
+                bump_snapshot_scopes(department_ids=[2])
+        apply_async.assert_called_once()
+
+    @override_settings(SNAPSHOT_WARM_CONCURRENCY=2)
+    def test_run_rebuilds_top_keys_even_when_cached(self):
+        for weeks in (4, 8, 12):
+            self.client.get(GRID_URL, {'weeks': weeks})
+        with mock.patch.object(
+            read_queries,
+            'build_grid_snapshot_payload',
+            wraps=read_queries.build_grid_snapshot_payload,
+        ) as build:
+            self.assertEqual(self.client.get(GRID_URL, {'weeks': 4}).status_code, 200)
+            summary = run_snapshot_warming(dispatch=False)
+        self.assertEqual(summary, {'candidates': 3, 'batches': 2, 'warmed': 3, 'failed': 0})
+        self.assertEqual(build.call_count, 3)
+        aggregate_cache.clear_local()
+        response = self.client.get(GRID_URL, {'weeks': 8})
+        self.assertEqual(response.json()['people'][0]['name'], 'Warm Person')
+
+    def test_warming_after_a_scope_bump_serves_the_next_request(self):
+        self.client.get(GRID_URL, {'weeks': 4})
+        with self.captureOnCommitCallbacks(execute=False):
+            bump_snapshot_scopes(project_ids=[1])
+        self.assertEqual(run_snapshot_warming(dispatch=False)['warmed'], 1)
+        self.assertEqual(len(warm_candidates()), 1)
+        aggregate_cache.clear_local()
+        with mock.patch('assignments.views.build_grid_snapshot_payload') as build:
+            response = self.client.get(GRID_URL, {'weeks': 4})
+        self.assertEqual(response.status_code, 200)
+        build.assert_not_called()
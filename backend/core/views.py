@@ -67,6 +67,7 @@ from .webpush import (
     web_push_vapid_status,
     generate_vapid_keypair,
 )
+from .aggregate_cache import aggregate_cache
 from .cache_keys import build_aggregate_cache_key
 from .cache_scopes import request_scope_version
 from accounts.permissions import IsAdminOrManager, is_admin_user, is_manager_user
@@ -79,7 +80,8 @@ from people.models import Person
 from people.serializers import PersonSerializer
 from departments.models import Department
 from departments.serializers import DepartmentSerializer
-from core.departments import get_descendant_department_ids
+from core.departments import department_children_map, get_descendant_department_ids
+from core.request_memo import request_memoized
 from roles.models import Role
 from roles.serializers import RoleSerializer
 from verticals.models import Vertical
@@ -228,10 +230,7 @@ def _page_urls(request, *, page_number: int, page_size: int, has_next: bool, has
 
 
 def _department_descendant_ids(root_department_id: int) -> list[int]:
-    rows = Department.objects.values_list('id', 'parent_department_id')
-    children_map = {}
-    for dept_id, parent_id in rows:
-        children_map.setdefault(parent_id, []).append(dept_id)
+    children_map = department_children_map()
     visited = set()
     stack = [root_department_id]
     while stack:
@@ -245,6 +244,24 @@ def _department_descendant_ids(root_department_id: int) -> list[int]:
     return sorted(visited)
 
 
+@request_memoized(invalidated_by=('roles.Role',))
+def _role_rows(include_inactive: bool) -> list:
+    roles_qs = Role.objects.order_by('sort_order', 'name', 'id')
+    if not include_inactive:
+        roles_qs = roles_qs.filter(is_active=True)
+    return list(RoleSerializer(roles_qs, many=True).data)
+
+
+@request_memoized(invalidated_by=('verticals.Vertical',))
+def _vertical_rows(include_inactive: bool, vertical_id: int | None = None) -> list:
+    verticals_qs = Vertical.objects.order_by('name')
+    if not include_inactive:
+        verticals_qs = verticals_qs.filter(is_active=True)
+    if vertical_id is not None:
+        verticals_qs = verticals_qs.filter(id=vertical_id)
+    return list(VerticalSerializer(verticals_qs, many=True).data)
+
+
 class UiBootstrapView(APIView):
     permission_classes = [IsAuthenticated]
     throttle_classes = [UiBootstrapThrottle]
@@ -326,12 +343,7 @@ class UiBootstrapView(APIView):
         }
 
         if 'verticals' in include_set:
-            verticals_qs = Vertical.objects.order_by('name')
-            if not include_inactive:
-                verticals_qs = verticals_qs.filter(is_active=True)
-            if enforced_vertical is not None:
-                verticals_qs = verticals_qs.filter(id=enforced_vertical)
-            payload['verticals'] = VerticalSerializer(verticals_qs, many=True).data
+            payload['verticals'] = _vertical_rows(include_inactive, enforced_vertical)
 
         if 'capabilities' in include_set:
             payload['capabilities'] = self._capabilities_payload()
@@ -345,10 +357,7 @@ class UiBootstrapView(APIView):
             payload['departmentsAll'] = DepartmentSerializer(departments_qs, many=True).data
 
         if 'roles' in include_set:
-            roles_qs = Role.objects.order_by('sort_order', 'name', 'id')
-            if not include_inactive:
-                roles_qs = roles_qs.filter(is_active=True)
-            payload['rolesAll'] = RoleSerializer(roles_qs, many=True).data
+            payload['rolesAll'] = _role_rows(include_inactive)
 
         if use_cache and cache_key:
             try:
@@ -569,14 +578,10 @@ class PeoplePageSnapshotView(APIView):
             except Exception:
                 pass
 
-        roles_qs = Role.objects.order_by('sort_order', 'name', 'id')
-        if not include_inactive:
-            roles_qs = roles_qs.filter(is_active=True)
-
         return {
             'locations': sorted(set(locations), key=lambda value: (str(value).lower(), str(value))),
             'departments': DepartmentSerializer(departments_qs, many=True).data,
-            'roles': RoleSerializer(roles_qs, many=True).data,
+            'roles': _role_rows(include_inactive),
         }
 
     def _build_selected_person_skills_payload(self, request):
@@ -683,50 +688,53 @@ class PeoplePageSnapshotView(APIView):
                         'selected_person_id': request.query_params.get('selected_person_id') or '',
                     },
                 )
-                cached = cache.get(cache_key)
-                if cached is not None:
-                    return Response(cached)
             except Exception:
                 cache_key = None
 
-        include_set = set(include_tokens or [])
-        payload = {
-            'contractVersion': 1,
-            'included': include_tokens or [],
-        }
-
-        if 'filters' in include_set:
-            payload['filters'] = self._build_filters_payload(request, include_inactive=include_inactive)
-
-        if 'people' in include_set:
-            queryset = self._build_people_queryset(request, include_inactive=include_inactive)
-            paginator = Paginator(queryset, page_size)
-            page_obj = paginator.get_page(page)
-            next_url, prev_url = _page_urls(
-                request,
-                page_number=page_obj.number,
-                page_size=page_size,
-                has_next=page_obj.has_next(),
-                has_previous=page_obj.has_previous(),
-            )
-            payload['people'] = {
-                'count': paginator.count,
-                'next': next_url,
-                'previous': prev_url,
-                'results': PersonSerializer(page_obj.object_list, many=True).data,
+        def _build_payload():
+            include_set = set(include_tokens or [])
+            payload = {
+                'contractVersion': 1,
+                'included': include_tokens or [],
             }
 
-        if 'selected_person_skills' in include_set:
-            selected_payload = self._build_selected_person_skills_payload(request)
-            if selected_payload is not None:
-                payload['selectedPersonSkills'] = selected_payload
+            if 'filters' in include_set:
+                payload['filters'] = self._build_filters_payload(request, include_inactive=include_inactive)
+
+            if 'people' in include_set:
+                queryset = self._build_people_queryset(request, include_inactive=include_inactive)
+                paginator = Paginator(queryset, page_size)
+                page_obj = paginator.get_page(page)
+                next_url, prev_url = _page_urls(
+                    request,
+                    page_number=page_obj.number,
+                    page_size=page_size,
+                    has_next=page_obj.has_next(),
+                    has_previous=page_obj.has_previous(),
+                )
+                payload['people'] = {
+                    'count': paginator.count,
+                    'next': next_url,
+                    'previous': prev_url,
+                    'results': PersonSerializer(page_obj.object_list, many=True).data,
+                }
+
+            if 'selected_person_skills' in include_set:
+                selected_payload = self._build_selected_person_skills_payload(request)
+                if selected_payload is not None:
+                    payload['selectedPersonSkills'] = selected_payload
+
+            payload = self._apply_payload_guardrails(payload)
+            return payload
 
-        payload = self._apply_payload_guardrails(payload)
         if use_cache and cache_key:
-            try:
-                cache.set(cache_key, payload, timeout=int(os.getenv('AGGREGATE_CACHE_TTL', '30')))
-            except Exception:
-                pass
+            payload = aggregate_cache.get_or_build(
+                cache_key,
+                _build_payload,
+                ttl=int(os.getenv('AGGREGATE_CACHE_TTL', '30')),
+            ).value
+        else:
+            payload = _build_payload()
         return Response(payload)
 
 
@@ -914,136 +922,139 @@ class SkillsPageSnapshotView(APIView):
                         'scope_version': scope_version,
                     },
                 )
-                cached = cache.get(cache_key)
-                if cached is not None:
-                    return Response(cached)
             except Exception:
                 cache_key = None
 
-        include_set = set(include_tokens or [])
-        payload = {
-            'contractVersion': 1,
-            'included': include_tokens or [],
-        }
+        def _build_payload():
+            include_set = set(include_tokens or [])
+            payload = {
+                'contractVersion': 1,
+                'included': include_tokens or [],
+            }
 
-        if 'departments' in include_set:
-            departments_qs = Department.objects.select_related('manager').order_by('name')
-            if not include_inactive:
-                departments_qs = departments_qs.filter(is_active=True)
-            if vertical_filter is not None:
-                departments_qs = departments_qs.filter(vertical_id=vertical_filter)
-            if department_scope_ids is not None:
-                departments_qs = departments_qs.filter(id__in=department_scope_ids)
-            payload['departments'] = DepartmentSerializer(departments_qs, many=True).data
-
-        if 'people' in include_set:
-            people_qs = (
-                Person.objects
-                .select_related('department', 'department__vertical', 'role')
-                .only(
-                    'id', 'name', 'weekly_capacity', 'role', 'department', 'location', 'notes',
-                    'created_at', 'updated_at', 'department__name', 'department__vertical_id',
-                    'department__vertical__name', 'role__name', 'is_active', 'hire_date',
+            if 'departments' in include_set:
+                departments_qs = Department.objects.select_related('manager').order_by('name')
+                if not include_inactive:
+                    departments_qs = departments_qs.filter(is_active=True)
+                if vertical_filter is not None:
+                    departments_qs = departments_qs.filter(vertical_id=vertical_filter)
+                if department_scope_ids is not None:
+                    departments_qs = departments_qs.filter(id__in=department_scope_ids)
+                payload['departments'] = DepartmentSerializer(departments_qs, many=True).data
+
+            if 'people' in include_set:
+                people_qs = (
+                    Person.objects
+                    .select_related('department', 'department__vertical', 'role')
+                    .only(
+                        'id', 'name', 'weekly_capacity', 'role', 'department', 'location', 'notes',
+                        'created_at', 'updated_at', 'department__name', 'department__vertical_id',
+                        'department__vertical__name', 'role__name', 'is_active', 'hire_date',
+                    )
+                    .order_by('name', 'id')
                 )
-                .order_by('name', 'id')
-            )
-            if not include_inactive:
-                people_qs = people_qs.filter(is_active=True)
-            if vertical_filter is not None:
-                people_qs = people_qs.filter(department__vertical_id=vertical_filter)
-            if department_scope_ids is not None:
-                people_qs = people_qs.filter(department_id__in=department_scope_ids)
-            if people_ids:
-                people_qs = people_qs.filter(id__in=people_ids)
-            if people_search:
-                people_qs = people_qs.filter(
-                    Q(name__icontains=people_search)
-                    | Q(location__icontains=people_search)
-                    | Q(role__name__icontains=people_search)
-                    | Q(department__name__icontains=people_search)
+                if not include_inactive:
+                    people_qs = people_qs.filter(is_active=True)
+                if vertical_filter is not None:
+                    people_qs = people_qs.filter(department__vertical_id=vertical_filter)
+                if department_scope_ids is not None:
+                    people_qs = people_qs.filter(department_id__in=department_scope_ids)
+                if people_ids:
+                    people_qs = people_qs.filter(id__in=people_ids)
+                if people_search:
+                    people_qs = people_qs.filter(
+                        Q(name__icontains=people_search)
+                        | Q(location__icontains=people_search)
+                        | Q(role__name__icontains=people_search)
+                        | Q(department__name__icontains=people_search)
+                    )
+                people_page = self._paginate(
+                    people_qs,
+                    request=request,
+                    page_key='people_page',
+                    page_size_key='people_page_size',
                 )
-            people_page = self._paginate(
-                people_qs,
-                request=request,
-                page_key='people_page',
-                page_size_key='people_page_size',
-            )
-            payload['people'] = {
-                'count': people_page['count'],
-                'next': people_page['next'],
-                'previous': people_page['previous'],
-                'results': PersonSerializer(people_page['results'], many=True).data,
-            }
+                payload['people'] = {
+                    'count': people_page['count'],
+                    'next': people_page['next'],
+                    'previous': people_page['previous'],
+                    'results': PersonSerializer(people_page['results'], many=True).data,
+                }
 
-        if 'skill_tags' in include_set:
-            skill_tags_qs = SkillTag.objects.filter(is_active=True).select_related('department').order_by('name')
-            if vertical_filter is not None and scope != 'global':
-                skill_tags_qs = skill_tags_qs.filter(
-                    Q(department__vertical_id=vertical_filter) | Q(department__isnull=True)
+            if 'skill_tags' in include_set:
+                skill_tags_qs = SkillTag.objects.filter(is_active=True).select_related('department').order_by('name')
+                if vertical_filter is not None and scope != 'global':
+                    skill_tags_qs = skill_tags_qs.filter(
+                        Q(department__vertical_id=vertical_filter) | Q(department__isnull=True)
+                    )
+                if scope == 'global':
+                    skill_tags_qs = skill_tags_qs.filter(department__isnull=True)
+                elif scope == 'department':
+                    skill_tags_qs = skill_tags_qs.filter(department__isnull=False)
+                if department_scope_ids is not None and scope != 'global':
+                    scope_q = Q(department_id__in=department_scope_ids)
+                    if include_global and scope != 'department':
+                        scope_q |= Q(department__isnull=True)
+                    skill_tags_qs = skill_tags_qs.filter(scope_q)
+                elif scope not in ('global', 'department') and not include_global:
+                    skill_tags_qs = skill_tags_qs.filter(department__isnull=False)
+                if skill_tag_ids:
+                    skill_tags_qs = skill_tags_qs.filter(id__in=skill_tag_ids)
+                if skill_search:
+                    skill_tags_qs = skill_tags_qs.filter(
+                        Q(name__icontains=skill_search) | Q(category__icontains=skill_search)
+                    )
+                skill_tags_page = self._paginate(
+                    skill_tags_qs,
+                    request=request,
+                    page_key='skill_tags_page',
+                    page_size_key='skill_tags_page_size',
                 )
-            if scope == 'global':
-                skill_tags_qs = skill_tags_qs.filter(department__isnull=True)
-            elif scope == 'department':
-                skill_tags_qs = skill_tags_qs.filter(department__isnull=False)
-            if department_scope_ids is not None and scope != 'global':
-                scope_q = Q(department_id__in=department_scope_ids)
-                if include_global and scope != 'department':
-                    scope_q |= Q(department__isnull=True)
-                skill_tags_qs = skill_tags_qs.filter(scope_q)
-            elif scope not in ('global', 'department') and not include_global:
-                skill_tags_qs = skill_tags_qs.filter(department__isnull=False)
-            if skill_tag_ids:
-                skill_tags_qs = skill_tags_qs.filter(id__in=skill_tag_ids)
-            if skill_search:
-                skill_tags_qs = skill_tags_qs.filter(
-                    Q(name__icontains=skill_search) | Q(category__icontains=skill_search)
+                payload['skillTags'] = {
+                    'count': skill_tags_page['count'],
+                    'next': skill_tags_page['next'],
+                    'previous': skill_tags_page['previous'],
+                    'results': SkillTagSerializer(skill_tags_page['results'], many=True).data,
+                }
+
+            if 'person_skills' in include_set:
+                person_skills_qs = PersonSkill.objects.select_related('person', 'skill_tag').order_by('skill_type', 'skill_tag__name', 'id')
+                if vertical_filter is not None:
+                    person_skills_qs = person_skills_qs.filter(person__department__vertical_id=vertical_filter)
+                if department_scope_ids is not None:
+                    person_skills_qs = person_skills_qs.filter(person__department_id__in=department_scope_ids)
+                if people_ids:
+                    person_skills_qs = person_skills_qs.filter(person_id__in=people_ids)
+                if skill_tag_ids:
+                    person_skills_qs = person_skills_qs.filter(skill_tag_id__in=skill_tag_ids)
+                if people_search:
+                    person_skills_qs = person_skills_qs.filter(person__name__icontains=people_search)
+                if skill_search:
+                    person_skills_qs = person_skills_qs.filter(skill_tag__name__icontains=skill_search)
+                person_skills_page = self._paginate(
+                    person_skills_qs,
+                    request=request,
+                    page_key='person_skills_page',
+                    page_size_key='person_skills_page_size',
                 )
-            skill_tags_page = self._paginate(
-                skill_tags_qs,
-                request=request,
-                page_key='skill_tags_page',
-                page_size_key='skill_tags_page_size',
-            )
-            payload['skillTags'] = {
-                'count': skill_tags_page['count'],
-                'next': skill_tags_page['next'],
-                'previous': skill_tags_page['previous'],
-                'results': SkillTagSerializer(skill_tags_page['results'], many=True).data,
-            }
+                payload['personSkills'] = {
+                    'count': person_skills_page['count'],
+                    'next': person_skills_page['next'],
+                    'previous': person_skills_page['previous'],
+                    'results': PersonSkillSerializer(person_skills_page['results'], many=True).data,
+                }
 
-        if 'person_skills' in include_set:
-            person_skills_qs = PersonSkill.objects.select_related('person', 'skill_tag').order_by('skill_type', 'skill_tag__name', 'id')
-            if vertical_filter is not None:
-                person_skills_qs = person_skills_qs.filter(person__department__vertical_id=vertical_filter)
-            if department_scope_ids is not None:
-                person_skills_qs = person_skills_qs.filter(person__department_id__in=department_scope_ids)
-            if people_ids:
-                person_skills_qs = person_skills_qs.filter(person_id__in=people_ids)
-            if skill_tag_ids:
-                person_skills_qs = person_skills_qs.filter(skill_tag_id__in=skill_tag_ids)
-            if people_search:
-                person_skills_qs = person_skills_qs.filter(person__name__icontains=people_search)
-            if skill_search:
-                person_skills_qs = person_skills_qs.filter(skill_tag__name__icontains=skill_search)
-            person_skills_page = self._paginate(
-                person_skills_qs,
-                request=request,
-                page_key='person_skills_page',
-                page_size_key='person_skills_page_size',
-            )
-            payload['personSkills'] = {
-                'count': person_skills_page['count'],
-                'next': person_skills_page['next'],
-                'previous': person_skills_page['previous'],
-                'results': PersonSkillSerializer(person_skills_page['results'], many=True).data,
-            }
+            payload = self._apply_payload_guardrails(payload)
+            return payload
 
-        payload = self._apply_payload_guardrails(payload)
         if use_cache and cache_key:
-            try:
-                cache.set(cache_key, payload, timeout=int(os.getenv('AGGREGATE_CACHE_TTL', '30')))
-            except Exception:
-                pass
+            payload = aggregate_cache.get_or_build(
+                cache_key,
+                _build_payload,
+                ttl=int(os.getenv('AGGREGATE_CACHE_TTL', '30')),
+            ).value
+        else:
+            payload = _build_payload()
         return Response(payload)
 
 
@@ -1094,12 +1105,12 @@ class SettingsPageSnapshotView(APIView):
             ).data
             return {'departments': departments}
         if section_id == 'role-management':
-            return {'roles': RoleSerializer(Role.objects.filter(is_active=True).order_by('sort_order', 'name', 'id'), many=True).data}
+            return {'roles': _role_rows(False)}
         if section_id == 'project-statuses':
             rows = ProjectStatusDefinition.objects.all().order_by('sort_order', 'label', 'key')
             return {'projectStatuses': ProjectStatusDefinitionSerializer(rows, many=True).data}
         if section_id == 'verticals':
-            return {'verticals': VerticalSerializer(Vertical.objects.order_by('name'), many=True).data}
+            return {'verticals': _vertical_rows(True)}
         if section_id == 'utilization-scheme':
             try:
                 return {'utilizationScheme': UtilizationSchemeSerializer(UtilizationScheme.get_active()).data}
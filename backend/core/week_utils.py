@@ -8,9 +8,12 @@ Added helpers (Step 1 of pre-deliverables plan):
 - ``working_days_before(target_date, business_days)``: subtract N business days
 - ``working_days_after(start_date, business_days)``: add N business days
 - ``count_working_days_between(start_date, end_date)``: inclusive count of Mon–Fri
+- ``working_days_before_many(dates, business_days)``: vectorised ``working_days_before``
 
 Implementation notes:
-- Weekends (Saturday/Sunday) are excluded. Holidays are not considered.
+- Weekends (Saturday/Sunday) and ``settings.BUSINESS_HOLIDAYS`` are excluded.
+- Offsets and counts are answered by index arithmetic on the precomputed
+  ``core.business_calendar`` calendar rather than by stepping day by day.
 - Functions validate inputs and raise ``ValueError`` for invalid or negative counts.
 """
 from __future__ import annotations
@@ -18,6 +21,8 @@ from __future__ import annotations
 from datetime import date, timedelta
 from typing import List, Optional, Mapping, Any
 
+from core.business_calendar import get_calendar
+
 
 def sunday_of_week(d: date) -> date:
     """Return the Sunday date for the week containing the given date.
@@ -81,7 +86,7 @@ def _require_date(obj: date, name: str) -> None:
 
 
 def is_working_day(d: date) -> bool:
-    """Return True if ``d`` is a working day (Mon–Fri), False for weekends.
+    """Return True if ``d`` is a working day (Mon–Fri, not a holiday).
 
     Example:
     >>> is_working_day(date(2024, 1, 12))  # Friday
@@ -90,14 +95,13 @@ def is_working_day(d: date) -> bool:
     False
     """
     _require_date(d, "d")
-    # Python: Monday=0..Sunday=6
-    return d.weekday() < 5
+    return get_calendar().is_working_day(d)
 
 
 def working_days_before(target_date: date, business_days: int) -> date:
     """Return the date that is ``business_days`` working days before ``target_date``.
 
-    - Skips weekends (Sat/Sun). Does not include ``target_date`` itself in the count.
+    - Skips weekends (Sat/Sun) and holidays. Does not include ``target_date`` itself in the count.
     - If ``target_date`` falls on a weekend, counting starts from the previous
       working day before the weekend.
     - ``business_days`` must be a non-negative integer.
@@ -116,20 +120,13 @@ def working_days_before(target_date: date, business_days: int) -> date:
     if business_days < 0:
         raise ValueError("business_days cannot be negative")
 
-    # Step backwards one day at a time, counting only working days
-    cur = target_date
-    remaining = business_days
-    while remaining > 0:
-        cur -= timedelta(days=1)
-        if is_working_day(cur):
-            remaining -= 1
-    return cur
+    return get_calendar().before(target_date, business_days)
 
 
 def working_days_after(start_date: date, business_days: int) -> date:
     """Return the date that is ``business_days`` working days after ``start_date``.
 
-    - Skips weekends (Sat/Sun). Does not include ``start_date`` itself in the count.
+    - Skips weekends (Sat/Sun) and holidays. Does not include ``start_date`` itself in the count.
     - If ``start_date`` falls on a weekend, counting starts from the next
       working day after the weekend.
     - ``business_days`` must be a non-negative integer.
@@ -148,14 +145,7 @@ def working_days_after(start_date: date, business_days: int) -> date:
     if business_days < 0:
         raise ValueError("business_days cannot be negative")
 
-    # Step forwards one day at a time, counting only working days
-    cur = start_date
-    remaining = business_days
-    while remaining > 0:
-        cur += timedelta(days=1)
-        if is_working_day(cur):
-            remaining -= 1
-    return cur
+    return get_calendar().after(start_date, business_days)
 
 
 def count_working_days_between(start_date: date, end_date: date) -> int:
@@ -178,13 +168,17 @@ def count_working_days_between(start_date: date, end_date: date) -> int:
     if start_date > end_date:
         raise ValueError("start_date cannot be after end_date")
 
-    cur = start_date
-    count = 0
-    while cur <= end_date:
-        if is_working_day(cur):
-            count += 1
-        cur += timedelta(days=1)
-    return count
+    return get_calendar().count(start_date, end_date)
+
+
+def working_days_before_many(target_dates: List[date], business_days) -> List[date]:
+    """Vectorised ``working_days_before``; ``business_days`` is one count or one per date."""
+    counts = [business_days] * len(target_dates) if isinstance(business_days, int) else list(business_days)
+    for d in target_dates:
+        _require_date(d, "target_date")
+    if any(not isinstance(n, int) or n < 0 for n in counts):
+        raise ValueError("business_days must be non-negative integers")
+    return get_calendar().before_many(target_dates, counts)
 
 
 def get_week_value(weekly_hours: Optional[Mapping[str, Any]], sunday_date: date, window: int = 3) -> float:
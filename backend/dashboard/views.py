@@ -13,7 +13,9 @@ from assignments.models import Assignment
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 import logging
 from core.models import UtilizationScheme
+from core.aggregate_cache import aggregate_cache
 from core.cache_keys import build_aggregate_cache_key
+from core.encoded_responses import cached_encoded_response
 from core.project_visibility import (
     get_hidden_project_ids_for_scope,
     resolve_visibility_scope,
@@ -24,9 +26,16 @@ from departments.models import Department
 from .serializers import DashboardResponseSerializer
 
 
+class _InvalidDashboardPayload(Exception):
+    pass
+
+
 class DashboardView(APIView):
     """Team dashboard with utilization metrics and overview"""
     permission_classes = [IsAuthenticated]
+    # Set by DashboardBootstrapView, which reads ``response.data`` and must
+    # not receive pre-encoded bytes.
+    nested_snapshot_call = False
 
     @extend_schema(
         parameters=[
@@ -81,216 +90,211 @@ class DashboardView(APIView):
                     'hire_eligibility_version': 2,
                 },
             )
-            try:
-                cached = cache.get(cache_key)
-            except Exception:
-                cached = None
-            if cached is not None:
-                return Response(cached)
-        
-        today = date.today()
-        week_start = today - timedelta(days=today.weekday())
-        week_end = week_start + timedelta(days=6)
-        
-        # Get active people, optionally filtered by department
-        active_people = active_people_on_or_before(Person.objects.filter(is_active=True), today)
-        if department_filter:
-            active_people = active_people.filter(department_id=department_filter)
-        if vertical_filter:
-            active_people = active_people.filter(department__vertical_id=vertical_filter)
-        total_people = active_people.count()
-        
-        # Calculate utilization distribution
-        utilization_ranges = {
-            'underutilized': 0,  # < 70%
-            'optimal': 0,         # 70-85%
-            'high': 0,            # 85-100%
-            'overallocated': 0    # > 100%
-        }
         
-        team_overview = []
-        available_people = []
-        total_utilization = 0
-        peak_utilization = 0
-        peak_person_name = None
-        
-        # Helper: get active scheme with a short in-process cache to avoid hot-path DB hits
-        def get_scheme_cached():
-            try:
-                cache_key_scheme = 'utilization_scheme:active'
-                sch = cache.get(cache_key_scheme)
-                if sch is None:
-                    sch = UtilizationScheme.get_active()
-                    # Cache for 60s
-                    try:
-                        cache.set(cache_key_scheme, sch, 60)
-                    except Exception:  # nosec B110
-                        pass
-                return sch
-            except Exception:
-                return UtilizationScheme.get_active()
-
-        use_scheme = bool(settings.FEATURES.get('UTILIZATION_SCHEME_ENABLED', True))
-        scheme = get_scheme_cached() if use_scheme else None
-
-        for person in active_people:
-            # Use multi-week utilization calculation
-            utilization_data = person.get_utilization_over_weeks(weeks, hidden_project_ids=hidden_project_ids)
-            percent = utilization_data['total_percentage']
-            peak_percent = utilization_data['peak_percentage']
-            total_utilization += percent
-            
-            # Track overall peak utilization
-            if peak_percent > peak_utilization:
-                peak_utilization = peak_percent
-                peak_person_name = person.name
-            
-            # Categorize utilization using UtilizationScheme when enabled
-            if scheme and scheme.mode == UtilizationScheme.MODE_ABSOLUTE:
-                hours = utilization_data.get('allocated_hours') or 0
-                # Guardrails: clamp negatives and warn
-                if hours < 0:
-                    try:
-                        logging.getLogger('monitoring').warning('negative_allocated_hours_clamped', extra={'person_id': person.id, 'hours': hours})
-                    except Exception:  # nosec B110
-                        pass
-                    hours = 0
-                # Zero hours: treat as underutilized for distribution purposes
-                if hours >= (scheme.red_min or 41):
-                    utilization_ranges['overallocated'] += 1
-                elif hours >= scheme.orange_min and hours <= scheme.orange_max:
-                    utilization_ranges['high'] += 1
-                elif hours >= scheme.green_min and hours <= scheme.green_max:
-                    utilization_ranges['optimal'] += 1
-                elif hours >= scheme.blue_min and hours <= scheme.blue_max:
-                    utilization_ranges['underutilized'] += 1
+        def _build_payload():
+            today = date.today()
+            week_start = today - timedelta(days=today.weekday())
+            week_end = week_start + timedelta(days=6)
+
+            # Get active people, optionally filtered by department
+            active_people = active_people_on_or_before(Person.objects.filter(is_active=True), today)
+            if department_filter:
+                active_people = active_people.filter(department_id=department_filter)
+            if vertical_filter:
+                active_people = active_people.filter(department__vertical_id=vertical_filter)
+            total_people = active_people.count()
+
+            # Calculate utilization distribution
+            utilization_ranges = {
+                'underutilized': 0,  # < 70%
+                'optimal': 0,         # 70-85%
+                'high': 0,            # 85-100%
+                'overallocated': 0    # > 100%
+            }
+
+            team_overview = []
+            available_people = []
+            total_utilization = 0
+            peak_utilization = 0
+            peak_person_name = None
+
+            # Helper: get active scheme with a short in-process cache to avoid hot-path DB hits
+            def get_scheme_cached():
+                try:
+                    cache_key_scheme = 'utilization_scheme:active'
+                    sch = cache.get(cache_key_scheme)
+                    if sch is None:
+                        sch = UtilizationScheme.get_active()
+                        # Cache for 60s
+                        try:
+                            cache.set(cache_key_scheme, sch, 60)
+                        except Exception:  # nosec B110
+                            pass
+                    return sch
+                except Exception:
+                    return UtilizationScheme.get_active()
+
+            use_scheme = bool(settings.FEATURES.get('UTILIZATION_SCHEME_ENABLED', True))
+            scheme = get_scheme_cached() if use_scheme else None
+
+            for person in active_people:
+                # Use multi-week utilization calculation
+                utilization_data = person.get_utilization_over_weeks(weeks, hidden_project_ids=hidden_project_ids)
+                percent = utilization_data['total_percentage']
+                peak_percent = utilization_data['peak_percentage']
+                total_utilization += percent
+
+                # Track overall peak utilization
+                if peak_percent > peak_utilization:
+                    peak_utilization = peak_percent
+                    peak_person_name = person.name
+
+                # Categorize utilization using UtilizationScheme when enabled
+                if scheme and scheme.mode == UtilizationScheme.MODE_ABSOLUTE:
+                    hours = utilization_data.get('allocated_hours') or 0
+                    # Guardrails: clamp negatives and warn
+                    if hours < 0:
+                        try:
+                            logging.getLogger('monitoring').warning('negative_allocated_hours_clamped', extra={'person_id': person.id, 'hours': hours})
+                        except Exception:  # nosec B110
+                            pass
+                        hours = 0
+                    # Zero hours: treat as underutilized for distribution purposes
+                    if hours >= (scheme.red_min or 41):
+                        utilization_ranges['overallocated'] += 1
+                    elif hours >= scheme.orange_min and hours <= scheme.orange_max:
+                        utilization_ranges['high'] += 1
+                    elif hours >= scheme.green_min and hours <= scheme.green_max:
+                        utilization_ranges['optimal'] += 1
+                    elif hours >= scheme.blue_min and hours <= scheme.blue_max:
+                        utilization_ranges['underutilized'] += 1
+                    else:
+                        # Outside configured bounds; clamp into nearest bucket
+                        if hours <= 0 or hours < scheme.blue_min:
+                            utilization_ranges['underutilized'] += 1
+                        else:
+                            utilization_ranges['overallocated'] += 1
+
+                    # Available people list mirrors underutilized bucket
+                    if (hours <= 0) or (hours < scheme.green_min):
+                        available_people.append({
+                            'id': person.id,
+                            'name': person.name,
+                            'available_hours': utilization_data['available_hours'],
+                            'utilization_percent': percent,
+                        })
                 else:
-                    # Outside configured bounds; clamp into nearest bucket
-                    if hours <= 0 or hours < scheme.blue_min:
+                    # Percent-mode (or feature disabled) fallback to thresholds 70/85/100
+                    if percent < 70:
                         utilization_ranges['underutilized'] += 1
+                        available_people.append({
+                            'id': person.id,
+                            'name': person.name,
+                            'available_hours': utilization_data['available_hours'],
+                            'utilization_percent': percent
+                        })
+                    elif percent <= 85:
+                        utilization_ranges['optimal'] += 1
+                    elif percent <= 100:
+                        utilization_ranges['high'] += 1
                     else:
                         utilization_ranges['overallocated'] += 1
 
-                # Available people list mirrors underutilized bucket
-                if (hours <= 0) or (hours < scheme.green_min):
-                    available_people.append({
-                        'id': person.id,
-                        'name': person.name,
-                        'available_hours': utilization_data['available_hours'],
-                        'utilization_percent': percent,
-                    })
-            else:
-                # Percent-mode (or feature disabled) fallback to thresholds 70/85/100
-                if percent < 70:
-                    utilization_ranges['underutilized'] += 1
-                    available_people.append({
-                        'id': person.id,
-                        'name': person.name,
-                        'available_hours': utilization_data['available_hours'],
-                        'utilization_percent': percent
-                    })
-                elif percent <= 85:
-                    utilization_ranges['optimal'] += 1
-                elif percent <= 100:
-                    utilization_ranges['high'] += 1
-                else:
-                    utilization_ranges['overallocated'] += 1
-            
-            # Add to team overview
-            team_overview.append({
-                'id': person.id,
-                'name': person.name,
-                'role': person.role.name if person.role else 'No Role',
-                'utilization_percent': percent,
-                'allocated_hours': utilization_data['allocated_hours'],
-                'capacity': person.weekly_capacity,
-                'is_overallocated': utilization_data['is_overallocated'],
-                'peak_utilization_percent': peak_percent,
-                'peak_week': utilization_data['peak_week_key'],
-                'is_peak_overallocated': utilization_data['is_peak_overallocated']
-            })
-        
-        # Calculate average utilization
-        avg_utilization = round(total_utilization / total_people, 1) if total_people > 0 else 0
-        
-        # Get total active assignments, optionally filtered by department
-        assignments_qs = Assignment.objects.filter(is_active=True, person__is_active=True)
-        assignments_qs = assignments_qs.filter(person_id__in=active_people.values('id'))
-        if hidden_project_ids:
-            assignments_qs = assignments_qs.exclude(project_id__in=sorted(hidden_project_ids))
-        if department_filter:
-            assignments_qs = assignments_qs.filter(person__department_id=department_filter)
-        if vertical_filter:
-            assignments_qs = assignments_qs.filter(project__vertical_id=vertical_filter)
-        total_assignments = assignments_qs.count()
-        
-        # Recent assignments (last 7 days), optionally filtered by department
-        recent_assignments = []
-        recent_assignment_qs = Assignment.objects.filter(
-            created_at__gte=timezone.now() - timedelta(days=7)
-        ).select_related('person', 'project', 'role_on_project_ref')
-        recent_assignment_qs = recent_assignment_qs.filter(person_id__in=active_people.values('id'))
-        if hidden_project_ids:
-            recent_assignment_qs = recent_assignment_qs.exclude(project_id__in=sorted(hidden_project_ids))
-        
-        if department_filter:
-            recent_assignment_qs = recent_assignment_qs.filter(person__department_id=department_filter)
-        if vertical_filter:
-            recent_assignment_qs = recent_assignment_qs.filter(project__vertical_id=vertical_filter)
-            
-        recent_assignment_qs = recent_assignment_qs.order_by('-created_at')
-        
-        for assignment in recent_assignment_qs:
-            role_name = None
-            try:
-                if assignment.role_on_project_ref:
-                    role_name = assignment.role_on_project_ref.name
-                elif assignment.role_on_project:
-                    role_name = assignment.role_on_project
-            except Exception:
+                # Add to team overview
+                team_overview.append({
+                    'id': person.id,
+                    'name': person.name,
+                    'role': person.role.name if person.role else 'No Role',
+                    'utilization_percent': percent,
+                    'allocated_hours': utilization_data['allocated_hours'],
+                    'capacity': person.weekly_capacity,
+                    'is_overallocated': utilization_data['is_overallocated'],
+                    'peak_utilization_percent': peak_percent,
+                    'peak_week': utilization_data['peak_week_key'],
+                    'is_peak_overallocated': utilization_data['is_peak_overallocated']
+                })
+
+            # Calculate average utilization
+            avg_utilization = round(total_utilization / total_people, 1) if total_people > 0 else 0
+
+            # Get total active assignments, optionally filtered by department
+            assignments_qs = Assignment.objects.filter(is_active=True, person__is_active=True)
+            assignments_qs = assignments_qs.filter(person_id__in=active_people.values('id'))
+            if hidden_project_ids:
+                assignments_qs = assignments_qs.exclude(project_id__in=sorted(hidden_project_ids))
+            if department_filter:
+                assignments_qs = assignments_qs.filter(person__department_id=department_filter)
+            if vertical_filter:
+                assignments_qs = assignments_qs.filter(project__vertical_id=vertical_filter)
+            total_assignments = assignments_qs.count()
+
+            # Recent assignments (last 7 days), optionally filtered by department
+            recent_assignments = []
+            recent_assignment_qs = Assignment.objects.filter(
+                created_at__gte=timezone.now() - timedelta(days=7)
+            ).select_related('person', 'project', 'role_on_project_ref')
+            recent_assignment_qs = recent_assignment_qs.filter(person_id__in=active_people.values('id'))
+            if hidden_project_ids:
+                recent_assignment_qs = recent_assignment_qs.exclude(project_id__in=sorted(hidden_project_ids))
+
+            if department_filter:
+                recent_assignment_qs = recent_assignment_qs.filter(person__department_id=department_filter)
+            if vertical_filter:
+                recent_assignment_qs = recent_assignment_qs.filter(project__vertical_id=vertical_filter)
+
+            recent_assignment_qs = recent_assignment_qs.order_by('-created_at')
+
+            for assignment in recent_assignment_qs:
                 role_name = None
-            client_name = None
-            try:
-                if assignment.project:
-                    client_name = assignment.project.client
-            except Exception:
+                try:
+                    if assignment.role_on_project_ref:
+                        role_name = assignment.role_on_project_ref.name
+                    elif assignment.role_on_project:
+                        role_name = assignment.role_on_project
+                except Exception:
+                    role_name = None
                 client_name = None
-            person_name = assignment.person.name if assignment.person else 'Unassigned'
-            recent_assignments.append({
-                'person': person_name,
-                'project': assignment.project_display,
-                'client': client_name,
-                'role': role_name,
-                'created': assignment.created_at.isoformat()
-            })
-        
-        payload = {
-            'summary': {
-                'total_people': total_people,
-                'avg_utilization': avg_utilization,
-                'peak_utilization': round(peak_utilization, 1),
-                'peak_person': peak_person_name,
-                'total_assignments': total_assignments,
-                'overallocated_count': utilization_ranges['overallocated']
-            },
-            'utilization_distribution': utilization_ranges,
-            'team_overview': sorted(team_overview, key=lambda x: x['name']),
-            'available_people': sorted(available_people, key=lambda x: -x['available_hours'])[:5],
-            'recent_assignments': recent_assignments
-        }
-
-        # Store in cache with short TTL if enabled
+                try:
+                    if assignment.project:
+                        client_name = assignment.project.client
+                except Exception:
+                    client_name = None
+                person_name = assignment.person.name if assignment.person else 'Unassigned'
+                recent_assignments.append({
+                    'person': person_name,
+                    'project': assignment.project_display,
+                    'client': client_name,
+                    'role': role_name,
+                    'created': assignment.created_at.isoformat()
+                })
+
+            payload = {
+                'summary': {
+                    'total_people': total_people,
+                    'avg_utilization': avg_utilization,
+                    'peak_utilization': round(peak_utilization, 1),
+                    'peak_person': peak_person_name,
+                    'total_assignments': total_assignments,
+                    'overallocated_count': utilization_ranges['overallocated']
+                },
+                'utilization_distribution': utilization_ranges,
+                'team_overview': sorted(team_overview, key=lambda x: x['name']),
+                'available_people': sorted(available_people, key=lambda x: -x['available_hours'])[:5],
+                'recent_assignments': recent_assignments
+            }
+            return payload
+
         if use_cache and cache_key is not None:
             # TTL preference: DASHBOARD_CACHE_TTL > AGGREGATE_CACHE_TTL > default(30)
             ttl = getattr(settings, 'DASHBOARD_CACHE_TTL', None)
             if ttl is None:
                 ttl = getattr(settings, 'AGGREGATE_CACHE_TTL', 30)
-            try:
-                cache.set(cache_key, payload, timeout=int(ttl))
-            except Exception:  # nosec B110
-                pass
+            if self.nested_snapshot_call:
+                return Response(aggregate_cache.get_or_build(cache_key, _build_payload, ttl=int(ttl)).value)
+            response, _ = cached_encoded_response(request, cache_key, _build_payload, ttl=int(ttl))
+            return response
 
-        return Response(payload)
+        return Response(_build_payload())
 
 
 def _parse_int(raw, default=None):
@@ -371,70 +375,69 @@ class DashboardBootstrapView(APIView):
                     'hire_eligibility_version': 2,
                 },
             )
-                cached = cache.get(cache_key)
-                if cached is not None:
-                    return Response(cached)
             except Exception:
                 cache_key = None
 
-        # Reuse canonical dashboard payload logic for summary/distribution parity.
-        dashboard_response = DashboardView().get(request)
-        dashboard_payload = getattr(dashboard_response, 'data', None)
-        if not isinstance(dashboard_payload, dict):
-            return Response({'error': 'invalid dashboard payload'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        def _build_payload():
+            # Reuse canonical dashboard payload logic for summary/distribution parity.
+            dashboard_response = DashboardView(nested_snapshot_call=True).get(request)
+            dashboard_payload = getattr(dashboard_response, 'data', None)
+            if not isinstance(dashboard_payload, dict):
+                raise _InvalidDashboardPayload()
 
-        projects_qs = Project.objects.filter(is_active=True)
-        if vertical_filter is not None:
-            projects_qs = projects_qs.filter(vertical_id=vertical_filter)
-        if hidden_project_ids:
-            projects_qs = projects_qs.exclude(id__in=sorted(hidden_project_ids))
-        project_counts_rows = projects_qs.values('status').annotate(count=Count('id'))
-        project_counts_by_status = {}
-        for row in project_counts_rows:
-            key = row.get('status') or 'Unknown'
-            project_counts_by_status[key] = int(row.get('count') or 0)
-
-        people_qs = active_people_on_or_before(
-            Person.objects
-            .select_related('role')
-            .filter(is_active=True)
-            .only('id', 'is_active', 'hire_date', 'role_id', 'role__name', 'department_id'),
-            date.today(),
-        )
-        if vertical_filter is not None:
-            people_qs = people_qs.filter(department__vertical_id=vertical_filter)
-        if department_filter is not None:
-            if include_children:
-                dept_ids = _department_descendant_ids(department_filter)
-                people_qs = people_qs.filter(department_id__in=dept_ids)
-            else:
-                people_qs = people_qs.filter(department_id=department_filter)
-
-        people_meta = []
-        for person in people_qs:
-            people_meta.append({
-                'id': person.id,
-                'isActive': bool(person.is_active),
-                'hireDate': person.hire_date.isoformat() if person.hire_date else None,
-                'roleId': person.role_id,
-                'roleName': person.role.name if getattr(person, 'role', None) else None,
-            })
-
-        payload = {
-            'contractVersion': 1,
-            'dashboard': dashboard_payload,
-            'projectCountsByStatus': project_counts_by_status,
-            'projectsTotal': int(sum(project_counts_by_status.values())),
-            'peopleMeta': people_meta,
-        }
+            projects_qs = Project.objects.filter(is_active=True)
+            if vertical_filter is not None:
+                projects_qs = projects_qs.filter(vertical_id=vertical_filter)
+            if hidden_project_ids:
+                projects_qs = projects_qs.exclude(id__in=sorted(hidden_project_ids))
+            project_counts_rows = projects_qs.values('status').annotate(count=Count('id'))
+            project_counts_by_status = {}
+            for row in project_counts_rows:
+                key = row.get('status') or 'Unknown'
+                project_counts_by_status[key] = int(row.get('count') or 0)
 
-        if use_cache and cache_key is not None:
-            ttl = getattr(settings, 'DASHBOARD_CACHE_TTL', None)
-            if ttl is None:
-                ttl = getattr(settings, 'AGGREGATE_CACHE_TTL', 30)
-            try:
-                cache.set(cache_key, payload, timeout=int(ttl))
-            except Exception:  # nosec B110
-                pass
+            people_qs = active_people_on_or_before(
+                Person.objects
+                .select_related('role')
+                .filter(is_active=True)
+                .only('id', 'is_active', 'hire_date', 'role_id', 'role__name', 'department_id'),
+                date.today(),
+            )
+            if vertical_filter is not None:
+                people_qs = people_qs.filter(department__vertical_id=vertical_filter)
+            if department_filter is not None:
+                if include_children:
+                    dept_ids = _department_descendant_ids(department_filter)
+                    people_qs = people_qs.filter(department_id__in=dept_ids)
+                else:
+                    people_qs = people_qs.filter(department_id=department_filter)
 
-        return Response(payload)
+            people_meta = []
+            for person in people_qs:
+                people_meta.append({
+                    'id': person.id,
+                    'isActive': bool(person.is_active),
+                    'hireDate': person.hire_date.isoformat() if person.hire_date else None,
+                    'roleId': person.role_id,
+                    'roleName': person.role.name if getattr(person, 'role', None) else None,
+                })
+
+            payload = {
+                'contractVersion': 1,
+                'dashboard': dashboard_payload,
+                'projectCountsByStatus': project_counts_by_status,
+                'projectsTotal': int(sum(project_counts_by_status.values())),
+                'peopleMeta': people_meta,
+            }
+            return payload
+
+        try:
+            if use_cache and cache_key is not None:
+                ttl = getattr(settings, 'DASHBOARD_CACHE_TTL', None)
+                if ttl is None:
+                    ttl = getattr(settings, 'AGGREGATE_CACHE_TTL', 30)
+                response, _ = cached_encoded_response(request, cache_key, _build_payload, ttl=int(ttl))
+                return response
+            return Response(_build_payload())
+        except _InvalidDashboardPayload:
+            return Response({'error': 'invalid dashboard payload'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
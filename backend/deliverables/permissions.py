@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
-from accounts.permissions import is_admin_or_manager
+from accounts.permissions import get_user_person_id, is_admin_or_manager
 from assignments.utils.project_membership import is_current_project_assignee
 
 
@@ -32,8 +32,8 @@ class DeliverableTaskPermission(BasePermission):
         if request.method in SAFE_METHODS:
             return True
         # Must be a current project assignee to update tasks
+        person_id = get_user_person_id(user)
         try:
-            person_id = getattr(getattr(user, 'profile', None), 'person_id', None)
             project_id = obj.deliverable.project_id
         except Exception:
             return False
@@ -6,6 +6,7 @@ from typing import List, Dict, Any, Optional
 
 from django.db import transaction
 
+from core.business_calendar import get_calendar
 from core.week_utils import working_days_before
 from core.models import PreDeliverableGlobalSettings
 from projects.models import ProjectPreDeliverableSettings
@@ -23,6 +24,95 @@ class RegenerateSummary:
     preserved_completed: int
 
 
+BATCH_CHUNK_SIZE = 1000
+
+
+class PreDeliverableBatchPlanner:
+    """Effective pre-deliverable settings for many deliverables at once.
+
+    Loads active types, global settings and the project overrides for the
+    given projects in three queries, then computes generated dates in
+    memory from the precomputed business-day calendar.
+    Effective-settings resolution matches the per-deliverable rules: project
+    override, then global default, then the type default.
+    """
+
+    def __init__(self, project_ids=None, type_ids=None):
+        types_qs = PreDeliverableType.objects.filter(is_active=True).order_by('sort_order', 'name')
+        if type_ids is not None:
+            types_qs = types_qs.filter(id__in=list(type_ids))
+        self.types = list(types_qs)
+        ids = [t.id for t in self.types]
+        self.glob_map = {
+            g.pre_deliverable_type_id: g
+            for g in PreDeliverableGlobalSettings.objects.filter(pre_deliverable_type_id__in=ids)
+        }
+        self.project_overrides: Dict[int, Dict[int, tuple]] = {}
+        overrides = ProjectPreDeliverableSettings.objects.filter(pre_deliverable_type_id__in=ids)
+        if project_ids is not None:
+            overrides = overrides.filter(project_id__in=list(set(project_ids)))
+        for project_id, type_id, days, enabled in overrides.values_list(
+            'project_id', 'pre_deliverable_type_id', 'days_before', 'is_enabled'
+        ):
+            self.project_overrides.setdefault(project_id, {})[type_id] = (days, enabled)
+        self.calendar = get_calendar()
+
+    def effective_types(self, project_id: Optional[int]) -> List[tuple]:
+        """Return ``[(type, days_before), ...]`` enabled for ``project_id``."""
+        proj_map = self.project_overrides.get(project_id, {})
+        out = []
+        for t in self.types:
+            if t.id in proj_map:
+                eff_days = int(proj_map[t.id][0])
+                eff_enabled = bool(proj_map[t.id][1])
+            elif t.id in self.glob_map:
+                g = self.glob_map[t.id]
+                eff_days = int(getattr(g, 'default_days_before') or 0)
+                eff_enabled = bool(getattr(g, 'is_enabled_by_default', True))
+            else:
+                eff_days = int(getattr(t, 'default_days_before') or 0)
+                eff_enabled = bool(getattr(t, 'is_active', True))
+            if eff_enabled:
+                out.append((t, eff_days))
+        return out
+
+    def generated_date(self, due: date, days_before: int) -> date:
+        return self.calendar.before(due, max(0, int(days_before)))
+
+    def build_items(self, deliverables, *, skip=frozenset(), completed=None) -> List[PreDeliverableItem]:
+        """Unsaved items for ``deliverables`` except ``(deliverable_id, type_id)`` pairs in ``skip``.
+
+        ``completed`` maps ``(deliverable_id, type_id) -> completed_date`` to carry
+        completion over when regenerating.
+        """
+        completed = completed or {}
+        items = []
+        for d in deliverables:
+            if d.date is None:
+                continue
+            for t, days in self.effective_types(d.project_id):
+                key = (d.id, t.id)
+                if key in skip:
+                    continue
+                item = PreDeliverableItem(
+                    deliverable=d,
+                    pre_deliverable_type=t,
+                    generated_date=self.generated_date(d.date, days),
+                    days_before=days,
+                )
+                if key in completed:
+                    item.is_completed = True
+                    item.completed_date = completed[key]
+                items.append(item)
+        return items
+
+
+def _chunks(seq, size: int = BATCH_CHUNK_SIZE):
+    seq = list(seq)
+    for start in range(0, len(seq), size):
+        yield seq[start:start + size]
+
+
 class PreDeliverableService:
     @staticmethod
     @transaction.atomic
@@ -34,58 +124,34 @@ class PreDeliverableService:
         """
         if deliverable is None:
             raise ValueError("deliverable is required")
-        if not getattr(deliverable, 'project', None):
-            deliverable = Deliverable.objects.select_related('project').get(id=deliverable.id)
         if deliverable.date is None:
             return []
+        return PreDeliverableService.generate_for_deliverables([deliverable])
 
-        # Batch load active types
-        types = list(PreDeliverableType.objects.filter(is_active=True).order_by('sort_order', 'name'))
-        if not types:
-            return []
-        type_ids = [t.id for t in types]
-
-        # Preload existing items for this deliverable to avoid duplicates
-        existing_type_ids = set(
-            PreDeliverableItem.objects
-            .filter(deliverable=deliverable, pre_deliverable_type_id__in=type_ids)
-            .values_list('pre_deliverable_type_id', flat=True)
-        )
-
-        # Batch-resolve effective settings
-        # 1) Project-specific overrides
-        proj_map = ProjectPreDeliverableSettings.get_project_settings(deliverable.project)
-        # 2) Global defaults for all types
-        glob_qs = PreDeliverableGlobalSettings.objects.filter(pre_deliverable_type_id__in=type_ids)
-        glob_map = {g.pre_deliverable_type_id: g for g in glob_qs}
+    @staticmethod
+    @transaction.atomic
+    def generate_for_deliverables(deliverables, *, planner: Optional[PreDeliverableBatchPlanner] = None) -> List[PreDeliverableItem]:
+        """Batch form of ``generate_pre_deliverables``: create missing items for many deliverables.
 
+        One existing-items query and one ``bulk_create`` per chunk.
+        """
+        deliverables = [d for d in deliverables if d is not None and d.date is not None]
+        if not deliverables:
+            return []
+        planner = planner or PreDeliverableBatchPlanner(project_ids={d.project_id for d in deliverables})
+        if not planner.types:
+            return []
+        type_ids = [t.id for t in planner.types]
         created: List[PreDeliverableItem] = []
-        for t in types:
-            # Resolve effective settings without extra queries per type
-            if t.id in proj_map:
-                eff_days = int(proj_map[t.id]['days_before'])
-                eff_enabled = bool(proj_map[t.id]['is_enabled'])
-            elif t.id in glob_map:
-                g = glob_map[t.id]
-                eff_days = int(getattr(g, 'default_days_before') or 0)
-                eff_enabled = bool(getattr(g, 'is_enabled_by_default', True))
-            else:
-                eff_days = int(getattr(t, 'default_days_before') or 0)
-                eff_enabled = bool(getattr(t, 'is_active', True))
-
-            if not eff_enabled:
-                continue
-            if t.id in existing_type_ids:
-                continue
-
-            gen_date = working_days_before(deliverable.date, eff_days)
-            item = PreDeliverableItem.objects.create(
-                deliverable=deliverable,
-                pre_deliverable_type=t,
-                generated_date=gen_date,
-                days_before=eff_days,
+        for chunk in _chunks(deliverables):
+            existing = set(
+                PreDeliverableItem.objects
+                .filter(deliverable_id__in=[d.id for d in chunk], pre_deliverable_type_id__in=type_ids)
+                .values_list('deliverable_id', 'pre_deliverable_type_id')
             )
-            created.append(item)
+            items = planner.build_items(chunk, skip=existing)
+            if items:
+                created.extend(PreDeliverableItem.objects.bulk_create(items, batch_size=BATCH_CHUNK_SIZE))
         return created
 
     @staticmethod
@@ -101,14 +167,21 @@ class PreDeliverableService:
         if new_date is None:
             deleted, _ = qs.delete()
             return int(deleted)
-        updated = 0
+        changed = []
         for item in qs:
             nd = working_days_before(new_date, int(item.days_before or 0))
             if item.generated_date != nd:
                 item.generated_date = nd
-                item.save(update_fields=['generated_date', 'updated_at'])
-                updated += 1
-        return updated
+                changed.append(item)
+        if changed:
+            # bulk_update bypasses auto_now, so stamp updated_at explicitly.
+            from django.utils import timezone
+
+            now = timezone.now()
+            for item in changed:
+                item.updated_at = now
+            PreDeliverableItem.objects.bulk_update(changed, ['generated_date', 'updated_at'], batch_size=BATCH_CHUNK_SIZE)
+        return len(changed)
 
     @staticmethod
     @transaction.atomic
@@ -125,20 +198,87 @@ class PreDeliverableService:
 
         Attempts to preserve completion flags when the type matches.
         """
-        # Lock current items for this deliverable to avoid concurrent races
-        items_qs = PreDeliverableItem.objects.select_for_update().filter(deliverable=deliverable)
-        prev = {it.pre_deliverable_type_id: (it.is_completed, it.completed_date) for it in items_qs}
-        deleted = PreDeliverableService.delete_pre_deliverables(deliverable)
-        created = PreDeliverableService.generate_pre_deliverables(deliverable)
-        preserved = 0
-        for it in created:
-            prev_state = prev.get(it.pre_deliverable_type_id)
-            if prev_state and prev_state[0]:
-                it.is_completed = True
-                it.completed_date = prev_state[1]
-                it.save(update_fields=['is_completed', 'completed_date', 'updated_at'])
-                preserved += 1
-        return RegenerateSummary(created=len(created), deleted=deleted, preserved_completed=preserved)
+        return PreDeliverableService.regenerate_for_deliverables([deliverable])
+
+    @staticmethod
+    @transaction.atomic
+    def regenerate_for_deliverables(deliverables, *, type_ids=None, planner: Optional[PreDeliverableBatchPlanner] = None) -> RegenerateSummary:
+        """Batch form of ``regenerate_pre_deliverables``.
+
+        With ``type_ids`` only items of those types are replaced (used when a
+        single type's global settings change). Completion flags carry over
+        per (deliverable, type); rows are locked, deleted and re-created with
+        one query each per chunk.
+        """
+        deliverables = [d for d in deliverables if d is not None]
+        if not deliverables:
+            return RegenerateSummary(created=0, deleted=0, preserved_completed=0)
+        planner = planner or PreDeliverableBatchPlanner(
+            project_ids={d.project_id for d in deliverables},
+            type_ids=type_ids,
+        )
+        created = deleted = preserved = 0
+        for chunk in _chunks(deliverables):
+            # Lock current items for these deliverables to avoid concurrent races
+            items_qs = PreDeliverableItem.objects.select_for_update().filter(deliverable_id__in=[d.id for d in chunk])
+            if type_ids is not None:
+                items_qs = items_qs.filter(pre_deliverable_type_id__in=list(type_ids))
+            completed = {
+                (deliverable_id, type_id): completed_date
+                for deliverable_id, type_id, is_completed, completed_date in items_qs.values_list(
+                    'deliverable_id', 'pre_deliverable_type_id', 'is_completed', 'completed_date'
+                )
+                if is_completed
+            }
+            deleted += int(items_qs.delete()[0])
+            items = planner.build_items(chunk, completed=completed)
+            if items:
+                PreDeliverableItem.objects.bulk_create(items, batch_size=BATCH_CHUNK_SIZE)
+            created += len(items)
+            preserved += sum(1 for it in items if it.is_completed)
+        return RegenerateSummary(created=created, deleted=deleted, preserved_completed=preserved)
+
+    @staticmethod
+    def backfill(deliverables_qs, *, regenerate: bool = False, chunk_size: int = BATCH_CHUNK_SIZE, on_progress=None) -> Dict[str, int]:
+        """Generate (or regenerate) items for every dated deliverable in ``deliverables_qs``.
+
+        Streams deliverables in id order, one chunk at a time, sharing a
+        single settings planner. ``on_progress(processed, total)`` is called
+        after each chunk.
+        """
+        qs = deliverables_qs.exclude(date__isnull=True).only('id', 'project_id', 'date').order_by('id')
+        total = qs.count()
+        planner = PreDeliverableBatchPlanner(project_ids=None)
+        out = {'processed': 0, 'created': 0, 'deleted': 0, 'preservedCompleted': 0}
+        last_id = 0
+        while True:
+            chunk = list(qs.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            try:
+                PreDeliverableService._backfill_chunk(chunk, planner, regenerate, out)
+            except Exception:
+                # Retry one by one so a single bad deliverable doesn't sink the chunk.
+                for d in chunk:
+                    try:
+                        PreDeliverableService._backfill_chunk([d], planner, regenerate, out)
+                    except Exception:  # nosec B112
+                        continue
+            out['processed'] += len(chunk)
+            if on_progress is not None:
+                on_progress(out['processed'], total)
+        return out
+
+    @staticmethod
+    def _backfill_chunk(chunk, planner: PreDeliverableBatchPlanner, regenerate: bool, out: Dict[str, int]) -> None:
+        if regenerate:
+            summary = PreDeliverableService.regenerate_for_deliverables(chunk, planner=planner)
+            out['created'] += summary.created
+            out['deleted'] += summary.deleted
+            out['preservedCompleted'] += summary.preserved_completed
+        else:
+            out['created'] += len(PreDeliverableService.generate_for_deliverables(chunk, planner=planner))
 
     @staticmethod
     def get_upcoming_for_user(user, days_ahead: int = 14):
@@ -69,16 +69,16 @@ def handle_project_settings_change(sender, instance: ProjectPreDeliverableSettin
     """Regenerate pre-deliverables for affected project's future deliverables."""
     def _do():
         future = instance.project.deliverables.filter(date__gte=timezone.now().date())
-        for d in future.select_related('project'):
-            PreDeliverableService.regenerate_pre_deliverables(d)
+        PreDeliverableService.regenerate_for_deliverables(future.only('id', 'project_id', 'date'))
     transaction.on_commit(_do)
 
 
 @receiver(post_save, sender=PreDeliverableGlobalSettings)
 def handle_global_settings_change(sender, instance: PreDeliverableGlobalSettings, created, **kwargs):
-    """Regenerate deliverables for projects without custom settings for this type.
+    """Regenerate this type's items for projects without custom settings for it.
 
-    Note: Kept simple (no Celery) and limited scope to future-dated deliverables.
+    Note: Kept simple (no Celery) and limited scope to future-dated deliverables;
+    only items of the changed type are replaced, in batches.
     """
     def _do():
         from projects.models import ProjectPreDeliverableSettings
@@ -90,6 +90,8 @@ def handle_global_settings_change(sender, instance: PreDeliverableGlobalSettings
         affected = Deliverable.objects.filter(
             date__gte=timezone.now().date(),
         ).exclude(project_id__in=proj_ids_with_custom)
-        for d in affected.select_related('project'):
-            PreDeliverableService.regenerate_pre_deliverables(d)
+        PreDeliverableService.regenerate_for_deliverables(
+            affected.only('id', 'project_id', 'date'),
+            type_ids=[instance.pre_deliverable_type_id],
+        )
     transaction.on_commit(_do)
@@ -47,3 +47,56 @@ class PreDeliverableServiceTests(TestCase):
         self.assertGreaterEqual(summary.created, 1)
         self.assertGreaterEqual(summary.deleted, 1)
         self.assertGreaterEqual(summary.preserved_completed, 1)
+
+
+class PreDeliverableBatchTests(TestCase):
+    def setUp(self):
+        self.type_a, _ = PreDeliverableType.objects.get_or_create(name="Batch Specs", defaults={"default_days_before": 2})
+        self.type_b, _ = PreDeliverableType.objects.get_or_create(name="Batch Models", defaults={"default_days_before": 5})
+        self.projects = [Project.objects.create(name=f"Batch Proj {i}") for i in range(3)]
+        from projects.models import ProjectPreDeliverableSettings
+        ProjectPreDeliverableSettings.objects.create(project=self.projects[0], pre_deliverable_type=self.type_a, days_before=7, is_enabled=True)
+        ProjectPreDeliverableSettings.objects.create(project=self.projects[1], pre_deliverable_type=self.type_b, days_before=1, is_enabled=False)
+        self.delivs = [
+            Deliverable.objects.create(project=p, description=f"D{i}", date=date(2025, 3, 10) + timedelta(days=i))
+            for i, p in enumerate(self.projects * 4)
+        ]
+        PreDeliverableItem.objects.all().delete()
+
+    def _snapshot(self):
+        return sorted(
+            PreDeliverableItem.objects.values_list('deliverable_id', 'pre_deliverable_type_id', 'generated_date', 'days_before')
+        )
+
+    def test_batch_generate_matches_per_deliverable_generation(self):
+        for d in self.delivs:
+            PreDeliverableService.generate_pre_deliverables(d)
+        expected = self._snapshot()
+        PreDeliverableItem.objects.all().delete()
+
+        created = PreDeliverableService.generate_for_deliverables(self.delivs)
+        self.assertEqual(len(created), len(expected))
+        self.assertEqual(self._snapshot(), expected)
+        self.assertEqual(PreDeliverableService.generate_for_deliverables(self.delivs), [])
+
+    def test_backfill_query_count_is_independent_of_deliverable_count(self):
+        with self.assertNumQueries(10):
+            summary = PreDeliverableService.backfill(Deliverable.objects.filter(id__in=[d.id for d in self.delivs]))
+        self.assertEqual(summary['processed'], len(self.delivs))
+        self.assertEqual(summary['created'], PreDeliverableItem.objects.count())
+
+    def test_type_scoped_regeneration_preserves_completion_and_other_types(self):
+        PreDeliverableService.generate_for_deliverables(self.delivs)
+        target = PreDeliverableItem.objects.filter(pre_deliverable_type=self.type_a).first()
+        target.is_completed = True
+        target.completed_date = date(2025, 3, 1)
+        target.save()
+        other_ids = set(PreDeliverableItem.objects.filter(pre_deliverable_type=self.type_b).values_list('id', flat=True))
+
+        summary = PreDeliverableService.regenerate_for_deliverables(self.delivs, type_ids=[self.type_a.id])
+
+        self.assertEqual(summary.preserved_completed, 1)
+        self.assertEqual(set(PreDeliverableItem.objects.filter(pre_deliverable_type=self.type_b).values_list('id', flat=True)), other_ids)
+        regenerated = PreDeliverableItem.objects.get(deliverable_id=target.deliverable_id, pre_deliverable_type=self.type_a)
+        self.assertTrue(regenerated.is_completed)
+        self.assertEqual(regenerated.completed_date, date(2025, 3, 1))
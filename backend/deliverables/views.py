@@ -27,6 +27,7 @@ from .serializers import (
     PreDeliverableItemSerializer,
 )
 from assignments.models import Assignment
+from assignments.rollup_service import rollup_state_for
 from accounts.models import UserProfile
 from assignments.lead_utils import is_lead_role_name, resolve_assignment_role_name
 from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer
@@ -38,7 +39,7 @@ from datetime import timedelta, date as _date
 from core.week_utils import sunday_of_week
 from .models import PreDeliverableItem
 from .services import PreDeliverableService
-from accounts.permissions import is_admin_or_manager, IsAdminOrManager
+from accounts.permissions import get_user_person_id, is_admin_or_manager, IsAdminOrManager
 from core.job_access import JobAccessRegistrationError, enqueue_user_facing_task
 from projects.change_log import record_project_change
 from core.webpush import (
@@ -278,13 +279,15 @@ class DeliverableViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 new_values = self._deliverable_log_fields(instance)
                 changes = self._deliverable_log_changes(old_values, new_values)
                 audit_snapshot = {}
-                for a in assignments.select_for_update():
+                previous_rollup_states = {}
+                for a in assignments.select_related('person').select_for_update(of=('self',)):
                     wh_before = dict(a.weekly_hours or {})
                     if not wh_before:
                         continue
                     wh_after = reallocate_weekly_hours(wh_before, old_date, new_date, window=(win_start, win_end))
                     if wh_after != wh_before:
                         changed_count += 1
+                        previous_rollup_states[a.id] = rollup_state_for(a)
                         a.weekly_hours = wh_after
                         changed_objs.append(a)
                         # Collect touched keys where values changed or moved
@@ -308,6 +311,16 @@ class DeliverableViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 if changed_objs:
                     # Bulk update weekly_hours
                     Assignment.objects.bulk_update(changed_objs, ['weekly_hours'])
+                    try:
+                        from assignments.week_hours_service import bulk_sync_assignment_week_hours
+                        bulk_sync_assignment_week_hours(changed_objs)
+                    except Exception:  # nosec B110
+                        pass
+                    try:
+                        from assignments.signals import invalidate_for_bulk_hours_update
+                        invalidate_for_bulk_hours_update(changed_objs, previous_rollup_states)
+                    except Exception:  # nosec B110
+                        pass
 
                 # Persist audit snapshot for observability and optional undo
                 try:
@@ -761,8 +774,7 @@ class DeliverableViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         if mine_only:
             from assignments.models import Assignment as _ProjAssign
             from deliverables.models import DeliverableAssignment as _DelAssign
-            _prof = getattr(request.user, 'profile', None)
-            _pid = getattr(_prof, 'person_id', None)
+            _pid = get_user_person_id(request.user)
             if _pid:
                 _project_ids_subq = _ProjAssign.objects.filter(
                     is_active=True, person_id=_pid
@@ -1285,16 +1297,5 @@ class PreDeliverableItemViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             d2 = parse_date(str(end))
             if d2:
                 dqs = dqs.filter(date__lte=d2)
-        total = dqs.count()
-        created = 0
-        deleted = 0
-        preserved = 0
-        for d in dqs.iterator():
-            if regenerate:
-                s = PreDeliverableService.regenerate_pre_deliverables(d)
-                created += int(s.created)
-                deleted += int(s.deleted)
-                preserved += int(s.preserved_completed)
-            else:
-                created += len(PreDeliverableService.generate_pre_deliverables(d))
-        return Response({'enqueued': False, 'result': {'processed': total, 'created': created, 'deleted': deleted, 'preservedCompleted': preserved}})
+        result = PreDeliverableService.backfill(dqs, regenerate=bool(regenerate))
+        return Response({'enqueued': False, 'result': result})
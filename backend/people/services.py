@@ -10,12 +10,22 @@ logger = logging.getLogger('cache_performance')
 
 class CapacityAnalysisService:
     @staticmethod
-    def get_capacity_heatmap(people_queryset, weeks: int = 12, cache_scope: str = "all") -> List[Dict]:
+    def get_capacity_heatmap(
+        people_queryset,
+        weeks: int = 12,
+        cache_scope: str = "all",
+        assignments_qs=None,
+    ) -> List[Dict]:
         """Compute per-person utilization summaries over N weeks.
 
         Expects people_queryset to be filtered (e.g., active only) and may include
-        select_related('department') to avoid N+1.
+        select_related('department') to avoid N+1. Hours come from
+        ``assignments_qs`` (active assignments by default) in one grouped read.
         """
+        from assignments.models import Assignment
+        from assignments.read_queries import week_hours_by_person
+        from core.week_utils import sunday_of_week
+
         try:
             version = cache.get('analytics_cache_version', 1)
         except Exception:
@@ -31,25 +41,40 @@ class CapacityAnalysisService:
             return cached
         logger.info("Cache MISS: %s", key, extra={'cache_hit': False})
 
-        people = list(people_queryset)
         today = date.today()
+        weeks = int(weeks or 1)
+        start_sunday = sunday_of_week(today)
+        week_dates = [start_sunday + timedelta(weeks=w) for w in range(weeks)]
+        week_keys = [wk.strftime('%Y-%m-%d') for wk in week_dates]
+
+        people = [p for p in people_queryset if is_hired_on_date(getattr(p, "hire_date", None), today)]
+        if assignments_qs is None:
+            assignments_qs = Assignment.objects.filter(is_active=True)
+        hours_by_person = week_hours_by_person(
+            assignments_qs.filter(person_id__in=[p.id for p in people]),
+            week_dates,
+        ) if people else {}
+
         result: List[Dict] = []
         for p in people:
-            if not is_hired_on_date(getattr(p, "hire_date", None), today):
-                continue
-            util = p.get_utilization_over_weeks_sunday(weeks=weeks)
+            cap = float(p.weekly_capacity or 0)
+            by_week = hours_by_person.get(p.id, {})
+            week_totals = {wk: by_week.get(wk_date, 0.0) for wk_date, wk in zip(week_dates, week_keys)}
+            average_hours = sum(week_totals.values()) / weeks
+            peak_hours = max(week_totals.values())
+            peak_week_key = next((wk for wk, v in week_totals.items() if v == peak_hours), None) if peak_hours > 0 else None
             result.append({
                 'id': p.id,
                 'name': p.name,
                 'weeklyCapacity': p.weekly_capacity,
                 'department': p.department.name if getattr(p, 'department', None) else None,
-                'weekKeys': util.get('week_keys', []),
-                'weekTotals': util.get('week_totals', {}),
+                'weekKeys': week_keys,
+                'weekTotals': {wk: round(v, 1) for wk, v in week_totals.items()},
                 'peak': {
-                    'weekKey': util.get('peak_week_key'),
-                    'percentage': util.get('peak_percentage'),
+                    'weekKey': peak_week_key,
+                    'percentage': round(round(peak_hours / cap * 100, 2), 1) if cap > 0 else 0,
                 },
-                'averagePercentage': util.get('total_percentage'),
+                'averagePercentage': round(average_hours / cap * 100, 1) if cap > 0 else 0,
             })
         try:
             cache.set(key, result, timeout=300)
@@ -58,25 +83,26 @@ class CapacityAnalysisService:
         return result
 
     @staticmethod
-    def get_workload_forecast(people_queryset, weeks: int = 8, cache_scope: str = "all") -> List[Dict]:
+    def get_workload_forecast(
+        people_queryset,
+        weeks: int = 8,
+        cache_scope: str = "all",
+        assignments_qs=None,
+    ) -> List[Dict]:
         """Aggregate team capacity vs allocated for N weeks ahead.
 
-        The queryset should prefetch active assignments to avoid N+1 at call site.
+        Allocated hours come from ``assignments_qs`` (active assignments by
+        default), summed per person in one pass through the hours read layer.
         """
+        from assignments.models import Assignment
+        from assignments.read_queries import week_hours_by_person
+
         # Sunday-only week starts
         from core.week_utils import sunday_of_week
         today = date.today()
         start_sunday = sunday_of_week(today)
         week_starts = [start_sunday + timedelta(weeks=w) for w in range(weeks)]
 
-        def hours_for_week(assignment, sunday_date: date) -> float:
-            wh = assignment.weekly_hours or {}
-            key = sunday_date.strftime('%Y-%m-%d')
-            try:
-                return float(wh.get(key) or 0)
-            except Exception:
-                return 0.0
-
         try:
             version = cache.get('analytics_cache_version', 1)
         except Exception:
@@ -93,6 +119,12 @@ class CapacityAnalysisService:
         logger.info("Cache MISS: %s", key, extra={'cache_hit': False})
 
         people = list(people_queryset)
+        if assignments_qs is None:
+            assignments_qs = Assignment.objects.filter(is_active=True)
+        hours_by_person = week_hours_by_person(
+            assignments_qs.filter(person_id__in=[p.id for p in people]),
+            week_starts,
+        ) if people else {}
         forecast: List[Dict] = []
         for week_start in week_starts:
             total_capacity_per_week = 0.0
@@ -103,9 +135,7 @@ class CapacityAnalysisService:
                     continue
                 cap = float(p.weekly_capacity or 0)
                 total_capacity_per_week += cap
-                person_alloc = 0.0
-                for a in getattr(p, 'assignments').all():
-                    person_alloc += hours_for_week(a, week_start)
+                person_alloc = hours_by_person.get(p.id, {}).get(week_start, 0.0)
                 total_allocated += person_alloc
                 if person_alloc > cap:
                     overallocated.append({'id': p.id, 'name': p.name})
@@ -26,7 +26,9 @@ def _bump_analytics_cache_version():
 def invalidate_on_person_change(sender, instance, **kwargs):
     _bump_analytics_cache_version()
     try:
-        bump_snapshot_scopes(department_ids=[instance.department_id] if getattr(instance, 'department_id', None) else [])
+        # Bump the department the person left as well, so its change sequence moves.
+        department_ids = [getattr(instance, 'department_id', None), getattr(instance, '_previous_department_id', None)]
+        bump_snapshot_scopes(department_ids=[d for d in department_ids if d])
     except Exception:
         pass
 
@@ -51,22 +53,26 @@ def capture_person_name(sender, instance: Person, **kwargs):
     if not instance.pk:
         instance._previous_name = None
         instance._previous_is_active = None
+        instance._previous_role_id = None
         return
     try:
         row = (
             Person.objects.filter(pk=instance.pk)
-            .values_list('name', 'is_active')
+            .values_list('name', 'is_active', 'role_id')
             .first()
         )
         if row:
             instance._previous_name = row[0]
             instance._previous_is_active = row[1]
+            instance._previous_role_id = row[2]
         else:
             instance._previous_name = None
             instance._previous_is_active = None
+            instance._previous_role_id = None
     except Exception:  # nosec B110
         instance._previous_name = None
         instance._previous_is_active = None
+        instance._previous_role_id = None
 
 
 @receiver(post_save, sender=Person)
@@ -107,11 +113,18 @@ def refresh_assigned_names_on_name_change(sender, instance: Person, **kwargs):
 
 
 @receiver(post_save, sender=Person)
-def sync_overhead_assignments_on_person_save(sender, instance: Person, **kwargs):
+def sync_overhead_assignments_on_person_save(sender, instance: Person, created: bool = False, **kwargs):
     if not getattr(instance, 'is_active', True):
         return
+    # Only new hires, reactivations and role/department moves can change overhead rows.
+    if not created and (
+        getattr(instance, '_previous_is_active', None) is True
+        and getattr(instance, '_previous_role_id', None) == instance.role_id
+        and getattr(instance, '_previous_department_id', None) == instance.department_id
+    ):
+        return
     try:
-        from assignments.overhead import sync_overhead_assignments_for_people
+        from assignments.overhead import queue_overhead_sync
     except Exception:  # nosec B110
         return
-    transaction.on_commit(lambda: sync_overhead_assignments_for_people([instance.id]))
+    transaction.on_commit(lambda: queue_overhead_sync(person_ids=[instance.id]))
@@ -11,6 +11,7 @@ from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.db.models import Q
 
+from core.job_progress import report_progress
 from .models import Person
 from .services import deactivate_person_cleanup
 from .utils.excel_handler import export_people_to_excel, import_people_from_excel
@@ -27,7 +28,7 @@ def export_people_excel_task(self, filters: Dict[str, Any] | None = None) -> Dic
 
     Returns a descriptor dict with storage path to be downloaded later.
     """
-    self.update_state(state='STARTED', meta={'progress': 5, 'message': 'Preparing export'})
+    report_progress(self, 'STARTED', 5, 'Preparing export')
     qs = (
         Person.objects
         .filter(is_active=True)
@@ -46,12 +47,12 @@ def export_people_excel_task(self, filters: Dict[str, Any] | None = None) -> Dic
     if department:
         qs = qs.filter(department__name__icontains=department)
 
-    self.update_state(state='PROGRESS', meta={'progress': 40, 'message': 'Generating Excel content'})
+    report_progress(self, 'PROGRESS', 40, 'Generating Excel content')
     # Reuse existing export utility to get an HttpResponse, then persist bytes
     response = export_people_to_excel(qs)
     content = response.content
 
-    self.update_state(state='PROGRESS', meta={'progress': 80, 'message': 'Saving export file'})
+    report_progress(self, 'PROGRESS', 80, 'Saving export file')
     fname = _export_filename()
     storage_key = os.path.join('exports', 'people', fname)
     default_storage.save(storage_key, ContentFile(content))
@@ -62,7 +63,7 @@ def export_people_excel_task(self, filters: Dict[str, Any] | None = None) -> Dic
         'filename': fname,
         'content_type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
     }
-    self.update_state(state='PROGRESS', meta={'progress': 95, 'message': 'Finalizing'})
+    report_progress(self, 'PROGRESS', 95, 'Finalizing')
     return meta
 
 
@@ -72,7 +73,7 @@ def import_people_excel_task(self, storage_path: str, update_existing: bool = Tr
 
     Supports either a default_storage key or an absolute filesystem path.
     """
-    self.update_state(state='STARTED', meta={'progress': 5, 'message': 'Starting import'})
+    report_progress(self, 'STARTED', 5, 'Starting import')
     try:
         # If an absolute path exists on disk, open directly; otherwise use default_storage
         if os.path.isabs(storage_path) and os.path.exists(storage_path):
@@ -82,7 +83,7 @@ def import_people_excel_task(self, storage_path: str, update_existing: bool = Tr
             fh = default_storage.open(storage_path, 'rb')
             close_fh = True
         try:
-            self.update_state(state='PROGRESS', meta={'progress': 30, 'message': 'Processing file'})
+            report_progress(self, 'PROGRESS', 30, 'Processing file')
             results = import_people_from_excel(fh, update_existing=update_existing, dry_run=dry_run)
         finally:
             if close_fh:
@@ -102,7 +103,7 @@ def import_people_excel_task(self, storage_path: str, update_existing: bool = Tr
             'error_count': errors,
             'details': results,
         }
-        self.update_state(state='PROGRESS', meta={'progress': 95, 'message': 'Import complete'})
+        report_progress(self, 'PROGRESS', 95, 'Import complete')
         return meta
     except Exception as e:
         # Let Celery mark as FAILURE with exception; also include meta for clients
@@ -112,7 +113,7 @@ def import_people_excel_task(self, storage_path: str, update_existing: bool = Tr
 @shared_task(bind=True)
 def deactivate_person_cleanup_task(self, person_id: int, zero_mode: str = 'all', actor_user_id: int | None = None) -> Dict[str, Any]:
     """Celery wrapper for deactivation cleanup; safe to run multiple times."""
-    self.update_state(state='STARTED', meta={'progress': 5, 'message': 'Deactivating assignments'})
+    report_progress(self, 'STARTED', 5, 'Deactivating assignments')
     result = deactivate_person_cleanup(person_id=person_id, zero_mode=zero_mode, actor_user_id=actor_user_id)
-    self.update_state(state='PROGRESS', meta={'progress': 95, 'message': 'Finalizing'})
+    report_progress(self, 'PROGRESS', 95, 'Finalizing')
     return result
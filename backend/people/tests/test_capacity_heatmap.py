@@ -1,3 +1,4 @@
+import json
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
@@ -121,3 +122,16 @@ class CapacityHeatmapApiTests(TestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         names = {item['name'] for item in resp.json()}
         self.assertNotIn('Future Hire', names)
+
+    def test_capacity_heatmap_columnar_format(self):
+        resp = self.client.get('/api/people/capacity_heatmap/?weeks=2&format=columnar')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        data = json.loads(resp.content)
+        self.assertEqual(data['format'], 'columnar')
+        self.assertEqual(len(data['weekKeys']), 2)
+        rows = dict(zip(data['people']['name'], data['hours']['values']))
+        self.assertEqual(rows['Alice'], [10.0, 20.0])
+        self.assertEqual(rows['Bob'], [5.0, 0.0])
+        json_resp = self.client.get('/api/people/capacity_heatmap/?weeks=2')
+        for response in (resp, json_resp):
+            self.assertIn('Accept', [part.strip() for part in response['Vary'].split(',')])
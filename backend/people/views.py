@@ -11,10 +11,12 @@ from django.db.models import Sum, Max, Prefetch, Value, Count
 from django.conf import settings
 from django.core.cache import cache
 from django.http import HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
 from django.utils.http import http_date
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from .models import Person
+from core.aggregate_cache import aggregate_cache
 from core.etag import ETagConditionalMixin
 from departments.models import Department
 from .serializers import (
@@ -35,6 +37,8 @@ import logging
 from datetime import datetime, timedelta, date
 import os
 from assignments.models import Assignment
+from assignments.read_queries import week_hours_by_person
+from core.week_utils import sunday_of_week
 from django.db.models import Q
 from django.db.models.functions import Coalesce, Lower
 from core.search_tokens import parse_search_tokens, apply_token_filter
@@ -49,6 +53,14 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serial
 from rest_framework import serializers
 from skills.models import PersonSkill, SkillTag
 from core.vertical_scope import get_request_enforced_vertical_id
+from core.cursors import KeysetPage, cursor_page_url, paginate_keyset, requested_cursor
+from core.columnar import (
+    capacity_heatmap_to_columnar,
+    columnar_etag,
+    columnar_renderer_classes,
+    columnar_response,
+    wants_columnar,
+)
 try:
     from core.tasks import bulk_skill_matching_async  # type: ignore
 except Exception:
@@ -391,7 +403,7 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         return response
 
     def _paginate_post_queryset(self, request, queryset, data=None):
-        """Paginate using body-provided page/page_size for POST search endpoints."""
+        """Paginate using body-provided page/page_size (or cursor) for POST search endpoints."""
         from django.core.paginator import Paginator
         from rest_framework.settings import api_settings
 
@@ -410,6 +422,17 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         if page_size <= 0:
             page_size = api_settings.PAGE_SIZE or 100
 
+        # Opt-in keyset mode: O(page size) per page, count carried in the cursor.
+        cursor_mode, cursor_token = requested_cursor(request, payload)
+        if cursor_mode:
+            page = paginate_keyset(queryset, cursor_token, page_size)
+            return (
+                page,
+                page,
+                cursor_page_url(request, page.next_cursor, page_size),
+                cursor_page_url(request, page.previous_cursor, page_size),
+            )
+
         paginator = Paginator(queryset, page_size)
         page_obj = paginator.get_page(page_number)
 
@@ -437,6 +460,7 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             fields={
                 'page': serializers.IntegerField(required=False),
                 'page_size': serializers.IntegerField(required=False),
+                'cursor': serializers.CharField(required=False, allow_null=True, allow_blank=True),
                 'department': serializers.IntegerField(required=False),
                 'include_children': serializers.IntegerField(required=False),
                 'department_filters': serializers.ListField(
@@ -471,6 +495,8 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 'count': serializers.IntegerField(),
                 'next': serializers.CharField(allow_null=True, required=False),
                 'previous': serializers.CharField(allow_null=True, required=False),
+                'nextCursor': serializers.CharField(allow_null=True, required=False),
+                'previousCursor': serializers.CharField(allow_null=True, required=False),
                 'results': PersonSerializer(many=True),
             }
         )
@@ -605,12 +631,16 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         page_obj, paginator, next_url, prev_url = self._paginate_post_queryset(request, queryset, data)
         serializer = self.get_serializer(page_obj.object_list, many=True)
 
-        response = Response({
+        response_payload = {
             'count': paginator.count,
             'next': next_url,
             'previous': prev_url,
             'results': serializer.data,
-        })
+        }
+        if isinstance(page_obj, KeysetPage):
+            response_payload['nextCursor'] = page_obj.next_cursor
+            response_payload['previousCursor'] = page_obj.previous_cursor
+        response = Response(response_payload)
         try:
             logging.getLogger('performance').info(
                 'endpoint_timing %s',
@@ -1085,8 +1115,7 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 asn_qs = asn_qs.filter(project__vertical_id=int(vertical_param))
             except Exception:
                 pass
-        asn_qs = asn_qs.only('weekly_hours', 'person_id')
-        people_qs = people_qs.prefetch_related(Prefetch('skills', queryset=skill_qs), Prefetch('assignments', queryset=asn_qs))
+        people_qs = people_qs.prefetch_related(Prefetch('skills', queryset=skill_qs))
 
         try:
             version = cache.get('analytics_cache_version', 1)
@@ -1117,53 +1146,13 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 resp['Last-Modified'] = http_date(last_modified.timestamp())
             return resp
 
-        payload = None
-        try:
-            payload = cache.get(cache_key)
-        except Exception:
-            payload = None
-        if payload is None:
-            lock_key = f"lock:{cache_key}"
-            got_lock = False
-            try:
-                got_lock = cache.add(lock_key, '1', timeout=10)
-            except Exception:
-                got_lock = True
-            if not got_lock:
-                t0 = time.time()
-                while time.time() - t0 < 2.0:
-                    try:
-                        payload = cache.get(cache_key)
-                        if payload is not None:
-                            break
-                    except Exception:  # nosec B110
-                        pass
-                    time.sleep(0.05)
-        if payload is None:
-            wk_key = week_monday.strftime('%Y-%m-%d')
+        def _build_payload():
+            week = sunday_of_week(week_monday)
+            allocated_by_person = week_hours_by_person(asn_qs, [week])
             results = []
             for p in people_qs:
                 cap = float(p.weekly_capacity or 0)
-                allocated = 0.0
-                for a in getattr(p, 'assignments').all():
-                    wh = a.weekly_hours or {}
-                    val = 0.0
-                    if wk_key in wh:
-                        try:
-                            val = float(wh[wk_key] or 0)
-                        except (TypeError, ValueError):
-                            val = 0.0
-                    else:
-                        for off in range(-3, 4):
-                            d2 = week_monday + _td(days=off)
-                            k2 = d2.strftime('%Y-%m-%d')
-                            if k2 in wh:
-                                try:
-                                    val = float(wh[k2] or 0)
-                                except (TypeError, ValueError):
-                                    val = 0.0
-                                break
-                    allocated += val
+                allocated = allocated_by_person.get(p.id, {}).get(week, 0.0)
                 available = max(0.0, cap - allocated)
                 if available < min_available:
                     continue
@@ -1199,14 +1188,9 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             for r in results:
                 r.pop('_score', None)
             payload = results[:limit]
-            try:
-                cache.set(cache_key, payload, timeout=int(os.getenv('AGGREGATE_CACHE_TTL', '30')))
-            except Exception:  # nosec B110
-                pass
-            try:
-                cache.delete(lock_key)
-            except Exception:  # nosec B110
-                pass
+            return payload
+
+        payload = aggregate_cache.get_or_build(cache_key, _build_payload, ttl=int(os.getenv('AGGREGATE_CACHE_TTL', '30'))).value
 
         response = Response(payload)
         response['ETag'] = f'"{etag}"'
@@ -1320,7 +1304,7 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             except Exception:  # nosec B110
                 pass
 
-        # Prefetch skills and assignments (if week provided)
+        # Prefetch skills; hours come from the read layer (if week provided)
         skill_qs = PersonSkill.objects.select_related('skill_tag')
         prefetches = [Prefetch('skills', queryset=skill_qs)]
         if week_monday is not None:
@@ -1330,8 +1314,6 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                     asn_qs = asn_qs.filter(project__vertical_id=int(vertical_param))
                 except Exception:
                     pass
-            asn_qs = asn_qs.only('weekly_hours', 'person_id')
-            prefetches.append(Prefetch('assignments', queryset=asn_qs))
         people_qs = people_qs.prefetch_related(*prefetches)
 
         # Cache & ETag computation
@@ -1379,93 +1361,53 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             except Exception:  # nosec B110
                 pass
 
-        payload = None
-        try:
-            payload = cache.get(cache_key)
-        except Exception:
-            payload = None
-        if payload is None:
-            lock_key = f"lock:{cache_key}"
-            got_lock = False
-            try:
-                got_lock = cache.add(lock_key, '1', timeout=10)
-            except Exception:
-                got_lock = True
-            if not got_lock:
-                t0 = time.time()
-                while time.time() - t0 < 2.0:
-                    try:
-                        payload = cache.get(cache_key)
-                        if payload is not None:
-                            break
-                    except Exception:  # nosec B110
-                        pass
-                    time.sleep(0.05)
-            if payload is None:
-                # Compute results
-                results = []
-                for p in people_qs:
-                    # person skill names (lowercase)
-                    skill_names = []
-                    for ps in getattr(p, 'skills').all():
-                        if ps.skill_tag and ps.skill_tag.name:
-                            skill_names.append(ps.skill_tag.name.lower())
-
-                    matched, missing = [], []
-                    for rs in req_skills:
-                        ok = any((rs in sn) or (sn in rs) for sn in skill_names)
-                        (matched if ok else missing).append(rs)
-
-                    base_score = (len(matched) / len(req_skills)) * 100.0 if req_skills else 0.0
-
-                    # Availability blend (70/30)
-                    if week_monday is not None:
-                        cap = float(p.weekly_capacity or 0)
-                        if cap > 0:
-                            wk_key = week_monday.strftime('%Y-%m-%d')
-                            allocated = 0.0
-                            for a in getattr(p, 'assignments').all():
-                                wh = a.weekly_hours or {}
-                                val = 0.0
-                                if wk_key in wh:
-                                    try:
-                                        val = float(wh[wk_key] or 0)
-                                    except (TypeError, ValueError):
-                                        val = 0.0
-                                else:
-                                    for off in range(-3, 4):
-                                        d = week_monday + _td(days=off)
-                                        k = d.strftime('%Y-%m-%d')
-                                        if k in wh:
-                                            try:
-                                                val = float(wh[k] or 0)
-                                            except (TypeError, ValueError):
-                                                val = 0.0
-                                            break
-                                allocated += val
-                            avail_pct = max(0.0, (cap - allocated) / cap * 100.0)
-                            base_score = 0.7 * base_score + 0.3 * avail_pct
-
-                    results.append({
-                        'personId': p.id,
-                        'name': p.name,
-                        'score': round(base_score, 1),
-                        'matchedSkills': matched,
-                        'missingSkills': missing,
-                        'departmentId': p.department_id,
-                        'roleName': getattr(p.role, 'name', None) if getattr(p, 'role', None) else None,
-                    })
-
-                results.sort(key=lambda x: (-x['score'], x['name']))
-                payload = results[:limit]
-                try:
-                    cache.set(cache_key, payload, timeout=int(os.getenv('AGGREGATE_CACHE_TTL', '30')))
-                except Exception:  # nosec B110
-                    pass
-            try:
-                cache.delete(lock_key)
-            except Exception:  # nosec B110
-                pass
+        def _build_payload():
+            allocated_by_person = {}
+            if week_monday is not None:
+                week = sunday_of_week(week_monday)
+                allocated_by_person = {
+                    pid: by_week.get(week, 0.0)
+                    for pid, by_week in week_hours_by_person(asn_qs, [week]).items()
+                }
+            # Compute results
+            results = []
+            for p in people_qs:
+                # person skill names (lowercase)
+                skill_names = []
+                for ps in getattr(p, 'skills').all():
+                    if ps.skill_tag and ps.skill_tag.name:
+                        skill_names.append(ps.skill_tag.name.lower())
+
+                matched, missing = [], []
+                for rs in req_skills:
+                    ok = any((rs in sn) or (sn in rs) for sn in skill_names)
+                    (matched if ok else missing).append(rs)
+
+                base_score = (len(matched) / len(req_skills)) * 100.0 if req_skills else 0.0
+
+                # Availability blend (70/30)
+                if week_monday is not None:
+                    cap = float(p.weekly_capacity or 0)
+                    if cap > 0:
+                        allocated = allocated_by_person.get(p.id, 0.0)
+                        avail_pct = max(0.0, (cap - allocated) / cap * 100.0)
+                        base_score = 0.7 * base_score + 0.3 * avail_pct
+
+                results.append({
+                    'personId': p.id,
+                    'name': p.name,
+                    'score': round(base_score, 1),
+                    'matchedSkills': matched,
+                    'missingSkills': missing,
+                    'departmentId': p.department_id,
+                    'roleName': getattr(p.role, 'name', None) if getattr(p, 'role', None) else None,
+                })
+
+            results.sort(key=lambda x: (-x['score'], x['name']))
+            payload = results[:limit]
+            return payload
+
+        payload = aggregate_cache.get_or_build(cache_key, _build_payload, ttl=int(os.getenv('AGGREGATE_CACHE_TTL', '30'))).value
 
         response = Response(payload)
         response['ETag'] = f'"{etag}"'
@@ -1691,10 +1633,16 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             OpenApiParameter(name='include_children', type=int, required=False, description='0|1'),
             OpenApiParameter(name='vertical', type=int, required=False, description='Filter by vertical id'),
             OpenApiParameter(name='visibility_scope', type=str, required=False, description='Visibility scope key for keyword-based project/client exclusion.'),
+            OpenApiParameter(name='format', type=str, required=False, description="'columnar' for the compact columnar representation (or Accept: application/vnd.workload.columnar+json)"),
         ],
         responses=PersonCapacityHeatmapItemSerializer(many=True)
     )
-    @action(detail=False, methods=['get'], throttle_classes=[HeatmapThrottle])
+    @action(
+        detail=False,
+        methods=['get'],
+        throttle_classes=[HeatmapThrottle],
+        renderer_classes=columnar_renderer_classes(),
+    )
     def capacity_heatmap(self, request):
         """Return per-person week summaries for the next N weeks (default 12)."""
         try:
@@ -1747,20 +1695,15 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 cache_scope = f"{cache_scope}_v{int(vertical_param)}"
             except Exception:  # nosec B110
                 pass
-        # Prefetch active assignments to avoid N+1 when computing utilization
-        try:
-            asn_qs = Assignment.objects.filter(is_active=True)
-            if vertical_param not in (None, ""):
-                try:
-                    asn_qs = asn_qs.filter(project__vertical_id=int(vertical_param))
-                except Exception:
-                    pass
-            if hidden_project_ids:
-                asn_qs = asn_qs.exclude(project_id__in=sorted(hidden_project_ids))
-            asn_qs = asn_qs.only('weekly_hours', 'person_id')
-            people = people.prefetch_related(Prefetch('assignments', queryset=asn_qs))
-        except Exception:  # nosec B110
-            pass
+        # Active assignments in scope; hours are summed in one grouped read
+        asn_qs = Assignment.objects.filter(is_active=True)
+        if vertical_param not in (None, ""):
+            try:
+                asn_qs = asn_qs.filter(project__vertical_id=int(vertical_param))
+            except Exception:  # nosec B110
+                pass
+        if hidden_project_ids:
+            asn_qs = asn_qs.exclude(project_id__in=sorted(hidden_project_ids))
         cache_scope = f"{cache_scope}:vs={visibility_scope}:vt={visibility_token}"
         # Build cache key and short-TTL caching (optional via feature flag)
         use_cache = bool(settings.FEATURES.get('SHORT_TTL_AGGREGATES'))
@@ -1788,6 +1731,9 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             active_count = 0
         etag_content = f"{weeks}-{cache_scope}-{active_count}-" + (last_modified.isoformat() if last_modified else 'none')
         etag = hashlib.sha256(etag_content.encode()).hexdigest()
+        columnar = wants_columnar(request)
+        if columnar:
+            etag = columnar_etag(etag)
 
         # Handle conditional request
         if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
@@ -1796,6 +1742,8 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             resp['ETag'] = f'"{etag}"'
             if last_modified:
                 resp['Last-Modified'] = http_date(last_modified.timestamp())
+            # JSON and columnar bodies share the URL; caches key on Accept.
+            patch_vary_headers(resp, ('Accept',))
             return resp
 
         if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
@@ -1807,50 +1755,38 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                     resp = HttpResponseNotModified()
                     resp['ETag'] = f'"{etag}"'
                     resp['Last-Modified'] = http_date(last_modified.timestamp())
+                    patch_vary_headers(resp, ('Accept',))
                     return resp
             except Exception:  # nosec B110
                 pass
 
-        payload = None
+        def _build_payload():
+            return CapacityAnalysisService.get_capacity_heatmap(
+                people, weeks, cache_scope=cache_scope, assignments_qs=asn_qs,
+            )
+
         if use_cache:
-            try:
-                payload = cache.get(cache_key)
-            except Exception:
-                payload = None
-        if payload is None:
-            # Single-flight lock to prevent cache stampedes on heavy compute
-            lock_key = f"lock:{cache_key}"
-            got_lock = False
-            if use_cache:
-                try:
-                    got_lock = cache.add(lock_key, '1', timeout=10)
-                except Exception:
-                    got_lock = True
-            try:
-                if not got_lock and use_cache:
-                    # Briefly wait for another worker
-                    t0 = time.time()
-                    while time.time() - t0 < 2.0:
-                        try:
-                            payload = cache.get(cache_key)
-                            if payload is not None:
-                                break
-                        except Exception:  # nosec B110
-                            pass
-                        time.sleep(0.05)
-                if payload is None:
-                    payload = CapacityAnalysisService.get_capacity_heatmap(people, weeks, cache_scope=cache_scope)
-            finally:
-                if use_cache:
-                    try:
-                        cache.delete(lock_key)
-                    except Exception:  # nosec B110
-                        pass
-            if use_cache:
-                try:
-                    cache.set(cache_key, payload, timeout=int(os.getenv('AGGREGATE_CACHE_TTL', '30')))
-                except Exception:  # nosec B110
-                    pass
+            payload = aggregate_cache.get_or_build(
+                cache_key,
+                _build_payload,
+                ttl=int(os.getenv('AGGREGATE_CACHE_TTL', '30')),
+            ).value
+        else:
+            payload = _build_payload()
+
+        if columnar:
+            # Columnar clients derive percent/available maps from hours and capacity.
+            response = columnar_response(
+                request,
+                endpoint='people.capacity_heatmap',
+                etag=etag,
+                build=lambda: capacity_heatmap_to_columnar(payload or []),
+            )
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+            response['Cache-Control'] = 'private, max-age=30'
+            patch_vary_headers(response, ('Accept',))
+            return response
 
         # Add convenience maps: percentByWeek and availableByWeek (optional fields)
         try:
@@ -1885,6 +1821,7 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         if last_modified:
             response['Last-Modified'] = http_date(last_modified.timestamp())
         response['Cache-Control'] = 'private, max-age=30'
+        patch_vary_headers(response, ('Accept',))
         return response
 
     @extend_schema(
@@ -1952,19 +1889,16 @@ class PersonViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             except Exception:  # nosec B110
                 pass
         cache_scope = f"{cache_scope}:vs={visibility_scope}:vt={visibility_token}"
-        try:
-            asn_qs = Assignment.objects.filter(is_active=True)
-            if vertical_param not in (None, ""):
-                try:
-                    asn_qs = asn_qs.filter(project__vertical_id=int(vertical_param))
-                except Exception:
-                    pass
-            if hidden_project_ids:
-                asn_qs = asn_qs.exclude(project_id__in=sorted(hidden_project_ids))
-            asn_qs = asn_qs.only('weekly_hours', 'person_id')
-            people_qs = people_qs.prefetch_related(Prefetch('assignments', queryset=asn_qs))
-        except Exception:  # nosec B110
-            pass
+        asn_qs = Assignment.objects.filter(is_active=True)
+        if vertical_param not in (None, ""):
+            try:
+                asn_qs = asn_qs.filter(project__vertical_id=int(vertical_param))
+            except Exception:  # nosec B110
+                pass
+        if hidden_project_ids:
+            asn_qs = asn_qs.exclude(project_id__in=sorted(hidden_project_ids))
 
-        result = CapacityAnalysisService.get_workload_forecast(people_qs, weeks, cache_scope=cache_scope)
+        result = CapacityAnalysisService.get_workload_forecast(
+            people_qs, weeks, cache_scope=cache_scope, assignments_qs=asn_qs,
+        )
         return Response(result)
@@ -16,6 +16,7 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from accounts.models import UserProfile
 from assignments.models import Assignment
+from assignments.read_queries import week_hours_by_assignment, week_hours_by_person
 from assignments.lead_utils import (
     is_lead_role_name,
     resolve_assignment_department_id,
@@ -68,28 +69,17 @@ class PersonalWorkView(APIView):
 
         today = date.today()
         current_sunday = sunday_of_week(today)
-        week_keys: List[str] = [(current_sunday + timedelta(weeks=w)).isoformat() for w in range(8)]
+        week_dates = [current_sunday + timedelta(weeks=w) for w in range(8)]
+        week_keys: List[str] = [wk.isoformat() for wk in week_dates]
 
         # Assignments for this person
-        assignments = list(
-            Assignment.objects.filter(person_id=person.id, is_active=True).select_related('project')
-        )
+        assignments_qs = Assignment.objects.filter(person_id=person.id, is_active=True)
+        assignments = list(assignments_qs.select_related('project'))
 
         weekly_capacity = int(getattr(person, 'weekly_capacity', 36) or 36)
-        week_totals: Dict[str, float] = {wk: 0.0 for wk in week_keys}
-        total_allocated_current = 0.0
-        for a in assignments:
-            wh = a.weekly_hours or {}
-            for wk in week_keys:
-                try:
-                    v = float(wh.get(wk) or 0)
-                except Exception:
-                    v = 0.0
-                week_totals[wk] += v
-            try:
-                total_allocated_current += float(wh.get(week_keys[0]) or 0)
-            except Exception:  # nosec B110
-                pass
+        by_week = week_hours_by_person(assignments_qs, week_dates).get(person.id, {})
+        week_totals: Dict[str, float] = {wk.isoformat(): float(by_week.get(wk, 0.0)) for wk in week_dates}
+        total_allocated_current = week_totals[week_keys[0]]
 
         utilization_percent = round((total_allocated_current / weekly_capacity * 100) if weekly_capacity else 0.0, 1)
         available_hours = max(0.0, weekly_capacity - total_allocated_current)
@@ -243,7 +233,8 @@ class PersonalLeadProjectGridView(APIView):
 
         today = date.today()
         current_sunday = sunday_of_week(today)
-        week_keys: List[str] = [(current_sunday + timedelta(weeks=w)).isoformat() for w in range(weeks)]
+        week_dates = [current_sunday + timedelta(weeks=w) for w in range(weeks)]
+        week_keys: List[str] = [wk.isoformat() for wk in week_dates]
 
         lead_assignments = list(
             Assignment.objects.filter(
@@ -276,14 +267,15 @@ class PersonalLeadProjectGridView(APIView):
 
         project_ids = sorted(scoped_departments_by_project.keys())
 
-        scoped_assignments = list(
+        scoped_qs = (
             Assignment.objects.filter(
                 is_active=True,
                 project_id__in=project_ids,
             )
             .filter(Q(person__is_active=True) | Q(person__isnull=True))
-            .select_related('project', 'person', 'department', 'role_on_project_ref')
         )
+        scoped_assignments = list(scoped_qs.select_related('project', 'person', 'department', 'role_on_project_ref'))
+        hours_by_assignment = week_hours_by_assignment(scoped_qs, week_dates)
 
         assignments_by_project: dict[str, list[dict]] = defaultdict(list)
         for assignment in scoped_assignments:
@@ -295,15 +287,11 @@ class PersonalLeadProjectGridView(APIView):
             if dept_id is None or dept_id not in scoped_depts:
                 continue
 
-            weekly_hours = assignment.weekly_hours or {}
-            compact_hours: dict[str, float] = {}
-            for wk in week_keys:
-                try:
-                    val = float(weekly_hours.get(wk) or 0.0)
-                except Exception:
-                    val = 0.0
-                if val:
-                    compact_hours[wk] = round(val, 2)
+            compact_hours: dict[str, float] = {
+                wk.isoformat(): round(val, 2)
+                for wk, val in hours_by_assignment.get(int(assignment.id), {}).items()
+                if val
+            }
 
             assignments_by_project[str(project_id)].append({
                 'id': int(assignment.id),
@@ -0,0 +1,111 @@
+"""Batched candidate scoring for the project staffing availability view.
+
+All candidates are scored with a fixed number of queries: one for the
+project's staffing context (departments/roles already on the project), one
+for the candidates' capacity and one ``week_hours_by`` pass that yields each
+person's allocated hours for the week, split by project.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Optional
+
+from assignments.models import Assignment
+from assignments.read_queries import week_hours_by
+
+
+def project_staffing_context(project_id: int) -> tuple[list[int], set[int]]:
+    """Return (department ids, people role ids) of active assignees on a project."""
+    department_ids: list[int] = []
+    role_ids: set[int] = set()
+    rows = (
+        Assignment.objects.filter(project_id=project_id, is_active=True, person__isnull=False)
+        .values_list('person__department_id', 'person__role_id')
+        .distinct()
+    )
+    for department_id, role_id in rows:
+        if department_id is not None and department_id not in department_ids:
+            department_ids.append(department_id)
+        if role_id is not None:
+            role_ids.add(int(role_id))
+    return department_ids, role_ids
+
+
+def _hours_by_person(people_qs, project_id: int, week_start: date, vertical_id: Optional[int]) -> dict[int, tuple[float, float]]:
+    """Return ``{person_id: (allocated hours, hours on project_id)}`` for ``week_start``.
+
+    Goes through the shared read layer, so off-Sunday JSON keys and
+    non-numeric values are handled like every other hours view.
+    """
+    asn_qs = Assignment.objects.filter(is_active=True, person_id__in=people_qs.order_by().values('id'))
+    if vertical_id is not None:
+        asn_qs = asn_qs.filter(project__vertical_id=vertical_id)
+    totals: dict[int, tuple[float, float]] = {}
+    for (person_id, row_project_id), by_week in week_hours_by(asn_qs, [week_start], 'person_id', 'project_id').items():
+        hours = sum(by_week.values())
+        allocated, on_project = totals.get(person_id, (0.0, 0.0))
+        totals[person_id] = (allocated + hours, on_project + (hours if row_project_id == project_id else 0.0))
+    return totals
+
+
+def availability_sort_key(item: dict) -> tuple:
+    return (-float(item['availableHours']), str(item['personName']).lower(), int(item['personId']))
+
+
+def score_project_candidates(
+    *,
+    project_id: int,
+    week_start: date,
+    people_qs,
+    vertical_id: Optional[int] = None,
+    staffing_department_ids: Iterable[int] | None = None,
+    staffing_role_ids: Iterable[int] | None = None,
+) -> list[dict]:
+    """Return availability items for every candidate, most available first."""
+    if staffing_department_ids is None or staffing_role_ids is None:
+        staffing_department_ids, staffing_role_ids = project_staffing_context(project_id)
+    dept_fit = set(staffing_department_ids or [])
+    role_fit = set(staffing_role_ids or [])
+
+    rows = people_qs.order_by().values('id', 'name', 'weekly_capacity', 'department_id', 'role_id')
+    hours = _hours_by_person(people_qs, project_id, week_start, vertical_id)
+    result: list[dict] = []
+    for row in rows:
+        cap = float(row.get('weekly_capacity') or 0)
+        allocated, project_hours = hours.get(row['id'], (0.0, 0.0))
+        available = max(0.0, cap - allocated)
+        result.append({
+            'personId': row['id'],
+            'personName': row['name'],
+            'totalHours': round(allocated, 1),
+            'capacity': cap,
+            'availableHours': round(available, 1),
+            'utilizationPercent': round((allocated / cap * 100.0), 1) if cap > 0 else 0.0,
+            'projectHours': round(project_hours, 1),
+            'departmentFit': row.get('department_id') in dept_fit,
+            'roleFit': row.get('role_id') in role_fit,
+        })
+    result.sort(key=availability_sort_key)
+    return result
+
+
+def page_after_cursor(items: list[dict], cursor: Optional[list], limit: int) -> tuple[list[dict], Optional[list]]:
+    """Slice ``items`` (sorted by ``availability_sort_key``) after a keyset cursor.
+
+    Returns the page and the cursor values for the next page (None at the end).
+    """
+    start = 0
+    if cursor and len(cursor) == 3:
+        try:
+            after = (-float(cursor[0]), str(cursor[1]), int(cursor[2]))
+        except (TypeError, ValueError):
+            after = None
+        if after is not None:
+            while start < len(items) and availability_sort_key(items[start]) <= after:
+                start += 1
+    page = items[start:start + limit]
+    if start + limit >= len(items) or not page:
+        return page, None
+    last = page[-1]
+    return page, [last['availableHours'], str(last['personName']).lower(), last['personId']]
@@ -164,6 +164,9 @@ class ProjectAvailabilityItemSerializer(serializers.Serializer):
     capacity = serializers.FloatField()
     availableHours = serializers.FloatField()
     utilizationPercent = serializers.FloatField()
+    projectHours = serializers.FloatField(required=False)
+    departmentFit = serializers.BooleanField(required=False)
+    roleFit = serializers.BooleanField(required=False)
 
 
 class ProjectTaskTemplateSerializer(serializers.ModelSerializer):
@@ -97,10 +97,10 @@ def sync_overhead_assignments_on_project_save(sender, instance: Project, **kwarg
     if 'overhead' not in name or not getattr(instance, 'is_active', True):
         return
     try:
-        from assignments.overhead import sync_overhead_assignments_for_projects
+        from assignments.overhead import queue_overhead_sync
     except Exception:  # nosec B110
         return
-    transaction.on_commit(lambda: sync_overhead_assignments_for_projects([instance.id]))
+    transaction.on_commit(lambda: queue_overhead_sync(project_ids=[instance.id]))
 
 
 @receiver(post_save, sender=Project)
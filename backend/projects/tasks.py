@@ -9,6 +9,7 @@ from celery import shared_task
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 
+from core.job_progress import report_progress
 from .models import Project
 from .utils.excel_handler import export_projects_to_excel
 from .assigned_names import rebuild_assigned_names_for_project
@@ -22,7 +23,7 @@ def _export_filename(prefix: str = 'projects_export', ext: str = 'xlsx') -> str:
 @shared_task(bind=True)
 def export_projects_excel_task(self, filters: Dict[str, Any] | None = None) -> Dict[str, Any]:
     """Generate Excel export for projects and store it in default storage."""
-    self.update_state(state='STARTED', meta={'progress': 5, 'message': 'Preparing export'})
+    report_progress(self, 'STARTED', 5, 'Preparing export')
     qs = (
         Project.objects
         .filter(is_active=True)
@@ -41,11 +42,11 @@ def export_projects_excel_task(self, filters: Dict[str, Any] | None = None) -> D
     if client:
         qs = qs.filter(client__icontains=client)
 
-    self.update_state(state='PROGRESS', meta={'progress': 40, 'message': 'Generating Excel content'})
+    report_progress(self, 'PROGRESS', 40, 'Generating Excel content')
     response = export_projects_to_excel(qs)
     content = response.content
 
-    self.update_state(state='PROGRESS', meta={'progress': 80, 'message': 'Saving export file'})
+    report_progress(self, 'PROGRESS', 80, 'Saving export file')
     fname = _export_filename()
     storage_key = os.path.join('exports', 'projects', fname)
     default_storage.save(storage_key, ContentFile(content))
@@ -56,7 +57,7 @@ def export_projects_excel_task(self, filters: Dict[str, Any] | None = None) -> D
         'filename': fname,
         'content_type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
     }
-    self.update_state(state='PROGRESS', meta={'progress': 95, 'message': 'Finalizing'})
+    report_progress(self, 'PROGRESS', 95, 'Finalizing')
     return meta
 
 
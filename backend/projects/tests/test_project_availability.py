@@ -0,0 +1,109 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from assignments.models import Assignment
+from assignments.week_hours_service import sync_assignment_week_hours
+from departments.models import Department
+from people.models import Person
+from projects.models import Project
+from roles.models import Role
+
+
+class ProjectAvailabilityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='avail', password='pw', is_staff=True)
+        self.client.force_authenticate(self.user)
+        self.week = '2025-01-05'
+        self.dept = Department.objects.create(name='Design')
+        self.engineer = Role.objects.create(name='Engineer')
+        self.drafter = Role.objects.create(name='Drafter')
+        self.project = Project.objects.create(name='Tower')
+        self.other = Project.objects.create(name='Bridge')
+        self.alice = Person.objects.create(name='Alice', weekly_capacity=40, department=self.dept, role=self.engineer)
+        self.bob = Person.objects.create(name='Bob', weekly_capacity=40, department=self.dept, role=self.drafter)
+        self.cara = Person.objects.create(name='Cara', weekly_capacity=40, department=self.dept, role=self.drafter)
+        self.dan = Person.objects.create(name='Dan', weekly_capacity=0, department=self.dept)
+        self.a1 = Assignment.objects.create(person=self.alice, project=self.project, weekly_hours={self.week: 10})
+        self.a2 = Assignment.objects.create(person=self.alice, project=self.other, weekly_hours={self.week: 20, '2025-01-12': 40})
+        self.a3 = Assignment.objects.create(person=self.bob, project=self.other, weekly_hours={self.week: 35})
+        self.a4 = Assignment.objects.create(
+            person=self.cara, project=self.other, weekly_hours={self.week: 30}, is_active=False,
+        )
+
+    def _get(self, **params):
+        params.setdefault('week', self.week)
+        return self.client.get(f'/api/projects/{self.project.id}/availability/', params)
+
+    def _assert_scores(self):
+        resp = self._get()
+        self.assertEqual(resp.status_code, 200, resp.content)
+        items = {row['personName']: row for row in resp.json()}
+        self.assertEqual(items['Alice']['totalHours'], 30.0)
+        self.assertEqual(items['Alice']['projectHours'], 10.0)
+        self.assertEqual(items['Alice']['availableHours'], 10.0)
+        self.assertEqual(items['Alice']['utilizationPercent'], 75.0)
+        self.assertTrue(items['Alice']['roleFit'])
+        self.assertEqual(items['Bob']['availableHours'], 5.0)
+        self.assertFalse(items['Bob']['roleFit'])
+        self.assertTrue(items['Bob']['departmentFit'])
+        # Inactive assignments do not consume capacity
+        self.assertEqual(items['Cara']['totalHours'], 0.0)
+        self.assertEqual(items['Dan']['utilizationPercent'], 0.0)
+        self.assertEqual([row['personName'] for row in resp.json()], ['Cara', 'Alice', 'Bob', 'Dan'])
+
+    def test_scores_candidates_from_json_hours(self):
+        self._assert_scores()
+
+    @override_settings(ASSIGNMENT_HOURS_STORAGE_MODE='normalized')
+    def test_scores_candidates_from_normalized_hours(self):
+        for asn in (self.a1, self.a2, self.a3, self.a4):
+            sync_assignment_week_hours(asn)
+        self._assert_scores()
+
+    def test_off_sunday_keys_fold_and_bad_values_are_skipped(self):
+        self.a1.weekly_hours = {'2025-01-06': 10}
+        self.a1.save()
+        self.a3.weekly_hours = {self.week: 'x', '2025-01-08': 35}
+        self.a3.save()
+        self._assert_scores()
+
+    def test_top_k_and_cursor_paging(self):
+        resp = self._get(top_k=2)
+        self.assertEqual([row['personName'] for row in resp.json()], ['Cara', 'Alice'])
+
+        names = []
+        cursor = None
+        for _ in range(5):
+            params = {'limit': 3}
+            if cursor:
+                params['cursor'] = cursor
+            resp = self._get(**params)
+            self.assertEqual(resp.status_code, 200, resp.content)
+            names.extend(row['personName'] for row in resp.json())
+            cursor = resp.get('X-Next-Cursor')
+            if not cursor:
+                break
+        self.assertEqual(names, ['Cara', 'Alice', 'Bob', 'Dan'])
+
+    def test_etag_depends_on_top_k_and_paging(self):
+        full = self._get()
+        top = self._get(top_k=2)
+        first_page = self._get(limit=2)
+        second_page = self._get(limit=2, cursor=first_page['X-Next-Cursor'])
+        etags = {resp['ETag'] for resp in (full, top, first_page, second_page)}
+        self.assertEqual(len(etags), 4)
+        # A validator from the full list must not turn a top_k request into a 304.
+        resp = self.client.get(
+            f'/api/projects/{self.project.id}/availability/',
+            {'week': self.week, 'top_k': 2},
+            HTTP_IF_NONE_MATCH=full['ETag'],
+        )
+        self.assertEqual(resp.status_code, 200)
+
+    def test_rejects_invalid_limit(self):
+        resp = self._get(limit=0)
+        self.assertEqual(resp.status_code, 400)
@@ -7,16 +7,17 @@ from rest_framework.decorators import action
 from rest_framework.throttling import UserRateThrottle
 from rest_framework.filters import OrderingFilter
 from rest_framework.views import APIView
-from django.db.models import Max, Min, Count, Exists, OuterRef, Q, Prefetch, F
+from django.db.models import Max, Min, Count, Exists, OuterRef, Q, F
 from django.db.models.functions import Coalesce
 from django.http import HttpResponseNotModified, StreamingHttpResponse
 from django.utils.http import http_date, parse_http_date
 from django.conf import settings
-from accounts.permissions import IsAdminOrManager, is_admin_or_manager, is_admin_user
+from accounts.permissions import IsAdminOrManager, get_user_person_id, is_admin_or_manager, is_admin_user
 from accounts.serializers import AdminAuditLogSerializer
 from django.core.cache import cache
 from django.utils import timezone
 from .models import Project, ProjectChangeLog, ProjectRole, ProjectStatusDefinition
+from core.aggregate_cache import aggregate_cache
 from core.etag import ETagConditionalMixin
 from .serializers import (
     ProjectSerializer,
@@ -66,6 +67,15 @@ except Exception:
     export_projects_excel_task = None  # type: ignore
 from .status_definitions import get_status_keys_included_in_analytics, clear_status_definitions_cache
 from core.vertical_scope import get_request_enforced_vertical_id
+from core.cursors import (
+    KeysetPage,
+    cursor_page_url,
+    decode_cursor,
+    encode_cursor,
+    paginate_keyset,
+    requested_cursor,
+)
+from .availability import page_after_cursor, project_staffing_context, score_project_candidates
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +83,18 @@ class ProjectAvailabilityThrottle(UserRateThrottle):
     scope = 'project_availability'
 
 
+def _optional_positive_int(raw, name: str, maximum: int = 1000):
+    if raw in (None, ''):
+        return None
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be an integer')
+    if value < 1 or value > maximum:
+        raise ValueError(f'{name} must be between 1 and {maximum}')
+    return value
+
+
 class ProjectStatusDefinitionViewSet(viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = 'key'
@@ -513,6 +535,7 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             fields={
                 'page': serializers.IntegerField(required=False),
                 'page_size': serializers.IntegerField(required=False),
+                'cursor': serializers.CharField(required=False, allow_null=True, allow_blank=True),
                 'ordering': serializers.CharField(required=False),
                 'vertical': serializers.IntegerField(required=False),
                 'status_in': serializers.CharField(required=False),
@@ -551,6 +574,8 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
                 'count': serializers.IntegerField(),
                 'next': serializers.CharField(allow_null=True, required=False),
                 'previous': serializers.CharField(allow_null=True, required=False),
+                'nextCursor': serializers.CharField(allow_null=True, required=False),
+                'previousCursor': serializers.CharField(allow_null=True, required=False),
                 'results': serializers.ListField(child=serializers.DictField()),
                 'rolesByDepartment': serializers.JSONField(required=False),
             }
@@ -583,10 +608,7 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             mine_only_raw = request.query_params.get('mine_only')
         mine_only = str(mine_only_raw or '').strip().lower() in ('1', 'true', 'yes', 'on')
         if mine_only:
-            try:
-                person_id = getattr(getattr(request.user, 'profile', None), 'person_id', None)
-            except Exception:
-                person_id = None
+            person_id = get_user_person_id(request.user)
             if not person_id:
                 queryset = queryset.none()
             else:
@@ -930,6 +952,9 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             'previous': prev_url,
             'results': results,
         }
+        if isinstance(page_obj, KeysetPage):
+            response_payload['nextCursor'] = page_obj.next_cursor
+            response_payload['previousCursor'] = page_obj.previous_cursor
         if include_role_map:
             project_ids = [int(obj.id) for obj in page_obj.object_list if getattr(obj, 'id', None)]
             response_payload['rolesByDepartment'] = self._build_roles_by_department_for_projects(
@@ -960,7 +985,7 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         return response
 
     def _paginate_post_queryset(self, request, queryset, data=None):
-        """Paginate using body-provided page/page_size for POST search endpoints."""
+        """Paginate using body-provided page/page_size (or cursor) for POST search endpoints."""
         from django.core.paginator import Paginator
         from rest_framework.settings import api_settings
 
@@ -979,6 +1004,17 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         if page_size <= 0:
             page_size = api_settings.PAGE_SIZE or 100
 
+        # Opt-in keyset mode: O(page size) per page, count carried in the cursor.
+        cursor_mode, cursor_token = requested_cursor(request, payload)
+        if cursor_mode:
+            page = paginate_keyset(queryset, cursor_token, page_size)
+            return (
+                page,
+                page,
+                cursor_page_url(request, page.next_cursor, page_size),
+                cursor_page_url(request, page.previous_cursor, page_size),
+            )
+
         paginator = Paginator(queryset, page_size)
         page_obj = paginator.get_page(page_number)
 
@@ -1136,10 +1172,7 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
 
         user = getattr(request, 'user', None)
         if not is_admin_or_manager(user):
-            try:
-                person_id = getattr(getattr(user, 'profile', None), 'person_id', None)
-            except Exception:
-                person_id = None
+            person_id = get_user_person_id(user)
             if not person_id or not is_current_project_assignee(person_id, project.id):
                 return Response({'detail': 'Project access required'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -1219,7 +1252,10 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             OpenApiParameter(name='department', type=int, required=False, description='Filter people by department id'),
             OpenApiParameter(name='include_children', type=int, required=False, description='Include child departments (0|1)'),
             OpenApiParameter(name='vertical', type=int, required=False, description='Filter by vertical id'),
-            OpenApiParameter(name='candidates_only', type=int, required=False, description='Limit to departments already staffing this project (0|1)')
+            OpenApiParameter(name='candidates_only', type=int, required=False, description='Limit to departments already staffing this project (0|1)'),
+            OpenApiParameter(name='top_k', type=int, required=False, description='Return only the K most available candidates'),
+            OpenApiParameter(name='limit', type=int, required=False, description='Page size; enables cursor paging (next cursor in X-Next-Cursor header)'),
+            OpenApiParameter(name='cursor', type=str, required=False, description='Opaque cursor from a previous X-Next-Cursor header'),
         ],
         responses=ProjectAvailabilityItemSerializer(many=True)
     )
@@ -1227,8 +1263,10 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
     def availability(self, request, pk=None):
         """Return availability snapshot for people relevant to the project context.
 
-        Response items: { personId, personName, totalHours, capacity, availableHours, utilizationPercent }
-        Uses Sunday as canonical week key; exact JSON key lookup (no tolerance).
+        Response items: { personId, personName, totalHours, capacity, availableHours, utilizationPercent,
+        projectHours, departmentFit, roleFit }
+        Hours come from one ``week_hours_by`` pass over the requested Sunday week,
+        so off-Sunday JSON keys fold into it (see projects.availability).
         """
         from datetime import date as _date, timedelta as _td, datetime as _dt
         try:
@@ -1244,6 +1282,12 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         except Exception:
             return Response({'detail': 'Invalid week format, expected YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            top_k = _optional_positive_int(request.query_params.get('top_k'), 'top_k')
+            limit = _optional_positive_int(request.query_params.get('limit'), 'limit')
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
         # Department scoping
         dept_param = request.query_params.get('department')
         include_children = request.query_params.get('include_children') == '1'
@@ -1299,13 +1343,8 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             except Exception:  # nosec B110
                 pass
 
-        # Candidate department ids for this project
-        cand_dept_ids = list(
-            Assignment.objects.filter(project_id=pk, is_active=True)
-            .values_list('person__department_id', flat=True)
-            .exclude(person__department_id__isnull=True)
-            .distinct()
-        )
+        # Candidate department ids (and roles) already staffing this project
+        cand_dept_ids, staffing_role_ids = project_staffing_context(pk)
         if vertical_param not in (None, ""):
             try:
                 allowed = set(Department.objects.filter(vertical_id=int(vertical_param)).values_list('id', flat=True))
@@ -1320,15 +1359,12 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             if not dept_param and cand_dept_ids:
                 people_qs = people_qs.filter(department_id__in=cand_dept_ids)
 
-        # Prefetch active assignments for availability computation
-        asn_qs = Assignment.objects.filter(is_active=True)
+        vertical_id = None
         if vertical_param not in (None, ""):
             try:
-                asn_qs = asn_qs.filter(project__vertical_id=int(vertical_param))
+                vertical_id = int(vertical_param)
             except Exception:  # nosec B110
-                pass
-        asn_qs = asn_qs.only('weekly_hours', 'person_id')
-        people_qs = people_qs.prefetch_related(Prefetch('assignments', queryset=asn_qs))
+                vertical_id = None
 
         # Short TTL caching + ETag/Last-Modified
         try:
@@ -1345,7 +1381,9 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         last_modified = max([dt for dt in lm_candidates if dt]) if any(lm_candidates) else None
 
         import hashlib
-        etag_content = f"{cache_key}-" + (last_modified.isoformat() if last_modified else 'none')
+        # top_k and paging change the body served from the same cached scores.
+        page_key = f"k={top_k}:l={limit}:c={request.query_params.get('cursor') or ''}"
+        etag_content = f"{cache_key}-{page_key}-" + (last_modified.isoformat() if last_modified else 'none')
         etag = hashlib.sha256(etag_content.encode()).hexdigest()
 
         if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
@@ -1368,70 +1406,35 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
             except ValueError:  # nosec B110
                 pass
 
-        payload = None
-        try:
-            payload = cache.get(cache_key)
-        except Exception:
-            payload = None
-        if payload is None:
-            lock_key = f"lock:{cache_key}"
-            got_lock = False
-            try:
-                got_lock = cache.add(lock_key, '1', timeout=10)
-            except Exception:
-                got_lock = True
-            if not got_lock:
-                t0 = time.time()
-                while time.time() - t0 < 2.0:
-                    try:
-                        payload = cache.get(cache_key)
-                        if payload is not None:
-                            break
-                    except Exception:  # nosec B110
-                        pass
-                    time.sleep(0.05)
-            if payload is None:
-                wk_key = week_monday.strftime('%Y-%m-%d')
-                result = []
-                for p in people_qs:
-                    cap = float(p.weekly_capacity or 0)
-                    allocated = 0.0
-                    for a in getattr(p, 'assignments').all():
-                        wh = a.weekly_hours or {}
-                        val = 0.0
-                        if wk_key in wh:
-                            try:
-                                val = float(wh[wk_key] or 0)
-                            except (TypeError, ValueError):
-                                val = 0.0
-                        allocated += val
-                    available = max(0.0, cap - allocated)
-                    util = round((allocated / cap * 100.0), 1) if cap > 0 else 0.0
-                    result.append({
-                        'personId': p.id,
-                        'personName': p.name,
-                        'totalHours': round(allocated, 1),
-                        'capacity': cap,
-                        'availableHours': round(available, 1),
-                        'utilizationPercent': util,
-                    })
-                # Optional: sort by availability desc then name
-                result.sort(key=lambda x: (-x['availableHours'], x['personName'].lower()))
-                payload = result
-                try:
-                    cache.set(cache_key, payload, timeout=int(os.getenv('AGGREGATE_CACHE_TTL', '30')))
-                except Exception:  # nosec B110
-                    pass
-            try:
-                cache.delete(lock_key)
-            except Exception:  # nosec B110
-                pass
-
-        response = Response(payload)
+        payload = aggregate_cache.get_or_build(
+            cache_key,
+            lambda: score_project_candidates(
+                project_id=int(pk),
+                week_start=week_monday,
+                people_qs=people_qs,
+                vertical_id=vertical_id,
+                staffing_department_ids=cand_dept_ids,
+                staffing_role_ids=staffing_role_ids,
+            ),
+            ttl=int(os.getenv('AGGREGATE_CACHE_TTL', '30')),
+        ).value
+
+        items = payload
+        next_cursor = None
+        if top_k is not None:
+            items = items[:top_k]
+        if limit is not None:
+            items, next_values = page_after_cursor(items, decode_cursor(request.query_params.get('cursor')), limit)
+            if next_values is not None:
+                next_cursor = encode_cursor(next_values)
+
+        response = Response(items)
         response['ETag'] = f'"{etag}"'
         if last_modified:
             response['Last-Modified'] = http_date(last_modified.timestamp())
         response['Cache-Control'] = 'private, max-age=30'
+        if next_cursor:
+            response['X-Next-Cursor'] = next_cursor
         return response
 
     @staticmethod
@@ -1604,10 +1607,7 @@ class ProjectViewSet(ETagConditionalMixin, viewsets.ModelViewSet):
         query_params = request.query_params
         mine_only = str(query_params.get('mine_only') or '').strip().lower() in ('1', 'true', 'yes', 'on')
         if mine_only:
-            try:
-                person_id = getattr(getattr(request.user, 'profile', None), 'person_id', None)
-            except Exception:
-                person_id = None
+            person_id = get_user_person_id(request.user)
             if not person_id:
                 queryset = queryset.none()
             else:
@@ -2168,10 +2168,7 @@ class ProjectChangeLogView(APIView):
 
         user = getattr(request, 'user', None)
         if not is_admin_or_manager(user):
-            try:
-                person_id = getattr(getattr(user, 'profile', None), 'person_id', None)
-            except Exception:
-                person_id = None
+            person_id = get_user_person_id(user)
             if not person_id or not is_current_project_assignee(person_id, project.id):
                 return Response({'detail': 'Project access required'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -5,7 +5,11 @@ from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from typing import Any
 
+from django.db.models import Q
+
 from assignments.models import Assignment
+from assignments.read_queries import week_hours_by_assignment
+from core.chunked import iter_keyset
 from core.models import AutoHoursRoleSetting, AutoHoursTemplate, AutoHoursTemplateRoleSetting, UtilizationScheme
 from core.project_visibility import get_hidden_project_ids_for_scope
 from departments.models import Department
@@ -109,30 +113,6 @@ def parse_iso_date(raw: str | None) -> date | None:
         return None
 
 
-def hours_for_week(weekly_hours: dict[str, Any], sunday_key: str) -> float:
-    if not isinstance(weekly_hours, dict):
-        return 0.0
-    try:
-        direct = float(weekly_hours.get(sunday_key) or 0.0)
-    except Exception:
-        direct = 0.0
-    if direct > 0:
-        return direct
-    try:
-        base = datetime.strptime(sunday_key, "%Y-%m-%d").date()
-    except Exception:
-        return 0.0
-    for offset in range(-3, 4):
-        alt_key = (base + timedelta(days=offset)).isoformat()
-        try:
-            value = float(weekly_hours.get(alt_key) or 0.0)
-        except Exception:
-            value = 0.0
-        if value > 0:
-            return value
-    return 0.0
-
-
 def expand_department_ids(department_id: int | None, include_children: bool) -> set[int] | None:
     if department_id is None:
         return None
@@ -272,32 +252,43 @@ def _evaluate_baseline(
     department_included: dict[int, list[float]] = defaultdict(lambda: [0.0] * scope.weeks)
     department_excluded: dict[int, list[float]] = defaultdict(lambda: [0.0] * scope.weeks)
 
-    base_qs = Assignment.objects.filter(is_active=True, project__isnull=False).select_related(
-        "project",
-        "person",
-        "role_on_project_ref",
-    )
+    base_qs = Assignment.objects.filter(is_active=True, project__isnull=False)
     if hidden_project_ids:
         base_qs = base_qs.exclude(project_id__in=sorted(hidden_project_ids))
     if scope.vertical_id is not None:
         base_qs = base_qs.filter(project__vertical_id=scope.vertical_id)
-
-    assignments = list(
-        base_qs.only(
-            "person_id",
-            "weekly_hours",
-            "department_id",
-            "role_on_project_ref_id",
-            "project_id",
-            "project__status",
-            "project__auto_hours_template_id",
-            "person__role_id",
-            "person__department_id",
-            "person__hire_date",
-            "role_on_project_ref__department_id",
+    if scope.department_ids is not None:
+        dept_ids = sorted(scope.department_ids)
+        base_qs = base_qs.filter(
+            Q(person__department_id__in=dept_ids)
+            | Q(department_id__in=dept_ids)
+            | Q(role_on_project_ref__department_id__in=dept_ids)
         )
-    )
-    if not assignments:
+
+    # Pass 1 (bounded by projects/roles, not assignments): projects per
+    # status and the role/template ids the role mapping needs.
+    project_role_ids: set[int] = set()
+    template_ids: set[int] = set()
+    seen_projects_by_status: dict[str, set[int]] = defaultdict(set)
+    for project_id, project_status, template_id in (
+        base_qs.order_by().values_list("project_id", "project__status", "project__auto_hours_template_id").distinct()
+    ):
+        status_key = normalize_status_key(project_status or "")
+        if not status_key:
+            continue
+        seen_projects_by_status[status_key].add(int(project_id))
+        if status_key in status_keys and template_id:
+            template_ids.add(int(template_id))
+    for project_status, role_id in (
+        base_qs.filter(role_on_project_ref_id__isnull=False)
+        .order_by()
+        .values_list("project__status", "role_on_project_ref_id")
+        .distinct()
+    ):
+        if normalize_status_key(project_status or "") in status_keys:
+            project_role_ids.add(int(role_id))
+
+    if not seen_projects_by_status:
         return BaselineEvaluation(
             demand_by_role=demand_by_role,
             baseline_total=total_demand,
@@ -311,76 +302,74 @@ def _evaluate_baseline(
             department_excluded=department_excluded,
         )
 
-    project_role_ids: set[int] = set()
-    template_ids: set[int] = set()
-    seen_projects_by_status: dict[str, set[int]] = defaultdict(set)
-    scoped_assignments: list[tuple[Assignment, str, int | None]] = []
-
-    for assignment in assignments:
-        status_key = normalize_status_key(getattr(assignment.project, "status", ""))
-        if not status_key:
-            continue
-        if scope.department_ids is not None:
-            in_scope = False
-            if assignment.person_id and getattr(assignment.person, "department_id", None) in scope.department_ids:
-                in_scope = True
-            if assignment.department_id and int(assignment.department_id) in scope.department_ids:
-                in_scope = True
-            role_department = getattr(getattr(assignment, "role_on_project_ref", None), "department_id", None)
-            if role_department and int(role_department) in scope.department_ids:
-                in_scope = True
-            if not in_scope:
-                continue
-
-        dept_id = None
-        if assignment.department_id:
-            dept_id = int(assignment.department_id)
-        elif assignment.person_id and getattr(assignment.person, "department_id", None):
-            dept_id = int(getattr(assignment.person, "department_id"))
-        else:
-            role_department = getattr(getattr(assignment, "role_on_project_ref", None), "department_id", None)
-            if role_department:
-                dept_id = int(role_department)
-
-        scoped_assignments.append((assignment, status_key, dept_id))
-        if assignment.project_id:
-            seen_projects_by_status[status_key].add(int(assignment.project_id))
-        if status_key in status_keys and assignment.role_on_project_ref_id:
-            project_role_ids.add(int(assignment.role_on_project_ref_id))
-        template_id = getattr(getattr(assignment, "project", None), "auto_hours_template_id", None)
-        if status_key in status_keys and template_id:
-            template_ids.add(int(template_id))
-
     template_map, global_map = _load_role_mapping_for_project_roles(project_role_ids, template_ids)
 
     for status_key, project_ids in seen_projects_by_status.items():
         status_stats[status_key]["projectCount"] = float(len(project_ids))
 
-    for assignment, status_key, dept_id in scoped_assignments:
+    # Pass 2: stream a narrow projection of the assignments in keyset chunks.
+    week_starts = [parse_iso_date(week_key) for week_key in scope.week_keys]
+    hours_by_assignment = week_hours_by_assignment(base_qs, [wk for wk in week_starts if wk is not None])
+    rows = base_qs.values_list(
+        "id",
+        "person_id",
+        "department_id",
+        "role_on_project_ref_id",
+        "project__status",
+        "project__auto_hours_template_id",
+        "person__role_id",
+        "person__department_id",
+        "person__hire_date",
+        "role_on_project_ref__department_id",
+    )
+    for (
+        assignment_id,
+        person_id,
+        assignment_department_id,
+        role_on_project_ref_id,
+        project_status,
+        template_id,
+        person_role_id,
+        person_department_id,
+        hire_date,
+        role_department,
+    ) in iter_keyset(rows, key="id"):
+        status_key = normalize_status_key(project_status or "")
+        if not status_key:
+            continue
+
+        dept_id = None
+        if assignment_department_id:
+            dept_id = int(assignment_department_id)
+        elif person_id and person_department_id:
+            dept_id = int(person_department_id)
+        elif role_department:
+            dept_id = int(role_department)
+
+        week_hours = hours_by_assignment.get(assignment_id)
+        if not week_hours:
+            continue
         is_included = status_key in status_keys
-        weekly_hours = assignment.weekly_hours or {}
-        template_id = getattr(getattr(assignment, "project", None), "auto_hours_template_id", None)
         mapped_roles: list[int] = []
-        person_role_id = int(getattr(getattr(assignment, "person", None), "role_id", 0) or 0)
-        if assignment.person_id:
+        person_role_id = int(person_role_id or 0)
+        if person_id:
             mapped_roles = [person_role_id] if person_role_id > 0 else []
         elif is_included:
             mapped_roles = _map_project_role_to_people_roles(
-                project_role_id=assignment.role_on_project_ref_id,
+                project_role_id=role_on_project_ref_id,
                 template_id=int(template_id) if template_id else None,
                 template_map=template_map,
                 global_map=global_map,
             )
 
-        for idx, week_key in enumerate(scope.week_keys):
-            value = hours_for_week(weekly_hours, week_key)
+        for idx, week_start in enumerate(week_starts):
+            value = week_hours.get(week_start, 0.0) if week_start is not None else 0.0
             if value <= 0:
                 continue
-            week_start = parse_iso_date(week_key)
             if (
-                assignment.person_id
+                person_id
                 and week_start is not None
-                and not is_hired_in_week(getattr(getattr(assignment, "person", None), "hire_date", None), week_start)
+                and not is_hired_in_week(hire_date, week_start)
             ):
                 continue
 
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import hashlib
+import heapq
 from collections import defaultdict
 from datetime import date, timedelta
-from itertools import combinations
 from typing import Any
 
-from django.db.models import Count, Max, Min, Q, Sum
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, F, Max, Min, Sum
 from django.utils.dateparse import parse_date
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -18,9 +21,11 @@ from rest_framework import serializers
 
 from accounts.permissions import IsAdminOrManager
 from assignments.models import WeeklyAssignmentSnapshot
+from core.cache_keys import build_aggregate_cache_key
+from core.cache_scopes import get_snapshot_scope_version
 from core.departments import get_descendant_department_ids
 from core.models import NetworkGraphSettings
-from core.project_visibility import apply_project_visibility_filters
+from core.project_visibility import apply_project_visibility_filters, visibility_cache_token
 from core.week_utils import sunday_of_week
 from projects.models import Project
 
@@ -225,88 +230,82 @@ class _NetworkGraphBaseView(APIView):
         }
         return list(nodes.values()), edges, stats, False
 
+    def _coworker_pair_rows(self, *, qs) -> list[tuple[int, int, int, int]]:
+        """Return (person_a, person_b, shared_weeks, shared_projects) per pair.
+
+        This is the sparse product A·Aᵀ of the person × (project, week)
+        incidence matrix, evaluated by the database: distinct memberships are
+        self-joined on (project, week) so only non-zero pairs are produced and
+        nothing quadratic happens in Python.
+        """
+        membership = (
+            qs.filter(person_id__isnull=False, project_id__isnull=False)
+            .order_by()
+            .values(m_project=F('project_id'), m_week=F('week_start'), m_person=F('person_id'))
+            .distinct()
+        )
+        inner_sql, params = membership.query.sql_with_params()
+        sql = (
+            f'WITH m AS ({inner_sql}) '
+            'SELECT a.m_person, b.m_person, COUNT(*), COUNT(DISTINCT a.m_project) '
+            'FROM m a JOIN m b '
+            'ON a.m_project = b.m_project AND a.m_week = b.m_week AND a.m_person < b.m_person '
+            'GROUP BY a.m_person, b.m_person'
+        )
+        with connections[qs.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            return [(int(r[0]), int(r[1]), int(r[2]), int(r[3])) for r in cursor.fetchall()]
+
     def _build_coworker(
         self,
         *,
         qs,
         settings_obj: NetworkGraphSettings,
     ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], dict[str, int], bool]:
-        pair_metrics: dict[tuple[int, int], dict[str, Any]] = {}
-        person_names: dict[int, str] = {}
-        person_active: dict[int, bool] = {}
+        pair_rows = self._coworker_pair_rows(qs=qs)
 
-        rows = list(
-            qs.filter(person_id__isnull=False, project_id__isnull=False)
-            .values('project_id', 'week_start', 'person_id', 'person_name', 'person_is_active')
-            .order_by('project_id', 'week_start', 'person_id')
-        )
+        person_ids = set()
+        for p1, p2, _weeks, _projects in pair_rows:
+            person_ids.add(p1)
+            person_ids.add(p2)
 
-        grouped: dict[tuple[int, date], list[tuple[int, str, bool]]] = defaultdict(list)
-        for row in rows:
-            project_id = int(row['project_id'])
-            week_start = row['week_start']
-            person_id = int(row['person_id'])
-            person_name = row.get('person_name') or f'Person {person_id}'
-            is_active = bool(row.get('person_is_active', True))
-            grouped[(project_id, week_start)].append((person_id, person_name, is_active))
-
-        for (project_id, _week_start), items in grouped.items():
-            unique_items = {}
-            for person_id, person_name, is_active in items:
-                unique_items[person_id] = (person_name, is_active)
-            person_ids = sorted(unique_items.keys())
-            for person_id in person_ids:
-                person_name, is_active = unique_items[person_id]
-                person_names[person_id] = person_name
-                person_active[person_id] = is_active
-            if len(person_ids) < 2:
-                continue
-            for p1, p2 in combinations(person_ids, 2):
-                key = (p1, p2)
-                metric = pair_metrics.setdefault(
-                    key,
-                    {
-                        'sharedWeeksCount': 0,
-                        'projects': set(),
-                    },
-                )
-                metric['sharedWeeksCount'] += 1
-                metric['projects'].add(project_id)
+        person_names: dict[int, str] = {}
+        person_active: dict[int, bool] = {}
+        if person_ids:
+            person_rows = (
+                qs.filter(person_id__in=person_ids)
+                .order_by()
+                .values_list('person_id', 'person_name', 'person_is_active')
+                .distinct()
+            )
+            for person_id, person_name, is_active in person_rows:
+                person_names[int(person_id)] = person_name or f'Person {person_id}'
+                person_active[int(person_id)] = bool(is_active)
 
         nodes: dict[str, dict[str, Any]] = {}
         edges: list[dict[str, Any]] = []
         coworker_project_weight = float(settings_obj.coworker_project_weight)
         coworker_week_weight = float(settings_obj.coworker_week_weight)
 
-        for (p1, p2), metric in pair_metrics.items():
-            shared_projects_count = len(metric['projects'])
-            shared_weeks_count = int(metric['sharedWeeksCount'])
+        for p1, p2, shared_weeks_count, shared_projects_count in pair_rows:
             score = (coworker_project_weight * shared_projects_count) + (coworker_week_weight * shared_weeks_count)
 
-            n1 = f'person:{p1}'
-            n2 = f'person:{p2}'
-            if n1 not in nodes:
-                nodes[n1] = {
-                    'id': n1,
-                    'label': person_names.get(p1, f'Person {p1}'),
-                    'type': 'person',
-                    'entityId': p1,
-                    'isActive': bool(person_active.get(p1, True)),
-                }
-            if n2 not in nodes:
-                nodes[n2] = {
-                    'id': n2,
-                    'label': person_names.get(p2, f'Person {p2}'),
-                    'type': 'person',
-                    'entityId': p2,
-                    'isActive': bool(person_active.get(p2, True)),
-                }
+            for person_id in (p1, p2):
+                node_id = f'person:{person_id}'
+                if node_id not in nodes:
+                    nodes[node_id] = {
+                        'id': node_id,
+                        'label': person_names.get(person_id, f'Person {person_id}'),
+                        'type': 'person',
+                        'entityId': person_id,
+                        'isActive': bool(person_active.get(person_id, True)),
+                    }
 
             edges.append(
                 {
                     'id': f'coworker:{p1}:{p2}',
-                    'source': n1,
-                    'target': n2,
+                    'source': f'person:{p1}',
+                    'target': f'person:{p2}',
                     'type': 'coworker',
                     'score': round(float(score), 4),
                     'metrics': {
@@ -393,6 +392,22 @@ class _NetworkGraphBaseView(APIView):
         }
         return list(nodes.values()), edges, stats, False
 
+    @staticmethod
+    def _edge_rank(edge: dict[str, Any]) -> tuple[float, str]:
+        return (-float(edge.get('score') or 0.0), str(edge.get('id') or ''))
+
+    def _prune_top_k_per_node(self, edges: list[dict[str, Any]], top_k: int) -> list[dict[str, Any]]:
+        """Keep an edge only if it ranks in the top ``top_k`` of either endpoint."""
+        by_node: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for edge in edges:
+            by_node[edge['source']].append(edge)
+            by_node[edge['target']].append(edge)
+        keep: set[str] = set()
+        for node_edges in by_node.values():
+            for edge in heapq.nsmallest(top_k, node_edges, key=self._edge_rank):
+                keep.add(edge['id'])
+        return [edge for edge in edges if edge['id'] in keep]
+
 
 class NetworkBootstrapView(_NetworkGraphBaseView):
     @extend_schema(
@@ -476,6 +491,7 @@ class NetworkGraphView(_NetworkGraphBaseView):
             OpenApiParameter(name='include_inactive', type=int, required=False, description='0|1'),
             OpenApiParameter(name='client', type=str, required=False),
             OpenApiParameter(name='max_edges', type=int, required=False),
+            OpenApiParameter(name='top_k', type=int, required=False, description='Keep only the k strongest edges per node'),
         ],
         responses=inline_serializer(
             name='NetworkGraphResponse',
@@ -524,6 +540,42 @@ class NetworkGraphView(_NetworkGraphBaseView):
         client_name = (request.query_params.get('client') or '').strip() or None
         max_edges = self._parse_int(request.query_params.get('max_edges'), int(settings_obj.max_edges_default)) or int(settings_obj.max_edges_default)
         max_edges = max(1, min(10000, int(max_edges)))
+        top_k = self._parse_int(request.query_params.get('top_k'))
+        if top_k is not None:
+            top_k = max(1, min(1000, int(top_k)))
+
+        cache_ttl = max(0, int(getattr(settings, 'NETWORK_GRAPH_CACHE_TTL_SECONDS', 0) or 0))
+        cache_key = None
+        if cache_ttl:
+            try:
+                cache_key = build_aggregate_cache_key(
+                    'reports.network.graph',
+                    request,
+                    filters={
+                        'mode': mode,
+                        'start': start_week.isoformat(),
+                        'end': end_week.isoformat(),
+                        'vertical': vertical_id if vertical_id is not None else 'all',
+                        'department': department_id if department_id is not None else 'all',
+                        'include_children': 1 if include_children else 0,
+                        'include_inactive': 1 if include_inactive else 0,
+                        'client': client_name or '',
+                        'max_edges': max_edges,
+                        'top_k': top_k or 0,
+                    },
+                    extra_scope={
+                        'snapshot_version': get_snapshot_scope_version('weekly_snapshots'),
+                        'settings_updated_at': settings_obj.updated_at.isoformat() if settings_obj.updated_at else '',
+                        'visibility': visibility_cache_token('report.network_graph'),
+                    },
+                )
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    resp = Response(cached)
+                    resp['X-Network-Cache'] = 'hit'
+                    return resp
+            except Exception:
+                cache_key = None
 
         qs = self._base_queryset(
             settings_obj=settings_obj,
@@ -543,11 +595,12 @@ class NetworkGraphView(_NetworkGraphBaseView):
         else:
             nodes, edges, stats, _ = self._build_client_experience(qs=qs, settings_obj=settings_obj)
 
-        edges_sorted = sorted(edges, key=lambda item: (-float(item.get('score') or 0.0), str(item.get('id') or '')))
-        truncated = len(edges_sorted) > max_edges
+        if top_k is not None:
+            edges = self._prune_top_k_per_node(edges, top_k)
+        truncated = len(edges) > max_edges
         if truncated:
             warnings.append(f'Edge list was trimmed to max_edges={max_edges}.')
-        edges_trimmed = edges_sorted[:max_edges]
+        edges_trimmed = heapq.nsmallest(max_edges, edges, key=self._edge_rank)
 
         node_ids = set()
         for edge in edges_trimmed:
@@ -570,6 +623,7 @@ class NetworkGraphView(_NetworkGraphBaseView):
             'appliedSettings': {
                 'includeInactive': include_inactive,
                 'maxEdges': max_edges,
+                'topK': top_k,
                 'coworkerProjectWeight': float(settings_obj.coworker_project_weight),
                 'coworkerWeekWeight': float(settings_obj.coworker_week_weight),
                 'coworkerMinScore': float(settings_obj.coworker_min_score),
@@ -592,4 +646,12 @@ class NetworkGraphView(_NetworkGraphBaseView):
             'truncated': truncated,
             'warnings': warnings,
         }
-        return Response(payload)
+        if cache_key:
+            try:
+                cache.set(cache_key, payload, timeout=cache_ttl)
+            except Exception:  # nosec B110
+                pass
+        resp = Response(payload)
+        if cache_ttl:
+            resp['X-Network-Cache'] = 'miss'
+        return resp
@@ -328,3 +328,50 @@ class NetworkGraphApiTests(TestCase):
         edge = next((e for e in cl.json()['edges'] if e['source'] == f'person:{self.person_a.id}'), None)
         self.assertIsNotNone(edge)
         self.assertEqual(edge['metrics']['distinctProjectsCount'], 1)
+
+    def test_top_k_prunes_edges_per_node(self):
+        self.client.force_authenticate(self.admin)
+        full = self.client.get(
+            f'/api/reports/network/graph/?mode=project_people&include_inactive=1&start={self.start}&end={self.end}'
+        )
+        self.assertEqual(full.status_code, status.HTTP_200_OK, full.content)
+        pruned = self.client.get(
+            f'/api/reports/network/graph/?mode=project_people&include_inactive=1&top_k=1&start={self.start}&end={self.end}'
+        )
+        self.assertEqual(pruned.status_code, status.HTTP_200_OK, pruned.content)
+        payload = pruned.json()
+        self.assertEqual(payload['appliedSettings']['topK'], 1)
+        self.assertLess(len(payload['edges']), len(full.json()['edges']))
+        edge_ids = {e['id'] for e in payload['edges']}
+        # Alice's strongest edge (Project A, 2 weeks) survives pruning.
+        self.assertIn(f'assignment:{self.person_a.id}:{self.project_a.id}', edge_ids)
+
+    def test_graph_cache_is_keyed_by_snapshot_version(self):
+        from core.cache_scopes import bump_weekly_snapshot_version
+
+        self.client.force_authenticate(self.admin)
+        path = f'/api/reports/network/graph/?mode=coworker&start={self.start}&end={self.end}'
+        first = self.client.get(path)
+        self.assertEqual(first.status_code, status.HTTP_200_OK, first.content)
+        self.assertEqual(first['X-Network-Cache'], 'miss')
+        second = self.client.get(path)
+        self.assertEqual(second['X-Network-Cache'], 'hit')
+        self.assertEqual(first.json()['edges'], second.json()['edges'])
+
+        WeeklyAssignmentSnapshot.objects.create(
+            week_start=date.fromisoformat(self.end),
+            person=self.person_c,
+            project=self.project_b,
+            department_id=self.dept_other.id,
+            hours=3,
+            person_name=self.person_c.name,
+            project_name=self.project_b.name,
+            client=self.project_b.client,
+            person_is_active=True,
+        )
+        bump_weekly_snapshot_version()
+
+        third = self.client.get(path)
+        self.assertEqual(third['X-Network-Cache'], 'miss')
+        edge_ids = {e['id'] for e in third.json()['edges']}
+        self.assertIn(f'coworker:{self.person_a.id}:{self.person_c.id}', edge_ids)
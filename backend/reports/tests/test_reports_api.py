@@ -1,3 +1,4 @@
+import time
 from datetime import date, timedelta
 from django.conf import settings
 from django.core.cache import cache
@@ -14,6 +15,7 @@ from verticals.models import Vertical
 from skills.models import SkillTag, PersonSkill
 from roles.models import Role
 from deliverables.models import Deliverable, PreDeliverableType, PreDeliverableItem, DeliverableAssignment
+from core.aggregate_cache import aggregate_cache
 from core.cache_keys import build_aggregate_cache_key
 
 
@@ -189,6 +191,7 @@ class DepartmentsOverviewReportsTests(TestCase):
         features['SHORT_TTL_AGGREGATES'] = True
         with override_settings(FEATURES=features):
             cache.clear()
+            aggregate_cache.clear_local()
             url = '/api/reports/departments/overview/?weeks=4'
 
             first = self.client.get(url)
@@ -213,14 +216,15 @@ class DepartmentsOverviewReportsTests(TestCase):
                     'include_inactive': 0,
                     'status_in': [],
                     'search': '',
+                    'hire_eligibility_version': 2,
                 },
             )
-            fresh_key = f'{base_key}:fresh'
-            stale_key = f'{base_key}:stale'
-            lock_key = f'{base_key}:lock'
-            self.assertIsNotNone(cache.get(stale_key))
-            cache.delete(fresh_key)
-            cache.set(lock_key, '1', timeout=5)
+            envelope = cache.get(base_key)
+            self.assertIsNotNone(envelope)
+            envelope['fresh_until'] = time.time() - 1
+            cache.set(base_key, envelope, timeout=60)
+            cache.set(f'lock:{base_key}', '1', timeout=5)
+            aggregate_cache.clear_local()
             stale_resp = self.client.get(url)
             self.assertEqual(stale_resp.status_code, status.HTTP_200_OK)
             self.assertEqual(stale_resp.headers.get('X-Overview-Cache'), 'stale')
@@ -1,11 +1,9 @@
 from collections import Counter, defaultdict
 from datetime import datetime, date as _date, timedelta
-import random
 import time
 from django.utils.dateparse import parse_date
 from django.db import connection, transaction
-from django.db.models import Count, Q, Prefetch
-from django.core.cache import cache
+from django.db.models import Count, Q
 from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -22,7 +20,10 @@ from people.services import CapacityAnalysisService
 from skills.models import PersonSkill
 from assignments.models import Assignment
 from assignments.analytics import compute_role_capacity
+from assignments.read_queries import week_hours_by_person
 from projects.models import Project
+from core.aggregate_cache import aggregate_builder, aggregate_cache, refresh_spec
+from core.week_utils import sunday_of_week
 from core.cache_keys import build_aggregate_cache_key
 from core.project_visibility import (
     get_hidden_project_ids_for_scope,
@@ -140,13 +141,6 @@ class DepartmentsOverviewView(APIView):
             value = min(max_value, value)
         return value
 
-    def _cache_keys(self, base_key: str) -> dict[str, str]:
-        return {
-            'fresh': f'{base_key}:fresh',
-            'stale': f'{base_key}:stale',
-            'lock': f'{base_key}:lock',
-        }
-
     def _respond(self, payload: dict, cache_state: str | None = None) -> Response:
         resp = Response(payload)
         if cache_state:
@@ -210,13 +204,19 @@ class DepartmentsOverviewView(APIView):
             1500,
             min_value=50,
         )
-        deadline_enabled = True
-        deadline_at = time.monotonic() + (max(0, endpoint_deadline_ms) / 1000.0)
-
+        build_kwargs = {
+            'weeks': weeks,
+            'vertical': vertical,
+            'department': department,
+            'include_children': include_children,
+            'include_inactive': include_inactive,
+            'status_in': sorted(status_in) if status_in else None,
+            'search': search,
+            'deadline_ms': endpoint_deadline_ms,
+            'query_timeout_ms': query_timeout_ms,
+        }
         use_cache = bool(settings.FEATURES.get('SHORT_TTL_AGGREGATES'))
-        cache_keys: dict[str, str] | None = None
-        lock_acquired = False
-        stale_payload: dict | None = None
+        cache_key: str | None = None
         if use_cache:
             try:
                 cache_key = build_aggregate_cache_key(
@@ -233,31 +233,53 @@ class DepartmentsOverviewView(APIView):
                         'hire_eligibility_version': 2,
                     },
                 )
-                cache_keys = self._cache_keys(cache_key)
-                cached = cache.get(cache_keys['fresh'])
-                if cached is not None:
-                    return self._respond(cached, 'fresh')
-
-                stale_payload = cache.get(cache_keys['stale'])
-                lock_ttl = self._setting_int(
-                    'REPORTS_DEPARTMENTS_OVERVIEW_CACHE_LOCK_SECONDS',
-                    10,
-                    min_value=1,
-                )
-                lock_acquired = bool(cache.add(cache_keys['lock'], 1, timeout=lock_ttl))
-                if not lock_acquired:
-                    if stale_payload is not None:
-                        return self._respond(stale_payload, 'stale')
-                    # Briefly poll in case another request is currently filling.
-                    for _ in range(3):
-                        time.sleep(0.05)
-                        cached = cache.get(cache_keys['fresh'])
-                        if cached is not None:
-                            return self._respond(cached, 'fresh')
             except Exception:
-                cache_keys = None
-                lock_acquired = False
+                cache_key = None
+        if not cache_key:
+            return self._respond(build_departments_overview(**build_kwargs), 'generated')
+
+        ttl_base = self._setting_int('AGGREGATE_CACHE_TTL', 30, min_value=1)
+        jitter = self._setting_int(
+            'REPORTS_DEPARTMENTS_OVERVIEW_CACHE_TTL_JITTER_SECONDS',
+            5,
+            min_value=0,
+        )
+        swr_seconds = self._setting_int(
+            'REPORTS_DEPARTMENTS_OVERVIEW_CACHE_STALE_SECONDS',
+            120,
+            min_value=1,
+        )
+        lock_ttl = self._setting_int(
+            'REPORTS_DEPARTMENTS_OVERVIEW_CACHE_LOCK_SECONDS',
+            10,
+            min_value=1,
+        )
+        result = aggregate_cache.get_or_build(
+            cache_key,
+            lambda: build_departments_overview(**build_kwargs),
+            ttl=ttl_base,
+            stale_ttl=swr_seconds,
+            lock_ttl=lock_ttl,
+            jitter=jitter,
+            refresh=refresh_spec(build_departments_overview, **build_kwargs),
+        )
+        cache_state = {'local': 'fresh', 'coalesced': 'fresh'}.get(result.state, result.state)
+        return self._respond(result.value, cache_state)
 
+    def _build_overview_payload(
+        self,
+        *,
+        weeks: int,
+        vertical: int | None,
+        department: int | None,
+        include_children: bool,
+        include_inactive: bool,
+        status_in: set[str] | None,
+        search: str,
+        deadline_at: float,
+        deadline_enabled: bool,
+        query_timeout_ms: int,
+    ) -> dict:
         partial_failures: list[str] = []
         errors_by_scope: dict[str, dict[str, str]] = {}
 
@@ -389,42 +411,23 @@ class DepartmentsOverviewView(APIView):
                         )
                     else:
                         try:
-                            assignment_hours_qs = Assignment.objects.filter(
-                                is_active=True,
-                                person_id__in=people_ids,
-                            ).values('person_id', 'weekly_hours')
+                            # Monday-keyed columns read the Sunday week containing them.
+                            week_sundays = {
+                                wk: sunday_of_week(datetime.strptime(wk, '%Y-%m-%d').date()) for wk in week_keys
+                            }
                             util_timeout = min(
                                 query_timeout_ms,
                                 max(50, self._time_left_ms(deadline_at, deadline_enabled)),
                             )
-                            assignment_hours_rows = self._list_with_timeout(assignment_hours_qs, util_timeout)
-                            for row in assignment_hours_rows:
-                                person_id = row.get('person_id')
-                                if person_id is None:
-                                    continue
-                                weekly_hours = row.get('weekly_hours') or {}
-                                if not isinstance(weekly_hours, dict):
-                                    continue
-                                for week_key in week_keys:
-                                    try:
-                                        hours_val = float(weekly_hours.get(week_key) or 0)
-                                    except Exception:
-                                        hours_val = 0.0
-                                    if hours_val <= 0:
-                                        # Tolerate nearby keys to match legacy data shape.
-                                        try:
-                                            base_date = datetime.strptime(week_key, '%Y-%m-%d').date()
-                                            for offset in range(-3, 4):
-                                                alt_key = (base_date + timedelta(days=offset)).strftime('%Y-%m-%d')
-                                                try:
-                                                    alt_val = float(weekly_hours.get(alt_key) or 0)
-                                                except Exception:
-                                                    alt_val = 0.0
-                                                if alt_val > 0:
-                                                    hours_val = alt_val
-                                                    break
-                                        except Exception:
-                                            hours_val = 0.0
+                            with transaction.atomic():
+                                self._set_statement_timeout(util_timeout)
+                                hours_by_person = week_hours_by_person(
+                                    Assignment.objects.filter(is_active=True, person_id__in=people_ids),
+                                    week_sundays.values(),
+                                )
+                            for person_id, by_week in hours_by_person.items():
+                                for week_key, sunday in week_sundays.items():
+                                    hours_val = by_week.get(sunday, 0.0)
                                     if hours_val > 0:
                                         person_week_totals[int(person_id)][week_key] += hours_val
                         except Exception:
@@ -594,34 +597,18 @@ class DepartmentsOverviewView(APIView):
             'overviewByDepartment': overview_by_department,
             'analyticsSeries': analytics_series,
         }
+        return payload
 
-        if use_cache and cache_keys:
-            try:
-                ttl_base = self._setting_int('AGGREGATE_CACHE_TTL', 30, min_value=1)
-                jitter = self._setting_int(
-                    'REPORTS_DEPARTMENTS_OVERVIEW_CACHE_TTL_JITTER_SECONDS',
-                    5,
-                    min_value=0,
-                )
-                swr_seconds = self._setting_int(
-                    'REPORTS_DEPARTMENTS_OVERVIEW_CACHE_STALE_SECONDS',
-                    120,
-                    min_value=1,
-                )
-                fresh_ttl = max(1, ttl_base + random.randint(-jitter, jitter))
-                stale_ttl = max(fresh_ttl + 1, fresh_ttl + swr_seconds)
-                cache.set(cache_keys['fresh'], payload, timeout=fresh_ttl)
-                cache.set(cache_keys['stale'], payload, timeout=stale_ttl)
-            except Exception:
-                pass
-            finally:
-                if lock_acquired:
-                    try:
-                        cache.delete(cache_keys['lock'])
-                    except Exception:
-                        pass
 
-        return self._respond(payload, 'generated')
+@aggregate_builder
+def build_departments_overview(*, deadline_ms: int, status_in: list[str] | None = None, **filters) -> dict:
+    """Departments overview payload from plain filter values; the deadline starts now."""
+    return DepartmentsOverviewView()._build_overview_payload(
+        status_in=set(status_in) if status_in else None,
+        deadline_at=time.monotonic() + (max(0, deadline_ms) / 1000.0),
+        deadline_enabled=True,
+        **filters,
+    )
 
 
 class RoleCapacityBootstrapView(APIView):
@@ -800,9 +787,9 @@ class ForecastBootstrapView(APIView):
             assignments_qs = assignments_qs.filter(project__vertical_id=vertical_id)
         if hidden_project_ids:
             assignments_qs = assignments_qs.exclude(project_id__in=sorted(hidden_project_ids))
-        assignments_qs = assignments_qs.only('weekly_hours', 'person_id')
-        people_qs = people_qs.prefetch_related(Prefetch('assignments', queryset=assignments_qs))
-        workload_forecast = CapacityAnalysisService.get_workload_forecast(people_qs, weeks, cache_scope=cache_scope)
+        workload_forecast = CapacityAnalysisService.get_workload_forecast(
+            people_qs, weeks, cache_scope=cache_scope, assignments_qs=assignments_qs,
+        )
 
         return Response({
             'departments': departments_payload,
@@ -1,15 +1,33 @@
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 
 from roles.models import Role
 
 
+@receiver(pre_save, sender=Role)
+def capture_role_overhead_hours(sender, instance: Role, **kwargs):
+    if not instance.pk:
+        instance._previous_overhead_hours = None
+        return
+    try:
+        instance._previous_overhead_hours = (
+            Role.objects.filter(pk=instance.pk)
+            .values_list('overhead_hours_per_week', flat=True)
+            .first()
+        )
+    except Exception:  # nosec B110
+        instance._previous_overhead_hours = None
+
+
 @receiver(post_save, sender=Role)
-def sync_overhead_assignments_on_role_save(sender, instance: Role, **kwargs):
+def sync_overhead_assignments_on_role_save(sender, instance: Role, created: bool = False, **kwargs):
+    # A brand-new role has no members yet; only overhead-hour changes matter.
+    if created or getattr(instance, '_previous_overhead_hours', None) == instance.overhead_hours_per_week:
+        return
     try:
-        from assignments.overhead import sync_overhead_assignments_for_roles
+        from assignments.overhead import queue_overhead_sync
     except Exception:  # nosec B110
         return
 
-    transaction.on_commit(lambda: sync_overhead_assignments_for_roles([instance.id]))
+    transaction.on_commit(lambda: queue_overhead_sync(role_ids=[instance.id]))
@@ -9,6 +9,7 @@ RUN_ID="$(date +%Y%m%d%H%M%S)"
 KEEP_STACK=0
 SKIP_UI_CHECKS="${LOAD_SKIP_UI_CHECKS:-0}"
 SOURCE_PROJECT="${SOURCE_PROJECT:-workload-tracker}"
+SEED_PROFILE="${LOAD_SEED_PROFILE:-small}"
 PROJECT_NAME=""
 BACKEND_PORT="${LOAD_BACKEND_PORT:-18080}"
 FRONTEND_PORT="${LOAD_FRONTEND_PORT:-13000}"
@@ -340,6 +341,7 @@ seed_load_data() {
   set +e
   compose exec -T backend python manage.py seed_load_test_data \
     --run-id "${RUN_ID}" \
+    --profile "${SEED_PROFILE}" \
     --manager-count 48 \
     --user-count 72 \
     --project-count "${target_projects}" \